@@ -8,10 +8,12 @@ import re
 import sys
 import tempfile
 import time
+from collections import OrderedDict
 from collections.abc import Awaitable, Callable
+from contextlib import aclosing
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Generic, Literal, TypeVar
+from typing import Any, Generic, Literal, TypeVar, get_args
 from urllib.parse import urlparse
 
 from dotenv import load_dotenv
@@ -26,7 +28,9 @@ from browser_use.agent.cloud_events import (
 from browser_use.agent.message_manager.utils import save_conversation
 from browser_use.dom.views import DEFAULT_INCLUDE_ATTRIBUTES
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_llm_client_pool
 from browser_use.llm.messages import BaseMessage, UserMessage
+from browser_use.llm.views import ChatInvokeCompletion
 from browser_use.tokens.service import TokenCost
 
 load_dotenv()
@@ -189,6 +193,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		vision_detail_level: Literal['auto', 'low', 'high'] = 'auto',
 		llm_timeout: int = 60,
 		step_timeout: int = 180,
+		speculative_state_prefetch: bool = False,
+		stream_actions: bool = False,
 		**kwargs,
 	):
 		if not isinstance(llm, BaseChatModel):
@@ -270,6 +276,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			include_tool_call_examples=include_tool_call_examples,
 			llm_timeout=llm_timeout,
 			step_timeout=step_timeout,
+			speculative_state_prefetch=speculative_state_prefetch,
+			stream_actions=stream_actions,
 		)
 
 		# Token cost service
@@ -284,6 +292,17 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Initialize file system
 		self._set_file_system(file_system_path)
 
+		# Next step's browser state, captured ahead when settings.speculative_state_prefetch is on
+		self._state_prefetch: asyncio.Task[BrowserStateSummary] | None = None
+		self._state_prefetch_origin: tuple[int, Page | None] | None = None  # page mutation count and tab it started on
+		self._state_prefetch_stats = {'used': 0, 'discarded': 0}
+		self._run_has_step_hooks = False  # hooks can drive the pages directly, see _start_state_prefetch()
+		self._dom_warmup: asyncio.Task[bool] | None = None  # running during the LLM call, see _get_next_action_warming_dom()
+		self._step_start_page_health: dict[str, int] | None = None  # see _step_page_health_counts()
+
+		# First action of the model output, started while the output streams in when settings.stream_actions is on
+		self._early_action: tuple[ActionModel, asyncio.Task[ActionResult]] | None = None
+
 		# Action setup
 		self._setup_action_models()
 		self._set_browser_use_version_and_source(source)
@@ -475,6 +494,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self._external_pause_event = asyncio.Event()
 		self._external_pause_event.set()
 
+		# The LLM API clients are pooled across agents, closed in close() once no agent uses them
+		get_llm_client_pool().retain()
+		self._llm_clients_retained = True
+
 	@property
 	def logger(self) -> logging.Logger:
 		"""Get instance-specific logger with task ID in the name"""
@@ -585,6 +608,16 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			logger.error('💾 File system is not set up. Cannot save state.')
 			raise ValueError('File system is not set up. Cannot save state.')
 
+	async def _save_file_system_state_async(self) -> None:
+		"""
+		save_file_system_state(), serializing the files in a worker thread while a next-state prefetch runs, so the
+		event loop keeps driving the capture. Nothing else touches the file system between the actions and the next step.
+		"""
+		if self.file_system is None or self._state_prefetch is None:
+			self.save_file_system_state()
+			return
+		self.state.file_system_state = await asyncio.to_thread(self.file_system.get_state)
+
 	def _set_message_context(self) -> str | None:
 		return self.settings.message_context
 
@@ -627,24 +660,36 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 	def _setup_action_models(self) -> None:
 		"""Setup dynamic action models from controller's registry"""
+		# AgentOutput types by the (cached) ActionModel they wrap, least recently used evicted first
+		self._agent_output_types: OrderedDict[type[ActionModel], type[AgentOutput]] = OrderedDict()
+
 		# Initially only include actions with no filters
 		self.ActionModel = self.controller.registry.create_action_model()
 		# Create output model with the dynamic actions
-		if self.settings.flash_mode:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.ActionModel)
-		elif self.settings.use_thinking:
-			self.AgentOutput = AgentOutput.type_with_custom_actions(self.ActionModel)
-		else:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.ActionModel)
+		self.AgentOutput = self._agent_output_type(self.ActionModel)
 
 		# used to force the done action when max_steps is reached
 		self.DoneActionModel = self.controller.registry.create_action_model(include_actions=['done'])
+		self.DoneAgentOutput = self._agent_output_type(self.DoneActionModel)
+
+	def _agent_output_type(self, action_model: type[ActionModel]) -> type[AgentOutput]:
+		"""The AgentOutput type for an action model, reused while the registry hands out the same action model"""
+		output_type = self._agent_output_types.get(action_model)
+		if output_type is not None:
+			self._agent_output_types.move_to_end(action_model)
+			return output_type
+
 		if self.settings.flash_mode:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.DoneActionModel)
+			output_type = AgentOutput.type_with_custom_actions_flash_mode(action_model)
 		elif self.settings.use_thinking:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions(self.DoneActionModel)
+			output_type = AgentOutput.type_with_custom_actions(action_model)
 		else:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.DoneActionModel)
+			output_type = AgentOutput.type_with_custom_actions_no_thinking(action_model)
+		self._agent_output_types[action_model] = output_type
+		# sized like the registry's ActionModel cache, there is no point keeping types for action models it evicted
+		while len(self._agent_output_types) > self.controller.registry.action_model_cache_size:
+			self._agent_output_types.popitem(last=False)
+		return output_type
 
 	def add_new_task(self, new_task: str) -> None:
 		"""Add a new task to the agent, keeping the same task_id as tasks are continuous"""
@@ -671,6 +716,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		"""Execute one step of the task"""
 		# Initialize timing first, before any exceptions can occur
 		self.step_start_time = time.time()
+		self._step_start_page_health = self.browser_session.page_health_stats() if self.browser_session else None
 
 		browser_state_summary = None
 
@@ -679,17 +725,22 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			browser_state_summary = await self._prepare_context(step_info)
 
 			# Phase 2: Get model output and execute actions
-			await self._get_next_action(browser_state_summary)
+			await self._get_next_action_warming_dom(browser_state_summary)
 			await self._execute_actions()
+			# the next step's browser state is captured while this step is post-processed and recorded
+			self._start_state_prefetch(step_info)
 
 			# Phase 3: Post-processing
 			await self._post_process()
 
 		except Exception as e:
+			await self._cancel_early_action(f'the step failed with {type(e).__name__}')
 			# Handle ALL exceptions in one place
 			await self._handle_step_error(e)
 
 		finally:
+			# a step cancelled while its output streamed in still has its early action running
+			await self._cancel_early_action('the step ended before its actions ran')
 			await self._finalize(browser_state_summary)
 
 	async def _prepare_context(self, step_info: AgentStepInfo | None = None) -> BrowserStateSummary:
@@ -698,10 +749,12 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		assert self.browser_session is not None, 'BrowserSession is not set up'
 
-		self.logger.debug(f'🌐 Step {self.state.n_steps + 1}: Getting browser state...')
-		browser_state_summary = await self.browser_session.get_browser_state_with_recovery(
-			cache_clickable_elements_hashes=True, include_screenshot=self.settings.use_vision
-		)
+		browser_state_summary = await self._take_state_prefetch()
+		if browser_state_summary is None:
+			self.logger.debug(f'🌐 Step {self.state.n_steps + 1}: Getting browser state...')
+			browser_state_summary = await self.browser_session.get_browser_state_with_recovery(
+				cache_clickable_elements_hashes=True, include_screenshot=self.settings.use_vision
+			)
 		current_page = await self.browser_session.get_current_page()
 
 		# Check for new downloads after getting browser state (catches PDF auto-downloads and previous step downloads)
@@ -738,6 +791,90 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		await self._handle_final_step(step_info)
 		return browser_state_summary
 
+	async def _get_next_action_warming_dom(self, browser_state_summary: BrowserStateSummary) -> None:
+		"""Get the next action, with speculative_state_prefetch bringing the DOM snapshot up to date during the LLM call"""
+		if not self.settings.speculative_state_prefetch or self.browser_session is None:
+			await self._get_next_action(browser_state_summary)
+			return
+
+		dom_warmup = self._dom_warmup = asyncio.create_task(self.browser_session.warm_dom_cache())
+		try:
+			await self._get_next_action(browser_state_summary)
+		except BaseException:
+			dom_warmup.cancel()
+			raise
+		finally:
+			# the actions must not run while the page is being analysed
+			await asyncio.gather(dom_warmup, return_exceptions=True)
+			self._dom_warmup = None
+
+	def _start_state_prefetch(self, step_info: AgentStepInfo | None = None) -> None:
+		"""
+		Start capturing the next step's browser state right after the actions. It runs while _finalize() awaits the
+		file system snapshot (taken in a worker thread) and yields after dispatching the step event, the history
+		itself is recorded on the event loop. _take_state_prefetch() uses it if nothing changed the pages since.
+		"""
+		if not self.settings.speculative_state_prefetch or self.browser_session is None or self._state_prefetch is not None:
+			return
+		if self.state.stopped or self.state.paused or (step_info and step_info.is_last_step()):
+			return
+		if self.state.last_result and self.state.last_result[-1].is_done:
+			return
+		if self._run_has_step_hooks:
+			# a state captured before on_step_end/on_step_start would be discarded after them anyway
+			return
+
+		self._state_prefetch_origin = (self.browser_session.page_mutation_count, self.browser_session.agent_current_page)
+		# new elements are marked when the state is used, against the state the LLM saw last
+		self._state_prefetch = asyncio.create_task(
+			self.browser_session.get_browser_state_with_recovery(
+				cache_clickable_elements_hashes=False, include_screenshot=self.settings.use_vision
+			)
+		)
+
+	def _state_prefetch_is_current(self, origin: tuple[int, Page | None]) -> bool:
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+		mutation_count, page = origin
+		return self.browser_session.page_mutation_count == mutation_count and self.browser_session.agent_current_page is page
+
+	async def _take_state_prefetch(self) -> BrowserStateSummary | None:
+		"""The browser state captured by _start_state_prefetch(), or None if there is none or something changed the pages"""
+		task, origin = self._state_prefetch, self._state_prefetch_origin
+		if task is None or origin is None:
+			return None
+		self._state_prefetch = self._state_prefetch_origin = None
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+
+		if not self._state_prefetch_is_current(origin):
+			await self._discard_state_prefetch(task, 'the pages changed since it started')
+			return None
+		try:
+			browser_state_summary = await task
+		except Exception as e:
+			await self._discard_state_prefetch(task, f'{type(e).__name__}: {e}')
+			return None
+		# checked again, the pages may have changed while the capture was running
+		page = origin[1]
+		if not self._state_prefetch_is_current(origin) or (page is not None and page.url != browser_state_summary.url):
+			await self._discard_state_prefetch(task, 'the pages changed during the capture')
+			return None
+
+		self.browser_session.mark_new_clickable_elements(browser_state_summary)
+		self._state_prefetch_stats['used'] += 1
+		self.logger.debug(f'🌐 Step {self.state.n_steps + 1}: Using browser state captured ahead')
+		return browser_state_summary
+
+	async def _discard_state_prefetch(self, task: asyncio.Task | None = None, reason: str = 'no longer current') -> None:
+		"""Drop a browser state captured ahead, waiting for its capture to stop so it can't overlap with the next one"""
+		if task is None:
+			task, self._state_prefetch, self._state_prefetch_origin = self._state_prefetch, None, None
+			if task is None:
+				return
+		task.cancel()
+		await asyncio.gather(task, return_exceptions=True)
+		self._state_prefetch_stats['discarded'] += 1
+		self.logger.debug(f'🗑️ Discarded browser state captured ahead: {reason}')
+
 	@observe_debug(ignore_input=True, name='get_next_action')
 	async def _get_next_action(self, browser_state_summary: BrowserStateSummary) -> None:
 		"""Execute LLM interaction with retry logic and handle callbacks"""
@@ -775,7 +912,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			raise ValueError('No model output to execute actions from')
 
 		self.logger.debug(f'⚡ Step {self.state.n_steps}: Executing {len(self.state.last_model_output.action)} actions...')
-		result = await self.multi_act(self.state.last_model_output.action)
+		early_action, self._early_action = self._early_action, None
+		result = await self.multi_act(
+			self.state.last_model_output.action, started_first_action=early_action[1] if early_action else None
+		)
 		self.logger.debug(f'✅ Step {self.state.n_steps}: Actions completed')
 
 		self.state.last_result = result
@@ -848,36 +988,57 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		if not self.state.last_result:
 			return
 
+		metadata = None
 		if browser_state_summary:
+			page_health_probes, page_health_cache_hits = self._step_page_health_counts()
 			metadata = StepMetadata(
 				step_number=self.state.n_steps,
 				step_start_time=self.step_start_time,
 				step_end_time=step_end_time,
+				page_health_probes=page_health_probes,
+				page_health_cache_hits=page_health_cache_hits,
+			)
+			self.logger.debug(
+				f'🩺 Step {self.state.n_steps}: {page_health_probes} page health probes, {page_health_cache_hits} answered from cache'
 			)
 
+		step_event = self._record_step(browser_state_summary, metadata)
+
+		# Save file system state after step completion
+		await self._save_file_system_state_async()
+
+		# Emit both step created and executed events
+		if step_event is not None:
+			self.eventbus.dispatch(step_event)
+			if self._state_prefetch is not None:
+				# the event handlers (cloud sync) and the capture of the next browser state run before the next step
+				await asyncio.sleep(0)
+
+	def _record_step(
+		self, browser_state_summary: BrowserStateSummary | None, metadata: StepMetadata | None
+	) -> CreateAgentStepEvent | None:
+		"""Add the step to the history, returns the step event to emit"""
+		assert self.state.last_result is not None
+		if browser_state_summary:
 			# Use _make_history_item like main branch
 			self._make_history_item(self.state.last_model_output, browser_state_summary, self.state.last_result, metadata)
 
 		# Log step completion summary
 		self._log_step_completion_summary(self.step_start_time, self.state.last_result)
 
-		# Save file system state after step completion
-		self.save_file_system_state()
+		if not (browser_state_summary and self.state.last_model_output):
+			return None
 
-		# Emit both step created and executed events
-		if browser_state_summary and self.state.last_model_output:
-			# Extract key step data for the event
-			actions_data = []
-			if self.state.last_model_output.action:
-				for action in self.state.last_model_output.action:
-					action_dict = action.model_dump() if hasattr(action, 'model_dump') else {}
-					actions_data.append(action_dict)
-
-			# Emit CreateAgentStepEvent
-			step_event = CreateAgentStepEvent.from_agent_step(
-				self, self.state.last_model_output, self.state.last_result, actions_data, browser_state_summary
-			)
-			self.eventbus.dispatch(step_event)
+		# Extract key step data for the event
+		actions_data = []
+		if self.state.last_model_output.action:
+			for action in self.state.last_model_output.action:
+				action_dict = action.model_dump() if hasattr(action, 'model_dump') else {}
+				actions_data.append(action_dict)
+
+		return CreateAgentStepEvent.from_agent_step(
+			self, self.state.last_model_output, self.state.last_result, actions_data, browser_state_summary
+		)
 
 	async def _handle_final_step(self, step_info: AgentStepInfo | None = None) -> None:
 		"""Handle special processing for the last step"""
@@ -996,7 +1157,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		"""Get next action from LLM based on current state"""
 
 		try:
-			response = await self.llm.ainvoke(input_messages, output_format=self.AgentOutput)
+			if self.settings.stream_actions:
+				response = await self._stream_model_output(input_messages)
+			else:
+				response = await self.llm.ainvoke(input_messages, output_format=self.AgentOutput)
 			parsed = response.completion
 
 			# cut the number of actions to max_actions_per_step if needed
@@ -1012,6 +1176,69 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			# Just re-raise - Pydantic's validation errors are already descriptive
 			raise
 
+	async def _stream_model_output(self, input_messages: list[BaseMessage]) -> ChatInvokeCompletion[AgentOutput]:
+		"""Stream the model output, starting its first action as soon as that action is complete"""
+		# astream_structured() is optional, BaseChatModel only requires ainvoke()
+		astream_structured = getattr(self.llm, 'astream_structured', None)
+		if astream_structured is None:
+			return await self.llm.ainvoke(input_messages, output_format=self.AgentOutput)
+
+		action_model = get_args(self.AgentOutput.model_fields['action'].annotation)[0]
+		response = None
+		try:
+			async with aclosing(astream_structured(input_messages, output_format=self.AgentOutput)) as stream:
+				async for item in stream:
+					if isinstance(item, ChatInvokeCompletion):
+						response = item
+					elif item.field == 'action' and item.index == 0:
+						await self._start_early_action(action_model, item.value)
+			if response is None:
+				raise ValueError('The model output stream ended without a complete output')
+		except BaseException as e:
+			# the full output didn't validate (or never came), the action must not go on
+			await self._cancel_early_action(f'the model output failed with {type(e).__name__}')
+			raise
+
+		if self._early_action is not None:
+			started_action = self._early_action[0]
+			actions = response.completion.action
+			if not actions or actions[0].model_dump(exclude_unset=True) != started_action.model_dump(exclude_unset=True):
+				await self._cancel_early_action('it is not the first action of the validated output')
+		return response
+
+	async def _start_early_action(self, action_model: type[ActionModel], action_data: Any) -> None:
+		"""Start the first action of a model output that is still streaming, see settings.stream_actions"""
+		if self._early_action is not None:
+			return
+		try:
+			await self._raise_if_stopped_or_paused()
+			action = action_model.model_validate(action_data)
+		except (InterruptedError, ValidationError):
+			# validating the complete output reports invalid actions
+			return
+		action_name = next(iter(action.model_dump(exclude_unset=True)), None)
+		if action_name is None or action_name == 'done':
+			# done depends on the whole output and has nothing to gain from an early start
+			return
+
+		self.logger.debug(f'⚡ Step {self.state.n_steps + 1}: Starting {action_name} while the model output streams in...')
+		self._early_action = (action, asyncio.create_task(self._act(action, wait_for_dom_warmup=True)))
+
+	async def _cancel_early_action(self, reason: str) -> None:
+		"""Cancel the action started before the model output was complete (an action that already ran can't be undone)"""
+		if self._early_action is None:
+			return
+		action, task = self._early_action
+		self._early_action = None
+		already_done = task.done()
+		task.cancel()
+		await asyncio.gather(task, return_exceptions=True)
+		action_name = next(iter(action.model_dump(exclude_unset=True)), 'unknown')
+		if already_done:
+			self.logger.warning(f'⚠️ {action_name} started early had already run when {reason}')
+		else:
+			self.logger.info(f'🛑 Cancelled {action_name} started early because {reason}')
+
 	def _log_agent_run(self) -> None:
 		"""Log the agent run"""
 		self.logger.info(f'🚀 Starting task: {self.task}')
@@ -1069,6 +1296,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				summary_lines.append(f'          {i + 1}. {detail}')
 			self.logger.info('\n'.join(summary_lines))
 
+	def _step_page_health_counts(self) -> tuple[int, int]:
+		"""Page responsiveness checks (probes, cache hits) made by the browser session since the step started"""
+		start = self._step_start_page_health
+		if not self.browser_session or start is None:
+			return 0, 0
+		current = self.browser_session.page_health_stats()
+		return current['probes'] - start['probes'], current['hits'] - start['hits']
+
 	def _log_step_completion_summary(self, step_start_time: float, result: list[ActionResult]) -> None:
 		"""Log step completion summary with action count, timing, and success/failure stats"""
 		if not result:
@@ -1170,6 +1405,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		loop = asyncio.get_event_loop()
 		agent_run_error: str | None = None  # Initialize error tracking variable
+		self._run_has_step_hooks = on_step_start is not None or on_step_end is not None
 		self._force_exit_telemetry_logged = False  # ADDED: Flag for custom telemetry on force exit
 
 		# Set up the  signal handler with callbacks specific to this agent
@@ -1246,6 +1482,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 				if on_step_start is not None:
 					await on_step_start(self)
+					# hooks can use the browser directly, which doesn't count as a page mutation
+					await self._discard_state_prefetch(reason='on_step_start ran')
 
 				self.logger.debug(f'🚶 Starting step {step + 1}/{max_steps}...')
 				step_info = AgentStepInfo(step_number=step, max_steps=max_steps)
@@ -1265,6 +1503,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 				if on_step_end is not None:
 					await on_step_end(self)
+					await self._discard_state_prefetch(reason='on_step_end ran')
 
 				if self.state.history.is_done():
 					self.logger.debug(f'🎯 Task completed after {step + 1} steps!')
@@ -1384,8 +1623,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self,
 		actions: list[ActionModel],
 		check_for_new_elements: bool = True,
+		started_first_action: 'asyncio.Task[ActionResult] | None' = None,
 	) -> list[ActionResult]:
-		"""Execute multiple actions"""
+		"""Execute multiple actions, the first one may already run in started_first_action"""
 		results: list[ActionResult] = []
 
 		assert self.browser_session is not None, 'BrowserSession is not set up'
@@ -1448,17 +1688,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				await asyncio.sleep(self.browser_profile.wait_between_actions)
 
 			try:
-				await self._raise_if_stopped_or_paused()
-
-				result = await self.controller.act(
-					action=action,
-					browser_session=self.browser_session,
-					file_system=self.file_system,
-					page_extraction_llm=self.settings.page_extraction_llm,
-					sensitive_data=self.sensitive_data,
-					available_file_paths=self.available_file_paths,
-					context=self.context,
-				)
+				if i == 0 and started_first_action is not None:
+					result = await started_first_action
+				else:
+					await self._raise_if_stopped_or_paused()
+					result = await self._act(action)
 
 				results.append(result)
 
@@ -1477,6 +1711,23 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		return results
 
+	async def _act(self, action: ActionModel, wait_for_dom_warmup: bool = False) -> ActionResult:
+		"""Execute a single action with the agent's context"""
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+		if wait_for_dom_warmup and self._dom_warmup is not None:
+			# the actions must not run while the page is being analysed
+			await asyncio.gather(self._dom_warmup, return_exceptions=True)
+
+		return await self.controller.act(
+			action=action,
+			browser_session=self.browser_session,
+			file_system=self.file_system,
+			page_extraction_llm=self.settings.page_extraction_llm,
+			sensitive_data=self.sensitive_data,
+			available_file_paths=self.available_file_paths,
+			context=self.context,
+		)
+
 	async def log_completion(self) -> None:
 		"""Log the completion of the task"""
 		if self.state.history.is_successful():
@@ -1625,6 +1876,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		)
 		self.state.paused = True
 		self._external_pause_event.clear()
+		if self._state_prefetch_origin is not None:
+			# the browser can be used by hand while paused, a state captured ahead won't be current anymore
+			self._state_prefetch_origin = (-1, None)
 
 		# Task paused
 
@@ -1698,6 +1952,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 	async def close(self):
 		"""Close all resources"""
+		await self._discard_state_prefetch(reason='the agent closed')
+		await self._cancel_early_action('the agent closed')
 		try:
 			# First close browser resources
 			assert self.browser_session is not None, 'BrowserSession is not set up'
@@ -1709,26 +1965,23 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		except Exception as e:
 			self.logger.error(f'Error during cleanup: {e}')
 
+		if self._llm_clients_retained:
+			self._llm_clients_retained = False
+			try:
+				await get_llm_client_pool().release()
+			except Exception as e:
+				self.logger.debug(f'Error closing LLM clients: {type(e).__name__}: {e}')
+
 	async def _update_action_models_for_page(self, page) -> None:
 		"""Update action models with page-specific actions"""
-		# Create new action model with current page's filtered actions
+		# Action model with current page's filtered actions (cached per set of matching actions by the registry)
 		self.ActionModel = self.controller.registry.create_action_model(page=page)
 		# Update output model with the new actions
-		if self.settings.flash_mode:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.ActionModel)
-		elif self.settings.use_thinking:
-			self.AgentOutput = AgentOutput.type_with_custom_actions(self.ActionModel)
-		else:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.ActionModel)
+		self.AgentOutput = self._agent_output_type(self.ActionModel)
 
 		# Update done action model too
 		self.DoneActionModel = self.controller.registry.create_action_model(include_actions=['done'], page=page)
-		if self.settings.flash_mode:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.DoneActionModel)
-		elif self.settings.use_thinking:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions(self.DoneActionModel)
-		else:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.DoneActionModel)
+		self.DoneAgentOutput = self._agent_output_type(self.DoneActionModel)
 
 	def get_trace_object(self) -> dict[str, Any]:
 		"""Get the trace and trace_details objects for the agent"""
@@ -67,6 +67,8 @@ class AgentSettings(BaseModel):
 	include_tool_call_examples: bool = False
 	llm_timeout: int = 60  # Timeout in seconds for LLM calls
 	step_timeout: int = 180  # Timeout in seconds for each step
+	speculative_state_prefetch: bool = False  # Capture the next step's browser state while the current step is recorded
+	stream_actions: bool = False  # Start the first action while the rest of the LLM output is still streaming
 
 
 class AgentState(BaseModel):
@@ -141,6 +143,8 @@ class StepMetadata(BaseModel):
 	step_start_time: float
 	step_end_time: float
 	step_number: int
+	page_health_probes: int = 0  # page responsiveness checks run against the browser during the step
+	page_health_cache_hits: int = 0  # page responsiveness checks answered from the session's cache
 
 	@property
 	def duration_seconds(self) -> float:
@@ -0,0 +1,286 @@
+"""Shared browsers for the standalone API server: many isolated sessions per Chromium process.
+
+Without it every `POST /sessions` launches its own Chromium with a persistent profile, so N sessions
+mean N browser processes. With shared browsers, the server launches a few browsers and gives each
+session its own incognito-style BrowserContext in one of them, wrapped in its own BrowserSession.
+Contexts don't share cookies, storage or cache, but they share the browser, GPU and network service
+processes, so an extra session costs a renderer instead of a whole browser.
+
+- at most `contexts_per_browser` contexts are open per browser, a new browser is launched when all are full
+- new contexts go to the fullest browser that has room, so the others drain and can be stopped
+- at most `max_browsers` browsers run at once, `acquire()` raises BrowserHostsFull beyond that
+- a browser left without contexts for `idle_ttl` seconds is stopped, except the last `min_browsers`
+- a browser that crashed or disconnected is dropped, later sessions go to another browser
+
+Configured via environment variables read by the standalone server:
+    BROWSER_USE_API_CONTEXTS_PER_BROWSER   max contexts per shared browser (0 disables shared browsers)
+    BROWSER_USE_API_MAX_BROWSERS           max shared browsers running at once
+    BROWSER_USE_API_MIN_BROWSERS           shared browsers kept running while idle
+    BROWSER_USE_API_BROWSER_IDLE_TTL       seconds an empty shared browser stays up before it is stopped
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Starts a browser to host contexts, returns the BrowserSession that owns it
+HostLauncher = Callable[[], Awaitable[Any]]
+# Opens a new context in a host browser, returns the started BrowserSession wrapping it
+ContextOpener = Callable[[Any, Dict[str, Any]], Awaitable[Any]]
+
+
+class BrowserHostsFull(Exception):
+    """Every shared browser is at its context cap and no more browsers may be launched"""
+
+
+@dataclass
+class BrowserHost:
+    """One shared browser and the sessions whose contexts live in it"""
+
+    host_id: int
+    launch: "asyncio.Task[Any]"
+    sessions: Dict[int, Any] = field(default_factory=dict)
+    reserved: int = 0  # contexts being opened right now
+    idle_since: Optional[float] = None
+
+    @property
+    def load(self) -> int:
+        return len(self.sessions) + self.reserved
+
+    @property
+    def host_session(self) -> Any:
+        if self.launch.done() and not self.launch.cancelled() and self.launch.exception() is None:
+            return self.launch.result()
+        return None
+
+    @property
+    def is_alive(self) -> bool:
+        """Still launching, or launched and connected"""
+        if not self.launch.done():
+            return True
+        host_session = self.host_session
+        browser = getattr(host_session, "browser", None)
+        return browser is not None and browser.is_connected()
+
+
+class SharedBrowserHosts:
+    """Hands out BrowserSessions on isolated contexts of a few shared browsers, launching browsers as needed"""
+
+    def __init__(
+        self,
+        launch_host: HostLauncher,
+        open_context: ContextOpener,
+        contexts_per_browser: int = 8,
+        max_browsers: int = 4,
+        min_browsers: int = 1,
+        idle_ttl: float = 120.0,
+    ):
+        self.launch_host = launch_host
+        self.open_context = open_context
+        self.contexts_per_browser = max(1, contexts_per_browser)
+        self.max_browsers = max(1, max_browsers)
+        self.min_browsers = max(0, min(min_browsers, self.max_browsers))
+        self.idle_ttl = idle_ttl
+
+        self._hosts: List[BrowserHost] = []
+        self._owners: Dict[int, BrowserHost] = {}
+        self._host_ids = itertools.count(1)
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._cleanup_tasks: Set[asyncio.Task] = set()  # stopping crashed browsers in the background
+        self._closed = False
+        self.launched = 0
+        self.launch_failures = 0
+        self.crashed = 0
+        self.stopped_idle = 0
+        self.contexts_opened = 0
+
+    @classmethod
+    def from_env(cls, launch_host: HostLauncher, open_context: ContextOpener) -> Optional["SharedBrowserHosts"]:
+        """Create the shared browsers from BROWSER_USE_API_* env vars, or None if they are disabled"""
+        contexts_per_browser = int(os.getenv("BROWSER_USE_API_CONTEXTS_PER_BROWSER", "0"))
+        if contexts_per_browser <= 0:
+            return None
+        return cls(
+            launch_host=launch_host,
+            open_context=open_context,
+            contexts_per_browser=contexts_per_browser,
+            max_browsers=int(os.getenv("BROWSER_USE_API_MAX_BROWSERS", "4")),
+            min_browsers=int(os.getenv("BROWSER_USE_API_MIN_BROWSERS", "1")),
+            idle_ttl=float(os.getenv("BROWSER_USE_API_BROWSER_IDLE_TTL", "120")),
+        )
+
+    async def start(self) -> None:
+        """Start the background reaper of idle browsers"""
+        self._closed = False
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_forever())
+
+    async def close(self) -> None:
+        """Stop every shared browser, which closes the contexts still open in them"""
+        self._closed = True
+        if self._reaper_task and not self._reaper_task.done():
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        hosts, self._hosts = self._hosts, []
+        self._owners.clear()
+        await asyncio.gather(*(self._stop_host(host) for host in hosts), *self._cleanup_tasks, return_exceptions=True)
+
+    async def acquire(self, profile_kwargs: Dict[str, Any]) -> Any:
+        """Open a session on a new context in a shared browser, launching a browser if all are full"""
+        host = self._reserve()
+        try:
+            host_session = await asyncio.shield(host.launch)
+            session = await self.open_context(host_session, dict(profile_kwargs))
+        except Exception:
+            host.reserved -= 1
+            if host.launch.done() and host.host_session is None and host in self._hosts:
+                self._hosts.remove(host)
+            self._mark_idle(host)
+            raise
+        host.reserved -= 1
+        host.sessions[id(session)] = session
+        host.idle_since = None
+        self._owners[id(session)] = host
+        self.contexts_opened += 1
+        return session
+
+    async def release(self, session: Any) -> None:
+        """Close a session's context, its browser keeps running for other sessions"""
+        host = self._owners.pop(id(session), None)
+        if host is not None:
+            host.sessions.pop(id(session), None)
+            self._mark_idle(host)
+        await close_context_session(session)
+
+    def owns(self, session: Any) -> bool:
+        return id(session) in self._owners
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "contexts_per_browser": self.contexts_per_browser,
+            "max_browsers": self.max_browsers,
+            "min_browsers": self.min_browsers,
+            "idle_ttl": self.idle_ttl,
+            "browsers": [
+                {
+                    "host_id": host.host_id,
+                    "contexts": len(host.sessions),
+                    "opening": host.reserved,
+                    "launching": not host.launch.done(),
+                }
+                for host in self._hosts
+            ],
+            "contexts": sum(len(host.sessions) for host in self._hosts),
+            "launched": self.launched,
+            "launch_failures": self.launch_failures,
+            "crashed": self.crashed,
+            "stopped_idle": self.stopped_idle,
+            "contexts_opened": self.contexts_opened,
+        }
+
+    # --- internals ---
+
+    def _reserve(self) -> BrowserHost:
+        """Pick the browser for a new context and reserve a slot in it, synchronously so concurrent acquires can't overfill"""
+        for host in [host for host in self._hosts if not host.is_alive]:
+            self._drop_crashed(host)
+
+        with_room = [host for host in self._hosts if host.load < self.contexts_per_browser]
+        if with_room:
+            host = max(with_room, key=lambda h: h.load)
+        elif len(self._hosts) < self.max_browsers:
+            host = BrowserHost(host_id=next(self._host_ids), launch=asyncio.create_task(self._launch()))
+            self._hosts.append(host)
+        else:
+            raise BrowserHostsFull(
+                f"All {len(self._hosts)} shared browsers are at {self.contexts_per_browser} contexts"
+            )
+        host.reserved += 1
+        host.idle_since = None
+        return host
+
+    async def _launch(self) -> Any:
+        try:
+            host_session = await self.launch_host()
+        except Exception:
+            self.launch_failures += 1
+            raise
+        self.launched += 1
+        logger.debug(f"Launched shared browser ({len(self._hosts)} running)")
+        return host_session
+
+    def _mark_idle(self, host: BrowserHost) -> None:
+        if host.load == 0 and host.idle_since is None:
+            host.idle_since = time.monotonic()
+
+    def _drop_crashed(self, host: BrowserHost) -> None:
+        self._hosts.remove(host)
+        self.crashed += 1
+        for session_id in host.sessions:
+            self._owners.pop(session_id, None)
+        logger.warning(f"Shared browser {host.host_id} disconnected, dropping its {len(host.sessions)} contexts")
+        # called from the synchronous _reserve, so the cleanup runs in the background
+        task = asyncio.create_task(self._stop_crashed(host, list(host.sessions.values())))
+        self._cleanup_tasks.add(task)
+        task.add_done_callback(self._cleanup_tasks.discard)
+
+    async def _stop_crashed(self, host: BrowserHost, sessions: List[Any]) -> None:
+        """Release the contexts of a disconnected browser's sessions like release() does, then stop what is left of it"""
+        await asyncio.gather(*(close_context_session(session) for session in sessions), return_exceptions=True)
+        await self._stop_host(host)
+
+    async def _reap_forever(self) -> None:
+        interval = max(1.0, min(self.idle_ttl / 2, 30.0))
+        while not self._closed:
+            await asyncio.sleep(interval)
+            await self.reap_idle()
+
+    async def reap_idle(self) -> int:
+        """Stop browsers that had no contexts for idle_ttl seconds, keeping min_browsers running"""
+        now = time.monotonic()
+        idle = [
+            host
+            for host in self._hosts
+            if host.load == 0 and host.idle_since is not None and now - host.idle_since > self.idle_ttl
+        ]
+        # the longest idle go first
+        idle.sort(key=lambda h: h.idle_since or 0.0)
+        stop = idle[: max(0, len(self._hosts) - self.min_browsers)]
+        for host in stop:
+            self._hosts.remove(host)
+        self.stopped_idle += len(stop)
+        await asyncio.gather(*(self._stop_host(host) for host in stop), return_exceptions=True)
+        return len(stop)
+
+    @staticmethod
+    async def _stop_host(host: BrowserHost) -> None:
+        try:
+            host_session = await host.launch
+            await host_session.kill()
+        except Exception as e:
+            logger.debug(f"Error stopping shared browser {host.host_id}: {type(e).__name__}: {e}")
+
+
+async def close_context_session(session: Any) -> None:
+    """Stop a BrowserSession running on a context of a shared browser, and close that context"""
+    context = getattr(session, "browser_context", None)
+    try:
+        # sessions on a passed-in browser don't own it, stop() only drops their references
+        await session.stop()
+    except Exception as e:
+        logger.debug(f"Error stopping shared browser session: {type(e).__name__}: {e}")
+    if context is not None:
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug(f"Error closing shared browser context: {type(e).__name__}: {e}")
@@ -0,0 +1,379 @@
+"""Warm pool of pre-launched BrowserSessions for the standalone API server.
+
+Launching Chromium dominates the latency of `POST /sessions` for short form-filling
+runs, so the pool keeps a few already-started sessions parked per profile key and
+hands them out on checkout. Sessions returned on close are scrubbed and parked
+again, or stopped if the pool is full. Scrubbing clears the cookies, the HTTP cache
+and all storage (local/session storage, IndexedDB, CacheStorage, service workers) of
+every origin the session navigated to, and replaces its tabs with a fresh one.
+
+Configured via environment variables read by the standalone server:
+    BROWSER_USE_API_POOL_MAX_SIZE   max idle sessions kept across all keys (0 disables the pool)
+    BROWSER_USE_API_POOL_MIN_SIZE   idle sessions kept warm for the default profile key
+    BROWSER_USE_API_POOL_IDLE_TTL   seconds an idle session may stay parked before it is stopped
+"""
+
+import asyncio
+import logging
+import os
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[Tuple[str, Any], ...]
+SessionLauncher = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# Origins each pooled browser context navigated to (pages and iframes), see watch_visited_origins()
+_visited_origins: "weakref.WeakKeyDictionary[Any, Set[str]]" = weakref.WeakKeyDictionary()
+
+
+def make_pool_key(profile_kwargs: Dict[str, Any]) -> PoolKey:
+    """Build a hashable key from the BrowserProfile kwargs that make two sessions interchangeable"""
+    items = []
+    for name, value in sorted(profile_kwargs.items()):
+        if isinstance(value, (list, tuple, set)):
+            value = tuple(sorted(str(v) for v in value))
+        elif isinstance(value, dict):
+            value = tuple(sorted((str(k), str(v)) for k, v in value.items()))
+        items.append((name, value))
+    return tuple(items)
+
+
+@dataclass
+class PoolStats:
+    """Counters exposed on /health"""
+
+    hits: int = 0
+    misses: int = 0
+    launched: int = 0
+    recycled: int = 0
+    discarded: int = 0
+    expired: int = 0
+    launch_failures: int = 0
+    checkouts: int = 0
+    checkout_total_ms: float = 0.0
+    checkout_max_ms: float = 0.0
+    last_checkout_ms: float = 0.0
+
+    def record_checkout(self, elapsed_ms: float, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.checkouts += 1
+        self.checkout_total_ms += elapsed_ms
+        self.checkout_max_ms = max(self.checkout_max_ms, elapsed_ms)
+        self.last_checkout_ms = elapsed_ms
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / self.checkouts, 3) if self.checkouts else None,
+            "launched": self.launched,
+            "recycled": self.recycled,
+            "discarded": self.discarded,
+            "expired": self.expired,
+            "launch_failures": self.launch_failures,
+            "checkout_latency_ms": {
+                "count": self.checkouts,
+                "avg": round(self.checkout_total_ms / self.checkouts, 2) if self.checkouts else None,
+                "max": round(self.checkout_max_ms, 2),
+                "last": round(self.last_checkout_ms, 2),
+            },
+        }
+
+
+@dataclass
+class _IdleSession:
+    session: Any
+    parked_at: float = field(default_factory=time.monotonic)
+
+
+class BrowserSessionPool:
+    """Keeps started BrowserSessions parked per profile key so checkout skips the browser launch.
+
+    - `min_size` idle sessions are kept warm for `warm_profile_kwargs` (the default session profile)
+    - at most `max_size` idle sessions are parked in total, extra returned sessions are stopped
+    - idle sessions older than `idle_ttl` seconds are stopped by a background reaper
+    Checked-out sessions are not counted against `max_size`, the server decides how many run at once.
+    """
+
+    def __init__(
+        self,
+        launcher: SessionLauncher,
+        min_size: int = 0,
+        max_size: int = 2,
+        idle_ttl: float = 300.0,
+        warm_profile_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.launcher = launcher
+        self.max_size = max(0, max_size)
+        self.min_size = max(0, min(min_size, self.max_size))
+        self.idle_ttl = idle_ttl
+        self.warm_profile_kwargs = dict(warm_profile_kwargs or {})
+        self.stats = PoolStats()
+
+        self._idle: Dict[PoolKey, Deque[_IdleSession]] = {}
+        self._checked_out: Dict[int, PoolKey] = {}
+        self._warming = 0
+        self._warm_task: Optional[asyncio.Task] = None
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @classmethod
+    def from_env(cls, launcher: SessionLauncher, warm_profile_kwargs: Optional[Dict[str, Any]] = None) -> Optional["BrowserSessionPool"]:
+        """Create a pool from BROWSER_USE_API_POOL_* env vars, or None if pooling is disabled"""
+        max_size = int(os.getenv("BROWSER_USE_API_POOL_MAX_SIZE", "0"))
+        if max_size <= 0:
+            return None
+        return cls(
+            launcher=launcher,
+            min_size=int(os.getenv("BROWSER_USE_API_POOL_MIN_SIZE", "1")),
+            max_size=max_size,
+            idle_ttl=float(os.getenv("BROWSER_USE_API_POOL_IDLE_TTL", "300")),
+            warm_profile_kwargs=warm_profile_kwargs,
+        )
+
+    @property
+    def idle_count(self) -> int:
+        return sum(len(entries) for entries in self._idle.values())
+
+    @property
+    def in_use_count(self) -> int:
+        return len(self._checked_out)
+
+    async def start(self) -> None:
+        """Start the background reaper and pre-launch the warm sessions"""
+        self._closed = False
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_forever())
+        self._schedule_warm()
+
+    async def close(self) -> None:
+        """Stop the background tasks and every parked session (checked-out sessions are left to their owners)"""
+        self._closed = True
+        for task in (self._reaper_task, self._warm_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        idle = [entry.session for entries in self._idle.values() for entry in entries]
+        self._idle.clear()
+        await asyncio.gather(*(self._stop_session(session) for session in idle), return_exceptions=True)
+
+    async def acquire(self, profile_kwargs: Dict[str, Any]) -> Any:
+        """Check out a started session matching profile_kwargs, launching a new one on a pool miss"""
+        start = time.perf_counter()
+        key = make_pool_key(profile_kwargs)
+        entries = self._idle.get(key)
+
+        while entries:
+            entry = entries.popleft()
+            if await self._is_usable(entry.session):
+                self._checked_out[id(entry.session)] = key
+                self.stats.record_checkout((time.perf_counter() - start) * 1000, hit=True)
+                self._schedule_warm()
+                return entry.session
+            self.stats.discarded += 1
+            await self._stop_session(entry.session)
+
+        session = await self._launch(profile_kwargs)
+        self._checked_out[id(session)] = key
+        self.stats.record_checkout((time.perf_counter() - start) * 1000, hit=False)
+        self._schedule_warm()
+        return session
+
+    async def release(self, session: Any) -> None:
+        """Return a checked-out session: scrub and park it, or stop it if the pool is full or it is unusable"""
+        key = self._checked_out.pop(id(session), None)
+        if key is None or self._closed or self.idle_count >= self.max_size:
+            self.stats.discarded += 1
+            await self._stop_session(session)
+            return
+
+        if not await scrub_browser_session(session) or not await self._is_usable(session):
+            self.stats.discarded += 1
+            await self._stop_session(session)
+            self._schedule_warm()
+            return
+
+        self._idle.setdefault(key, deque()).append(_IdleSession(session=session))
+        self.stats.recycled += 1
+
+    def owns(self, session: Any) -> bool:
+        return id(session) in self._checked_out
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "idle_ttl": self.idle_ttl,
+            "idle": self.idle_count,
+            "in_use": self.in_use_count,
+            "warming": self._warming,
+            **self.stats.as_dict(),
+        }
+
+    # --- internals ---
+
+    async def _launch(self, profile_kwargs: Dict[str, Any]) -> Any:
+        try:
+            session = await self.launcher(dict(profile_kwargs))
+        except Exception:
+            self.stats.launch_failures += 1
+            raise
+        self.stats.launched += 1
+        watch_visited_origins(session)
+        return session
+
+    def _schedule_warm(self) -> None:
+        if self._closed or self.min_size <= 0:
+            return
+        if self._warm_task is None or self._warm_task.done():
+            self._warm_task = asyncio.create_task(self._warm())
+
+    async def _warm(self) -> None:
+        """Top up the idle sessions for the warm profile key to min_size"""
+        key = make_pool_key(self.warm_profile_kwargs)
+        while not self._closed:
+            have = len(self._idle.get(key, ())) + self._warming
+            if have >= self.min_size or self.idle_count + self._warming >= self.max_size:
+                return
+            self._warming += 1
+            try:
+                session = await self._launch(self.warm_profile_kwargs)
+            except Exception as e:
+                logger.warning(f"Failed to pre-launch pooled browser session: {type(e).__name__}: {e}")
+                return
+            finally:
+                self._warming -= 1
+            if self._closed:
+                await self._stop_session(session)
+                return
+            self._idle.setdefault(key, deque()).append(_IdleSession(session=session))
+            logger.debug(f"Pre-launched pooled browser session ({self.idle_count} idle)")
+
+    async def _reap_forever(self) -> None:
+        interval = max(1.0, min(self.idle_ttl / 2, 30.0))
+        while not self._closed:
+            await asyncio.sleep(interval)
+            await self.reap_expired()
+
+    async def reap_expired(self) -> int:
+        """Stop idle sessions parked longer than idle_ttl, keeping min_size warm for the default key"""
+        now = time.monotonic()
+        warm_key = make_pool_key(self.warm_profile_kwargs)
+        expired: List[Any] = []
+        for key, entries in self._idle.items():
+            keep = self.min_size if key == warm_key else 0
+            # entries are appended in parking order, so the oldest are at the left
+            while len(entries) > keep and now - entries[0].parked_at > self.idle_ttl:
+                expired.append(entries.popleft().session)
+        for key in [key for key, entries in self._idle.items() if not entries]:
+            del self._idle[key]
+        self.stats.expired += len(expired)
+        await asyncio.gather(*(self._stop_session(session) for session in expired), return_exceptions=True)
+        return len(expired)
+
+    @staticmethod
+    async def _is_usable(session: Any) -> bool:
+        try:
+            return bool(await session.is_connected(restart=False))
+        except Exception:
+            return False
+
+    @staticmethod
+    async def _stop_session(session: Any) -> None:
+        try:
+            await session.kill()
+        except Exception as e:
+            logger.debug(f"Error stopping pooled browser session: {type(e).__name__}: {e}")
+
+
+def url_origin(url: str) -> Optional[str]:
+    """The origin of an http(s) URL, None for about:, data: and other URLs without storage of their own"""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def watch_visited_origins(session: Any) -> None:
+    """Record the origins the session's pages and iframes navigate to, so scrub_browser_session() can clear their storage"""
+    context = getattr(session, "browser_context", None)
+    if context is None or context in _visited_origins:
+        return
+    origins: Set[str] = set()
+    _visited_origins[context] = origins
+
+    def on_request(request: Any) -> None:
+        if request.is_navigation_request():
+            origin = url_origin(request.url)
+            if origin:
+                origins.add(origin)
+
+    context.on("request", on_request)
+
+
+async def clear_origin_data(context: Any, page: Any, origins: Iterable[str]) -> None:
+    """Clear all storage of the given origins and the browser's HTTP cache via CDP"""
+    cdp = await context.new_cdp_session(page)
+    try:
+        for origin in sorted(origins):
+            await cdp.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        await cdp.send("Network.clearBrowserCache")
+    finally:
+        try:
+            await cdp.detach()
+        except Exception:
+            pass
+
+
+async def scrub_browser_session(session: Any) -> bool:
+    """Reset a session so the next checkout starts clean: no cookies, storage, caches, tabs or cached DOM state.
+
+    Returns False if the session could not be fully scrubbed, it must not be handed to anyone else then.
+    """
+    context = getattr(session, "browser_context", None)
+    if context is None:
+        return False
+    try:
+        origins = set(_visited_origins.get(context, ()))
+        pages = list(context.pages)
+        for page in pages:
+            for frame in getattr(page, "frames", ()):
+                origin = url_origin(frame.url)
+                if origin:
+                    origins.add(origin)
+
+        # a fresh tab has no history or session storage to carry over
+        keep = await context.new_page()
+        for page in pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        await context.clear_cookies()
+        await clear_origin_data(context, keep, origins)
+        if context in _visited_origins:
+            _visited_origins[context].clear()
+        await keep.goto("about:blank", wait_until="load", timeout=5000)
+
+        session.agent_current_page = keep
+        session.human_current_page = keep
+        session._cached_browser_state_summary = None
+        session._cached_clickable_element_hashes = None
+        session._downloaded_files.clear()
+        return True
+    except Exception as e:
+        logger.debug(f"Failed to scrub pooled browser session: {type(e).__name__}: {e}")
+        return False
@@ -0,0 +1,146 @@
+"""Interactive elements of a browser state, as returned by the API endpoints.
+
+Every endpoint that answers with the page state (click, type, key, scroll, select_dropdown_option,
+browser_get_state) lists the page's interactive elements as {index, tag, text, placeholder?, href?}.
+The list is built once per DOM snapshot: sessions with incremental DOM snapshots report the same
+snapshot id while the page is unchanged, and the list built for it is reused.
+
+Response modes:
+    full    every element (default)
+    diff    only the elements added or changed since the last state sent for the same session,
+            plus an elements_diff summary with the removed indices
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_MODES = ("full", "diff")
+DEFAULT_RESPONSE_MODE = "full"
+
+# How much of each element's text is reported
+ELEMENT_TEXT_MAX_DEPTH = 2
+ELEMENT_TEXT_MAX_LENGTH = 100
+
+
+def validate_response_mode(mode: str) -> str:
+    if mode not in RESPONSE_MODES:
+        raise ValueError(f"Unknown response_mode {mode!r}, expected one of {', '.join(RESPONSE_MODES)}")
+    return mode
+
+
+def build_interactive_elements(state: Any) -> List[Dict[str, Any]]:
+    """Interactive elements of a BrowserStateSummary, sorted by index"""
+    element_texts = state.element_tree.get_clickable_elements_text(max_depth=ELEMENT_TEXT_MAX_DEPTH)
+    interactive_elements = []
+    for index in sorted(state.selector_map):
+        element = state.selector_map[index]
+        elem_info = {
+            "index": index,
+            "tag": element.tag_name,
+            "text": element_texts.get(index, "")[:ELEMENT_TEXT_MAX_LENGTH],
+        }
+        if element.attributes.get("placeholder"):
+            elem_info["placeholder"] = element.attributes["placeholder"]
+        if element.attributes.get("href"):
+            elem_info["href"] = element.attributes["href"]
+        interactive_elements.append(elem_info)
+    return interactive_elements
+
+
+@dataclass
+class ElementsResponse:
+    # Every element the caller knows about after this response, as it was presented
+    elements: List[Dict[str, Any]]
+    # What goes into the response's interactive_elements
+    interactive_elements: List[Dict[str, Any]]
+    # Summary of the changes in diff mode, None when the full list was sent
+    elements_diff: Optional[Dict[str, Any]] = None
+
+
+class InteractiveElementsSerializer:
+    """Builds interactive element lists once per DOM snapshot and remembers what each session was sent"""
+
+    def __init__(self, max_cached_snapshots: int = 64):
+        self.max_cached_snapshots = max_cached_snapshots
+        # snapshot id -> interactive elements, shared read-only between responses
+        self._snapshots: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        # session id -> {index: element} last sent to that session, the base of the next diff
+        self._last_sent: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def serialize(self, state: Any) -> List[Dict[str, Any]]:
+        """Interactive elements of the state, cached by its DOM snapshot id. Don't modify the returned list"""
+        snapshot_id = getattr(state, "dom_snapshot_id", None)
+        if snapshot_id is not None:
+            cached = self._snapshots.get(snapshot_id)
+            if cached is not None:
+                self._snapshots.move_to_end(snapshot_id)
+                self.hits += 1
+                return cached
+
+        self.misses += 1
+        interactive_elements = build_interactive_elements(state)
+        if snapshot_id is not None:
+            self._snapshots[snapshot_id] = interactive_elements
+            while len(self._snapshots) > self.max_cached_snapshots:
+                self._snapshots.popitem(last=False)
+        return interactive_elements
+
+    def respond(
+        self,
+        session_id: str,
+        state: Any,
+        response_mode: str = DEFAULT_RESPONSE_MODE,
+        only_labeled: bool = False,
+        empty_text: Optional[str] = None,
+    ) -> ElementsResponse:
+        """Interactive elements for a response to session_id.
+
+        only_labeled drops divs and elements without text, empty_text replaces missing texts.
+        """
+        validate_response_mode(response_mode)
+        elements = self.serialize(state)
+        if only_labeled:
+            elements = [elem for elem in elements if elem["tag"] != "div" and elem["text"] != ""]
+        if empty_text is not None:
+            elements = [elem if elem["text"] else {**elem, "text": empty_text} for elem in elements]
+
+        current = {elem["index"]: elem for elem in elements}
+        previous = self._last_sent.get(session_id)
+        self._last_sent[session_id] = current
+
+        if response_mode == "full" or previous is None:
+            return ElementsResponse(elements=elements, interactive_elements=elements)
+
+        added, changed, unchanged = [], [], 0
+        for index, elem in current.items():
+            previous_elem = previous.get(index)
+            if previous_elem is None:
+                added.append(index)
+            elif previous_elem != elem:
+                changed.append(index)
+            else:
+                unchanged += 1
+        removed = sorted(index for index in previous if index not in current)
+        updated = set(added) | set(changed)
+        return ElementsResponse(
+            elements=elements,
+            interactive_elements=[elem for elem in elements if elem["index"] in updated],
+            elements_diff={"added": added, "changed": changed, "removed": removed, "unchanged": unchanged},
+        )
+
+    def forget(self, session_id: str) -> None:
+        self._last_sent.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cached_snapshots": len(self._snapshots),
+            "hits": self.hits,
+            "misses": self.misses,
+            "sessions": len(self._last_sent),
+        }
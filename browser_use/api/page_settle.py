@@ -0,0 +1,128 @@
+"""Async page-settle detection for the standalone API server.
+
+After a click / type / key / scroll the server needs the page to finish reacting before it
+reads the DOM. Instead of a fixed blocking sleep this waits on real signals, without ever
+blocking the event loop, so other sessions keep progressing while one page settles:
+
+    none     read state immediately
+    network  wait until BrowserSession._wait_for_stable_network reports no pending requests
+    dom      network, then wait until the DOM has had no mutations for a quiet period
+    fixed    sleep for max_wait seconds (the old behaviour, but non-blocking)
+
+Every mode is capped at max_wait seconds in total.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SETTLE_MODES = ("none", "network", "dom", "fixed")
+DEFAULT_SETTLE_MODE = "dom"
+DEFAULT_SETTLE_MAX_WAIT = 2.0
+DEFAULT_DOM_QUIET_PERIOD = 0.3
+
+# Resolves once the document has gone quiet_ms without mutations, or after timeout_ms
+DOM_QUIET_JS = """
+({quietMs, timeoutMs}) => new Promise((resolve) => {
+    const root = document.documentElement || document;
+    const start = performance.now();
+    let mutations = 0;
+    let quietTimer = null;
+    let done = false;
+    const finish = (quiet) => {
+        if (done) return;
+        done = true;
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(hardTimer);
+        resolve({quiet, mutations, elapsedMs: Math.round(performance.now() - start)});
+    };
+    const observer = new MutationObserver((records) => {
+        mutations += records.length;
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), quietMs);
+    });
+    observer.observe(root, {subtree: true, childList: true, attributes: true, characterData: true});
+    quietTimer = setTimeout(() => finish(true), quietMs);
+    const hardTimer = setTimeout(() => finish(false), timeoutMs);
+})
+"""
+
+
+@dataclass
+class SettleResult:
+    mode: str
+    elapsed: float
+    timed_out: bool = False
+    dom_mutations: Optional[int] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "elapsed_ms": round(self.elapsed * 1000, 1),
+            "timed_out": self.timed_out,
+            "dom_mutations": self.dom_mutations,
+        }
+
+
+def validate_settle_mode(mode: str) -> str:
+    if mode not in SETTLE_MODES:
+        raise ValueError(f"settle_mode must be one of {', '.join(SETTLE_MODES)}, got {mode!r}")
+    return mode
+
+
+async def wait_for_page_settle(
+    session: Any,
+    mode: str = DEFAULT_SETTLE_MODE,
+    max_wait: float = DEFAULT_SETTLE_MAX_WAIT,
+    quiet_period: float = DEFAULT_DOM_QUIET_PERIOD,
+) -> SettleResult:
+    """Wait (asynchronously) until the session's current page has settled after an action"""
+    validate_settle_mode(mode)
+    start = time.monotonic()
+    max_wait = max(0.0, max_wait)
+
+    if mode == "none" or max_wait == 0:
+        return SettleResult(mode=mode, elapsed=0.0)
+
+    if mode == "fixed":
+        await asyncio.sleep(max_wait)
+        return SettleResult(mode=mode, elapsed=time.monotonic() - start)
+
+    result = SettleResult(mode=mode, elapsed=0.0)
+
+    try:
+        await asyncio.wait_for(session._wait_for_stable_network(), timeout=max_wait)
+    except asyncio.TimeoutError:
+        result.timed_out = True
+    except Exception as e:
+        logger.debug(f"Network settle wait failed, continuing: {type(e).__name__}: {e}")
+
+    remaining = max_wait - (time.monotonic() - start)
+    if mode == "dom" and remaining > 0:
+        try:
+            page = await session.get_current_page()
+            quiet = await asyncio.wait_for(
+                page.evaluate(
+                    DOM_QUIET_JS,
+                    {"quietMs": int(min(quiet_period, remaining) * 1000), "timeoutMs": int(remaining * 1000)},
+                ),
+                # the JS resolves itself at timeoutMs, this only guards against a hung renderer
+                timeout=remaining + 1.0,
+            )
+            result.dom_mutations = quiet.get("mutations")
+            result.timed_out = result.timed_out or not quiet.get("quiet", True)
+        except asyncio.TimeoutError:
+            result.timed_out = True
+        except Exception as e:
+            # navigation destroys the execution context mid-wait, the new document is what we read next anyway
+            logger.debug(f"DOM settle wait interrupted, continuing: {type(e).__name__}: {e}")
+    elif mode == "dom":
+        result.timed_out = True
+
+    result.elapsed = time.monotonic() - start
+    return result
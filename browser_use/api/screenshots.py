@@ -0,0 +1,153 @@
+"""Screenshots for the standalone API responses.
+
+Inline base64 PNGs in every click / type / key / scroll response were most of the server's
+bandwidth, and callers rarely look at them. By default a response now carries a screenshot
+handle instead, and the image is fetched only if needed:
+
+    GET /sessions/{session_id}/screenshots/{handle}
+
+Screenshot modes:
+    handle   capture, keep the frame in the session's store and return its handle (default)
+    inline   capture and return the base64 image in the response, as before
+    none     don't capture
+
+Frames are encoded by Chrome (Page.captureScreenshot format jpeg|webp|png with quality, and
+clip.scale to downscale to max_width), and each session keeps its most recent frames in an
+LRU capped in bytes (BROWSER_USE_API_SCREENSHOT_STORE_BYTES, 16 MiB by default).
+"""
+
+import base64
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from browser_use.browser.views import PLACEHOLDER_4PX_SCREENSHOT
+
+logger = logging.getLogger(__name__)
+
+SCREENSHOT_MODES = ("handle", "inline", "none")
+SCREENSHOT_MEDIA_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+DEFAULT_SCREENSHOT_MODE = "handle"
+DEFAULT_SCREENSHOT_FORMAT = "jpeg"
+DEFAULT_SCREENSHOT_QUALITY = 80
+DEFAULT_STORE_MAX_BYTES = 16 * 1024 * 1024
+
+
+@dataclass
+class ScreenshotFrame:
+    handle: str
+    data: bytes
+    media_type: str
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+class ScreenshotStore:
+    """Recent screenshot frames per session, evicting the least recently used above max_bytes per session"""
+
+    def __init__(self, max_bytes_per_session: int = DEFAULT_STORE_MAX_BYTES):
+        self.max_bytes_per_session = max_bytes_per_session
+        self._frames: Dict[str, "OrderedDict[str, ScreenshotFrame]"] = {}
+        self._sizes: Dict[str, int] = {}
+        self.stored = 0
+        self.served = 0
+        self.evicted = 0
+
+    @classmethod
+    def from_env(cls) -> "ScreenshotStore":
+        return cls(max_bytes_per_session=int(os.getenv("BROWSER_USE_API_SCREENSHOT_STORE_BYTES", str(DEFAULT_STORE_MAX_BYTES))))
+
+    def put(self, session_id: str, data: bytes, media_type: str) -> ScreenshotFrame:
+        frame = ScreenshotFrame(handle=secrets.token_urlsafe(12), data=data, media_type=media_type)
+        frames = self._frames.setdefault(session_id, OrderedDict())
+        frames[frame.handle] = frame
+        self._sizes[session_id] = self._sizes.get(session_id, 0) + frame.size
+        self.stored += 1
+
+        # always keep the newest frame, even if it alone is over the cap
+        while self._sizes[session_id] > self.max_bytes_per_session and len(frames) > 1:
+            _, evicted = frames.popitem(last=False)
+            self._sizes[session_id] -= evicted.size
+            self.evicted += 1
+        return frame
+
+    def get(self, session_id: str, handle: str) -> Optional[ScreenshotFrame]:
+        frames = self._frames.get(session_id)
+        frame = frames.get(handle) if frames else None
+        if frame is not None:
+            frames.move_to_end(handle)  # type: ignore[union-attr]
+            self.served += 1
+        return frame
+
+    def forget(self, session_id: str) -> None:
+        self._frames.pop(session_id, None)
+        self._sizes.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._frames),
+            "frames": sum(len(frames) for frames in self._frames.values()),
+            "bytes": sum(self._sizes.values()),
+            "max_bytes_per_session": self.max_bytes_per_session,
+            "stored": self.stored,
+            "served": self.served,
+            "evicted": self.evicted,
+        }
+
+
+async def capture_screenshot(
+    session: Any,
+    image_format: str = DEFAULT_SCREENSHOT_FORMAT,
+    quality: Optional[int] = DEFAULT_SCREENSHOT_QUALITY,
+    max_width: Optional[int] = None,
+) -> Optional[Tuple[str, str]]:
+    """Capture the session's current page, returns (base64 data, media type) or None if it failed"""
+    if image_format not in SCREENSHOT_MEDIA_TYPES:
+        raise ValueError(f"Unknown screenshot format {image_format!r}, expected one of {', '.join(SCREENSHOT_MEDIA_TYPES)}")
+    try:
+        data = await session.take_screenshot(image_format=image_format, quality=quality, max_width=max_width)
+    except Exception as e:
+        logger.warning(f"Screenshot failed: {type(e).__name__}: {e}")
+        return None
+    if not data:
+        return None
+    # empty tabs get a tiny placeholder PNG whatever the requested format
+    media_type = SCREENSHOT_MEDIA_TYPES["png"] if data == PLACEHOLDER_4PX_SCREENSHOT else SCREENSHOT_MEDIA_TYPES[image_format]
+    return data, media_type
+
+
+async def screenshot_response_fields(
+    store: ScreenshotStore,
+    session_id: str,
+    session: Any,
+    mode: str = DEFAULT_SCREENSHOT_MODE,
+    image_format: str = DEFAULT_SCREENSHOT_FORMAT,
+    quality: Optional[int] = DEFAULT_SCREENSHOT_QUALITY,
+    max_width: Optional[int] = None,
+) -> Dict[str, Any]:
+    """The screenshot fields of a state response for the requested mode"""
+    if mode not in SCREENSHOT_MODES:
+        raise ValueError(f"Unknown screenshot mode {mode!r}, expected one of {', '.join(SCREENSHOT_MODES)}")
+    if mode == "none":
+        return {}
+
+    captured = await capture_screenshot(session, image_format, quality, max_width)
+    if captured is None:
+        return {}
+    data, media_type = captured
+    if mode == "inline":
+        return {"screenshot": data, "screenshot_media_type": media_type}
+
+    frame = store.put(session_id, base64.b64decode(data), media_type)
+    return {
+        "screenshot_handle": frame.handle,
+        "screenshot_url": f"/sessions/{session_id}/screenshots/{frame.handle}",
+        "screenshot_media_type": media_type,
+    }
@@ -0,0 +1,156 @@
+"""Per-session actors for the standalone API server's /mcp dispatcher.
+
+Each session_id gets its own asyncio queue and worker task. Operations on one session run
+strictly one after another (two tool calls never interleave Playwright operations on the
+same page), while different sessions run in parallel on the event loop.
+
+Queues are bounded: when a session already has `max_queue_depth` operations waiting,
+`submit()` raises SessionQueueFull with a retry-after estimate so the server can answer
+429 instead of piling up work. Workers of sessions that go quiet exit after `idle_timeout`.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Operation = Callable[[], Awaitable[Any]]
+
+
+class SessionQueueFull(Exception):
+    """Raised when a session's operation queue is at max depth"""
+
+    def __init__(self, session_id: str, depth: int, retry_after: int):
+        super().__init__(f"Session {session_id} has {depth} operations queued, retry after {retry_after}s")
+        self.session_id = session_id
+        self.depth = depth
+        self.retry_after = retry_after
+
+
+class SessionActor:
+    """Serializes operations for one session on a dedicated worker task"""
+
+    def __init__(self, session_id: str, max_queue_depth: int, idle_timeout: float, on_idle: Callable[["SessionActor"], None]):
+        self.session_id = session_id
+        self.max_queue_depth = max_queue_depth
+        self.idle_timeout = idle_timeout
+        self._on_idle = on_idle
+        self._queue: "asyncio.Queue[Tuple[Operation, asyncio.Future]]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._running = False
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._avg_duration = 1.0  # seconds, exponential moving average of operation durations
+
+    @property
+    def depth(self) -> int:
+        """Operations queued or in progress"""
+        return self._queue.qsize() + (1 if self._running else 0)
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.depth * self._avg_duration))
+
+    async def submit(self, operation: Operation) -> Any:
+        if self.depth >= self.max_queue_depth:
+            self.rejected += 1
+            raise SessionQueueFull(self.session_id, self.depth, self.retry_after())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operation, future))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run(), name=f"session-actor-{self.session_id}")
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                operation, future = await asyncio.wait_for(self._queue.get(), timeout=self.idle_timeout)
+            except asyncio.TimeoutError:
+                if self._queue.empty():
+                    self._on_idle(self)
+                    return
+                continue
+
+            if future.cancelled():
+                continue
+            self._running = True
+            start = time.monotonic()
+            try:
+                result = await operation()
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except BaseException as e:
+                self.failed += 1
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self.completed += 1
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._running = False
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * (time.monotonic() - start)
+
+    async def close(self) -> None:
+        """Stop the worker and fail anything still queued"""
+        if self._worker and not self._worker.done() and self._worker is not asyncio.current_task():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, Exception):
+                pass
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError(f"Session {self.session_id} was closed"))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_duration_ms": round(self._avg_duration * 1000, 1),
+        }
+
+
+class SessionActorRegistry:
+    """Creates one SessionActor per session_id on first use"""
+
+    def __init__(self, max_queue_depth: int = 8, idle_timeout: float = 300.0):
+        self.max_queue_depth = max(1, max_queue_depth)
+        self.idle_timeout = idle_timeout
+        self._actors: Dict[str, SessionActor] = {}
+
+    def get(self, session_id: str) -> SessionActor:
+        actor = self._actors.get(session_id)
+        if actor is None:
+            actor = SessionActor(session_id, self.max_queue_depth, self.idle_timeout, on_idle=self._forget)
+            self._actors[session_id] = actor
+        return actor
+
+    async def submit(self, session_id: str, operation: Operation) -> Any:
+        """Run operation on the session's worker once everything queued before it has finished"""
+        return await self.get(session_id).submit(operation)
+
+    async def discard(self, session_id: str) -> None:
+        actor = self._actors.pop(session_id, None)
+        if actor:
+            await actor.close()
+
+    async def close(self) -> None:
+        actors = list(self._actors.values())
+        self._actors.clear()
+        await asyncio.gather(*(actor.close() for actor in actors), return_exceptions=True)
+
+    def _forget(self, actor: SessionActor) -> None:
+        if self._actors.get(actor.session_id) is actor:
+            del self._actors[actor.session_id]
+
+    def stats(self) -> Dict[str, Any]:
+        return {session_id: actor.stats() for session_id, actor in self._actors.items()}
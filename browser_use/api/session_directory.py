@@ -0,0 +1,367 @@
+"""Session directory for running the standalone API server as several workers.
+
+Browser sessions live in the memory of the worker process that launched them. The directory
+records which worker owns each session_id (and the CDP endpoint of its browser), so that any
+worker receiving a /mcp call can forward it to the owner instead of answering "not found".
+
+Backends, selected with BROWSER_USE_API_SESSION_DIRECTORY:
+    memory                      (default) single process, nothing is shared
+    sqlite:///path/to/file.db   shared by all workers on one machine
+    redis://host:6379/0         shared across machines, needs `pip install redis`
+
+Each worker announces itself with BROWSER_USE_API_WORKER_URL (the base URL other workers can
+reach it on, e.g. http://10.0.0.5:8001) and optionally BROWSER_USE_API_WORKER_ID.
+
+The URL must reach exactly one worker, so run each worker as its own server on its own port
+(uvicorn ... --port 8001, --port 8002, ...) instead of `uvicorn --workers N`, whose processes all
+share one port. A worker refuses to start when a live worker already claimed its URL.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Set on forwarded requests so the owner never forwards them again
+FORWARDED_HEADER = "X-Browser-Use-Forwarded-By"
+
+
+@dataclass
+class SessionRecord:
+    session_id: str
+    worker_id: str
+    worker_url: Optional[str] = None
+    cdp_url: Optional[str] = None
+    status: str = "active"  # active | closed
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "SessionRecord":
+        return cls(**json.loads(data))
+
+
+@dataclass
+class WorkerIdentity:
+    worker_id: str
+    worker_url: Optional[str]
+
+    @classmethod
+    def from_env(cls) -> "WorkerIdentity":
+        return cls(
+            worker_id=os.getenv("BROWSER_USE_API_WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}",
+            worker_url=(os.getenv("BROWSER_USE_API_WORKER_URL") or "").rstrip("/") or None,
+        )
+
+
+class SessionDirectory(ABC):
+    """Maps session_id -> SessionRecord, shared between workers"""
+
+    shared: bool = True
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[SessionRecord]: ...
+
+    @abstractmethod
+    async def put(self, record: SessionRecord) -> None: ...
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None: ...
+
+    @abstractmethod
+    async def list(self) -> List[SessionRecord]: ...
+
+    async def mark_closed(self, session_id: str) -> None:
+        record = await self.get(session_id)
+        if record:
+            record.status = "closed"
+            record.updated_at = time.time()
+            await self.put(record)
+
+    async def remove_worker(self, worker_id: str) -> None:
+        """Forget the active sessions of a worker that is shutting down"""
+        for record in await self.list():
+            if record.worker_id == worker_id and record.status == "active":
+                await self.delete(record.session_id)
+
+    @abstractmethod
+    async def claim_worker_url(self, worker_url: str, worker_id: str, force: bool = False) -> Optional[str]:
+        """Claim worker_url for worker_id, return the other worker holding it instead (unless force)"""
+
+    @abstractmethod
+    async def release_worker_url(self, worker_url: str, worker_id: str) -> None: ...
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemorySessionDirectory(SessionDirectory):
+    shared = False
+
+    def __init__(self):
+        self._records: Dict[str, SessionRecord] = {}
+        self._worker_urls: Dict[str, str] = {}
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        return self._records.get(session_id)
+
+    async def put(self, record: SessionRecord) -> None:
+        self._records[record.session_id] = record
+
+    async def delete(self, session_id: str) -> None:
+        self._records.pop(session_id, None)
+
+    async def list(self) -> List[SessionRecord]:
+        return list(self._records.values())
+
+    async def claim_worker_url(self, worker_url: str, worker_id: str, force: bool = False) -> Optional[str]:
+        holder = self._worker_urls.setdefault(worker_url, worker_id)
+        if holder != worker_id and not force:
+            return holder
+        self._worker_urls[worker_url] = worker_id
+        return None
+
+    async def release_worker_url(self, worker_url: str, worker_id: str) -> None:
+        if self._worker_urls.get(worker_url) == worker_id:
+            del self._worker_urls[worker_url]
+
+
+class SQLiteSessionDirectory(SessionDirectory):
+    """Directory in a SQLite file, for several workers on the same machine"""
+
+    def __init__(self, path: str):
+        self.path = str(Path(path).expanduser())
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the to_thread calls, a lock keeps them from interleaving
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, record TEXT NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS worker_urls (worker_url TEXT PRIMARY KEY, worker_id TEXT NOT NULL)")
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        rows = await asyncio.to_thread(self._execute, "SELECT record FROM sessions WHERE session_id = ?", (session_id,))
+        return SessionRecord.from_json(rows[0][0]) if rows else None
+
+    async def put(self, record: SessionRecord) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO sessions (session_id, record) VALUES (?, ?)",
+            (record.session_id, record.to_json()),
+        )
+
+    async def delete(self, session_id: str) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    async def list(self) -> List[SessionRecord]:
+        rows = await asyncio.to_thread(self._execute, "SELECT record FROM sessions")
+        return [SessionRecord.from_json(row[0]) for row in rows]
+
+    async def claim_worker_url(self, worker_url: str, worker_id: str, force: bool = False) -> Optional[str]:
+        verb = "INSERT OR REPLACE" if force else "INSERT OR IGNORE"
+        await asyncio.to_thread(
+            self._execute, f"{verb} INTO worker_urls (worker_url, worker_id) VALUES (?, ?)", (worker_url, worker_id)
+        )
+        rows = await asyncio.to_thread(self._execute, "SELECT worker_id FROM worker_urls WHERE worker_url = ?", (worker_url,))
+        holder = rows[0][0] if rows else worker_id
+        return holder if holder != worker_id else None
+
+    async def release_worker_url(self, worker_url: str, worker_id: str) -> None:
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM worker_urls WHERE worker_url = ? AND worker_id = ?", (worker_url, worker_id)
+        )
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisSessionDirectory(SessionDirectory):
+    """Directory in a Redis hash, for workers spread over several machines"""
+
+    def __init__(self, url: str, key: str = "browser_use_api:sessions"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise ImportError(f"Redis session directory requires the redis package, install it with: pip install redis ({e})") from e
+        self.key = key
+        self._client = redis_asyncio.from_url(url, decode_responses=True)
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        data = await self._client.hget(self.key, session_id)
+        return SessionRecord.from_json(data) if data else None
+
+    async def put(self, record: SessionRecord) -> None:
+        await self._client.hset(self.key, record.session_id, record.to_json())
+
+    async def delete(self, session_id: str) -> None:
+        await self._client.hdel(self.key, session_id)
+
+    async def claim_worker_url(self, worker_url: str, worker_id: str, force: bool = False) -> Optional[str]:
+        if force:
+            await self._client.hset(f"{self.key}:worker_urls", worker_url, worker_id)
+            return None
+        await self._client.hsetnx(f"{self.key}:worker_urls", worker_url, worker_id)
+        holder = await self._client.hget(f"{self.key}:worker_urls", worker_url)
+        return holder if holder and holder != worker_id else None
+
+    async def release_worker_url(self, worker_url: str, worker_id: str) -> None:
+        if await self._client.hget(f"{self.key}:worker_urls", worker_url) == worker_id:
+            await self._client.hdel(f"{self.key}:worker_urls", worker_url)
+
+    async def list(self) -> List[SessionRecord]:
+        values = await self._client.hvals(self.key)
+        return [SessionRecord.from_json(value) for value in values]
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def session_directory_from_env() -> SessionDirectory:
+    """Build the session directory configured by BROWSER_USE_API_SESSION_DIRECTORY"""
+    spec = os.getenv("BROWSER_USE_API_SESSION_DIRECTORY", "memory").strip()
+    if spec in ("", "memory"):
+        return InMemorySessionDirectory()
+    if spec.startswith("sqlite:///"):
+        return SQLiteSessionDirectory(spec[len("sqlite:///"):])
+    if spec.startswith(("redis://", "rediss://", "unix://")):
+        return RedisSessionDirectory(spec)
+    raise ValueError(f"Unsupported BROWSER_USE_API_SESSION_DIRECTORY: {spec!r} (expected memory, sqlite:///path or redis://host)")
+
+
+class SessionRouter:
+    """Decides whether a session's tool call runs here or on the worker that owns its browser"""
+
+    def __init__(self, directory: SessionDirectory, identity: WorkerIdentity, mode: str = "proxy", timeout: float = 120.0):
+        if mode not in ("proxy", "redirect"):
+            raise ValueError(f"Session routing mode must be proxy or redirect, got {mode!r}")
+        self.directory = directory
+        self.identity = identity
+        self.mode = mode
+        self.timeout = timeout
+        self.forwarded = 0
+        self._http_client: Any = None
+
+    @classmethod
+    def from_env(cls) -> "SessionRouter":
+        return cls(
+            directory=session_directory_from_env(),
+            identity=WorkerIdentity.from_env(),
+            mode=os.getenv("BROWSER_USE_API_SESSION_ROUTING", "proxy"),
+            timeout=float(os.getenv("BROWSER_USE_API_FORWARD_TIMEOUT", "120")),
+        )
+
+    async def start(self) -> None:
+        """Claim this worker's URL, refusing to start if another live worker is reachable on it"""
+        if not self.directory.shared or not self.identity.worker_url:
+            return
+        url, worker_id = self.identity.worker_url, self.identity.worker_id
+        holder = await self.directory.claim_worker_url(url, worker_id)
+        if holder is None:
+            return
+        if await self._answers_as(url, holder):
+            raise RuntimeError(
+                f"BROWSER_USE_API_WORKER_URL {url} is already used by worker {holder}. Each worker needs its own URL, "
+                "run one server per port instead of uvicorn --workers, whose processes share one port"
+            )
+        # The previous holder is gone (crashed without releasing its claim)
+        logger.info(f"Taking over worker URL {url} from stale worker {holder}")
+        await self.directory.claim_worker_url(url, worker_id, force=True)
+
+    async def _answers_as(self, worker_url: str, worker_id: str) -> bool:
+        """Whether the server at worker_url is the worker worker_id"""
+        import httpx
+
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(f"{worker_url}/health")
+                return response.json().get("routing", {}).get("worker_id") == worker_id
+        except Exception:
+            return False
+
+    async def register(self, session_id: str, cdp_url: Optional[str] = None) -> None:
+        await self.directory.put(
+            SessionRecord(
+                session_id=session_id,
+                worker_id=self.identity.worker_id,
+                worker_url=self.identity.worker_url,
+                cdp_url=cdp_url,
+            )
+        )
+
+    async def mark_closed(self, session_id: str) -> None:
+        await self.directory.mark_closed(session_id)
+
+    async def is_closed(self, session_id: str) -> bool:
+        record = await self.directory.get(session_id)
+        return bool(record and record.status == "closed")
+
+    async def remote_owner(self, session_id: str) -> Optional[SessionRecord]:
+        """Return the directory record if an active session is owned by a different worker"""
+        if not self.directory.shared:
+            return None
+        record = await self.directory.get(session_id)
+        if record is None or record.status != "active" or record.worker_id == self.identity.worker_id:
+            return None
+        if not record.worker_url:
+            raise RuntimeError(f"Session {session_id} is owned by worker {record.worker_id} which has no BROWSER_USE_API_WORKER_URL")
+        return record
+
+    async def forward(self, record: SessionRecord, payload: Dict[str, Any]) -> Any:
+        """POST the MCP call to the owning worker and return (status_code, json body, headers)"""
+        import httpx
+
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=self.timeout)
+        self.forwarded += 1
+        response = await self._http_client.post(
+            f"{record.worker_url}/mcp",
+            json=payload,
+            headers={FORWARDED_HEADER: self.identity.worker_id},
+        )
+        try:
+            body = response.json()
+        except ValueError:
+            body = {"detail": response.text}
+        return response.status_code, body, response.headers
+
+    def redirect_url(self, record: SessionRecord) -> str:
+        return f"{record.worker_url}/mcp"
+
+    async def close(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+        try:
+            await self.directory.remove_worker(self.identity.worker_id)
+            if self.identity.worker_url:
+                await self.directory.release_worker_url(self.identity.worker_url, self.identity.worker_id)
+        except Exception as e:
+            logger.debug(f"Failed to remove worker sessions from directory: {type(e).__name__}: {e}")
+        await self.directory.close()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.identity.worker_id,
+            "worker_url": self.identity.worker_url,
+            "directory": type(self.directory).__name__,
+            "mode": self.mode,
+            "forwarded": self.forwarded,
+        }
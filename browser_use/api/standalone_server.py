@@ -16,11 +16,11 @@ import time
 import secrets
 import string
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
+from fastapi.responses import JSONResponse, RedirectResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import uvicorn
@@ -35,43 +35,84 @@ logger = logging.getLogger(__name__)
 # Import specific browser_use modules to avoid config system
 try:
     from browser_use.browser import BrowserProfile, BrowserSession
+    from browser_use.browser.asset_cache import get_asset_cache
     from browser_use.controller.service import Controller
     from browser_use.filesystem.file_system import FileSystem
     from browser_use.llm.openai.chat import ChatOpenAI
+    from browser_use.llm.client_pool import close_llm_clients, get_llm_client_pool
     from browser_use.agent.service import Agent
     from browser_use import ActionModel
+    from browser_use.api.browser_pool import BrowserSessionPool
+    from browser_use.api.browser_hosts import BrowserHostsFull, SharedBrowserHosts
+    from browser_use.api.session_actors import SessionActorRegistry, SessionQueueFull
+    from browser_use.api.session_directory import FORWARDED_HEADER, SessionRouter
+    from browser_use.api.page_settle import DEFAULT_SETTLE_MAX_WAIT, DEFAULT_SETTLE_MODE, wait_for_page_settle
+    from browser_use.api.interactive_elements import DEFAULT_RESPONSE_MODE, InteractiveElementsSerializer
+    from browser_use.api.screenshots import (
+        DEFAULT_SCREENSHOT_FORMAT,
+        DEFAULT_SCREENSHOT_MODE,
+        DEFAULT_SCREENSHOT_QUALITY,
+        ScreenshotStore,
+        screenshot_response_fields,
+    )
 except ImportError as e:
     logger.error(f"Failed to import browser_use modules: {e}")
     logger.error("Make sure you have browser-use installed with: pip install browser-use")
     sys.exit(1)
 
+SettleMode = Literal["none", "network", "dom", "fixed"]
+ResponseMode = Literal["full", "diff"]
+RESPONSE_MODE_DESCRIPTION = "full lists every interactive element, diff only those added or changed since the last state returned for this session"
+ScreenshotMode = Literal["handle", "inline", "none"]
+ScreenshotFormat = Literal["jpeg", "webp", "png"]
+
+class ScreenshotOptions(BaseModel):
+    """Screenshot settings shared by the requests that answer with the page state"""
+    screenshot_mode: ScreenshotMode = Field(DEFAULT_SCREENSHOT_MODE, description="handle returns a screenshot_url to fetch the image from, inline returns it as base64, none skips it")
+    screenshot_format: ScreenshotFormat = Field(DEFAULT_SCREENSHOT_FORMAT, description="Image encoding of the screenshot")
+    screenshot_quality: int = Field(DEFAULT_SCREENSHOT_QUALITY, ge=0, le=100, description="JPEG/WebP quality")
+    screenshot_max_width: Optional[int] = Field(None, gt=0, description="Downscale the screenshot to at most this many pixels wide")
+
 # Pydantic models for API requests and responses
 class BrowserNavigateRequest(BaseModel):
     url: str = Field(..., description="The URL to navigate to")
     new_tab: bool = Field(False, description="Whether to open in a new tab")
     session_id: str = Field("default", description="Browser session ID")
 
-class BrowserClickRequest(BaseModel):
+class BrowserClickRequest(ScreenshotOptions):
     index: int = Field(..., description="The index of the element to click")
     new_tab: bool = Field(False, description="Whether to open in a new tab")
     session_id: str = Field("default", description="Browser session ID")
+    settle_mode: SettleMode = Field(DEFAULT_SETTLE_MODE, description="How to wait for the page to settle before reading state: none, network, dom or fixed")
+    settle_max_wait: float = Field(DEFAULT_SETTLE_MAX_WAIT, description="Maximum seconds to wait for the page to settle")
+    response_mode: ResponseMode = Field(DEFAULT_RESPONSE_MODE, description=RESPONSE_MODE_DESCRIPTION)
 
-class BrowserTypeRequest(BaseModel):
+class BrowserTypeRequest(ScreenshotOptions):
     index: int = Field(..., description="The index of the input element")
     text: str = Field(..., description="The text to type")
     session_id: str = Field("default", description="Browser session ID")
+    settle_mode: SettleMode = Field(DEFAULT_SETTLE_MODE, description="How to wait for the page to settle before reading state: none, network, dom or fixed")
+    settle_max_wait: float = Field(DEFAULT_SETTLE_MAX_WAIT, description="Maximum seconds to wait for the page to settle")
+    response_mode: ResponseMode = Field(DEFAULT_RESPONSE_MODE, description=RESPONSE_MODE_DESCRIPTION)
 
-class BrowserStateRequest(BaseModel):
+class BrowserStateRequest(ScreenshotOptions):
     include_screenshot: bool = Field(False, description="Whether to include a screenshot")
     session_id: str = Field("default", description="Browser session ID")
+    response_mode: ResponseMode = Field(DEFAULT_RESPONSE_MODE, description=RESPONSE_MODE_DESCRIPTION)
 
-class BrowserKeyRequest(BaseModel):
+class BrowserKeyRequest(ScreenshotOptions):
     key: str = Field(..., description="The key to press (e.g., 'Enter', 'Escape', 'Tab', 'Space')")
     session_id: str = Field("default", description="Browser session ID")
+    settle_mode: SettleMode = Field(DEFAULT_SETTLE_MODE, description="How to wait for the page to settle before reading state: none, network, dom or fixed")
+    settle_max_wait: float = Field(DEFAULT_SETTLE_MAX_WAIT, description="Maximum seconds to wait for the page to settle")
+    response_mode: ResponseMode = Field(DEFAULT_RESPONSE_MODE, description=RESPONSE_MODE_DESCRIPTION)
 
-class BrowserScrollRequest(BaseModel):
+class BrowserScrollRequest(ScreenshotOptions):
     direction: str = Field("down", description="Direction to scroll ('up' or 'down')")
     session_id: str = Field("default", description="Browser session ID")
+    settle_mode: SettleMode = Field(DEFAULT_SETTLE_MODE, description="How to wait for the page to settle before reading state: none, network, dom or fixed")
+    settle_max_wait: float = Field(DEFAULT_SETTLE_MAX_WAIT, description="Maximum seconds to wait for the page to settle")
+    response_mode: ResponseMode = Field(DEFAULT_RESPONSE_MODE, description=RESPONSE_MODE_DESCRIPTION)
 
 class FileUploadRequest(BaseModel):
     file_path: str = Field(..., description="Path to the file to upload")
@@ -146,10 +187,11 @@ class FileUploadResponse(BaseModel):
     session_id: str
     message: str
 
-class SelectDropdownRequest(BaseModel):
+class SelectDropdownRequest(ScreenshotOptions):
     session_id: str
     index: int
     text: str
+    response_mode: ResponseMode = Field(DEFAULT_RESPONSE_MODE, description=RESPONSE_MODE_DESCRIPTION)
 
 class TaskResponse(BaseModel):
     task_id: str
@@ -162,9 +204,79 @@ class BrowserStateResponse(BaseModel):
     title: str
     tabs: List[Dict[str, str]]
     interactive_elements: List[Dict[str, Any]]
+    # Set when response_mode="diff": {added, changed, removed, unchanged}, interactive_elements then only has added and changed elements
+    elements_diff: Optional[Dict[str, Any]] = None
     screenshot: Optional[str] = None
+    screenshot_handle: Optional[str] = None
+    screenshot_url: Optional[str] = None
+    screenshot_media_type: Optional[str] = None
     message: Optional[str] = None
 
+def base_profile_kwargs() -> Dict[str, Any]:
+    """BrowserProfile settings shared by every API session"""
+    kwargs = {
+        "downloads_path": str(Path.home() / 'Downloads' / 'browser-use-api'),
+        "keep_alive": False,
+        "headless": False,
+        # The DOM node map is transferred in the compact columnar format
+        "packed_dom_wire_format": True,
+        # The state probes are independent CDP calls, run them side by side
+        "concurrent_state_capture": True,
+        # Learn how long each domain takes to settle and which endpoints are long polls
+        "adaptive_network_idle": True,
+    }
+    # Opt-in: repeated state reads only transfer the DOM nodes whose text or form values changed
+    if os.getenv("BROWSER_USE_API_INCREMENTAL_DOM", "").lower() in ("1", "true", "yes"):
+        kwargs["incremental_dom_snapshots"] = True
+    # Opt-in disk cache of static assets, shared by all sessions so target sites' bundles are downloaded once
+    asset_cache_dir = os.getenv("BROWSER_USE_API_ASSET_CACHE_DIR")
+    if asset_cache_dir:
+        kwargs["asset_cache_dir"] = asset_cache_dir
+        kwargs["asset_cache_max_bytes"] = int(os.getenv("BROWSER_USE_API_ASSET_CACHE_MAX_MB", "512")) * 1024 * 1024
+    return kwargs
+
+def asset_cache_status() -> Dict[str, Any]:
+    kwargs = base_profile_kwargs()
+    if "asset_cache_dir" not in kwargs:
+        return {"enabled": False}
+    asset_cache = get_asset_cache(Path(kwargs["asset_cache_dir"]), kwargs["asset_cache_max_bytes"])
+    return {"enabled": True, **asset_cache.stats()}
+
+def pooled_profile_kwargs(wait_between_actions: float = 0.5, allowed_domains: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Per-request BrowserProfile settings, used as the pool key for warm sessions"""
+    return {
+        "wait_between_actions": wait_between_actions,
+        "allowed_domains": list(allowed_domains or []),
+    }
+
+async def launch_pooled_session(profile_kwargs: Dict[str, Any]) -> BrowserSession:
+    """Start a browser for the pool, pooled browsers run side by side so each gets its own temp profile dir"""
+    profile = BrowserProfile(**base_profile_kwargs(), user_data_dir=None, **profile_kwargs)
+    session = BrowserSession(browser_profile=profile)
+    await session.start()
+    return session
+
+async def launch_browser_host() -> BrowserSession:
+    """Start a shared browser whose contexts are handed out to sessions, it runs with a temp profile of its own"""
+    profile = BrowserProfile(**base_profile_kwargs(), user_data_dir=None)
+    session = BrowserSession(browser_profile=profile)
+    await session.start()
+    return session
+
+async def open_context_session(host: BrowserSession, profile_kwargs: Dict[str, Any]) -> BrowserSession:
+    """Open an isolated (incognito-style) context in a shared browser, wrapped in a BrowserSession of its own"""
+    if host.browser is None:
+        raise RuntimeError("Shared browser host is not running, cannot open a context in it")
+    profile = BrowserProfile(**base_profile_kwargs(), user_data_dir=None, **profile_kwargs)
+    context = await host.browser.new_context(**profile.kwargs_for_new_context().model_dump(mode='json'))
+    session = BrowserSession(browser_profile=profile, browser=host.browser, browser_context=context)
+    try:
+        await session.start()
+    except Exception:
+        await context.close()
+        raise
+    return session
+
 # Global state management
 class ServerState:
     def __init__(self):
@@ -176,10 +288,34 @@ class ServerState:
         self.account_storage: Dict[str, List[Dict[str, str]]] = {}
         # Form submission status: {session_id: bool} - tracks if browser session was properly closed
         self.form_submission_status: Dict[str, bool] = {}
+        # Warm pool of pre-launched browsers, None unless BROWSER_USE_API_POOL_MAX_SIZE > 0
+        self.browser_pool: Optional[BrowserSessionPool] = BrowserSessionPool.from_env(
+            launch_pooled_session, warm_profile_kwargs=pooled_profile_kwargs()
+        )
+        # Sessions as contexts of a few shared browsers, None unless BROWSER_USE_API_CONTEXTS_PER_BROWSER > 0
+        self.browser_hosts: Optional[SharedBrowserHosts] = SharedBrowserHosts.from_env(
+            launch_browser_host, open_context_session
+        )
+        # One actor (queue + worker) per session so /mcp calls for a session run one at a time
+        self.session_actors = SessionActorRegistry(
+            max_queue_depth=int(os.getenv("BROWSER_USE_API_SESSION_QUEUE_DEPTH", "8")),
+            idle_timeout=float(os.getenv("BROWSER_USE_API_SESSION_ACTOR_IDLE_TIMEOUT", "300")),
+        )
+        # Latest interactive elements seen per session: {session_id: {index: text}}
+        self.latest_states: Dict[str, Dict[int, str]] = {}
+        # Builds interactive_elements once per DOM snapshot and keeps what each session was sent, for diff responses
+        self.interactive_elements = InteractiveElementsSerializer()
+        # Recent screenshot frames per session, served by GET /sessions/{id}/screenshots/{handle}
+        self.screenshots = ScreenshotStore.from_env()
+        # Which worker owns which session, so /mcp calls reach the worker holding the browser
+        self.session_router = SessionRouter.from_env()
 
     async def cleanup(self):
         """Clean up all active sessions"""
         logger.info("Cleaning up server state...")
+
+        # Stop the per-session workers before their browsers go away
+        await self.session_actors.close()
         
         # Close all agents
         for agent_id, agent in self.agents.items():
@@ -192,11 +328,28 @@ class ServerState:
         # Close all browser sessions
         for session_id, session in self.browser_sessions.items():
             try:
-                await session.stop()
+                if self.browser_hosts and self.browser_hosts.owns(session):
+                    await self.browser_hosts.release(session)
+                else:
+                    await session.stop()
                 logger.debug(f"Closed browser session {session_id}")
             except Exception as e:
                 logger.error(f"Error closing browser session {session_id}: {e}")
 
+        # Stop the warm browsers parked in the pool
+        if self.browser_pool:
+            await self.browser_pool.close()
+
+        # Stop the shared browsers
+        if self.browser_hosts:
+            await self.browser_hosts.close()
+
+        # Drop this worker's sessions from the shared session directory
+        await self.session_router.close()
+
+        # Close the pooled LLM API connections
+        await close_llm_clients()
+
     def generate_password(self, length: int = 16) -> str:
         """Generate a secure random password"""
         # alphabet = string.ascii_letters + string.digits + "1!@#$%^&*Aa"
@@ -252,6 +405,16 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting standalone browser-use API server")
     server_state._load_accounts_from_file()
+    # Keep LLM API connections warm between agents, they are closed on shutdown
+    get_llm_client_pool().close_when_unused = False
+    if server_state.browser_pool:
+        await server_state.browser_pool.start()
+        logger.info(f"Browser pool enabled: {server_state.browser_pool.status()}")
+    if server_state.browser_hosts:
+        await server_state.browser_hosts.start()
+        logger.info(f"Shared browsers enabled: {server_state.browser_hosts.contexts_per_browser} contexts per browser")
+    # Refuses to start when another live worker already answers on this worker's URL
+    await server_state.session_router.start()
     yield
     # Shutdown
     await server_state.cleanup()
@@ -274,13 +437,22 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
-    app.state.latest_state = None
-
-    def update_latest_state(interactive_elements: list):
-        app.state.latest_state = {
+    def update_latest_state(session_id: str, interactive_elements: list):
+        server_state.latest_states[session_id] = {
             x['index']: x['text'] for x in interactive_elements
         }
 
+    async def screenshot_fields(session_id: str, session: BrowserSession, options: ScreenshotOptions) -> Dict[str, Any]:
+        return await screenshot_response_fields(
+            server_state.screenshots,
+            session_id,
+            session,
+            mode=options.screenshot_mode,
+            image_format=options.screenshot_format,
+            quality=options.screenshot_quality,
+            max_width=options.screenshot_max_width,
+        )
+
     @app.get("/")
     async def root():
         return {
@@ -312,7 +484,15 @@ def create_app() -> FastAPI:
             "status": "healthy",
             "active_sessions": len(server_state.browser_sessions),
             "active_agents": len(server_state.agents),
-            "openai_api_key": api_key_status
+            "openai_api_key": api_key_status,
+            "session_queues": server_state.session_actors.stats(),
+            "routing": server_state.session_router.status(),
+            "interactive_elements": server_state.interactive_elements.stats(),
+            "screenshots": server_state.screenshots.stats(),
+            "asset_cache": asset_cache_status(),
+            "llm_clients": get_llm_client_pool().stats(),
+            "browser_pool": server_state.browser_pool.status() if server_state.browser_pool else {"enabled": False},
+            "browser_hosts": server_state.browser_hosts.status() if server_state.browser_hosts else {"enabled": False}
         }
 
     # Helper function to get or create session
@@ -349,18 +529,23 @@ def create_app() -> FastAPI:
             )
 
         try:
-            # Create browser profile with basic settings
-            profile = BrowserProfile(
-                downloads_path=str(Path.home() / 'Downloads' / 'browser-use-api'),
-                wait_between_actions=request.wait_between_actions,
-                keep_alive=False,  # Keep browser alive between tool calls
-                user_data_dir='~/.config/browseruse/profiles/api',
-                headless=False,
-                allowed_domains=request.allowed_domains,
-            )
-            
-            session = BrowserSession(browser_profile=profile)
-            await session.start()
+            profile_kwargs = pooled_profile_kwargs(request.wait_between_actions, request.allowed_domains)
+            if server_state.browser_hosts:
+                # Open a context in a shared browser (launches another browser when all are at their cap)
+                session = await server_state.browser_hosts.acquire(profile_kwargs)
+            elif server_state.browser_pool:
+                # Check out a warm browser (launches a new one on a pool miss)
+                session = await server_state.browser_pool.acquire(profile_kwargs)
+            else:
+                # Create browser profile with basic settings
+                profile = BrowserProfile(
+                    **base_profile_kwargs(),
+                    user_data_dir='~/.config/browseruse/profiles/api',
+                    **profile_kwargs,
+                )
+
+                session = BrowserSession(browser_profile=profile)
+                await session.start()
 
             # Store session and create controller
             server_state.browser_sessions[session_id] = session
@@ -373,6 +558,9 @@ def create_app() -> FastAPI:
             # Initialize form submission status as False (not yet submitted)
             server_state.form_submission_status[session_id] = False
 
+            # Announce this worker as the owner so other workers forward calls here
+            await server_state.session_router.register(session_id, cdp_url=session.cdp_url)
+
             logger.info(f"Created browser session {session_id}")
             
             return SessionResponse(
@@ -384,11 +572,21 @@ def create_app() -> FastAPI:
         except HTTPException:
             # Re-raise HTTP exceptions as-is (don't wrap them)
             raise
+        except BrowserHostsFull as e:
+            raise HTTPException(status_code=503, detail=str(e))
         except Exception as e:
             # Clean up partial session if creation failed
             if session_id in server_state.browser_sessions:
+                partial_session = server_state.browser_sessions[session_id]
                 try:
-                    await server_state.browser_sessions[session_id].stop()
+                    if server_state.browser_hosts and server_state.browser_hosts.owns(partial_session):
+                        # frees the context slot in the shared browser too
+                        await server_state.browser_hosts.release(partial_session)
+                    elif server_state.browser_pool and server_state.browser_pool.owns(partial_session):
+                        # frees the pool slot, an unusable session is stopped instead of parked
+                        await server_state.browser_pool.release(partial_session)
+                    else:
+                        await partial_session.stop()
                 except Exception:
                     pass
                 del server_state.browser_sessions[session_id]
@@ -413,9 +611,14 @@ def create_app() -> FastAPI:
                 await server_state.agents[session_id].close()
                 del server_state.agents[session_id]
 
-            # Close browser session
+            # Close browser session (pooled browsers are scrubbed and parked for the next session)
             session = server_state.browser_sessions[session_id]
-            await session.stop()
+            if server_state.browser_hosts and server_state.browser_hosts.owns(session):
+                await server_state.browser_hosts.release(session)
+            elif server_state.browser_pool and server_state.browser_pool.owns(session):
+                await server_state.browser_pool.release(session)
+            else:
+                await session.stop()
             del server_state.browser_sessions[session_id]
 
             # Clean up other resources
@@ -423,9 +626,13 @@ def create_app() -> FastAPI:
                 del server_state.controllers[session_id]
             if session_id in server_state.file_systems:
                 del server_state.file_systems[session_id]
+            server_state.latest_states.pop(session_id, None)
+            server_state.interactive_elements.forget(session_id)
+            server_state.screenshots.forget(session_id)
             
             # Mark form submission as complete for this session
             server_state.form_submission_status[session_id] = True
+            await server_state.session_router.mark_closed(session_id)
 
             logger.info(f"Closed browser session {session_id}")
             
@@ -462,9 +669,149 @@ def create_app() -> FastAPI:
         
         return {"sessions": sessions}
 
+    @app.get("/sessions/{session_id}/screenshots/{handle}")
+    async def get_screenshot(session_id: str, handle: str):
+        """Serve a screenshot frame returned as screenshot_handle by an earlier response"""
+        frame = server_state.screenshots.get(session_id, handle)
+        if frame is not None:
+            return Response(content=frame.data, media_type=frame.media_type, headers={"Cache-Control": "private, max-age=3600, immutable"})
+
+        # The frame is stored by the worker that owns the session's browser
+        owner = await server_state.session_router.remote_owner(session_id)
+        if owner:
+            return RedirectResponse(f"{owner.worker_url}/sessions/{session_id}/screenshots/{handle}", status_code=307)
+        raise HTTPException(status_code=404, detail=f"Screenshot {handle} not found for session {session_id}")
+
+    # Tools that don't touch a browser page run directly instead of on the session's actor
+    UNQUEUED_TOOLS = {"get_tool_schemas", "list_browser_sessions", "check_form_submission_status", "get_agent_task_status"}
+    # Tools answered by whichever worker receives them
+    LOCAL_TOOLS = {"get_tool_schemas", "list_browser_sessions", "check_form_submission_status"}
+
+    async def dispatch_tool(tool_name: str, parameters: Dict[str, Any], background_tasks: BackgroundTasks):
+        """Route a normalized MCP tool call to its handler"""
+        if tool_name == "get_tool_schemas":
+            return tool_schemas()
+        
+        # Session management tools
+        elif tool_name == "create_browser_session":
+            create_req = CreateSessionRequest(**parameters)
+            return await create_session(create_req)
+        
+        elif tool_name == "list_browser_sessions":
+            return await list_sessions()
+        
+        elif tool_name == "close_browser_session":
+            close_req = CloseSessionRequest(**parameters)
+            return await close_session(close_req)
+        
+        elif tool_name == "check_form_submission_status":
+            check_req = CheckSubmissionStatusRequest(**parameters)
+            session_id = check_req.session_id
+            
+            # Check if form submission was completed (browser closed), possibly on another worker
+            is_complete = server_state.form_submission_status.get(session_id, False) or await server_state.session_router.is_closed(session_id)
+            
+            if is_complete:
+                return {
+                    "status": "complete",
+                    "form_submitted": True,
+                    "message": "Form has been successfully submitted. Task is complete. Stop execution now.",
+                    "session_id": session_id
+                }
+            else:
+                return {
+                    "status": "pending",
+                    "form_submitted": False,
+                    "message": "Form submission not yet complete. Browser session is still active or was not properly closed.",
+                    "session_id": session_id
+                }
+        
+        # Browser navigation tools
+        elif tool_name == "navigate":
+            nav_req = BrowserNavigateRequest(**parameters)
+            return await browser_navigate(nav_req)
+        
+        elif tool_name == "click":
+            click_req = BrowserClickRequest(**parameters)
+            return await browser_click(click_req)
+        
+        elif tool_name == "type":
+            type_req = BrowserTypeRequest(**parameters)
+            return await browser_type(type_req)
+        
+        elif tool_name == "key":
+            key_req = BrowserKeyRequest(**parameters)
+            return await browser_key(key_req)
+        
+        elif tool_name == "scroll":
+            scroll_req = BrowserScrollRequest(**parameters)
+            return await browser_scroll(scroll_req)
+        
+        elif tool_name == "browser_get_state":
+            state_req = BrowserStateRequest(**parameters)
+            return await get_browser_state(state_req)
+        
+        # Content extraction tool
+        # elif tool_name == "extract_content":
+        #     extract_req = BrowserExtractContentRequest(**parameters)
+        #     return await browser_extract_content(extract_req)
+        
+        # Browser navigation tools
+        elif tool_name == "go_back":
+            back_req = BrowserGoBackRequest(**parameters)
+            return await browser_go_back(back_req)
+        
+        # Tab management tools
+        elif tool_name == "list_tabs":
+            list_tabs_req = BrowserListTabsRequest(**parameters)
+            return await browser_list_tabs(list_tabs_req)
+
+        elif tool_name == "switch_tab":
+            switch_req = BrowserSwitchTabRequest(**parameters)
+            return await browser_switch_tab(switch_req)
+        
+        elif tool_name == "close_tab":
+            close_tab_req = BrowserCloseTabRequest(**parameters)
+            return await browser_close_tab(close_tab_req)
+        
+        elif tool_name == "upload_file":
+            upload_req = FileUploadRequest(**parameters)
+            return await browser_upload_file(upload_req)
+        
+        # Agent tools
+        elif tool_name == "browse_agent":
+            agent_req = AgentTaskRequest(**parameters)
+            return await run_agent_task(agent_req, background_tasks)
+        
+        elif tool_name == "retry_browse_agent":
+            retry_req = RetryWithAgentRequest(**parameters)
+            return await retry_with_browser_use_agent(retry_req, background_tasks)
+        
+        elif tool_name == "get_agent_task_status":
+            task_id = parameters.get("task_id")
+            if not task_id:
+                raise HTTPException(status_code=400, detail="task_id parameter required")
+            return await get_agent_task_status(task_id)
+        
+        elif tool_name == "select_dropdown_option":
+            select_req = SelectDropdownRequest(**parameters)
+            return await select_dropdown_option(select_req)
+
+        # Account management tools
+        elif tool_name == "generate_account_credentials":
+            cred_req = PasswordGenerationRequest(**parameters)
+            return await generate_account_credentials(cred_req)
+        
+        elif tool_name == "retrieve_account_credentials":
+            retrieve_req = AccountRetrievalRequest(**parameters)
+            return await retrieve_account_credentials(retrieve_req)
+        
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown tool: {tool_name}")
+
     # Unified MCP endpoint
     @app.post("/mcp")
-    async def mcp_endpoint(request: MCPRequest, background_tasks: BackgroundTasks):
+    async def mcp_endpoint(request: MCPRequest, background_tasks: BackgroundTasks, http_request: Request):
         """Unified MCP endpoint that routes to appropriate tools based on tool_name"""
         try:
             tool_name = request.tool_name
@@ -501,7 +848,10 @@ def create_app() -> FastAPI:
             # Allow get_tool_schemas and check_form_submission_status to always run
             if tool_name not in ["get_tool_schemas", "check_form_submission_status"]:
                 session_id = parameters.get("session_id")
-                if session_id and server_state.form_submission_status.get(session_id, False):
+                if session_id and (
+                    server_state.form_submission_status.get(session_id, False)
+                    or await server_state.session_router.is_closed(session_id)
+                ):
                     return {
                         "status": "completed",
                         "form_submitted": True,
@@ -510,126 +860,45 @@ def create_app() -> FastAPI:
                         "instruction": "Stop execution now. Do not create new sessions or perform any more browser actions."
                     }
 
-            if tool_name == "get_tool_schemas":
-                return tool_schemas()
-            
-            # Session management tools
-            elif tool_name == "create_browser_session":
-                create_req = CreateSessionRequest(**parameters)
-                return await create_session(create_req)
-            
-            elif tool_name == "list_browser_sessions":
-                return await list_sessions()
-            
-            elif tool_name == "close_browser_session":
-                close_req = CloseSessionRequest(**parameters)
-                return await close_session(close_req)
-            
-            elif tool_name == "check_form_submission_status":
-                check_req = CheckSubmissionStatusRequest(**parameters)
-                session_id = check_req.session_id
-                
-                # Check if form submission was completed (browser closed)
-                is_complete = server_state.form_submission_status.get(session_id, False)
-                
-                if is_complete:
-                    return {
-                        "status": "complete",
-                        "form_submitted": True,
-                        "message": "Form has been successfully submitted. Task is complete. Stop execution now.",
-                        "session_id": session_id
-                    }
-                else:
-                    return {
-                        "status": "pending",
-                        "form_submitted": False,
-                        "message": "Form submission not yet complete. Browser session is still active or was not properly closed.",
-                        "session_id": session_id
-                    }
-            
-            # Browser navigation tools
-            elif tool_name == "navigate":
-                nav_req = BrowserNavigateRequest(**parameters)
-                return await browser_navigate(nav_req)
-            
-            elif tool_name == "click":
-                click_req = BrowserClickRequest(**parameters)
-                return await browser_click(click_req)
-            
-            elif tool_name == "type":
-                type_req = BrowserTypeRequest(**parameters)
-                return await browser_type(type_req)
-            
-            elif tool_name == "key":
-                key_req = BrowserKeyRequest(**parameters)
-                return await browser_key(key_req)
-            
-            elif tool_name == "scroll":
-                scroll_req = BrowserScrollRequest(**parameters)
-                return await browser_scroll(scroll_req)
-            
-            elif tool_name == "browser_get_state":
-                state_req = BrowserStateRequest(**parameters)
-                return await get_browser_state(state_req)
-            
-            # Content extraction tool
-            # elif tool_name == "extract_content":
-            #     extract_req = BrowserExtractContentRequest(**parameters)
-            #     return await browser_extract_content(extract_req)
-            
-            # Browser navigation tools
-            elif tool_name == "go_back":
-                back_req = BrowserGoBackRequest(**parameters)
-                return await browser_go_back(back_req)
-            
-            # Tab management tools
-            elif tool_name == "list_tabs":
-                list_tabs_req = BrowserListTabsRequest(**parameters)
-                return await browser_list_tabs(list_tabs_req)
-
-            elif tool_name == "switch_tab":
-                switch_req = BrowserSwitchTabRequest(**parameters)
-                return await browser_switch_tab(switch_req)
-            
-            elif tool_name == "close_tab":
-                close_tab_req = BrowserCloseTabRequest(**parameters)
-                return await browser_close_tab(close_tab_req)
-            
-            elif tool_name == "upload_file":
-                upload_req = FileUploadRequest(**parameters)
-                return await browser_upload_file(upload_req)
-            
-            # Agent tools
-            elif tool_name == "browse_agent":
-                agent_req = AgentTaskRequest(**parameters)
-                return await run_agent_task(agent_req, background_tasks)
-            
-            elif tool_name == "retry_browse_agent":
-                retry_req = RetryWithAgentRequest(**parameters)
-                return await retry_with_browser_use_agent(retry_req, background_tasks)
-            
-            elif tool_name == "get_agent_task_status":
-                task_id = parameters.get("task_id")
-                if not task_id:
-                    raise HTTPException(status_code=400, detail="task_id parameter required")
-                return await get_agent_task_status(task_id)
-            
-            elif tool_name == "select_dropdown_option":
-                select_req = SelectDropdownRequest(**parameters)
-                return await select_dropdown_option(select_req)
-
-            # Account management tools
-            elif tool_name == "generate_account_credentials":
-                cred_req = PasswordGenerationRequest(**parameters)
-                return await generate_account_credentials(cred_req)
-            
-            elif tool_name == "retrieve_account_credentials":
-                retrieve_req = AccountRetrievalRequest(**parameters)
-                return await retrieve_account_credentials(retrieve_req)
-            
-            else:
-                raise HTTPException(status_code=400, detail=f"Unknown tool: {tool_name}")
-                
+            session_id = parameters.get("session_id", "default")
+
+            # Forward calls for sessions whose browser lives on another worker
+            if tool_name not in LOCAL_TOOLS:
+                owner = await server_state.session_router.remote_owner(session_id)
+                if owner and http_request.headers.get(FORWARDED_HEADER):
+                    # The owner's URL reached another worker, never answer for a session this worker doesn't have
+                    raise HTTPException(
+                        status_code=421,
+                        detail=f"Session {session_id} belongs to worker {owner.worker_id}, but its URL {owner.worker_url} "
+                        f"reached worker {server_state.session_router.identity.worker_id}. Each worker needs its own port.",
+                    )
+                if owner:
+                    if server_state.session_router.mode == "redirect":
+                        return RedirectResponse(server_state.session_router.redirect_url(owner), status_code=307)
+                    status_code, body, headers = await server_state.session_router.forward(
+                        owner, {"tool_name": tool_name, "parameters": parameters}
+                    )
+                    if status_code >= 400:
+                        detail = body.get("detail", body) if isinstance(body, dict) else body
+                        retry_after = {"Retry-After": headers["retry-after"]} if "retry-after" in headers else None
+                        raise HTTPException(status_code=status_code, detail=detail, headers=retry_after)
+                    return body
+
+            if tool_name in UNQUEUED_TOOLS:
+                return await dispatch_tool(tool_name, parameters, background_tasks)
+
+            # Run on the session's actor so calls for one session never interleave
+            try:
+                result = await server_state.session_actors.submit(
+                    session_id, lambda: dispatch_tool(tool_name, parameters, background_tasks)
+                )
+            except SessionQueueFull as e:
+                raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+            if tool_name == "close_browser_session":
+                await server_state.session_actors.discard(session_id)
+            return result
+
         except Exception as e:
             logger.error(f"Error in MCP endpoint for tool {request.tool_name}: {e}")
             if isinstance(e, HTTPException):
@@ -705,36 +974,24 @@ def create_app() -> FastAPI:
 
             await session._click_element_node(element)
             
-            time.sleep(2)
-            state = await session.get_browser_state_with_recovery(cache_clickable_elements_hashes=False)
-
-            interactive_elements = []
-            for index, element in state.selector_map.items():
-                elem_info = {
-                    'index': index,
-                    'tag': element.tag_name,
-                    'text': element.get_all_text_till_next_clickable_element(max_depth=2)[:100],
-                }
-                if element.attributes.get('placeholder'):
-                    elem_info['placeholder'] = element.attributes['placeholder']
-                if element.attributes.get('href'):
-                    elem_info['href'] = element.attributes['href']
-                if elem_info['tag'] != 'div' and elem_info['text'] != '':
-                    interactive_elements.append(elem_info)
-                interactive_elements = sorted(interactive_elements, key=lambda x: x['index'])
+            await wait_for_page_settle(session, request.settle_mode, request.settle_max_wait)
+            state = await session.get_browser_state_with_recovery(cache_clickable_elements_hashes=False, include_screenshot=False)
+
+            elements = server_state.interactive_elements.respond(request.session_id, state, request.response_mode, only_labeled=True)
 
             response_data = {
                 'url': state.url,
                 'title': state.title,
                 'tabs': [{'url': tab.url, 'title': tab.title} for tab in state.tabs],
-                'interactive_elements': interactive_elements,
-                'message': f'Clicked on element {app.state.latest_state[request.index]}.'
+                'interactive_elements': elements.interactive_elements,
+                'elements_diff': elements.elements_diff,
+                'message': f'Clicked on element {server_state.latest_states.get(request.session_id, {}).get(request.index, request.index)}.'
             }
             
-            if interactive_elements[-1]['tag'] == 'tr':
+            if elements.elements and elements.elements[-1]['tag'] == 'tr':
                 response_data['message'] += ' The table is incomplete. Now you need to scroll down to load more rows.'
             
-            update_latest_state(interactive_elements)
+            update_latest_state(request.session_id, elements.elements)
             
             # page = await session.get_current_page()
             # xpath = element.xpath
@@ -746,7 +1003,7 @@ def create_app() -> FastAPI:
             #     xpath
             # )
 
-            response_data['screenshot'] = state.screenshot
+            response_data.update(await screenshot_fields(request.session_id, session, request))
             return BrowserStateResponse(**response_data)
 
         except Exception as e:
@@ -765,34 +1022,24 @@ def create_app() -> FastAPI:
 
             await session._input_text_element_node(element, request.text)
             
-            time.sleep(2)
+            await wait_for_page_settle(session, request.settle_mode, request.settle_max_wait)
             page = await session.get_current_page()
 
-            state = await session.get_browser_state_with_recovery(cache_clickable_elements_hashes=False)
+            state = await session.get_browser_state_with_recovery(cache_clickable_elements_hashes=False, include_screenshot=False)
 
-            interactive_elements = []
-            for index, element in state.selector_map.items():
-                elem_info = {
-                    'index': index,
-                    'tag': element.tag_name,
-                    'text': element.get_all_text_till_next_clickable_element(max_depth=2)[:100],
-                }
-                if element.attributes.get('placeholder'):
-                    elem_info['placeholder'] = element.attributes['placeholder']
-                if element.attributes.get('href'):
-                    elem_info['href'] = element.attributes['href']
-                interactive_elements.append(elem_info)
+            elements = server_state.interactive_elements.respond(request.session_id, state, request.response_mode)
 
             response_data = {
                 'url': state.url,
                 'title': state.title,
                 'tabs': [{'url': tab.url, 'title': tab.title} for tab in state.tabs],
-                'interactive_elements': interactive_elements,
+                'interactive_elements': elements.interactive_elements,
+                'elements_diff': elements.elements_diff,
                 'message': f'Typed {request.text} on element {request.index}.'
             }
-            update_latest_state(interactive_elements)
+            update_latest_state(request.session_id, elements.elements)
 
-            response_data['screenshot'] = state.screenshot
+            response_data.update(await screenshot_fields(request.session_id, session, request))
             return BrowserStateResponse(**response_data)
             return {"message": f"Typed '{request.text}' into element {request.index}"}
 
@@ -814,30 +1061,21 @@ def create_app() -> FastAPI:
                 for char in request.key:
                     await page.keyboard.press(char)
             
-            time.sleep(2)
-            state = await session.get_browser_state_with_recovery(cache_clickable_elements_hashes=False)
-
-            interactive_elements = []
-            for index, element in state.selector_map.items():
-                elem_info = {
-                    'index': index,
-                    'tag': element.tag_name,
-                    'text': element.get_all_text_till_next_clickable_element(max_depth=2)[:100],
-                }
-                if element.attributes.get('placeholder'):
-                    elem_info['placeholder'] = element.attributes['placeholder']
-                if element.attributes.get('href'):
-                    elem_info['href'] = element.attributes['href']
-                interactive_elements.append(elem_info)
+            await wait_for_page_settle(session, request.settle_mode, request.settle_max_wait)
+            state = await session.get_browser_state_with_recovery(cache_clickable_elements_hashes=False, include_screenshot=False)
+
+            elements = server_state.interactive_elements.respond(request.session_id, state, request.response_mode)
 
             response_data = {
                 'url': state.url,
                 'title': state.title,
                 'tabs': [{'url': tab.url, 'title': tab.title} for tab in state.tabs],
-                'interactive_elements': interactive_elements,
+                'interactive_elements': elements.interactive_elements,
+                'elements_diff': elements.elements_diff,
             }
+            update_latest_state(request.session_id, elements.elements)
 
-            response_data['screenshot'] = state.screenshot
+            response_data.update(await screenshot_fields(request.session_id, session, request))
             return BrowserStateResponse(**response_data)
             
             # return {"message": f"Pressed key: {request.key}"}
@@ -972,31 +1210,21 @@ def create_app() -> FastAPI:
                             
                             page = await browser_session.get_current_page()
 
-                            state = await browser_session.get_browser_state_with_recovery(cache_clickable_elements_hashes=False)
+                            state = await browser_session.get_browser_state_with_recovery(cache_clickable_elements_hashes=False, include_screenshot=False)
 
-                            interactive_elements = []
-                            for index, element in state.selector_map.items():
-                                elem_info = {
-                                    'index': index,
-                                    'tag': element.tag_name,
-                                    'text': element.get_all_text_till_next_clickable_element(max_depth=2)[:100],
-                                }
-                                if element.attributes.get('placeholder'):
-                                    elem_info['placeholder'] = element.attributes['placeholder']
-                                if element.attributes.get('href'):
-                                    elem_info['href'] = element.attributes['href']
-                                interactive_elements.append(elem_info)
+                            elements = server_state.interactive_elements.respond(request.session_id, state, request.response_mode)
 
                             response_data = {
                                 'url': state.url,
                                 'title': state.title,
                                 'tabs': [{'url': tab.url, 'title': tab.title} for tab in state.tabs],
-                                'interactive_elements': interactive_elements,
+                                'interactive_elements': elements.interactive_elements,
+                                'elements_diff': elements.elements_diff,
                                 'message': msg
                             }
-                            update_latest_state(interactive_elements)
+                            update_latest_state(request.session_id, elements.elements)
 
-                            response_data['screenshot'] = state.screenshot
+                            response_data.update(await screenshot_fields(request.session_id, browser_session, request))
                             return BrowserStateResponse(**response_data)
 
                             return {'message': msg}
@@ -1097,30 +1325,21 @@ def create_app() -> FastAPI:
             # Perform the scroll
             await page.evaluate('(distance) => window.scrollBy(0, distance)', scroll_distance)
             
-            time.sleep(2)
-            state = await session.get_browser_state_with_recovery(cache_clickable_elements_hashes=False)
-
-            interactive_elements = []
-            for index, element in state.selector_map.items():
-                elem_info = {
-                    'index': index,
-                    'tag': element.tag_name,
-                    'text': element.get_all_text_till_next_clickable_element(max_depth=2)[:100],
-                }
-                if element.attributes.get('placeholder'):
-                    elem_info['placeholder'] = element.attributes['placeholder']
-                if element.attributes.get('href'):
-                    elem_info['href'] = element.attributes['href']
-                interactive_elements.append(elem_info)
+            await wait_for_page_settle(session, request.settle_mode, request.settle_max_wait)
+            state = await session.get_browser_state_with_recovery(cache_clickable_elements_hashes=False, include_screenshot=False)
+
+            elements = server_state.interactive_elements.respond(request.session_id, state, request.response_mode)
 
             response_data = {
                 'url': state.url,
                 'title': state.title,
                 'tabs': [{'url': tab.url, 'title': tab.title} for tab in state.tabs],
-                'interactive_elements': interactive_elements,
+                'interactive_elements': elements.interactive_elements,
+                'elements_diff': elements.elements_diff,
             }
+            update_latest_state(request.session_id, elements.elements)
 
-            response_data['screenshot'] = state.screenshot
+            response_data.update(await screenshot_fields(request.session_id, session, request))
             return BrowserStateResponse(**response_data)
             # return {"message": f"Scrolled {request.direction} by {abs(scroll_distance)} pixels"}
 
@@ -1330,33 +1549,21 @@ def create_app() -> FastAPI:
         try:
             session = await get_session(request.session_id)
             
-            state = await session.get_browser_state_with_recovery(cache_clickable_elements_hashes=False)
-
-            interactive_elements = []
-            for index, element in state.selector_map.items():
-                elem_info = {
-                    'index': index,
-                    'tag': element.tag_name,
-                    'text': element.get_all_text_till_next_clickable_element(max_depth=2)[:100],
-                }
-                if elem_info['text'] == '':
-                    elem_info['text'] = '(No text)'
-                if element.attributes.get('placeholder'):
-                    elem_info['placeholder'] = element.attributes['placeholder']
-                if element.attributes.get('href'):
-                    elem_info['href'] = element.attributes['href']
-                interactive_elements.append(elem_info)
+            state = await session.get_browser_state_with_recovery(cache_clickable_elements_hashes=False, include_screenshot=False)
+
+            elements = server_state.interactive_elements.respond(request.session_id, state, request.response_mode, empty_text='(No text)')
 
             response_data = {
                 'url': state.url,
                 'title': state.title,
                 'tabs': [{'url': tab.url, 'title': tab.title} for tab in state.tabs],
-                'interactive_elements': interactive_elements,
+                'interactive_elements': elements.interactive_elements,
+                'elements_diff': elements.elements_diff,
             }
-            update_latest_state(interactive_elements)
+            update_latest_state(request.session_id, elements.elements)
 
-            if request.include_screenshot and state.screenshot:
-                response_data['screenshot'] = state.screenshot
+            if request.include_screenshot:
+                response_data.update(await screenshot_fields(request.session_id, session, request))
 
             return BrowserStateResponse(**response_data)
 
@@ -1517,6 +1724,13 @@ def create_app() -> FastAPI:
 # Create app instance
 app = create_app()
 
+SCREENSHOT_SCHEMA_PROPERTIES = {
+    "screenshot_mode": {"type": "string", "enum": ["handle", "inline", "none"]},
+    "screenshot_format": {"type": "string", "enum": ["jpeg", "webp", "png"]},
+    "screenshot_quality": {"type": "integer", "minimum": 0, "maximum": 100},
+    "screenshot_max_width": {"type": "integer", "minimum": 1},
+}
+
 def tool_schemas() -> Dict[str, Any]:
     return {
         "rules": [
@@ -1524,6 +1738,8 @@ def tool_schemas() -> Dict[str, Any]:
             "For DOM elements, the key is ALWAYS 'index' (never element_index).",
             "Call browser_get_state before click/type to get correct indices.",
             "Indices can change after interactions; refresh state often.",
+            "Pass response_mode='diff' to receive only the elements added or changed since your last state; elements_diff lists removed indices.",
+            "Screenshots come back as screenshot_url (GET it only if you need the image); screenshot_mode='inline' returns base64, 'none' skips them.",
             "Use the same session_id across calls."
         ],
         "tools": {
@@ -1560,7 +1776,9 @@ def tool_schemas() -> Dict[str, Any]:
                     "required": ["session_id"],
                     "properties": {
                         "session_id": {"type": "string"},
-                        "include_screenshot": {"type": "boolean"}
+                        "include_screenshot": {"type": "boolean"},
+                        "response_mode": {"type": "string", "enum": ["full", "diff"]},
+                        **SCREENSHOT_SCHEMA_PROPERTIES
                     },
                     "additionalProperties": False
                 },
@@ -1573,7 +1791,11 @@ def tool_schemas() -> Dict[str, Any]:
                     "properties": {
                         "session_id": {"type": "string"},
                         "index": {"type": "integer"},
-                        "new_tab": {"type": "boolean"}
+                        "new_tab": {"type": "boolean"},
+                        "settle_mode": {"type": "string", "enum": ["none", "network", "dom", "fixed"]},
+                        "settle_max_wait": {"type": "number"},
+                        "response_mode": {"type": "string", "enum": ["full", "diff"]},
+                        **SCREENSHOT_SCHEMA_PROPERTIES
                     },
                     "additionalProperties": False
                 },
@@ -1586,7 +1808,11 @@ def tool_schemas() -> Dict[str, Any]:
                     "properties": {
                         "session_id": {"type": "string"},
                         "index": {"type": "integer"},
-                        "text": {"type": "string"}
+                        "text": {"type": "string"},
+                        "settle_mode": {"type": "string", "enum": ["none", "network", "dom", "fixed"]},
+                        "settle_max_wait": {"type": "number"},
+                        "response_mode": {"type": "string", "enum": ["full", "diff"]},
+                        **SCREENSHOT_SCHEMA_PROPERTIES
                     },
                     "additionalProperties": False
                 },
@@ -1596,7 +1822,7 @@ def tool_schemas() -> Dict[str, Any]:
                 "parameters": {
                     "type": "object",
                     "required": ["session_id", "key"],
-                    "properties": {"session_id": {"type": "string"}, "key": {"type": "string"}},
+                    "properties": {"session_id": {"type": "string"}, "key": {"type": "string"}, "settle_mode": {"type": "string", "enum": ["none", "network", "dom", "fixed"]}, "settle_max_wait": {"type": "number"}, "response_mode": {"type": "string", "enum": ["full", "diff"]}, **SCREENSHOT_SCHEMA_PROPERTIES},
                     "additionalProperties": False
                 },
                 "example": {"tool_name": "key", "parameters": {"session_id": "session_123", "key": "Enter"}}
@@ -1605,7 +1831,7 @@ def tool_schemas() -> Dict[str, Any]:
                 "parameters": {
                     "type": "object",
                     "required": ["session_id"],
-                    "properties": {"session_id": {"type": "string"}, "direction": {"type": "string"}},
+                    "properties": {"session_id": {"type": "string"}, "direction": {"type": "string"}, "settle_mode": {"type": "string", "enum": ["none", "network", "dom", "fixed"]}, "settle_max_wait": {"type": "number"}, "response_mode": {"type": "string", "enum": ["full", "diff"]}, **SCREENSHOT_SCHEMA_PROPERTIES},
                     "additionalProperties": False
                 },
                 "example": {"tool_name": "scroll", "parameters": {"session_id": "session_123", "direction": "down"}}
@@ -1614,7 +1840,7 @@ def tool_schemas() -> Dict[str, Any]:
                 "parameters": {
                     "type": "object",
                     "required": ["session_id", "index", "text"],
-                    "properties": {"session_id": {"type": "string"}, "index": {"type": "integer"}, "text": {"type": "string"}},
+                    "properties": {"session_id": {"type": "string"}, "index": {"type": "integer"}, "text": {"type": "string"}, "response_mode": {"type": "string", "enum": ["full", "diff"]}, **SCREENSHOT_SCHEMA_PROPERTIES},
                     "additionalProperties": False
                 },
                 "example": {"tool_name": "select_dropdown_option", "parameters": {"session_id": "session_123", "index": 7, "text": "United States"}}
@@ -0,0 +1,350 @@
+"""
+On-disk cache of static assets shared by browser sessions, enabled with BrowserProfile(asset_cache_dir=...).
+
+Every session launches with its own (often temporary) profile, so the browser's HTTP cache starts empty and
+the same script, stylesheet, font and image bundles of a target site are downloaded again for every session.
+The AssetCache answers those requests from a directory shared by every session that points at it:
+
+- only GET requests for static resource types are considered, keyed on the URL plus the request headers that
+  change the response (see KEY_HEADERS). Requests carrying a Cookie or Authorization header are never looked up
+  nor stored, a response to them may be personalised even when it claims to be cacheable
+- responses are stored only if Cache-Control allows a shared cache to (no no-store/private, no Set-Cookie,
+  no Vary on other headers), and served until their max-age/Expires is over
+- stale entries with an ETag or Last-Modified are revalidated with a conditional request, a 304 refreshes them
+- the directory is capped at max_bytes, the least recently used entries are evicted first
+
+Entries are written to temporary files and renamed into place, and the index is guarded by a lock, so
+sessions running concurrently in one process can share a cache. Two sessions missing the same asset at
+the same time both fetch it, the last one to finish wins.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_RESOURCE_TYPES = frozenset({'script', 'stylesheet', 'font', 'image'})
+
+# Request headers that make a request credentialed, their responses are never shared through the cache
+CREDENTIAL_HEADERS = ('cookie', 'authorization')
+
+# Request headers that can change the response of a static asset, part of the cache key. Origin is one of them:
+# CORS responses (fonts, module scripts) often echo it in Access-Control-Allow-Origin, which is replayed
+KEY_HEADERS = ('accept', 'accept-language', 'origin')
+
+# Vary values that don't split the cache: the key already covers them, and bodies are stored decoded
+IGNORED_VARY_HEADERS = frozenset({*KEY_HEADERS, 'accept-encoding'})
+
+# Response headers replayed when an asset is served from the cache
+STORED_HEADERS = (
+	'content-type',
+	'cache-control',
+	'etag',
+	'last-modified',
+	'access-control-allow-origin',
+	'access-control-allow-credentials',
+	'timing-allow-origin',
+)
+
+
+def parse_cache_control(value: str) -> dict[str, str | None]:
+	directives: dict[str, str | None] = {}
+	for part in value.split(','):
+		name, _, argument = part.strip().partition('=')
+		if name:
+			directives[name.lower()] = argument.strip('"') or None
+	return directives
+
+
+def cache_key(url: str, headers: dict[str, str]) -> str:
+	key_headers = '\n'.join(f'{name}:{headers.get(name, "")}' for name in KEY_HEADERS)
+	return hashlib.sha256(f'{url}\n{key_headers}'.encode()).hexdigest()
+
+
+def is_cacheable_request(request: Any, headers: dict[str, str]) -> bool:
+	"""Whether the request may use the cache, headers must come from all_headers() since request.headers omits cookie"""
+	if request.method != 'GET' or request.resource_type not in CACHEABLE_RESOURCE_TYPES:
+		return False
+	if not request.url.startswith(('http://', 'https://')):
+		return False
+	return not any(name in headers for name in CREDENTIAL_HEADERS) and 'range' not in headers
+
+
+def freshness_lifetime(headers: dict[str, str]) -> float | None:
+	"""Seconds a response may be served from a shared cache, None if it must not be stored at all"""
+	directives = parse_cache_control(headers.get('cache-control', ''))
+	if 'no-store' in directives or 'private' in directives:
+		return None
+	if 'set-cookie' in headers:
+		return None
+	vary = {name.strip().lower() for name in headers.get('vary', '').split(',') if name.strip()}
+	if '*' in vary or vary - IGNORED_VARY_HEADERS:
+		return None
+
+	if 'no-cache' in directives:
+		lifetime = 0.0
+	elif (max_age := directives.get('s-maxage') or directives.get('max-age')) is not None:
+		try:
+			lifetime = float(max_age)
+		except ValueError:
+			lifetime = 0.0
+	elif 'expires' in headers:
+		try:
+			expires = parsedate_to_datetime(headers['expires']).timestamp()
+			date = parsedate_to_datetime(headers['date']).timestamp() if 'date' in headers else time.time()
+			lifetime = expires - date
+		except (TypeError, ValueError):
+			lifetime = 0.0
+	else:
+		lifetime = 0.0
+
+	age = headers.get('age', '')
+	lifetime -= float(age) if age.isdigit() else 0.0
+	if lifetime <= 0 and 'etag' not in headers and 'last-modified' not in headers:
+		# would be stale right away and can't be revalidated
+		return None
+	return max(lifetime, 0.0)
+
+
+@dataclass
+class CachedAsset:
+	key: str
+	url: str
+	status: int
+	headers: dict[str, str]
+	expires_at: float
+	size: int
+	last_access: float = 0.0
+
+	@property
+	def is_fresh(self) -> bool:
+		return time.time() < self.expires_at
+
+	def conditional_headers(self) -> dict[str, str]:
+		headers = {}
+		if etag := self.headers.get('etag'):
+			headers['if-none-match'] = etag
+		if last_modified := self.headers.get('last-modified'):
+			headers['if-modified-since'] = last_modified
+		return headers
+
+
+class AssetCache:
+	"""Static assets on disk, shared by every session using the same directory"""
+
+	def __init__(self, directory: Path, max_bytes: int = 512 * 1024 * 1024):
+		self.directory = directory
+		self.max_bytes = max_bytes
+		# a single asset may take at most this share of the cache
+		self.max_entry_bytes = max_bytes // 8
+		self._entries: dict[str, CachedAsset] = {}
+		self._total_bytes = 0
+		self._lock = threading.Lock()
+		self._loaded = False
+		self.hits = 0
+		self.misses = 0
+		self.revalidated = 0
+		self.evictions = 0
+		self.bytes_served = 0
+
+	def _body_path(self, key: str) -> Path:
+		return self.directory / f'{key}.bin'
+
+	def _meta_path(self, key: str) -> Path:
+		return self.directory / f'{key}.json'
+
+	def _load(self) -> None:
+		with self._lock:
+			if self._loaded:
+				return
+			self._loaded = True
+			if not self.directory.exists():
+				return
+			for meta_path in self.directory.glob('*.json'):
+				try:
+					entry = CachedAsset(**json.loads(meta_path.read_text()))
+					entry.last_access = self._body_path(entry.key).stat().st_mtime
+				except Exception as e:
+					logger.debug(f'Ignoring unreadable asset cache entry {meta_path.name}: {type(e).__name__}: {e}')
+					continue
+				self._entries[entry.key] = entry
+				self._total_bytes += entry.size
+
+	def get(self, key: str) -> CachedAsset | None:
+		self._load()
+		with self._lock:
+			return self._entries.get(key)
+
+	def read_body(self, entry: CachedAsset) -> bytes | None:
+		"""The stored body, None if the entry was evicted in the meantime"""
+		try:
+			body = self._body_path(entry.key).read_bytes()
+		except FileNotFoundError:
+			return None
+		entry.last_access = time.time()
+		try:
+			# persist the access time for the LRU order after a restart
+			os.utime(self._body_path(entry.key))
+		except OSError:
+			pass
+		return body
+
+	def store(self, url: str, key: str, status: int, headers: dict[str, str], body: bytes, lifetime: float) -> bool:
+		if len(body) > self.max_entry_bytes:
+			return False
+		self._load()
+		entry = CachedAsset(
+			key=key,
+			url=url,
+			status=status,
+			headers={name: headers[name] for name in STORED_HEADERS if name in headers},
+			expires_at=time.time() + lifetime,
+			size=len(body),
+			last_access=time.time(),
+		)
+		try:
+			self.directory.mkdir(parents=True, exist_ok=True)
+			self._write_atomic(self._body_path(key), body)
+			self._write_atomic(self._meta_path(key), json.dumps(asdict(entry)).encode())
+		except OSError as e:
+			logger.debug(f'Failed to store {url[:100]} in the asset cache: {type(e).__name__}: {e}')
+			return False
+
+		with self._lock:
+			previous = self._entries.get(key)
+			self._total_bytes += entry.size - (previous.size if previous else 0)
+			self._entries[key] = entry
+			evicted = self._evict_locked(keep=key)
+		for stale in evicted:
+			self._remove_files(stale)
+		return True
+
+	def refresh(self, entry: CachedAsset, headers: dict[str, str]) -> None:
+		"""Extend an entry after a 304, with the freshness the revalidation response carries"""
+		merged = {**entry.headers, **{name: headers[name] for name in STORED_HEADERS if name in headers}}
+		lifetime = freshness_lifetime({**merged, **headers})
+		entry.headers = merged
+		entry.expires_at = time.time() + (lifetime or 0.0)
+		try:
+			self._write_atomic(self._meta_path(entry.key), json.dumps(asdict(entry)).encode())
+		except OSError as e:
+			logger.debug(f'Failed to refresh {entry.url[:100]} in the asset cache: {type(e).__name__}: {e}')
+
+	def _evict_locked(self, keep: str) -> list[str]:
+		evicted = []
+		if self._total_bytes <= self.max_bytes:
+			return evicted
+		for entry in sorted(self._entries.values(), key=lambda e: e.last_access):
+			if self._total_bytes <= self.max_bytes:
+				break
+			if entry.key == keep:
+				continue
+			del self._entries[entry.key]
+			self._total_bytes -= entry.size
+			self.evictions += 1
+			evicted.append(entry.key)
+		return evicted
+
+	def _remove_files(self, key: str) -> None:
+		for path in (self._meta_path(key), self._body_path(key)):
+			try:
+				path.unlink()
+			except FileNotFoundError:
+				pass
+
+	@staticmethod
+	def _write_atomic(path: Path, data: bytes) -> None:
+		tmp_path = path.with_name(f'{path.name}.{uuid.uuid4().hex}.tmp')
+		tmp_path.write_bytes(data)
+		tmp_path.replace(path)
+
+	async def handle(self, route: Any) -> bool:
+		"""Serve the routed request from the cache or fetch and store it, returns False if it should continue"""
+		request = route.request
+		if request.method != 'GET' or request.resource_type not in CACHEABLE_RESOURCE_TYPES:
+			# all_headers() is a round trip to the browser, skip it for requests that can't be cached anyway
+			return False
+		headers = await request.all_headers()
+		if not is_cacheable_request(request, headers):
+			return False
+
+		key = cache_key(request.url, headers)
+		entry = await asyncio.to_thread(self.get, key)
+		if entry and entry.is_fresh and await self._fulfill_from_cache(route, entry):
+			return True
+
+		try:
+			if entry:
+				response = await route.fetch(headers={**headers, **entry.conditional_headers()})
+				if response.status == 304:
+					await asyncio.to_thread(self.refresh, entry, response.headers)
+					if await self._fulfill_from_cache(route, entry):
+						self.revalidated += 1
+						return True
+					response = await route.fetch()
+			else:
+				response = await route.fetch()
+			body = await response.body()
+		except Exception as e:
+			# let the browser load it the normal way
+			logger.debug(f'Asset cache fetch failed for {request.url[:100]}: {type(e).__name__}: {e}')
+			return False
+
+		self.misses += 1
+		if response.status == 200 and (lifetime := freshness_lifetime(response.headers)) is not None:
+			await asyncio.to_thread(self.store, request.url, key, response.status, response.headers, body, lifetime)
+		try:
+			await route.fulfill(response=response, body=body)
+		except Exception as e:
+			logger.debug(f'Failed to fulfill {request.url[:100]}: {type(e).__name__}: {e}')
+		return True
+
+	async def _fulfill_from_cache(self, route: Any, entry: CachedAsset) -> bool:
+		body = await asyncio.to_thread(self.read_body, entry)
+		if body is None:
+			return False
+		self.hits += 1
+		self.bytes_served += len(body)
+		try:
+			await route.fulfill(status=entry.status, headers=entry.headers, body=body)
+		except Exception as e:
+			logger.debug(f'Failed to fulfill {entry.url[:100]} from the asset cache: {type(e).__name__}: {e}')
+		return True
+
+	def stats(self) -> dict[str, Any]:
+		with self._lock:
+			entries, total_bytes = len(self._entries), self._total_bytes
+		return {
+			'entries': entries,
+			'bytes': total_bytes,
+			'max_bytes': self.max_bytes,
+			'hits': self.hits,
+			'misses': self.misses,
+			'revalidated': self.revalidated,
+			'evictions': self.evictions,
+			'bytes_served': self.bytes_served,
+		}
+
+
+_caches: dict[Path, AssetCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_asset_cache(directory: Path, max_bytes: int = 512 * 1024 * 1024) -> AssetCache:
+	"""The cache for a directory, shared by every session using it"""
+	directory = directory.expanduser().resolve()
+	with _caches_lock:
+		cache = _caches.get(directory)
+		if cache is None:
+			cache = _caches[directory] = AssetCache(directory, max_bytes)
+		return cache
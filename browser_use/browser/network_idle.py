@@ -0,0 +1,424 @@
+"""
+Network idle detection for page loads, with per-domain settle profiles learned from previous navigations.
+
+BrowserSession._wait_for_stable_network waits until no relevant request has been pending for an idle
+window, capped at maximum_wait_page_load_time. With adaptive_network_idle enabled, each navigation is
+also recorded in the domain's SettleProfile:
+
+- the longest silence after which requests started again: once a domain has enough samples, its idle
+  window shrinks to a margin above that gap (never above the configured window), so fast sites stop
+  paying the full wait_for_network_idle_page_load_time on every load
+- the xhr/fetch requests still pending when the maximum wait was hit: endpoints caught doing this
+  repeatedly are long polls, and are ignored on later loads instead of holding every navigation to the
+  maximum wait. Their strikes decay whenever the endpoint completes within a load, and documents, scripts,
+  stylesheets etc. never get strikes, a slow page or bundle is waited for no matter how often it timed out
+
+Adaptive loads also wait for xhr/fetch requests (the data many pages render from), since long polls among
+them are learned and ignored. Without adaptive_network_idle only page resources are waited for, and so is
+the first load of a domain without a profile: the xhr/fetch requests it leaves pending once the page settled
+are taken for long polls, so its profile starts out ignoring them instead of learning them from timeouts.
+
+Profiles are kept in a small JSON file (see SettleProfileStore) so they survive restarts.
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+RELEVANT_RESOURCE_TYPES = frozenset({'document', 'stylesheet', 'image', 'font', 'script', 'iframe'})
+# Requests that can be long polls, waited for (and learned) with adaptive_network_idle only
+LONG_POLL_RESOURCE_TYPES = frozenset({'xhr', 'fetch'})
+
+RELEVANT_CONTENT_TYPES = ('text/html', 'text/css', 'application/javascript', 'image/', 'font/', 'application/json')
+
+STREAMING_CONTENT_TYPES = ('streaming', 'video', 'audio', 'webm', 'mp4', 'event-stream', 'websocket', 'protobuf')
+
+IGNORED_URL_PATTERNS = (
+	# Analytics and tracking
+	'analytics',
+	'tracking',
+	'telemetry',
+	'beacon',
+	'metrics',
+	# Ad-related
+	'doubleclick',
+	'adsystem',
+	'adserver',
+	'advertising',
+	# Social media widgets
+	'facebook.com/plugins',
+	'platform.twitter',
+	'linkedin.com/embed',
+	# Live chat and support
+	'livechat',
+	'zendesk',
+	'intercom',
+	'crisp.chat',
+	'hotjar',
+	# Push notifications
+	'push-notifications',
+	'onesignal',
+	'pushwoosh',
+	# Background sync/heartbeat
+	'heartbeat',
+	'ping',
+	'alive',
+	# WebRTC and streaming
+	'webrtc',
+	'rtmp://',
+	'wss://',
+	# Common CDNs for dynamic content
+	'cloudfront.net',
+	'fastly.net',
+)
+
+# One alternation instead of a substring scan per pattern for every request
+IGNORED_URL_RE = re.compile('|'.join(re.escape(pattern) for pattern in IGNORED_URL_PATTERNS))
+
+# Samples a domain needs before its idle window is shortened
+MIN_SAMPLES_TO_ADAPT = 3
+# Every Nth navigation of a domain uses the full idle window, to notice sites that got slower
+CALIBRATION_INTERVAL = 10
+# Learned idle window = longest observed silence before more requests x margin, at least MIN_IDLE_WINDOW
+IDLE_WINDOW_MARGIN = 2.0
+MIN_IDLE_WINDOW = 0.15
+# Times an endpoint has to be caught pending at the maximum wait before it is treated as a long poll
+LONG_POLL_STRIKES = 2
+MAX_LONG_POLL_ENDPOINTS = 20
+# Seconds the store waits to batch profile updates into one write
+SAVE_DELAY = 2.0
+
+
+def endpoint_key(url: str) -> str:
+	"""Host and path of a request URL, without the query string (which usually carries cursors/timestamps)"""
+	parsed = urlparse(url)
+	return f'{parsed.netloc}{parsed.path}'
+
+
+def domain_key(url: str) -> str | None:
+	host = urlparse(url).hostname
+	return host.lower() if host else None
+
+
+def is_relevant_request(request: Any, include_api_requests: bool = False) -> bool:
+	"""Whether a request should hold up the page load (xhr/fetch only with include_api_requests)"""
+	if request.resource_type not in RELEVANT_RESOURCE_TYPES and not (
+		include_api_requests and request.resource_type in LONG_POLL_RESOURCE_TYPES
+	):
+		return False
+
+	url = request.url.lower()
+	# Filter out data URLs and blob URLs
+	if url.startswith(('data:', 'blob:')):
+		return False
+	if IGNORED_URL_RE.search(url):
+		return False
+
+	# Filter out requests with certain headers
+	headers = request.headers
+	if headers.get('purpose') == 'prefetch' or headers.get('sec-fetch-dest') in ('video', 'audio'):
+		return False
+	return True
+
+
+def is_relevant_response(response: Any) -> bool:
+	"""Whether the response of a pending request counts as page activity, as opposed to a stream or large download"""
+	content_type = response.headers.get('content-type', '').lower()
+
+	# Skip if content type indicates streaming or real-time data
+	if any(t in content_type for t in STREAMING_CONTENT_TYPES):
+		return False
+
+	# Only process relevant content types
+	if not any(ct in content_type for ct in RELEVANT_CONTENT_TYPES):
+		return False
+
+	# Skip if response is too large (likely not essential for page load)
+	content_length = response.headers.get('content-length')
+	if content_length and content_length.isdigit() and int(content_length) > 5 * 1024 * 1024:  # 5MB
+		return False
+	return True
+
+
+@dataclass
+class SettleProfile:
+	"""What previous page loads of one domain looked like"""
+
+	samples: int = 0
+	max_quiet_gap: float = 0.0  # longest silence observed before requests started again
+	# xhr/fetch endpoint -> times it was pending at the maximum wait, minus the times it completed
+	long_poll_strikes: dict[str, int] = field(default_factory=dict)
+
+	@property
+	def long_poll_endpoints(self) -> set[str]:
+		return {endpoint for endpoint, strikes in self.long_poll_strikes.items() if strikes >= LONG_POLL_STRIKES}
+
+	def idle_window(self, configured: float) -> float:
+		"""Silence needed before the network counts as idle, never more than the configured window"""
+		if self.samples < MIN_SAMPLES_TO_ADAPT or self.samples % CALIBRATION_INTERVAL == 0:
+			return configured
+		return min(configured, max(MIN_IDLE_WINDOW, self.max_quiet_gap * IDLE_WINDOW_MARGIN))
+
+	def record(
+		self,
+		max_quiet_gap: float,
+		timed_out_endpoints: set[str],
+		completed_endpoints: set[str] | None = None,
+		long_poll_endpoints: set[str] | None = None,
+	) -> None:
+		self.samples += 1
+		self.max_quiet_gap = max(self.max_quiet_gap, max_quiet_gap)
+		for endpoint in timed_out_endpoints:
+			self.long_poll_strikes[endpoint] = self.long_poll_strikes.get(endpoint, 0) + 1
+		for endpoint in long_poll_endpoints or set():
+			# already known to outlast a page load, ignored until it completes within one
+			self.long_poll_strikes[endpoint] = max(self.long_poll_strikes.get(endpoint, 0), LONG_POLL_STRIKES)
+		for endpoint in (completed_endpoints or set()) - timed_out_endpoints:
+			# it answered within a page load, whatever held it up before wasn't a long poll
+			strikes = self.long_poll_strikes.pop(endpoint, 0) - 1
+			if strikes > 0:
+				self.long_poll_strikes[endpoint] = strikes
+		if len(self.long_poll_strikes) > MAX_LONG_POLL_ENDPOINTS:
+			# keep the most confirmed endpoints
+			strongest = sorted(self.long_poll_strikes.items(), key=lambda item: item[1], reverse=True)
+			self.long_poll_strikes = dict(strongest[:MAX_LONG_POLL_ENDPOINTS])
+
+
+class SettleProfileStore:
+	"""
+	Per-domain settle profiles, persisted as JSON.
+
+	Updates made on an event loop are written SAVE_DELAY seconds later in a worker thread, batched with the
+	updates made meanwhile; anything still unwritten is flushed at exit.
+	"""
+
+	def __init__(self, path: Path | None = None, max_domains: int = 500):
+		self.path = path
+		self.max_domains = max_domains
+		self._profiles: dict[str, SettleProfile] = {}
+		self._loaded = False
+		self._dirty = False
+		self._save_handle: asyncio.TimerHandle | None = None
+		self._write_lock = threading.Lock()
+		if path:
+			atexit.register(self.flush)
+
+	def get(self, domain: str) -> SettleProfile | None:
+		"""The profile of a domain, None until a load of it was recorded"""
+		self._load()
+		return self._profiles.get(domain)
+
+	def record(
+		self,
+		domain: str,
+		max_quiet_gap: float,
+		timed_out_endpoints: set[str],
+		completed_endpoints: set[str] | None = None,
+		long_poll_endpoints: set[str] | None = None,
+	) -> None:
+		self._load()
+		profile = self._profiles.setdefault(domain, SettleProfile())
+		profile.record(max_quiet_gap, timed_out_endpoints, completed_endpoints, long_poll_endpoints)
+		if len(self._profiles) > self.max_domains:
+			# drop the least visited domains
+			others = sorted((d for d in self._profiles if d != domain), key=lambda d: self._profiles[d].samples)
+			for stale in others[: len(self._profiles) - self.max_domains]:
+				del self._profiles[stale]
+		self._schedule_save()
+
+	def _load(self) -> None:
+		if self._loaded:
+			return
+		self._loaded = True
+		if not self.path or not self.path.exists():
+			return
+		try:
+			data = json.loads(self.path.read_text())
+			# fields dropped from SettleProfile may still be in older files
+			known = {f.name for f in fields(SettleProfile)}
+			self._profiles = {
+				domain: SettleProfile(**{key: value for key, value in profile.items() if key in known})
+				for domain, profile in data.items()
+			}
+		except Exception as e:
+			logger.debug(f'Ignoring unreadable network settle profiles at {self.path}: {type(e).__name__}: {e}')
+
+	def flush(self) -> None:
+		"""Write pending updates now"""
+		if self._save_handle is not None:
+			self._save_handle.cancel()
+			self._save_handle = None
+		if self._dirty:
+			self._write(self._snapshot())
+
+	def _schedule_save(self) -> None:
+		if not self.path:
+			return
+		self._dirty = True
+		try:
+			loop = asyncio.get_running_loop()
+		except RuntimeError:
+			self.flush()
+			return
+		if self._save_handle is None:
+			self._save_handle = loop.call_later(SAVE_DELAY, self._save_in_background)
+
+	def _save_in_background(self) -> None:
+		self._save_handle = None
+		if self._dirty:
+			asyncio.get_running_loop().run_in_executor(None, self._write, self._snapshot())
+
+	def _snapshot(self) -> dict[str, Any]:
+		# copied on the loop, the profiles keep changing while the worker thread writes
+		self._dirty = False
+		return {domain: asdict(profile) for domain, profile in self._profiles.items()}
+
+	def _write(self, data: dict[str, Any]) -> None:
+		if not self.path:
+			return
+		with self._write_lock:
+			try:
+				self.path.parent.mkdir(parents=True, exist_ok=True)
+				tmp_path = self.path.with_suffix('.tmp')
+				tmp_path.write_text(json.dumps(data))
+				tmp_path.replace(self.path)
+			except Exception as e:
+				logger.debug(f'Failed to save network settle profiles to {self.path}: {type(e).__name__}: {e}')
+
+
+_stores: dict[Path | None, SettleProfileStore] = {}
+
+
+def get_settle_profile_store(path: Path | None) -> SettleProfileStore:
+	"""The store for a profiles file, shared by every session using it"""
+	store = _stores.get(path)
+	if store is None:
+		store = _stores[path] = SettleProfileStore(path)
+	return store
+
+
+@dataclass
+class NetworkIdleResult:
+	idle: bool  # False if the maximum wait was hit first
+	elapsed: float
+	max_quiet_gap: float  # longest silence before requests started again
+	pending_urls: list[str]
+	pending_poll_endpoints: set[str] = field(default_factory=set)  # xhr/fetch endpoints among pending_urls
+	completed_poll_endpoints: set[str] = field(default_factory=set)  # xhr/fetch endpoints that got a response
+	unwaited_poll_endpoints: set[str] = field(default_factory=set)  # watched xhr/fetch endpoints still pending at the end
+
+
+class NetworkIdleWatcher:
+	"""
+	Tracks the relevant requests of a page and wakes on request/response events instead of polling.
+
+	Attach on_request, on_response and on_request_failed to the page's request, response and requestfailed
+	events, then await watcher.wait(idle_window, max_wait). With include_api_requests, xhr/fetch requests
+	are waited for too, except those to ignored_endpoints (which are still watched, to notice them completing).
+	With watch_api_requests, xhr/fetch requests that aren't waited for are watched all the same.
+	"""
+
+	def __init__(
+		self, ignored_endpoints: set[str] | None = None, include_api_requests: bool = False, watch_api_requests: bool = False
+	):
+		self.ignored_endpoints = ignored_endpoints or set()
+		self.include_api_requests = include_api_requests
+		self.watch_api_requests = watch_api_requests or include_api_requests
+		self.pending: dict[Any, str] = {}  # request -> url
+		self.ignored_pending: dict[Any, str] = {}  # request -> endpoint, for requests to ignored endpoints
+		self.completed_poll_endpoints: set[str] = set()
+		self.last_activity = time.monotonic()
+		self.quiet_since: float | None = self.last_activity
+		self.max_quiet_gap = 0.0
+		self._activity = asyncio.Event()
+
+	def on_request(self, request: Any) -> None:
+		if not is_relevant_request(request, self.watch_api_requests):
+			return
+		if not self.include_api_requests and request.resource_type in LONG_POLL_RESOURCE_TYPES:
+			self.ignored_pending[request] = endpoint_key(request.url)
+			return
+		if self.ignored_endpoints:
+			endpoint = endpoint_key(request.url)
+			if endpoint in self.ignored_endpoints:
+				self.ignored_pending[request] = endpoint
+				return
+		now = time.monotonic()
+		if not self.pending and self.quiet_since is not None:
+			self.max_quiet_gap = max(self.max_quiet_gap, now - self.quiet_since)
+		self.pending[request] = request.url
+		self.quiet_since = None
+		self.last_activity = now
+		self._activity.set()
+
+	def on_response(self, response: Any) -> None:
+		request = response.request
+		ignored_endpoint = self.ignored_pending.pop(request, None)
+		if ignored_endpoint is not None:
+			self.completed_poll_endpoints.add(ignored_endpoint)
+			return
+		if request not in self.pending:
+			return
+		url = self.pending.pop(request)
+		if request.resource_type in LONG_POLL_RESOURCE_TYPES:
+			self.completed_poll_endpoints.add(endpoint_key(url))
+		if is_relevant_response(response):
+			self.last_activity = time.monotonic()
+		if not self.pending:
+			self.quiet_since = time.monotonic()
+		self._activity.set()
+
+	def on_request_failed(self, request: Any) -> None:
+		"""Requests that failed or were aborted never get a response"""
+		self.ignored_pending.pop(request, None)
+		if self.pending.pop(request, None) is not None and not self.pending:
+			self.quiet_since = time.monotonic()
+			self._activity.set()
+
+	async def wait(self, idle_window: float, max_wait: float) -> NetworkIdleResult:
+		start = time.monotonic()
+		deadline = start + max_wait
+		while True:
+			now = time.monotonic()
+			if not self.pending and now - self.last_activity >= idle_window:
+				return NetworkIdleResult(
+					True,
+					now - start,
+					self.max_quiet_gap,
+					[],
+					completed_poll_endpoints=set(self.completed_poll_endpoints),
+					unwaited_poll_endpoints=set(self.ignored_pending.values()),
+				)
+			if now >= deadline:
+				pending_poll_endpoints = {
+					endpoint_key(url)
+					for request, url in self.pending.items()
+					if request.resource_type in LONG_POLL_RESOURCE_TYPES
+				}
+				return NetworkIdleResult(
+					False,
+					now - start,
+					self.max_quiet_gap,
+					list(self.pending.values()),
+					pending_poll_endpoints=pending_poll_endpoints,
+					completed_poll_endpoints=set(self.completed_poll_endpoints),
+					unwaited_poll_endpoints=set(self.ignored_pending.values()),
+				)
+
+			# sleep until the idle window would be over, or until the next request/response
+			wake_at = deadline if self.pending else min(deadline, self.last_activity + idle_window)
+			self._activity.clear()
+			try:
+				await asyncio.wait_for(self._activity.wait(), timeout=max(0.0, wake_at - now))
+			except TimeoutError:
+				pass
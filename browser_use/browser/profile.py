@@ -10,6 +10,7 @@ from urllib.parse import urlparse
 from pydantic import AfterValidator, AliasChoices, BaseModel, ConfigDict, Field, model_validator
 from uuid_extensions import uuid7str
 
+from browser_use.browser.resource_policy import ResourcePolicy
 from browser_use.browser.types import ClientCertificate, Geolocation, HttpCredentials, ProxySettings, ViewportSize
 from browser_use.config import CONFIG
 from browser_use.observability import observe_debug
@@ -584,11 +585,50 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	wait_for_network_idle_page_load_time: float = Field(default=0.5, description='Time to wait for network idle.')
 	maximum_wait_page_load_time: float = Field(default=5.0, description='Maximum time to wait for page load.')
 	wait_between_actions: float = Field(default=0.5, description='Time to wait between actions.')
+	adaptive_network_idle: bool = Field(
+		default=False,
+		description='Learn per-domain network settle times and long-poll endpoints from previous page loads to shorten the network idle wait.',
+	)
+	network_settle_profiles_path: str | Path | None = Field(
+		default=None,
+		description='JSON file the learned network settle profiles are kept in, defaults to network_settle_profiles.json in the config dir.',
+	)
+	resource_policy: ResourcePolicy | None = Field(
+		default=None,
+		description='Requests to block in every page (by resource type, URL pattern or domain), e.g. ResourcePolicy.form_filling().',
+	)
+	asset_cache_dir: str | Path | None = Field(
+		default=None,
+		description='Directory of an on-disk cache for static assets (scripts, stylesheets, fonts, images) shared by every session using it, None to disable.',
+	)
+	asset_cache_max_bytes: int = Field(
+		default=512 * 1024 * 1024,
+		description='Size cap of the asset cache directory, least recently used assets are evicted first.',
+	)
+	page_health_cache_ttl: float = Field(
+		default=1.0,
+		description='Seconds a page responsiveness check is reused for the same page and navigation, 0 to check before every call.',
+	)
 
 	# --- UI/viewport/DOM ---
 	include_dynamic_attributes: bool = Field(default=True, description='Include dynamic attributes in selectors.')
 	highlight_elements: bool = Field(default=True, description='Highlight interactive elements on the page.')
 	viewport_expansion: int = Field(default=500, description='Viewport expansion in pixels for LLM context.')
+	incremental_dom_snapshots: bool = Field(
+		default=False,
+		description='Keep a node registry in the page and only transfer DOM nodes that changed since the last state.',
+	)
+	packed_dom_wire_format: bool = Field(
+		default=False,
+		description='Transfer the DOM node map as columnar arrays with a shared string table instead of per-node objects.',
+	)
+	concurrent_state_capture: bool = Field(
+		default=False, description='Capture the DOM, tabs, page info, scroll info and title of a browser state concurrently.'
+	)
+	state_probe_timeout: float = Field(
+		default=5.0,
+		description='Seconds each small browser state probe (tabs, page info, scroll info, title) may take before it is skipped.',
+	)
 
 	profile_directory: str = 'Default'  # e.g. 'Profile 1', 'Profile 2', 'Custom Profile', etc.
 
@@ -0,0 +1,176 @@
+"""
+Blocking of heavy resources a workload doesn't need, configured with BrowserProfile(resource_policy=...).
+
+Form filling and extraction don't need analytics, ads, fonts or media, but every navigation downloads
+them and the network idle wait waits for them. A ResourcePolicy blocks requests by resource type, URL
+glob pattern and domain (including subdomains). Blocked images can be answered with a 1x1 transparent
+PNG instead of an error, so layouts and onload handlers keep working.
+
+The policy is installed once per browser context with context.route(). Note that Playwright disables
+the HTTP cache for contexts with routes, so only enable it when the blocked traffic outweighs that.
+"""
+
+import base64
+import fnmatch
+import logging
+import re
+from typing import Any
+from urllib.parse import urlparse
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+logger = logging.getLogger(__name__)
+
+# 1x1 transparent PNG answered for blocked images when image_placeholder=True
+PLACEHOLDER_IMAGE = base64.b64decode(
+	'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=='
+)
+
+# Rough typical transfer size per resource type, used to estimate the bytes a blocked request saved
+# (the real size is unknown since the request never happens)
+ESTIMATED_RESOURCE_BYTES = {
+	'image': 40_000,
+	'media': 500_000,
+	'font': 30_000,
+	'script': 25_000,
+	'stylesheet': 15_000,
+	'xhr': 2_000,
+	'fetch': 2_000,
+	'other': 5_000,
+}
+
+# Analytics, ads and tracking hosts that never matter for what the agent does on a page
+TRACKING_DOMAINS = [
+	'google-analytics.com',
+	'googletagmanager.com',
+	'googlesyndication.com',
+	'googleadservices.com',
+	'doubleclick.net',
+	'adservice.google.com',
+	'facebook.net',
+	'hotjar.com',
+	'segment.io',
+	'segment.com',
+	'mixpanel.com',
+	'amplitude.com',
+	'fullstory.com',
+	'clarity.ms',
+	'newrelic.com',
+	'nr-data.net',
+	'optimizely.com',
+	'criteo.com',
+	'taboola.com',
+	'outbrain.com',
+]
+
+
+class ResourcePolicy(BaseModel):
+	"""Which requests to block in every page of the browser context"""
+
+	model_config = ConfigDict(extra='forbid')
+
+	block_resource_types: set[str] = Field(
+		default_factory=set, description='Playwright resource types to block, e.g. image, media, font, stylesheet.'
+	)
+	block_url_patterns: list[str] = Field(
+		default_factory=list, description='Glob patterns matched against the full request URL, e.g. *.mp4 or *://*/ads/*.'
+	)
+	block_domains: list[str] = Field(default_factory=list, description='Block requests to these domains and their subdomains.')
+	image_placeholder: bool = Field(
+		default=False, description='Answer blocked images with a 1x1 transparent PNG instead of failing the request.'
+	)
+
+	@field_validator('block_resource_types')
+	@classmethod
+	def _never_block_documents(cls, value: set[str]) -> set[str]:
+		if 'document' in value:
+			raise ValueError('resource_policy cannot block documents, pages would fail to load')
+		return value
+
+	@classmethod
+	def form_filling(cls) -> 'ResourcePolicy':
+		"""Media, fonts and tracking blocked, images kept since vision models may need them"""
+		return cls(block_resource_types={'media', 'font'}, block_domains=list(TRACKING_DOMAINS))
+
+	@property
+	def is_empty(self) -> bool:
+		return not (self.block_resource_types or self.block_url_patterns or self.block_domains)
+
+
+def is_main_frame_navigation(request: Any) -> bool:
+	"""Whether the request navigates a page's top-level frame"""
+	try:
+		return request.is_navigation_request() and request.frame.parent_frame is None
+	except Exception:
+		# service worker requests have no frame
+		return False
+
+
+class ResourceBlocker:
+	"""Applies a ResourcePolicy to intercepted requests and counts what it blocked"""
+
+	def __init__(self, policy: ResourcePolicy):
+		self.policy = policy
+		self._url_re = (
+			re.compile('|'.join(fnmatch.translate(pattern) for pattern in policy.block_url_patterns), re.IGNORECASE)
+			if policy.block_url_patterns
+			else None
+		)
+		self._domains = frozenset(domain.lower().lstrip('.') for domain in policy.block_domains)
+		self.blocked_requests = 0
+		self.estimated_bytes_saved = 0
+		self.blocked_by_reason: dict[str, int] = {}
+
+	def _is_blocked_domain(self, url: str) -> bool:
+		if not self._domains:
+			return False
+		host = (urlparse(url).hostname or '').lower()
+		# example.com blocks example.com, www.example.com, a.b.example.com
+		while host:
+			if host in self._domains:
+				return True
+			_, _, host = host.partition('.')
+		return False
+
+	def block_reason(self, url: str, resource_type: str, main_frame_navigation: bool = False) -> str | None:
+		"""Why the request is blocked (resource_type, url_pattern or domain), None if it isn't"""
+		if main_frame_navigation:
+			# top-level navigations always go through, even to a blocked domain the agent was asked to visit,
+			# iframe documents (ad and tracker frames) are matched like any other request
+			return None
+		if resource_type in self.policy.block_resource_types:
+			return 'resource_type'
+		if url.startswith(('data:', 'blob:')):
+			return None
+		if self._is_blocked_domain(url):
+			return 'domain'
+		if self._url_re is not None and self._url_re.match(url):
+			return 'url_pattern'
+		return None
+
+	async def handle(self, route: Any) -> bool:
+		"""Block the routed request if the policy says so, returns False if it should continue"""
+		request = route.request
+		reason = self.block_reason(request.url, request.resource_type, is_main_frame_navigation(request))
+		if reason is None:
+			return False
+
+		self.blocked_requests += 1
+		self.blocked_by_reason[reason] = self.blocked_by_reason.get(reason, 0) + 1
+		self.estimated_bytes_saved += ESTIMATED_RESOURCE_BYTES.get(request.resource_type, ESTIMATED_RESOURCE_BYTES['other'])
+		try:
+			if request.resource_type == 'image' and self.policy.image_placeholder:
+				await route.fulfill(status=200, content_type='image/png', body=PLACEHOLDER_IMAGE)
+			else:
+				await route.abort('blockedbyclient')
+		except Exception as e:
+			# the page may have navigated away or closed in the meantime
+			logger.debug(f'Failed to block {request.url[:100]}: {type(e).__name__}: {e}')
+		return True
+
+	def stats(self) -> dict[str, Any]:
+		return {
+			'blocked_requests': self.blocked_requests,
+			'estimated_bytes_saved': self.estimated_bytes_saved,
+			'blocked_by_reason': dict(self.blocked_by_reason),
+		}
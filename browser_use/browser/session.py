@@ -9,10 +9,11 @@ import re
 import shutil
 import tempfile
 import time
-from dataclasses import dataclass
+import weakref
+from dataclasses import dataclass, field
 from functools import wraps
 from pathlib import Path
-from typing import Any, Self
+from typing import Any, Literal, Self
 from urllib.parse import urlparse
 
 import anyio
@@ -33,10 +34,19 @@ from playwright._impl._api_structures import ViewportSize
 from pydantic import AliasChoices, BaseModel, ConfigDict, Field, InstanceOf, PrivateAttr, model_validator
 from uuid_extensions import uuid7str
 
+from browser_use.browser.asset_cache import AssetCache, get_asset_cache
+from browser_use.browser.network_idle import (
+	NetworkIdleWatcher,
+	SettleProfileStore,
+	domain_key,
+	get_settle_profile_store,
+)
 from browser_use.browser.profile import BROWSERUSE_DEFAULT_CHANNEL, BrowserChannel, BrowserProfile
+from browser_use.browser.resource_policy import ResourceBlocker, ResourcePolicy
 from browser_use.browser.types import (
 	Browser,
 	BrowserContext,
+	CDPSession,
 	ElementHandle,
 	FrameLocator,
 	Page,
@@ -50,6 +60,7 @@ from browser_use.browser.views import (
 	BrowserError,
 	BrowserStateSummary,
 	PageInfo,
+	PageMetrics,
 	TabInfo,
 	URLNotAllowedError,
 )
@@ -57,7 +68,7 @@ from browser_use.browser.views import (
 # Lazy imports for heavy DOM services to improve startup time
 # from browser_use.dom.clickable_element_processor.service import ClickableElementProcessor
 # from browser_use.dom.service import DomService
-from browser_use.dom.views import DOMElementNode, SelectorMap
+from browser_use.dom.views import DOMElementNode, DOMState, SelectorMap
 from browser_use.utils import (
 	is_new_tab_page,
 	match_url_with_domain_pattern,
@@ -151,9 +162,11 @@ def require_healthy_browser(usable_page=True, reopen_page=True):
 						# self.logger.debug('Skipping responsiveness check for about:blank page')
 						return await func(self, *args, **kwargs)
 
-					# Check if page is responsive
+					# Check if page is responsive, reusing a recent check of the same page and navigation
 					# self.logger.debug(f'Checking page responsiveness for {func.__name__}...')
-					if await self._is_page_responsive(self.agent_current_page):
+					if self._page_health.is_fresh(self.agent_current_page) or await self._probe_page_health(
+						self.agent_current_page
+					):
 						# self.logger.debug('✅ Confirmed page is responsive')
 						pass
 					else:
@@ -195,6 +208,26 @@ def require_healthy_browser(usable_page=True, reopen_page=True):
 	return decorator
 
 
+# Everything get_page_metrics needs from the page, read in a single evaluation
+PAGE_METRICS_JS = """() => {
+	const root = document.documentElement;
+	const body = document.body;
+	const url = window.location.href.toLowerCase();
+	// Chrome's built-in PDF viewer, or a URL / document that is a PDF
+	const pdfEmbed = document.querySelector('embed[type="application/x-google-chrome-pdf"], embed[type="application/pdf"]');
+	return {
+		viewport_width: window.innerWidth,
+		viewport_height: window.innerHeight,
+		page_width: Math.max(root ? root.scrollWidth : 0, body ? body.scrollWidth : 0),
+		page_height: Math.max(root ? root.scrollHeight : 0, body ? body.scrollHeight : 0),
+		scroll_x: window.scrollX || window.pageXOffset || (root && root.scrollLeft) || 0,
+		scroll_y: window.scrollY || window.pageYOffset || (root && root.scrollTop) || 0,
+		title: document.title,
+		content_type: document.contentType,
+		is_pdf_viewer: !!pdfEmbed || url.includes('.pdf') || document.contentType === 'application/pdf',
+	};
+}"""
+
 DEFAULT_BROWSER_PROFILE = BrowserProfile()
 
 
@@ -208,6 +241,186 @@ class CachedClickableElementHashes:
 	hashes: set[str]
 
 
+@dataclass
+class PageHealthCache:
+	"""
+	Recent successful page responsiveness checks, by page and navigation.
+
+	A page that answered the last check is trusted for ttl seconds, until it navigates, crashes or closes.
+	"""
+
+	ttl: float = 1.0
+	probes: int = 0  # checks that ran page.evaluate('1')
+	hits: int = 0  # checks answered from the cache
+	_navigation_ids: weakref.WeakKeyDictionary = field(default_factory=weakref.WeakKeyDictionary, repr=False)
+	_checked: weakref.WeakKeyDictionary = field(default_factory=weakref.WeakKeyDictionary, repr=False)
+
+	def is_fresh(self, page: Page) -> bool:
+		checked = self._checked.get(page)
+		if checked is None or page.is_closed():
+			return False
+		navigation_id, checked_at = checked
+		if navigation_id != self._navigation_ids.get(page) or time.monotonic() - checked_at > self.ttl:
+			return False
+		self.hits += 1
+		return True
+
+	def mark_responsive(self, page: Page) -> None:
+		if self.ttl <= 0:
+			return
+		if page not in self._navigation_ids:
+			self._watch(page)
+		self._checked[page] = (self._navigation_ids[page], time.monotonic())
+
+	def invalidate(self, page: Page | None = None) -> None:
+		if page is None:
+			self._checked.clear()
+		else:
+			self._checked.pop(page, None)
+
+	def stats(self) -> dict[str, int]:
+		return {'probes': self.probes, 'hits': self.hits}
+
+	def _watch(self, page: Page) -> None:
+		self._navigation_ids[page] = 0
+
+		def on_frame_navigated(frame) -> None:
+			if frame == page.main_frame:
+				self._navigation_ids[page] = self._navigation_ids.get(page, 0) + 1
+				self.invalidate(page)
+
+		page.on('framenavigated', on_frame_navigated)
+		page.on('crash', lambda _: self.invalidate(page))
+		page.on('close', lambda _: self.invalidate(page))
+
+
+@dataclass
+class CDPSessionPool:
+	"""
+	One attached CDP session per page, attached on first use and reused until the page closes or crashes.
+
+	Attaching a CDP session is a round-trip to the browser, so screenshots, scroll gestures and any other
+	raw CDP commands share the page's session instead of attaching and detaching one per call.
+	"""
+
+	created: int = 0  # sessions attached
+	reused: int = 0  # calls served by an already attached session
+	_sessions: weakref.WeakKeyDictionary = field(default_factory=weakref.WeakKeyDictionary, repr=False)
+	_locks: weakref.WeakKeyDictionary = field(default_factory=weakref.WeakKeyDictionary, repr=False)
+	_browser_session: CDPSession | None = field(default=None, repr=False)
+	_browser_lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+	_watched_pages: weakref.WeakSet = field(default_factory=weakref.WeakSet, repr=False)
+	_detaching: set[asyncio.Task] = field(default_factory=set, repr=False)
+
+	async def get(self, page: Page) -> CDPSession:
+		"""The page's CDP session, attaching it if needed"""
+		cdp_session = self._sessions.get(page)
+		if cdp_session is not None:
+			self.reused += 1
+			return cdp_session
+
+		lock = self._locks.setdefault(page, asyncio.Lock())
+		async with lock:
+			# another caller may have attached it while we waited
+			cdp_session = self._sessions.get(page)
+			if cdp_session is not None:
+				self.reused += 1
+				return cdp_session
+			cdp_session = await page.context.new_cdp_session(page)  # type: ignore
+			self._sessions[page] = cdp_session
+			self.created += 1
+			if page not in self._watched_pages:
+				# once per page, it may be re-attached after a failed command
+				self._watched_pages.add(page)
+				page.on('close', lambda _: self.discard(page, detach=False))
+				page.on('crash', lambda _: self.discard(page, detach=False))
+			return cdp_session
+
+	async def send(self, page: Page, method: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+		"""Send a CDP command to the page through its pooled session"""
+		cdp_session = await self.get(page)
+		try:
+			return await cdp_session.send(method, params or {})  # type: ignore
+		except Exception:
+			# the session may be detached or the target gone, attach a fresh one next time
+			self.discard(page)
+			raise
+
+	async def get_browser_session(self, browser: Browser) -> CDPSession:
+		"""A browser-level CDP session (Target.*, Browser.* commands), attached on first use"""
+		cdp_session = self._browser_session
+		if cdp_session is not None:
+			self.reused += 1
+			return cdp_session
+
+		async with self._browser_lock:
+			# another caller may have attached it while we waited
+			cdp_session = self._browser_session
+			if cdp_session is not None:
+				self.reused += 1
+				return cdp_session
+			cdp_session = self._browser_session = await browser.new_browser_cdp_session()  # type: ignore
+			self.created += 1
+			return cdp_session
+
+	def discard(self, page: Page | None = None, detach: bool = True) -> None:
+		"""Forget the page's session (or every session), detaching it in the background unless its target is gone"""
+		if page is None:
+			cdp_sessions = list(self._sessions.values())
+			if self._browser_session is not None:
+				cdp_sessions.append(self._browser_session)
+			self._sessions.clear()
+			self._browser_session = None
+		else:
+			cdp_session = self._sessions.pop(page, None)
+			cdp_sessions = [cdp_session] if cdp_session is not None else []
+		if detach:
+			self._detach_in_background(cdp_sessions)
+
+	def discard_browser_session(self) -> None:
+		"""Forget the browser-level session (e.g. after a failed command), detaching it in the background"""
+		cdp_session, self._browser_session = self._browser_session, None
+		if cdp_session is not None:
+			self._detach_in_background([cdp_session])
+
+	async def close(self) -> None:
+		"""Detach every pooled session"""
+		cdp_sessions = list(self._sessions.values())
+		if self._browser_session is not None:
+			cdp_sessions.append(self._browser_session)
+		self.discard(detach=False)
+		await self._detach_all(cdp_sessions)
+		if self._detaching:
+			await asyncio.gather(*self._detaching, return_exceptions=True)
+
+	def _detach_in_background(self, cdp_sessions: list[CDPSession]) -> None:
+		if not cdp_sessions:
+			return
+		try:
+			loop = asyncio.get_running_loop()
+		except RuntimeError:
+			# no event loop left to talk to the browser, the sessions go away with the connection
+			return
+		task = loop.create_task(self._detach_all(cdp_sessions))
+		self._detaching.add(task)
+		task.add_done_callback(self._detaching.discard)
+
+	@staticmethod
+	async def _detach_all(cdp_sessions: list[CDPSession]) -> None:
+		for cdp_session in cdp_sessions:
+			try:
+				await asyncio.wait_for(cdp_session.detach(), timeout=1.0)
+			except Exception:
+				pass
+
+	def stats(self) -> dict[str, int]:
+		return {
+			'attached': len(self._sessions) + (self._browser_session is not None),
+			'created': self.created,
+			'reused': self.reused,
+		}
+
+
 class BrowserSession(BaseModel):
 	"""
 	Represents an active browser session with a running browser process somewhere.
@@ -300,6 +513,12 @@ class BrowserSession(BaseModel):
 	_auto_download_pdfs: bool = PrivateAttr(default=True)  # Auto-download PDFs when detected
 	_subprocess: Any = PrivateAttr(default=None)  # Chrome subprocess reference for error handling
 	_current_page_loading_status: str | None = PrivateAttr(default=None)  # Track loading status for current page
+	_page_health: PageHealthCache = PrivateAttr(default_factory=PageHealthCache)  # Recent responsiveness checks per page
+	_cdp_sessions: CDPSessionPool = PrivateAttr(default_factory=CDPSessionPool)  # Attached CDP session per page
+	_resource_blocker: ResourceBlocker | None = PrivateAttr(default=None)  # Applies browser_profile.resource_policy
+	_asset_cache: AssetCache | None = PrivateAttr(default=None)  # Shared static asset cache, see browser_profile.asset_cache_dir
+	_page_mutations: int = PrivateAttr(default=0)  # Actions run on the pages so far, see note_page_mutation()
+	_routed_context: Any = PrivateAttr(default=None)  # Context the request interception route is installed on
 
 	@model_validator(mode='after')
 	def apply_session_overrides_to_profile(self) -> Self:
@@ -337,6 +556,11 @@ class BrowserSession(BaseModel):
 			self._logger = logging.getLogger(f'browser_use.{self}')
 		return self._logger
 
+	@property
+	def cdp_sessions(self) -> CDPSessionPool:
+		"""Attached CDP session per page, use cdp_sessions.send(page, method, params) to issue raw CDP commands"""
+		return self._cdp_sessions
+
 	def __repr__(self) -> str:
 		is_copy = '©' if self._original_browser_session else '#'
 		port_number_or_pid = (
@@ -407,13 +631,19 @@ class BrowserSession(BaseModel):
 				self._setup_viewports(),
 				self._setup_current_page_change_listeners(),
 				self._start_context_tracing(),
+				self._setup_request_interception(),
 				return_exceptions=True,
 			)
 
 			# Check for exceptions in setup results
 			for i, result in enumerate(setup_results):
 				if isinstance(result, Exception):
-					setup_task_names = ['_setup_viewports', '_setup_current_page_change_listeners', '_start_context_tracing']
+					setup_task_names = [
+						'_setup_viewports',
+						'_setup_current_page_change_listeners',
+						'_start_context_tracing',
+						'_setup_request_interception',
+					]
 					raise Exception(f'Browser setup failed in {setup_task_names[i]}: {result}') from result
 
 			self.initialized = True
@@ -460,6 +690,9 @@ class BrowserSession(BaseModel):
 			)
 			return  # nothing to do if keep_alive=True, leave the browser running
 
+		# Detach our CDP sessions while the connection is still up (a browser we don't own keeps running)
+		await self._cdp_sessions.close()
+
 		# Only the owner can actually stop the browser
 		if not self._owns_browser_resources:
 			self.logger.debug(f'🔗 BrowserSession.stop() called on a copy, not closing shared browser resources {_hint}')
@@ -1461,6 +1694,14 @@ class BrowserSession(BaseModel):
 			else:
 				raise
 
+		# Install the DOM analyzer once per document instead of sending index.js with every state capture
+		try:
+			from browser_use.dom.service import get_dom_runtime_install_js
+
+			await self.browser_context.add_init_script(get_dom_runtime_install_js())
+		except Exception as e:
+			self.logger.debug(f'Failed to register DOM analysis runtime init script, it will be installed on demand: {e}')
+
 		if self.browser_profile.stealth and not isinstance(self.playwright, Patchright):
 			self.logger.warning('⚠️ Failed to set up stealth mode. (...) got normal playwright objects as input.')
 
@@ -1614,6 +1855,46 @@ class BrowserSession(BaseModel):
 					f'⚠️ Failed to add visibility listener to existing tab, is it crashed or ignoring CDP commands?: [{page_idx}]{page.url}: {type(e).__name__}: {e}'
 				)
 
+	async def _setup_request_interception(self) -> None:
+		"""Route the context's requests through the resource_policy and the asset cache, installed once per context"""
+		policy = self.browser_profile.resource_policy
+		if isinstance(policy, dict):
+			# BrowserSession(resource_policy=...) overrides reach the profile through model_dump()
+			policy = ResourcePolicy.model_validate(policy)
+		if policy and policy.is_empty:
+			policy = None
+		asset_cache_dir = self.browser_profile.asset_cache_dir
+		if not (policy or asset_cache_dir) or not self.browser_context:
+			return
+		if self._routed_context is self.browser_context:
+			return
+
+		if policy and self._resource_blocker is None:
+			self._resource_blocker = ResourceBlocker(policy)
+			self.logger.debug(f'🚧 Blocking requests per resource_policy: {policy.model_dump(exclude_defaults=True)}')
+		if asset_cache_dir and self._asset_cache is None:
+			self._asset_cache = get_asset_cache(Path(asset_cache_dir), self.browser_profile.asset_cache_max_bytes)
+			self.logger.debug(f'📦 Serving static assets from the shared cache in {_log_pretty_path(asset_cache_dir)}')
+		await self.browser_context.route('**/*', self._route_request)
+		self._routed_context = self.browser_context
+
+	async def _route_request(self, route) -> None:
+		if self._resource_blocker and await self._resource_blocker.handle(route):
+			return
+		if self._asset_cache and await self._asset_cache.handle(route):
+			return
+		await route.fallback()
+
+	def asset_cache_stats(self) -> dict[str, Any] | None:
+		"""Hits, misses and size of the shared asset cache, None if it isn't enabled"""
+		return self._asset_cache.stats() if self._asset_cache else None
+
+	def resource_blocking_stats(self) -> dict[str, Any]:
+		"""Requests blocked by the resource_policy so far, and the estimated bytes that saved"""
+		if self._resource_blocker is None:
+			return {'blocked_requests': 0, 'estimated_bytes_saved': 0, 'blocked_by_reason': {}}
+		return self._resource_blocker.stats()
+
 	@observe_debug(
 		ignore_input=True, ignore_output=True, name='setup_viewports', metadata={'browser_profile': '{{browser_profile}}'}
 	)
@@ -1710,9 +1991,9 @@ class BrowserSession(BaseModel):
 
 			# cdp api: https://chromedevtools.github.io/devtools-protocol/tot/Browser/#method-setWindowBounds
 			try:
-				cdp_session = await page.context.new_cdp_session(page)  # type: ignore
-				window_id_result = await cdp_session.send('Browser.getWindowForTarget')
-				await cdp_session.send(
+				window_id_result = await self._cdp_sessions.send(page, 'Browser.getWindowForTarget')
+				await self._cdp_sessions.send(
+					page,
 					'Browser.setWindowBounds',
 					{
 						'windowId': window_id_result['windowId'],
@@ -1722,10 +2003,6 @@ class BrowserSession(BaseModel):
 						},
 					},
 				)
-				try:
-					await asyncio.wait_for(cdp_session.detach(), timeout=1.0)
-				except (TimeoutError, Exception):
-					pass
 			except Exception as e:
 				_log_size = lambda size: f'{size["width"]}x{size["height"]}px'
 				try:
@@ -1816,6 +2093,8 @@ class BrowserSession(BaseModel):
 		self.agent_current_page = None
 		self.human_current_page = None
 		self._cached_clickable_element_hashes = None
+		self._page_health.invalidate()
+		self._cdp_sessions.discard()
 		# Reset CDP connection info when browser is stopped
 		self.browser_pid = None
 		self._cached_browser_state_summary = None
@@ -2709,183 +2988,61 @@ class BrowserSession(BaseModel):
 	# 	return list(Path(self.browser_profile.downloads_path).glob('*'))
 
 	async def _wait_for_stable_network(self):
-		pending_requests = set()
-		last_activity = asyncio.get_event_loop().time()
-
 		page = await self.get_current_page()
 
-		# Define relevant resource types and content types
-		RELEVANT_RESOURCE_TYPES = {
-			'document',
-			'stylesheet',
-			'image',
-			'font',
-			'script',
-			'iframe',
-		}
-
-		RELEVANT_CONTENT_TYPES = {
-			'text/html',
-			'text/css',
-			'application/javascript',
-			'image/',
-			'font/',
-			'application/json',
-		}
-
-		# Additional patterns to filter out
-		IGNORED_URL_PATTERNS = {
-			# Analytics and tracking
-			'analytics',
-			'tracking',
-			'telemetry',
-			'beacon',
-			'metrics',
-			# Ad-related
-			'doubleclick',
-			'adsystem',
-			'adserver',
-			'advertising',
-			# Social media widgets
-			'facebook.com/plugins',
-			'platform.twitter',
-			'linkedin.com/embed',
-			# Live chat and support
-			'livechat',
-			'zendesk',
-			'intercom',
-			'crisp.chat',
-			'hotjar',
-			# Push notifications
-			'push-notifications',
-			'onesignal',
-			'pushwoosh',
-			# Background sync/heartbeat
-			'heartbeat',
-			'ping',
-			'alive',
-			# WebRTC and streaming
-			'webrtc',
-			'rtmp://',
-			'wss://',
-			# Common CDNs for dynamic content
-			'cloudfront.net',
-			'fastly.net',
-		}
-
-		async def on_request(request):
-			# Filter by resource type
-			if request.resource_type not in RELEVANT_RESOURCE_TYPES:
-				return
-
-			# Filter out streaming, websocket, and other real-time requests
-			if request.resource_type in {
-				'websocket',
-				'media',
-				'eventsource',
-				'manifest',
-				'other',
-			}:
-				return
-
-			# Filter out by URL patterns
-			url = request.url.lower()
-			if any(pattern in url for pattern in IGNORED_URL_PATTERNS):
-				return
-
-			# Filter out data URLs and blob URLs
-			if url.startswith(('data:', 'blob:')):
-				return
-
-			# Filter out requests with certain headers
-			headers = request.headers
-			if headers.get('purpose') == 'prefetch' or headers.get('sec-fetch-dest') in [
-				'video',
-				'audio',
-			]:
-				return
-
-			nonlocal last_activity
-			pending_requests.add(request)
-			last_activity = asyncio.get_event_loop().time()
-			# self.logger.debug(f'Request started: {request.url} ({request.resource_type})')
-
-		async def on_response(response):
-			request = response.request
-			if request not in pending_requests:
-				return
-
-			# Filter by content type if available
-			content_type = response.headers.get('content-type', '').lower()
-
-			# Skip if content type indicates streaming or real-time data
-			if any(
-				t in content_type
-				for t in [
-					'streaming',
-					'video',
-					'audio',
-					'webm',
-					'mp4',
-					'event-stream',
-					'websocket',
-					'protobuf',
-				]
-			):
-				pending_requests.remove(request)
-				return
-
-			# Only process relevant content types
-			if not any(ct in content_type for ct in RELEVANT_CONTENT_TYPES):
-				pending_requests.remove(request)
-				return
-
-			# Skip if response is too large (likely not essential for page load)
-			content_length = response.headers.get('content-length')
-			if content_length and int(content_length) > 5 * 1024 * 1024:  # 5MB
-				pending_requests.remove(request)
-				return
-
-			nonlocal last_activity
-			pending_requests.remove(request)
-			last_activity = asyncio.get_event_loop().time()
-			# self.logger.debug(f'Request resolved: {request.url} ({content_type})')
+		# with adaptive_network_idle, use (and update) what previous loads of this domain looked like,
+		# the first load of a domain waits like without it while watching which xhr/fetch requests outlast it
+		domain = domain_key(page.url) if self.browser_profile.adaptive_network_idle else None
+		settle_profile = self._settle_profile_store().get(domain) if domain else None
+		idle_window = self.browser_profile.wait_for_network_idle_page_load_time
+		if settle_profile:
+			idle_window = settle_profile.idle_window(idle_window)
+
+		watcher = NetworkIdleWatcher(
+			ignored_endpoints=settle_profile.long_poll_endpoints if settle_profile else None,
+			include_api_requests=settle_profile is not None,
+			watch_api_requests=domain is not None,
+		)
 
 		# Attach event listeners
-		page.on('request', on_request)
-		page.on('response', on_response)
-
-		now = asyncio.get_event_loop().time()
+		page.on('request', watcher.on_request)
+		page.on('response', watcher.on_response)
+		page.on('requestfailed', watcher.on_request_failed)
 		try:
-			# Wait for idle time
-			start_time = asyncio.get_event_loop().time()
-			while True:
-				await asyncio.sleep(0.1)
-				now = asyncio.get_event_loop().time()
-				if (
-					len(pending_requests) == 0
-					and (now - last_activity) >= self.browser_profile.wait_for_network_idle_page_load_time
-				):
-					# Clear loading status when page loads successfully
-					self._current_page_loading_status = None
-					break
-				if now - start_time > self.browser_profile.maximum_wait_page_load_time:
-					self.logger.debug(
-						f'{self} Network timeout after {self.browser_profile.maximum_wait_page_load_time}s with {len(pending_requests)} '
-						f'pending requests: {[r.url for r in pending_requests]}'
-					)
-					# Set loading status for LLM to see
-					self._current_page_loading_status = f'Page loading was aborted after {self.browser_profile.maximum_wait_page_load_time}s with {len(pending_requests)} pending network requests. You may want to use the wait action to allow more time for the page to fully load.'
-					break
-
+			result = await watcher.wait(idle_window, self.browser_profile.maximum_wait_page_load_time)
 		finally:
 			# Clean up event listeners
-			page.remove_listener('request', on_request)
-			page.remove_listener('response', on_response)
+			page.remove_listener('request', watcher.on_request)
+			page.remove_listener('response', watcher.on_response)
+			page.remove_listener('requestfailed', watcher.on_request_failed)
+
+		if result.idle:
+			# Clear loading status when page loads successfully
+			self._current_page_loading_status = None
+		else:
+			self.logger.debug(
+				f'{self} Network timeout after {self.browser_profile.maximum_wait_page_load_time}s with {len(result.pending_urls)} '
+				f'pending requests: {result.pending_urls}'
+			)
+			# Set loading status for LLM to see
+			self._current_page_loading_status = f'Page loading was aborted after {self.browser_profile.maximum_wait_page_load_time}s with {len(result.pending_urls)} pending network requests. You may want to use the wait action to allow more time for the page to fully load.'
+
+		if domain:
+			# only xhr/fetch requests can be long polls, a slow document or bundle is always waited for
+			self._settle_profile_store().record(
+				domain,
+				result.max_quiet_gap,
+				result.pending_poll_endpoints,
+				result.completed_poll_endpoints,
+				long_poll_endpoints=result.unwaited_poll_endpoints if settle_profile is None else None,
+			)
+
+		if result.elapsed > 1:
+			self.logger.debug(f'💤 Page network traffic calmed down after {result.elapsed:.2f} seconds')
 
-		elapsed = now - start_time
-		if elapsed > 1:
-			self.logger.debug(f'💤 Page network traffic calmed down after {now - start_time:.2f} seconds')
+	def _settle_profile_store(self) -> SettleProfileStore:
+		path = self.browser_profile.network_settle_profiles_path
+		return get_settle_profile_store(Path(path) if path else CONFIG.BROWSER_USE_CONFIG_DIR / 'network_settle_profiles.json')
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='wait_for_page_and_frames_load')
 	async def _wait_for_page_and_frames_load(self, timeout_overwrite: float | None = None):
@@ -3179,33 +3336,37 @@ class BrowserSession(BaseModel):
 
 		updated_state = await self._get_updated_state(include_screenshot=include_screenshot)
 
-		# Find out which elements are new
-		# Do this only if url has not changed
 		if cache_clickable_elements_hashes:
-			# Lazy import heavy DOM service
-			from browser_use.dom.clickable_element_processor.service import ClickableElementProcessor
-
-			# if we are on the same url as the last state, we can use the cached hashes
-			if self._cached_clickable_element_hashes and self._cached_clickable_element_hashes.url == updated_state.url:
-				# Pointers, feel free to edit in place
-				updated_state_clickable_elements = ClickableElementProcessor.get_clickable_elements(updated_state.element_tree)
-
-				for dom_element in updated_state_clickable_elements:
-					dom_element.is_new = (
-						ClickableElementProcessor.hash_dom_element(dom_element)
-						not in self._cached_clickable_element_hashes.hashes  # see which elements are new from the last state where we cached the hashes
-					)
-			# in any case, we need to cache the new hashes
-			self._cached_clickable_element_hashes = CachedClickableElementHashes(
-				url=updated_state.url,
-				hashes=ClickableElementProcessor.get_clickable_elements_hashes(updated_state.element_tree),
-			)
+			self.mark_new_clickable_elements(updated_state)
 
 		assert updated_state
 		self._cached_browser_state_summary = updated_state
 
 		return self._cached_browser_state_summary
 
+	def mark_new_clickable_elements(self, state: BrowserStateSummary) -> None:
+		"""Mark the elements of a state that weren't in the last state marked this way, and remember its elements for the next one"""
+		# Lazy import heavy DOM service
+		from browser_use.dom.clickable_element_processor.service import ClickableElementProcessor
+
+		# Find out which elements are new
+		# Do this only if url has not changed
+		# if we are on the same url as the last state, we can use the cached hashes
+		if self._cached_clickable_element_hashes and self._cached_clickable_element_hashes.url == state.url:
+			# Pointers, feel free to edit in place
+			updated_state_clickable_elements = ClickableElementProcessor.get_clickable_elements(state.element_tree)
+
+			for dom_element in updated_state_clickable_elements:
+				dom_element.is_new = (
+					ClickableElementProcessor.hash_dom_element(dom_element)
+					not in self._cached_clickable_element_hashes.hashes  # see which elements are new from the last state where we cached the hashes
+				)
+		# in any case, we need to cache the new hashes
+		self._cached_clickable_element_hashes = CachedClickableElementHashes(
+			url=state.url,
+			hashes=ClickableElementProcessor.get_clickable_elements_hashes(state.element_tree),
+		)
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_minimal_state_summary')
 	@require_healthy_browser(usable_page=True, reopen_page=True)
 	@time_execution_async('--get_minimal_state_summary')
@@ -3326,57 +3487,19 @@ class BrowserSession(BaseModel):
 				return self.browser_state_summary
 
 			# Normal path for regular pages
-			self.logger.debug('🧹 Removing highlights...')
-			try:
-				await self.remove_highlights()
-			except TimeoutError:
-				self.logger.debug('Timeout to remove highlights')
+			timings: dict[str, float] = {}
+			capture_start = time.perf_counter()
+			concurrent = self.browser_profile.concurrent_state_capture
+			probe_timeout = self.browser_profile.state_probe_timeout
 
-			# Check for PDF and auto-download if needed
-			try:
-				pdf_path = await self._auto_download_pdf_if_needed(page)
-				if pdf_path:
-					self.logger.info(f'📄 PDF auto-downloaded: {pdf_path}')
-			except Exception as e:
-				self.logger.debug(f'PDF auto-download check failed: {type(e).__name__}: {e}')
+			# highlights must be removed before the DOM build draws the new ones
+			self.logger.debug('🧹 Removing highlights...')
+			await self._timed_state_probe(timings, 'remove_highlights', self.remove_highlights(), timeout=probe_timeout)
 
 			self.logger.debug('🌳 Starting DOM processing...')
 			from browser_use.dom.service import DomService
 
 			dom_service = DomService(page, logger=self.logger)
-			try:
-				content = await asyncio.wait_for(
-					dom_service.get_clickable_elements(
-						focus_element=focus_element,
-						viewport_expansion=self.browser_profile.viewport_expansion,
-						highlight_elements=self.browser_profile.highlight_elements,
-					),
-					timeout=45.0,  # 45 second timeout for DOM processing - generous for complex pages
-				)
-				self.logger.debug('✅ DOM processing completed')
-			except TimeoutError:
-				self.logger.warning(f'DOM processing timed out after 45 seconds for {page.url}')
-				self.logger.warning('🔄 Falling back to minimal DOM state to allow basic navigation...')
-
-				# Create minimal DOM state for basic navigation
-				from browser_use.dom.views import DOMElementNode
-
-				minimal_element_tree = DOMElementNode(
-					tag_name='body',
-					xpath='/body',
-					attributes={},
-					children=[],
-					is_visible=True,
-					parent=None,
-				)
-
-				from browser_use.dom.views import DOMState
-
-				content = DOMState(element_tree=minimal_element_tree, selector_map={})
-
-			self.logger.debug('📋 Getting tabs info...')
-			tabs_info = await self.get_tabs_info()
-			self.logger.debug('✅ Tabs info completed')
 
 			# Get all cross-origin iframes within the page and open them in new tabs
 			# mark the titles of the new tabs so the LLM knows to check them for additional content
@@ -3399,32 +3522,28 @@ class BrowserSession(BaseModel):
 			# 		)
 			# 	)
 
-			if include_screenshot:
-				try:
-					self.logger.debug('📸 Capturing screenshot...')
-					# Reasonable timeout for screenshot
-					screenshot_b64 = await self.take_screenshot()
-					# self.logger.debug('✅ Screenshot completed')
-				except Exception as e:
-					self.logger.warning(f'❌ Screenshot failed for {_log_pretty_url(page.url)}: {type(e).__name__} {e}')
-					screenshot_b64 = None
-			else:
-				screenshot_b64 = None
-
-			# Get comprehensive page information
-			page_info = await self.get_page_info(page)
-			try:
-				self.logger.debug('📏 Getting scroll info...')
-				pixels_above, pixels_below = await asyncio.wait_for(self.get_scroll_info(page), timeout=5.0)
-				self.logger.debug('✅ Scroll info completed')
-			except Exception as e:
-				self.logger.warning(f'Failed to get scroll info: {type(e).__name__}')
-				pixels_above, pixels_below = 0, 0
-
-			try:
-				title = await asyncio.wait_for(page.title(), timeout=3.0)
-			except Exception:
-				title = 'Title unavailable'
+			# the screenshot has to wait for the DOM build only when it should show the element highlights
+			screenshot_after_dom = not concurrent or self.browser_profile.highlight_elements
+			probes = [
+				self._timed_state_probe(timings, 'dom', self._build_dom_state(dom_service, focus_element), required=True),
+				self._timed_state_probe(timings, 'tabs', self.get_tabs_info(), timeout=probe_timeout, default=[]),
+				# viewport, scroll extents, title and PDF viewer status in a single evaluation, then the PDF auto-download
+				self._page_metrics_and_pdf_probe(timings, page, probe_timeout),
+			]
+			if include_screenshot and not screenshot_after_dom:
+				probes.append(self._timed_state_probe(timings, 'screenshot', self.take_screenshot()))
+			results = await self._run_state_probes(concurrent, *probes)
+			content, tabs_info, (page_metrics, pdf_path) = results[:3]
+			if pdf_path:
+				self.logger.info(f'📄 PDF auto-downloaded: {pdf_path}')
+			screenshot_b64 = results[3] if len(results) > 3 else None
+			if include_screenshot and screenshot_after_dom:
+				self.logger.debug('📸 Capturing screenshot...')
+				screenshot_b64 = await self._timed_state_probe(timings, 'screenshot', self.take_screenshot())
+			timings['total'] = time.perf_counter() - capture_start
+			self.logger.debug(
+				'⏱️ State capture timings: ' + ', '.join(f'{name}={duration:.3f}s' for name, duration in timings.items())
+			)
 
 			# Check if this is a minimal fallback state
 			browser_errors = []
@@ -3433,22 +3552,25 @@ class BrowserSession(BaseModel):
 					f'DOM processing timed out for {page.url} - using minimal state. Basic navigation still available via go_to_url, scroll, and search actions.'
 				)
 
-			# Check if current page is a PDF viewer
-			is_pdf_viewer = await self._is_pdf_viewer(page)
-
+			page_info = page_metrics.page_info if page_metrics else None
 			self.browser_state_summary = BrowserStateSummary(
 				element_tree=content.element_tree,
 				selector_map=content.selector_map,
 				url=page.url,
-				title=title,
+				title=page_metrics.title if page_metrics else 'Title unavailable',
 				tabs=tabs_info,
 				screenshot=screenshot_b64,
 				page_info=page_info,
-				pixels_above=pixels_above,
-				pixels_below=pixels_below,
+				pixels_above=page_info.pixels_above if page_info else 0,
+				pixels_below=page_info.pixels_below if page_info else 0,
 				browser_errors=browser_errors,
-				is_pdf_viewer=is_pdf_viewer,
+				is_pdf_viewer=page_metrics.is_pdf_viewer if page_metrics else False,
 				loading_status=self._current_page_loading_status,
+				content_type=page_metrics.content_type if page_metrics else None,
+				blocked_requests=self._resource_blocker.blocked_requests if self._resource_blocker else 0,
+				estimated_bytes_saved=self._resource_blocker.estimated_bytes_saved if self._resource_blocker else 0,
+				dom_snapshot_id=dom_service.snapshot_id,
+				timings=timings,
 			)
 
 			self.logger.debug('✅ get_state_summary completed successfully')
@@ -3460,7 +3582,134 @@ class BrowserSession(BaseModel):
 				return self.browser_state_summary
 			raise
 
+	@staticmethod
+	async def _run_state_probes(concurrent: bool, *probes: Any) -> list[Any]:
+		"""Await the state capture probes together, or one after another in the given order"""
+		if concurrent:
+			return list(await asyncio.gather(*probes))
+		return [await probe for probe in probes]
+
+	async def _timed_state_probe(
+		self,
+		timings: dict[str, float],
+		name: str,
+		probe: Any,
+		timeout: float | None = None,
+		default: Any = None,
+		required: bool = False,
+	) -> Any:
+		"""Await one part of the state capture, recording its duration in timings, returns default if it fails or times out
+
+		A required probe has no default, its errors propagate to the caller unchanged.
+		"""
+		start = time.perf_counter()
+		try:
+			return await asyncio.wait_for(probe, timeout=timeout)
+		except TimeoutError:
+			if required:
+				raise
+			self.logger.warning(f'⏱️ State capture step {name} timed out after {timeout}s, continuing without it')
+			return default
+		except Exception as e:
+			if required:
+				raise
+			self.logger.warning(f'❌ State capture step {name} failed: {type(e).__name__}: {e}')
+			return default
+		finally:
+			timings[name] = time.perf_counter() - start
+
+	async def _page_metrics_and_pdf_probe(
+		self, timings: dict[str, float], page: Page, timeout: float | None
+	) -> tuple[PageMetrics | None, str | None]:
+		"""Read the page metrics, then auto-download the PDF if they show the PDF viewer, without reading them again"""
+		page_metrics = await self._timed_state_probe(timings, 'page_metrics', self.get_page_metrics(page), timeout=timeout)
+		is_pdf_viewer = page_metrics.is_pdf_viewer if page_metrics else None
+		pdf_path = await self._timed_state_probe(timings, 'pdf_download', self._auto_download_pdf_if_needed(page, is_pdf_viewer))
+		return page_metrics, pdf_path
+
+	async def _build_dom_state(self, dom_service: Any, focus_element: int = -1) -> DOMState:
+		"""Build the DOM state, or a minimal one allowing basic navigation if it takes more than 45s"""
+		try:
+			content = await asyncio.wait_for(
+				dom_service.get_clickable_elements(
+					focus_element=focus_element,
+					viewport_expansion=self.browser_profile.viewport_expansion,
+					highlight_elements=self.browser_profile.highlight_elements,
+					incremental=self.browser_profile.incremental_dom_snapshots,
+					packed=self.browser_profile.packed_dom_wire_format,
+				),
+				timeout=45.0,  # 45 second timeout for DOM processing - generous for complex pages
+			)
+			self.logger.debug('✅ DOM processing completed')
+			return content
+		except TimeoutError:
+			self.logger.warning(f'DOM processing timed out after 45 seconds for {dom_service.page.url}')
+			self.logger.warning('🔄 Falling back to minimal DOM state to allow basic navigation...')
+
+			# Create minimal DOM state for basic navigation
+			minimal_element_tree = DOMElementNode(
+				tag_name='body',
+				xpath='/body',
+				attributes={},
+				children=[],
+				is_visible=True,
+				parent=None,
+			)
+			return DOMState(element_tree=minimal_element_tree, selector_map={})
+
 	# region - Page Health Check Helpers
+	async def _probe_page_health(self, page: Page) -> bool:
+		"""Check page responsiveness for @require_healthy_browser and remember a successful check"""
+		self._page_health.ttl = self.browser_profile.page_health_cache_ttl
+		self._page_health.probes += 1
+		if await self._is_page_responsive(page):
+			self._page_health.mark_responsive(page)
+			return True
+		self._page_health.invalidate(page)
+		return False
+
+	def page_health_stats(self) -> dict[str, int]:
+		"""Number of page responsiveness checks run (probes) and answered from the cache (hits) so far"""
+		return self._page_health.stats()
+
+	def note_page_mutation(self) -> None:
+		"""Record that an action is about to change the pages, any browser state captured before is stale"""
+		self._page_mutations += 1
+
+	@property
+	def page_mutation_count(self) -> int:
+		"""Number of actions run on the pages so far, compare before and after to know if a captured state is still current"""
+		return self._page_mutations
+
+	async def warm_dom_cache(self) -> bool:
+		"""
+		Bring the incremental DOM snapshot of the current page up to date (e.g. while waiting for the LLM), so the
+		next state capture only transfers what changed since. Only useful with browser_profile.incremental_dom_snapshots,
+		full DOM builds don't keep anything between calls.
+		"""
+		page = self.agent_current_page
+		if not self.browser_profile.incremental_dom_snapshots or page is None or page.is_closed():
+			return False
+
+		from browser_use.dom.service import DomService
+
+		try:
+			if self.browser_profile.highlight_elements:
+				# the snapshot is built with the arguments of the next capture, which redraws the highlights
+				await self.remove_highlights()
+			await asyncio.wait_for(
+				DomService(page, logger=self.logger).refresh_dom_snapshot(
+					highlight_elements=self.browser_profile.highlight_elements,
+					viewport_expansion=self.browser_profile.viewport_expansion,
+					packed=self.browser_profile.packed_dom_wire_format,
+				),
+				timeout=10.0,
+			)
+			return True
+		except Exception as e:
+			self.logger.debug(f'Warming the DOM snapshot failed: {type(e).__name__}: {e}')
+			return False
+
 	@observe_debug(ignore_input=True)
 	async def _is_page_responsive(self, page: Page, timeout: float = 5.0) -> bool:
 		"""Check if a page is responsive by trying to evaluate simple JavaScript."""
@@ -3490,17 +3739,22 @@ class BrowserSession(BaseModel):
 					pass
 
 	async def _force_close_page_via_cdp(self, page_url: str) -> bool:
-		"""Force close a crashed page using CDP from a clean temporary page."""
+		"""Force close a crashed page using CDP, from the pooled browser-level session or a clean temporary page."""
 		try:
-			# self.logger.info('🔨 Creating temporary page for CDP force-close...')
+			temp_page = None
+			if self.browser:
+				# Target.* commands don't need a page, reuse the browser-level session
+				cdp_session = await asyncio.wait_for(self._cdp_sessions.get_browser_session(self.browser), timeout=5.0)
+			else:
+				# self.logger.info('🔨 Creating temporary page for CDP force-close...')
 
-			# Create a clean page for CDP operations
-			assert self.browser_context, 'Browser context is not set up yet'
-			temp_page = await asyncio.wait_for(self.browser_context.new_page(), timeout=5.0)
-			await asyncio.wait_for(temp_page.goto('about:blank'), timeout=2.0)
+				# Create a clean page for CDP operations (persistent contexts have no Browser object to attach to)
+				assert self.browser_context, 'Browser context is not set up yet'
+				temp_page = await asyncio.wait_for(self.browser_context.new_page(), timeout=5.0)
+				await asyncio.wait_for(temp_page.goto('about:blank'), timeout=2.0)
 
-			# Create CDP session from the clean page
-			cdp_session = await asyncio.wait_for(self.browser_context.new_cdp_session(temp_page), timeout=5.0)  # type: ignore
+				# Create CDP session from the clean page
+				cdp_session = await asyncio.wait_for(self.browser_context.new_cdp_session(temp_page), timeout=5.0)  # type: ignore
 
 			try:
 				# Get all browser targets
@@ -3528,13 +3782,20 @@ class BrowserSession(BaseModel):
 					)
 					return False
 
+			except Exception:
+				if temp_page is None:
+					# the pooled browser session may be what's broken, attach a fresh one next time
+					self._cdp_sessions.discard_browser_session()
+				raise
+
 			finally:
-				# Clean up
-				try:
-					await asyncio.wait_for(cdp_session.detach(), timeout=1.0)
-				except Exception:
-					pass
-				await temp_page.close()
+				# Clean up the temporary page, the pooled browser session stays attached
+				if temp_page:
+					try:
+						await asyncio.wait_for(cdp_session.detach(), timeout=1.0)
+					except Exception:
+						pass
+					await temp_page.close()
 
 		except Exception as e:
 			self.logger.error(f'❌ Using raw CDP to force-close crashed page failed: {type(e).__name__}: {e}')
@@ -3680,6 +3941,7 @@ class BrowserSession(BaseModel):
 
 		# Prevent re-entrance
 		self._in_recovery = True
+		self._page_health.invalidate()
 		try:
 			# Get current URL before recovery
 			assert self.agent_current_page, 'Agent current page is not set'
@@ -3743,10 +4005,19 @@ class BrowserSession(BaseModel):
 	)
 	@require_healthy_browser(usable_page=True, reopen_page=True)
 	@time_execution_async('--take_screenshot')
-	async def take_screenshot(self, full_page: bool = False) -> str | None:
+	async def take_screenshot(
+		self,
+		full_page: bool = False,
+		image_format: Literal['png', 'jpeg', 'webp'] = 'png',
+		quality: int | None = None,
+		max_width: int | None = None,
+	) -> str | None:
 		"""
 		Returns a base64 encoded screenshot of the current page using CDP.
 
+		image_format and quality (0-100, jpeg/webp only) are passed to Page.captureScreenshot, and a
+		max_width (in image pixels) narrower than the viewport makes Chrome downscale while encoding.
+
 		The decorator order ensures:
 		1. @retry runs first (outer decorator)
 		2. @require_healthy_browser runs on each retry attempt
@@ -3774,28 +4045,41 @@ class BrowserSession(BaseModel):
 			pass
 
 		# Take screenshot using CDP to get around playwright's unnecessary slowness and weird behavior
-		cdp_session = None
 		try:
-			# Create CDP session for the screenshot
+			# Reuse the page's pooled CDP session for the screenshot
 			self.logger.debug(
-				f'📸 Taking viewport-only PNG screenshot of page via fresh CDP session: {_log_pretty_url(page.url)}'
+				f'📸 Taking viewport-only {image_format.upper()} screenshot of page via pooled CDP session: {_log_pretty_url(page.url)}'
 			)
-			cdp_session = await self.browser_context.new_cdp_session(page)  # type: ignore
+			cdp_session = await self._cdp_sessions.get(page)
+
+			capture_params: dict[str, Any] = {
+				'captureBeyondViewport': False,
+				'fromSurface': True,
+				'format': image_format,
+			}
+			if quality is not None and image_format != 'png':
+				capture_params['quality'] = quality
+			if max_width:
+				# visualViewport is in device pixels, cssVisualViewport in CSS pixels (what clip is measured in)
+				metrics = await cdp_session.send('Page.getLayoutMetrics')
+				css_viewport = metrics.get('cssVisualViewport') or {}
+				device_width = (metrics.get('visualViewport') or {}).get('clientWidth') or css_viewport.get('clientWidth')
+				if css_viewport and device_width and device_width > max_width:
+					capture_params['clip'] = {
+						'x': css_viewport['pageX'],
+						'y': css_viewport['pageY'],
+						'width': css_viewport['clientWidth'],
+						'height': css_viewport['clientHeight'],
+						'scale': max_width / device_width,
+					}
 
 			# Capture screenshot via CDP
-			screenshot_response = await cdp_session.send(
-				'Page.captureScreenshot',
-				{
-					'captureBeyondViewport': False,
-					'fromSurface': True,
-					'format': 'png',
-				},
-			)
+			screenshot_response = await cdp_session.send('Page.captureScreenshot', capture_params)
 
 			screenshot_b64 = screenshot_response.get('data')
 			if not screenshot_b64:
 				raise Exception(
-					f'CDP returned empty screenshot data for page {_log_pretty_url(page.url)}? (expected png base64)'
+					f'CDP returned empty screenshot data for page {_log_pretty_url(page.url)}? (expected {image_format} base64)'
 				)  # have never seen this happen in practice
 
 			return screenshot_b64
@@ -3806,13 +4090,9 @@ class BrowserSession(BaseModel):
 				self.logger.warning(f'⏱️ Screenshot timed out on page {_log_pretty_url(page.url)} (possibly crashed): {error_str}')
 			else:
 				self.logger.error(f'❌ Screenshot failed on page {_log_pretty_url(page.url)} (possibly crashed): {error_str}')
+			# the session may be what's broken, attach a fresh one for the next attempt
+			self._cdp_sessions.discard(page)
 			raise
-		finally:
-			if cdp_session:
-				try:
-					await asyncio.wait_for(cdp_session.detach(), timeout=1.0)
-				except Exception:
-					pass
 
 	# region - User Actions
 
@@ -4418,39 +4698,22 @@ class BrowserSession(BaseModel):
 	@require_healthy_browser(usable_page=True, reopen_page=True)
 	async def get_scroll_info(self, page: Page) -> tuple[int, int]:
 		"""Get scroll position information for the current page."""
-		scroll_y = await page.evaluate('window.scrollY')
-		viewport_height = await page.evaluate('window.innerHeight')
-		total_height = await page.evaluate('document.documentElement.scrollHeight')
-		# Convert to int to handle fractional pixels
-		pixels_above = int(scroll_y)
-		pixels_below = int(max(0, total_height - (scroll_y + viewport_height)))
-		return pixels_above, pixels_below
+		page_info = (await self._read_page_metrics(page)).page_info
+		return page_info.pixels_above, page_info.pixels_below
 
 	@require_healthy_browser(usable_page=True, reopen_page=True)
 	async def get_page_info(self, page: Page) -> PageInfo:
 		"""Get comprehensive page size and scroll information."""
-		# Get all page dimensions and scroll info in one JavaScript call for efficiency
-		page_data = await page.evaluate("""() => {
-			return {
-				// Current viewport dimensions
-				viewport_width: window.innerWidth,
-				viewport_height: window.innerHeight,
-				
-				// Total page dimensions
-				page_width: Math.max(
-					document.documentElement.scrollWidth,
-					document.body.scrollWidth || 0
-				),
-				page_height: Math.max(
-					document.documentElement.scrollHeight,
-					document.body.scrollHeight || 0
-				),
-				
-				// Current scroll position
-				scroll_x: window.scrollX || window.pageXOffset || document.documentElement.scrollLeft || 0,
-				scroll_y: window.scrollY || window.pageYOffset || document.documentElement.scrollTop || 0
-			};
-		}""")
+		return (await self._read_page_metrics(page)).page_info
+
+	@require_healthy_browser(usable_page=True, reopen_page=True)
+	async def get_page_metrics(self, page: Page) -> PageMetrics:
+		"""Get page size, scroll position, title, content type and PDF viewer status in one round-trip."""
+		return await self._read_page_metrics(page)
+
+	async def _read_page_metrics(self, page: Page) -> PageMetrics:
+		# Get all page dimensions, scroll info and document info in one JavaScript call for efficiency
+		page_data = await page.evaluate(PAGE_METRICS_JS)
 
 		# Calculate derived values (convert to int to handle fractional pixels)
 		viewport_width = int(page_data['viewport_width'])
@@ -4460,12 +4723,6 @@ class BrowserSession(BaseModel):
 		scroll_x = int(page_data['scroll_x'])
 		scroll_y = int(page_data['scroll_y'])
 
-		# Calculate scroll information
-		pixels_above = scroll_y
-		pixels_below = max(0, page_height - (scroll_y + viewport_height))
-		pixels_left = scroll_x
-		pixels_right = max(0, page_width - (scroll_x + viewport_width))
-
 		# Create PageInfo object with comprehensive information
 		page_info = PageInfo(
 			viewport_width=viewport_width,
@@ -4474,13 +4731,17 @@ class BrowserSession(BaseModel):
 			page_height=page_height,
 			scroll_x=scroll_x,
 			scroll_y=scroll_y,
-			pixels_above=pixels_above,
-			pixels_below=pixels_below,
-			pixels_left=pixels_left,
-			pixels_right=pixels_right,
+			pixels_above=scroll_y,
+			pixels_below=max(0, page_height - (scroll_y + viewport_height)),
+			pixels_left=scroll_x,
+			pixels_right=max(0, page_width - (scroll_x + viewport_width)),
+		)
+		return PageMetrics(
+			page_info=page_info,
+			title=page_data['title'],
+			content_type=page_data['content_type'],
+			is_pdf_viewer=page_data['is_pdf_viewer'],
 		)
-
-		return page_info
 
 	async def _scroll_with_cdp_gesture(self, page: Page, pixels: int) -> bool:
 		"""
@@ -4495,8 +4756,6 @@ class BrowserSession(BaseModel):
 		"""
 		try:
 			# Use CDP to synthesize scroll gesture - works in all contexts including PDFs
-			cdp_session = await page.context.new_cdp_session(page)  # type: ignore
-
 			# Get viewport center for scroll origin
 			viewport = await page.evaluate("""
 				() => ({
@@ -4508,7 +4767,8 @@ class BrowserSession(BaseModel):
 			center_x = viewport['width'] // 2
 			center_y = viewport['height'] // 2
 
-			await cdp_session.send(
+			await self._cdp_sessions.send(
+				page,
 				'Input.synthesizeScrollGesture',
 				{
 					'x': center_x,
@@ -4520,10 +4780,6 @@ class BrowserSession(BaseModel):
 				},
 			)
 
-			try:
-				await asyncio.wait_for(cdp_session.detach(), timeout=1.0)
-			except (TimeoutError, Exception):
-				pass
 			self.logger.debug(f'📄 Scrolled via CDP Input.synthesizeScrollGesture: {pixels}px')
 			return True
 
@@ -4722,29 +4978,15 @@ class BrowserSession(BaseModel):
 		Returns True if PDF is detected, False otherwise.
 		"""
 		try:
-			is_pdf_viewer = await page.evaluate("""
-				() => {
-					// Check for Chrome's built-in PDF viewer (updated selector)
-					const pdfEmbed = document.querySelector('embed[type="application/x-google-chrome-pdf"]') ||
-									 document.querySelector('embed[type="application/pdf"]');
-					const isPdfViewer = !!pdfEmbed;
-					
-					// Also check if the URL ends with .pdf or has PDF content-type
-					const url = window.location.href;
-					const isPdfUrl = url.toLowerCase().includes('.pdf') || 
-									document.contentType === 'application/pdf';
-					
-					return isPdfViewer || isPdfUrl;
-				}
-			""")
-			return is_pdf_viewer
+			return (await self._read_page_metrics(page)).is_pdf_viewer
 		except Exception as e:
 			self.logger.debug(f'Error checking PDF viewer: {type(e).__name__}: {e}')
 			return False
 
-	async def _auto_download_pdf_if_needed(self, page: Page) -> str | None:
+	async def _auto_download_pdf_if_needed(self, page: Page, is_pdf_viewer: bool | None = None) -> str | None:
 		"""
 		Check if the current page is a PDF viewer and automatically download the PDF if so.
+		Pass is_pdf_viewer when the page metrics were already read, to skip reading them again.
 		Returns the download path if a PDF was downloaded, None otherwise.
 		"""
 		if not self.browser_profile.downloads_path or not self._auto_download_pdfs:
@@ -4752,7 +4994,8 @@ class BrowserSession(BaseModel):
 
 		try:
 			# Check if we're in a PDF viewer
-			is_pdf_viewer = await self._is_pdf_viewer(page)
+			if is_pdf_viewer is None:
+				is_pdf_viewer = await self._is_pdf_viewer(page)
 			self.logger.debug(f'is_pdf_viewer: {is_pdf_viewer}')
 
 			if not is_pdf_viewer:
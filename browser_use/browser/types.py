@@ -5,6 +5,7 @@ import sys
 from patchright._impl._errors import TargetClosedError as PatchrightTargetClosedError
 from patchright.async_api import Browser as PatchrightBrowser
 from patchright.async_api import BrowserContext as PatchrightBrowserContext
+from patchright.async_api import CDPSession as PatchrightCDPSession
 from patchright.async_api import ElementHandle as PatchrightElementHandle
 from patchright.async_api import FrameLocator as PatchrightFrameLocator
 from patchright.async_api import Page as PatchrightPage
@@ -13,6 +14,7 @@ from patchright.async_api import async_playwright as _async_patchright
 from playwright._impl._errors import TargetClosedError as PlaywrightTargetClosedError
 from playwright.async_api import Browser as PlaywrightBrowser
 from playwright.async_api import BrowserContext as PlaywrightBrowserContext
+from playwright.async_api import CDPSession as PlaywrightCDPSession
 from playwright.async_api import ElementHandle as PlaywrightElementHandle
 from playwright.async_api import FrameLocator as PlaywrightFrameLocator
 from playwright.async_api import Page as PlaywrightPage
@@ -22,6 +24,7 @@ from playwright.async_api import async_playwright as _async_playwright
 # Define types to be Union[Patchright, Playwright]
 Browser = PatchrightBrowser | PlaywrightBrowser
 BrowserContext = PatchrightBrowserContext | PlaywrightBrowserContext
+CDPSession = PatchrightCDPSession | PlaywrightCDPSession
 Page = PatchrightPage | PlaywrightPage
 ElementHandle = PatchrightElementHandle | PlaywrightElementHandle
 FrameLocator = PatchrightFrameLocator | PlaywrightFrameLocator
@@ -46,6 +46,15 @@ class PageInfo(BaseModel):
 	# Page statistics are now computed dynamically instead of stored
 
 
+class PageMetrics(BaseModel):
+	"""Page size, scroll position, title and content type, read from the page in a single evaluation"""
+
+	page_info: PageInfo
+	title: str
+	content_type: str | None = None  # document.contentType, e.g. text/html or application/pdf
+	is_pdf_viewer: bool = False
+
+
 @dataclass
 class BrowserStateSummary(DOMState):
 	"""The summary of the browser's current state designed for an LLM to process"""
@@ -66,6 +75,11 @@ class BrowserStateSummary(DOMState):
 	browser_errors: list[str] = field(default_factory=list)
 	is_pdf_viewer: bool = False  # Whether the current page is a PDF viewer
 	loading_status: str | None = None  # Message about page loading status (e.g., network timeout)
+	content_type: str | None = None  # document.contentType of the page
+	blocked_requests: int = 0  # requests blocked by the profile's resource_policy so far in this session
+	estimated_bytes_saved: int = 0  # estimated bytes those blocked requests would have downloaded
+	dom_snapshot_id: str | None = None  # Incremental DOM snapshot the tree was built from, unchanged page -> same id
+	timings: dict[str, float] = field(default_factory=dict, repr=False)  # Seconds spent in each step of the state capture
 
 
 @dataclass
@@ -201,6 +201,11 @@ class FlatEnvConfig(BaseSettings):
 	AZURE_OPENAI_KEY: str = Field(default='')
 	SKIP_LLM_API_KEY_VERIFICATION: bool = Field(default=False)
 
+	# LLM HTTP connection pooling (see browser_use/llm/client_pool.py)
+	BROWSER_USE_LLM_MAX_CONNECTIONS: int = Field(default=100)
+	BROWSER_USE_LLM_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=20)
+	BROWSER_USE_LLM_KEEPALIVE_EXPIRY: float = Field(default=60.0)
+
 	# Runtime hints
 	IN_DOCKER: bool | None = Field(default=None)
 	IS_IN_EVALS: bool = Field(default=False)
@@ -3,6 +3,7 @@ import functools
 import inspect
 import logging
 import re
+from collections import OrderedDict
 from collections.abc import Callable
 from inspect import Parameter, iscoroutinefunction, signature
 from types import UnionType
@@ -36,6 +37,11 @@ class Registry(Generic[Context]):
 		self.registry = ActionRegistry()
 		self.telemetry = ProductTelemetry()
 		self.exclude_actions = exclude_actions if exclude_actions is not None else []
+		# ActionModel types by the names of the actions they include, least recently used evicted first
+		self._action_models: OrderedDict[tuple[str, ...], type[ActionModel]] = OrderedDict()
+		self.action_model_cache_size = 32
+		self.action_model_cache_hits = 0
+		self.action_model_cache_misses = 0
 
 	def _get_special_param_types(self) -> dict[str, type | UnionType | None]:
 		"""Get the expected types for special parameters from SpecialActionParameters"""
@@ -303,6 +309,8 @@ class Registry(Generic[Context]):
 				page_filter=page_filter,
 			)
 			self.registry.actions[func.__name__] = action
+			# cached action models were built from the previous set of actions
+			self._action_models.clear()
 
 			# Return the normalized function so it can be called with kwargs
 			return normalized_func
@@ -365,6 +373,9 @@ class Registry(Generic[Context]):
 				if 'page' in sig.parameters:
 					special_context['page'] = await browser_session.get_current_page()
 
+			if browser_session:
+				browser_session.note_page_mutation()
+
 			# All functions are now normalized to accept kwargs only
 			# Call with params and unpacked special context
 			try:
@@ -477,9 +488,10 @@ class Registry(Generic[Context]):
 
 		Each action model contains only the specific action being used,
 		rather than all actions with most set to None.
-		"""
-		from typing import Union
 
+		Models are cached by the set of actions that pass the filters, so pages allowing the same
+		actions get the same model type instead of a new one per step.
+		"""
 		# Filter actions based on page if provided:
 		#   if page is None, only include actions with no filters
 		#   if page is provided, only include actions that match the page
@@ -503,6 +515,24 @@ class Registry(Generic[Context]):
 			if domain_is_allowed and page_is_allowed:
 				available_actions[name] = action
 
+		key = tuple(available_actions)
+		cached = self._action_models.get(key)
+		if cached is not None:
+			self._action_models.move_to_end(key)
+			self.action_model_cache_hits += 1
+			return cached
+
+		self.action_model_cache_misses += 1
+		action_model = self._build_action_model(available_actions)
+		self._action_models[key] = action_model
+		while len(self._action_models) > self.action_model_cache_size:
+			self._action_models.popitem(last=False)
+		return action_model
+
+	def _build_action_model(self, available_actions: dict[str, RegisteredAction]) -> type[ActionModel]:
+		"""Build the Union of individual action models for create_action_model()"""
+		from typing import Union
+
 		# Create individual action models for each action
 		individual_action_models: list[type[BaseModel]] = []
 
@@ -562,6 +592,15 @@ class Registry(Generic[Context]):
 
 		return result_model  # type:ignore
 
+	def action_model_cache_stats(self) -> dict[str, Any]:
+		lookups = self.action_model_cache_hits + self.action_model_cache_misses
+		return {
+			'size': len(self._action_models),
+			'hits': self.action_model_cache_hits,
+			'misses': self.action_model_cache_misses,
+			'hit_rate': round(self.action_model_cache_hits / lookups, 3) if lookups else None,
+		}
+
 	def get_prompt_description(self, page=None) -> str:
 		"""Get a description of all actions for the prompt
 
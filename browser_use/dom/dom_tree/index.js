@@ -4,9 +4,15 @@
     focusHighlightIndex: -1,
     viewportExpansion: 0,
     debugMode: false,
+    incremental: false,
+    knownSnapshotId: null,
+    packed: false,
   }
 ) => {
   const { doHighlightElements, focusHighlightIndex, viewportExpansion, debugMode } = args;
+  const incremental = Boolean(args.incremental);
+  const knownSnapshotId = args.knownSnapshotId ?? null;
+  const packed = Boolean(args.packed);
   let highlightIndex = 0; // Reset highlight index
 
   // Add caching mechanisms at the top level
@@ -95,6 +101,136 @@
 
   const HIGHLIGHT_CONTAINER_ID = "playwright-highlight-container";
 
+  /**
+   * Persistent per-document registry used in incremental mode.
+   *
+   * Nodes keep the same id across snapshots (stored in a WeakMap), the last serialized
+   * form of every node is remembered so only changed nodes are returned, and a
+   * MutationObserver (plus input/focus/transition listeners) collects the nodes that changed
+   * since into a dirty set. The next snapshot only analyses the dirty subtrees and their
+   * ancestors again, every other subtree is copied from the last snapshot (only renumbering
+   * highlight indexes), and an untouched page skips the traversal entirely. Events that move
+   * the whole layout (page scroll, resize, loads), mutations that can move or cover elements
+   * outside their own subtree (elements added or removed, class/style/visibility changes, e.g. a
+   * modal opening) and dirty sets too large to be worth it fall back to a full traversal, so the
+   * incremental path only covers text and form value changes.
+   */
+  const REGISTRY_KEY = "__browserUseDomRegistry";
+  const MAX_DIRTY_NODES = 500;
+  // attributes that can change the size, position, stacking or visibility of an element
+  const LAYOUT_ATTRIBUTES = new Set(["class", "style", "hidden", "open", "width", "height", "src", "colspan", "rowspan"]);
+
+  function shiftsLayout(record) {
+    if (record.type === "attributes") return LAYOUT_ATTRIBUTES.has(record.attributeName);
+    if (record.type === "childList") {
+      return [...record.addedNodes, ...record.removedNodes].some(node => node.nodeType === Node.ELEMENT_NODE);
+    }
+    return false;
+  }
+
+  function isHighlightNode(node) {
+    if (!node) return false;
+    const element = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+    return Boolean(element && (element.id === HIGHLIGHT_CONTAINER_ID || element.closest?.(`#${HIGHLIGHT_CONTAINER_ID}`)));
+  }
+
+  function isOwnMutation(record) {
+    if (record.type === "attributes" && record.attributeName === "browser-user-highlight-id") return true;
+    if (isHighlightNode(record.target)) return true;
+    if (record.type === "childList") {
+      const touched = [...record.addedNodes, ...record.removedNodes];
+      return touched.length > 0 && touched.every(node => node.id === HIGHLIGHT_CONTAINER_ID || isHighlightNode(node));
+    }
+    return false;
+  }
+
+  function createRegistry() {
+    const registry = {
+      document,
+      token: Math.random().toString(36).slice(2),
+      counter: 0,
+      snapshotId: null,
+      nodeIds: new WeakMap(),
+      nextId: 0,
+      nodes: new Map(), // id -> JSON of the node data sent in the last snapshot
+      data: new Map(), // id -> node data sent in the last snapshot
+      elements: new Map(), // id -> DOM node, to redraw the highlights of copied subtrees
+      parentHighlighted: new Map(), // id -> isParentHighlighted the node data was built with
+      rootId: null,
+      argsKey: null,
+      dirtyNodes: new Set(), // nodes whose subtree changed since the last snapshot
+      layoutDirty: true, // everything may have moved, the next snapshot traverses the whole document
+      // shadow roots and iframes are not covered by the observer, pages with them are always re-traversed
+      hasUnobservedRegions: false,
+      highlighted: [],
+    };
+    const markNodeDirty = (node) => {
+      if (registry.layoutDirty) return;
+      registry.dirtyNodes.add(node);
+      if (registry.dirtyNodes.size > MAX_DIRTY_NODES) {
+        registry.layoutDirty = true;
+        registry.dirtyNodes.clear();
+      }
+    };
+    const markLayoutDirty = () => {
+      registry.layoutDirty = true;
+      registry.dirtyNodes.clear();
+    };
+    // events on an element only affect its subtree, events on the document or window (page scroll) move everything
+    const markTargetDirty = (event) => {
+      if (event.target?.nodeType === Node.ELEMENT_NODE) markNodeDirty(event.target);
+      else markLayoutDirty();
+    };
+    registry.collect = (records) => {
+      for (const record of records) {
+        if (isOwnMutation(record)) continue;
+        if (shiftsLayout(record)) markLayoutDirty();
+        else markNodeDirty(record.target);
+      }
+    };
+    registry.observer = new MutationObserver(registry.collect);
+    registry.observer.observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+    for (const type of ["scroll", "input", "change", "focusin", "transitionend", "animationend"]) {
+      window.addEventListener(type, markTargetDirty, { capture: true, passive: true });
+    }
+    // a resize or a loaded image or frame changes the size of everything around it
+    for (const type of ["resize", "load"]) {
+      window.addEventListener(type, markLayoutDirty, { capture: true, passive: true });
+    }
+    return registry;
+  }
+
+  let registry = null;
+  if (incremental) {
+    registry = window[REGISTRY_KEY];
+    if (!registry || registry.document !== document) {
+      registry = createRegistry();
+      window[REGISTRY_KEY] = registry;
+    }
+  }
+
+  // Set while re-traversing a document of which only some subtrees are dirty, see buildDomTree()
+  let reuse = null;
+  let rebuildDepth = 0; // > 0 inside a dirty subtree
+  const copiedIds = new Set(); // nodes whose data was copied unchanged from the last snapshot
+
+  /**
+   * Returns the id for a node: a per-call counter normally, a stable id in incremental mode.
+   *
+   * @param {Node} node - The node to get the id for.
+   * @returns {string} The node id.
+   */
+  function nextNodeId(node) {
+    if (!registry) return `${ID.current++}`;
+    let id = registry.nodeIds.get(node);
+    if (id === undefined) {
+      id = `${registry.nextId++}`;
+      registry.nodeIds.set(node, id);
+    }
+    registry.elements.set(id, node);
+    return id;
+  }
+
   // Add a WeakMap cache for XPath strings
   const xpathCache = new WeakMap();
 
@@ -1158,6 +1294,7 @@
       // regardless of viewport status
       if (nodeData.isInViewport || viewportExpansion === -1) {
         nodeData.highlightIndex = highlightIndex++;
+        if (registry) registry.highlighted.push([node, nodeData.highlightIndex, parentIframe]);
 
         if (doHighlightElements) {
           if (focusHighlightIndex >= 0) {
@@ -1178,7 +1315,8 @@
   }
 
   /**
-   * Creates a node data object for a given node and its descendants.
+   * Creates the node data objects of a node and its descendants, copying clean subtrees from
+   * the last snapshot in incremental mode.
    *
    * @param {HTMLElement} node - The node to process.
    * @param {HTMLElement | null} parentIframe - The parent iframe node.
@@ -1186,6 +1324,71 @@
    * @returns {string | null} The ID of the node data object, or null if the node is not processed.
    */
   function buildDomTree(node, parentIframe = null, isParentHighlighted = false) {
+    if (!registry) return buildNodeData(node, parentIframe, isParentHighlighted);
+
+    if (reuse && rebuildDepth === 0 && node) {
+      if (reuse.dirtyNodes.has(node)) {
+        // the whole subtree of a dirty node is analysed again
+        rebuildDepth++;
+        try {
+          return buildRecordedNodeData(node, parentIframe, isParentHighlighted);
+        } finally {
+          rebuildDepth--;
+        }
+      }
+      const id = registry.nodeIds.get(node);
+      if (
+        !reuse.dirtyAncestors.has(node) &&
+        id !== undefined &&
+        registry.data.has(id) &&
+        registry.parentHighlighted.get(id) === isParentHighlighted
+      ) {
+        copySubtreeData(id);
+        return id;
+      }
+    }
+    return buildRecordedNodeData(node, parentIframe, isParentHighlighted);
+  }
+
+  function buildRecordedNodeData(node, parentIframe, isParentHighlighted) {
+    const id = buildNodeData(node, parentIframe, isParentHighlighted);
+    if (id !== null) registry.parentHighlighted.set(id, isParentHighlighted);
+    return id;
+  }
+
+  /**
+   * Copies the node data of a clean subtree from the last snapshot, renumbering its highlight
+   * indexes in traversal order and redrawing its highlights.
+   *
+   * @param {string} id - The id of the subtree root.
+   */
+  function copySubtreeData(id) {
+    let nodeData = registry.data.get(id);
+    if (nodeData.highlightIndex !== undefined) {
+      const index = highlightIndex++;
+      if (index !== nodeData.highlightIndex) nodeData = { ...nodeData, highlightIndex: index };
+      const element = registry.elements.get(id);
+      registry.highlighted.push([element, index, null]);
+      if (doHighlightElements && (focusHighlightIndex < 0 || focusHighlightIndex === index)) {
+        highlightElement(element, index, null);
+      }
+    }
+    if (nodeData === registry.data.get(id)) copiedIds.add(id);
+    DOM_HASH_MAP[id] = nodeData;
+    for (const childId of nodeData.children ?? []) {
+      copySubtreeData(childId);
+    }
+  }
+
+  /**
+   * Creates a node data object for a given node and its descendants.
+   *
+   * @param {HTMLElement} node - The node to process.
+   * @param {HTMLElement | null} parentIframe - The parent iframe node.
+   * @param {boolean} isParentHighlighted - Whether the parent node is highlighted.
+   * @returns {string | null} The ID of the node data object, or null if the node is not processed.
+   */
+  function buildNodeData(node, parentIframe = null, isParentHighlighted = false) {
     // Fast rejection checks first
     if (!node || node.id === HIGHLIGHT_CONTAINER_ID ||
       (node.nodeType !== Node.ELEMENT_NODE && node.nodeType !== Node.TEXT_NODE)) {
@@ -1211,7 +1414,7 @@
         if (domElement) nodeData.children.push(domElement);
       }
 
-      const id = `${ID.current++}`;
+      const id = nextNodeId(node);
       DOM_HASH_MAP[id] = nodeData;
       return id;
     }
@@ -1234,7 +1437,7 @@
         return null;
       }
 
-      const id = `${ID.current++}`;
+      const id = nextNodeId(node);
       DOM_HASH_MAP[id] = {
         type: "TEXT_NODE",
         text: textContent,
@@ -1330,6 +1533,7 @@
 
       // Handle iframes
       if (tagName === "iframe") {
+        if (registry) registry.hasUnobservedRegions = true;
         try {
           const iframeDoc = node.contentDocument || node.contentWindow?.document;
           if (iframeDoc) {
@@ -1360,6 +1564,7 @@
         // Handle shadow DOM
         if (node.shadowRoot) {
           nodeData.shadowRoot = true;
+          if (registry) registry.hasUnobservedRegions = true;
           for (const child of node.shadowRoot.childNodes) {
             const domElement = buildDomTree(child, parentIframe, nodeWasHighlighted);
             if (domElement) nodeData.children.push(domElement);
@@ -1386,15 +1591,185 @@
       }
     }
 
-    const id = `${ID.current++}`;
+    const id = nextNodeId(node);
     DOM_HASH_MAP[id] = nodeData;
     return id;
   }
 
+  // Flag bits of the packed wire format, mirrored in browser_use/dom/service.py
+  const PACKED_TEXT_NODE = 1;
+  const PACKED_VISIBLE = 2;
+  const PACKED_TOP_ELEMENT = 4;
+  const PACKED_INTERACTIVE = 8;
+  const PACKED_IN_VIEWPORT = 16;
+  const PACKED_SHADOW_ROOT = 32;
+
+  /**
+   * Packs a node map into columnar arrays: one row per node, tag names, xpaths, texts and
+   * attribute names/values interned in a shared string table, booleans folded into a flag
+   * bitmask, and attributes/children stored as flat arrays addressed by per-row offsets.
+   *
+   * @param {Object<string, any>} nodeMap - Node data objects keyed by node id.
+   * @returns {Object} The packed node map.
+   */
+  function packNodeMap(nodeMap) {
+    const strings = [];
+    const stringIndex = new Map();
+    const intern = (value) => {
+      let index = stringIndex.get(value);
+      if (index === undefined) {
+        index = strings.length;
+        strings.push(value);
+        stringIndex.set(value, index);
+      }
+      return index;
+    };
+
+    const ids = [];
+    const flags = [];
+    const tags = [];
+    const xpaths = [];
+    const texts = [];
+    const highlights = [];
+    const attrOffsets = [0];
+    const attrNames = [];
+    const attrValues = [];
+    const childOffsets = [0];
+    const childIds = [];
+
+    for (const [id, nodeData] of Object.entries(nodeMap)) {
+      ids.push(Number(id));
+      if (nodeData.type === "TEXT_NODE") {
+        flags.push(PACKED_TEXT_NODE | (nodeData.isVisible ? PACKED_VISIBLE : 0));
+        tags.push(-1);
+        xpaths.push(-1);
+        texts.push(intern(nodeData.text));
+        highlights.push(-1);
+      } else {
+        flags.push(
+          (nodeData.isVisible ? PACKED_VISIBLE : 0) |
+          (nodeData.isTopElement ? PACKED_TOP_ELEMENT : 0) |
+          (nodeData.isInteractive ? PACKED_INTERACTIVE : 0) |
+          (nodeData.isInViewport ? PACKED_IN_VIEWPORT : 0) |
+          (nodeData.shadowRoot ? PACKED_SHADOW_ROOT : 0)
+        );
+        tags.push(intern(nodeData.tagName));
+        xpaths.push(intern(nodeData.xpath));
+        texts.push(-1);
+        highlights.push(nodeData.highlightIndex ?? -1);
+        for (const [name, value] of Object.entries(nodeData.attributes)) {
+          attrNames.push(intern(name));
+          attrValues.push(value === null ? -1 : intern(value));
+        }
+        for (const childId of nodeData.children) {
+          childIds.push(Number(childId));
+        }
+      }
+      attrOffsets.push(attrNames.length);
+      childOffsets.push(childIds.length);
+    }
+
+    return { strings, ids, flags, tags, xpaths, texts, highlights, attrOffsets, attrNames, attrValues, childOffsets, childIds };
+  }
+
+  /**
+   * Builds the result object, swapping the node map for its packed form if requested.
+   */
+  function buildResult(nodeMap, extra) {
+    if (packed) {
+      return { ...extra, packed: packNodeMap(nodeMap) };
+    }
+    return { ...extra, map: nodeMap };
+  }
+
+  const argsKey = JSON.stringify([doHighlightElements, focusHighlightIndex, viewportExpansion]);
+
+  // mutations made since the observer last ran are still queued
+  if (registry) registry.collect(registry.observer.takeRecords());
+
+  // The caller has the last snapshot and only the dirty subtrees may have changed since
+  const canCopyCleanSubtrees = Boolean(
+    registry &&
+    !registry.layoutDirty &&
+    !registry.hasUnobservedRegions &&
+    registry.snapshotId !== null &&
+    registry.snapshotId === knownSnapshotId &&
+    registry.argsKey === argsKey &&
+    document.readyState === "complete"
+  );
+
+  // Nothing changed since the snapshot the caller already has: redraw the highlights and skip the traversal
+  if (canCopyCleanSubtrees && registry.dirtyNodes.size === 0) {
+    if (doHighlightElements) {
+      for (const [element, index, parentIframe] of registry.highlighted) {
+        if (focusHighlightIndex >= 0 && focusHighlightIndex !== index) continue;
+        if (element.isConnected) highlightElement(element, index, parentIframe);
+      }
+    }
+    return buildResult({}, { rootId: registry.rootId, snapshotId: registry.snapshotId, unchanged: true });
+  }
+
+  // a change above the body (e.g. a class on <html>) can restyle every node
+  if (canCopyCleanSubtrees && ![...registry.dirtyNodes].some(node => node !== document.body && node.contains?.(document.body))) {
+    const dirtyAncestors = new Set();
+    for (const node of registry.dirtyNodes) {
+      let current = node.parentNode;
+      while (current && !dirtyAncestors.has(current)) {
+        dirtyAncestors.add(current);
+        current = current.parentNode;
+      }
+    }
+    reuse = { dirtyNodes: registry.dirtyNodes, dirtyAncestors };
+  }
+  if (registry) {
+    registry.dirtyNodes = new Set();
+    registry.layoutDirty = false;
+    registry.hasUnobservedRegions = false;
+    registry.highlighted = [];
+  }
+
   const rootId = buildDomTree(document.body);
 
   // Clear the cache before starting
   DOM_CACHE.clearCache();
 
-  return { rootId, map: DOM_HASH_MAP };
+  if (!registry) {
+    return buildResult(DOM_HASH_MAP, { rootId });
+  }
+
+  // Incremental mode: only send nodes whose data changed since the caller's snapshot
+  const baseSnapshotId = registry.snapshotId;
+  const isDelta = baseSnapshotId !== null && baseSnapshotId === knownSnapshotId;
+  const changed = {};
+  const removed = [];
+  const serialized = new Map();
+  for (const [id, nodeData] of Object.entries(DOM_HASH_MAP)) {
+    if (copiedIds.has(id)) {
+      // copied unchanged from the last snapshot
+      serialized.set(id, registry.nodes.get(id));
+      continue;
+    }
+    const json = JSON.stringify(nodeData);
+    serialized.set(id, json);
+    if (!isDelta || registry.nodes.get(id) !== json) changed[id] = nodeData;
+  }
+  for (const id of registry.nodes.keys()) {
+    if (serialized.has(id)) continue;
+    if (isDelta) removed.push(id);
+    registry.elements.delete(id);
+    registry.parentHighlighted.delete(id);
+  }
+
+  registry.nodes = serialized;
+  registry.data = new Map(Object.entries(DOM_HASH_MAP));
+  registry.rootId = rootId;
+  registry.argsKey = argsKey;
+  registry.snapshotId = `${registry.token}:${++registry.counter}`;
+
+  return buildResult(changed, {
+    rootId,
+    removed,
+    snapshotId: registry.snapshotId,
+    baseSnapshotId: isDelta ? baseSnapshotId : null,
+  });
 };
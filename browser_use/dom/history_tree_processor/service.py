@@ -1,6 +1,7 @@
 import hashlib
 
 from browser_use.dom.history_tree_processor.view import DOMHistoryElement, HashedDomElement
+from browser_use.dom.utils import EMPTY_BRANCH_PATH_HASH, branch_path_hash_step, format_hash
 from browser_use.dom.views import DOMElementNode
 
 
@@ -36,8 +37,7 @@ class HistoryTreeProcessor:
 
 		def process_node(node: DOMElementNode):
 			if node.highlight_index is not None:
-				hashed_node = HistoryTreeProcessor._hash_dom_element(node)
-				if hashed_node == hashed_dom_history_element:
+				if node.hash == hashed_dom_history_element:
 					return node
 			for child in node.children:
 				if isinstance(child, DOMElementNode):
@@ -51,9 +51,8 @@ class HistoryTreeProcessor:
 	@staticmethod
 	def compare_history_element_and_dom_element(dom_history_element: DOMHistoryElement, dom_element: DOMElementNode) -> bool:
 		hashed_dom_history_element = HistoryTreeProcessor._hash_dom_history_element(dom_history_element)
-		hashed_dom_element = HistoryTreeProcessor._hash_dom_element(dom_element)
 
-		return hashed_dom_history_element == hashed_dom_element
+		return hashed_dom_history_element == dom_element.hash
 
 	@staticmethod
 	def _hash_dom_history_element(dom_history_element: DOMHistoryElement) -> HashedDomElement:
@@ -65,8 +64,9 @@ class HistoryTreeProcessor:
 
 	@staticmethod
 	def _hash_dom_element(dom_element: DOMElementNode) -> HashedDomElement:
-		parent_branch_path = HistoryTreeProcessor._get_parent_branch_path(dom_element)
-		branch_path_hash = HistoryTreeProcessor._parent_branch_path_hash(parent_branch_path)
+		"""Use dom_element.hash instead, it is memoized on the node"""
+		# the branch path hash is derived from the (memoized) parent's instead of walking to the root
+		branch_path_hash = format_hash(dom_element.get_branch_path_hash())
 		attributes_hash = HistoryTreeProcessor._attributes_hash(dom_element.attributes)
 		xpath_hash = HistoryTreeProcessor._xpath_hash(dom_element.xpath)
 		# text_hash = DomTreeProcessor._text_hash(dom_element)
@@ -87,17 +87,19 @@ class HistoryTreeProcessor:
 
 	@staticmethod
 	def _parent_branch_path_hash(parent_branch_path: list[str]) -> str:
-		parent_branch_path_string = '/'.join(parent_branch_path)
-		return hashlib.sha256(parent_branch_path_string.encode()).hexdigest()
+		# same derivation as DOMElementNode.get_branch_path_hash(), one tag at a time
+		branch_path_hash = EMPTY_BRANCH_PATH_HASH
+		for tag_name in parent_branch_path:
+			branch_path_hash = branch_path_hash_step(branch_path_hash, tag_name)
+		return format_hash(branch_path_hash)
 
 	@staticmethod
 	def _attributes_hash(attributes: dict[str, str]) -> str:
-		attributes_string = ''.join(f'{key}={value}' for key, value in attributes.items())
-		return hashlib.sha256(attributes_string.encode()).hexdigest()
+		return format_hash(hash(tuple(attributes.items())))
 
 	@staticmethod
 	def _xpath_hash(xpath: str) -> str:
-		return hashlib.sha256(xpath.encode()).hexdigest()
+		return format_hash(hash(xpath))
 
 	@staticmethod
 	def _text_hash(dom_element: DOMElementNode) -> str:
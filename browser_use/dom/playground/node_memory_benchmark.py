@@ -0,0 +1,56 @@
+"""
+Measure the memory held by a constructed DOM tree, per node.
+
+Uses the synthetic listing page from packed_format_benchmark and counts, with tracemalloc, what stays
+allocated once a buildDomTree result has been decoded from JSON, turned into DOMElementNode/DOMTextNode
+objects and dropped: the nodes, the strings and attribute dicts they keep alive, children lists and the
+selector map, for both wire formats.
+
+Run with: python -m browser_use.dom.playground.node_memory_benchmark [node_count]
+"""
+
+import asyncio
+import gc
+import json
+import sys
+import tracemalloc
+
+from browser_use.dom.playground.packed_format_benchmark import _NoPage, build_synthetic_page
+from browser_use.dom.service import DomService, pack_node_map
+
+
+async def measure_tree_memory(message: str) -> int:
+	"""Bytes still allocated while the tree built from the JSON message is alive"""
+	service = DomService(_NoPage())  # type: ignore[arg-type]
+	gc.collect()
+	tracemalloc.start()
+	try:
+		before = tracemalloc.get_traced_memory()[0]
+		eval_page = json.loads(message)
+		tree = await service._construct_dom_tree(eval_page)
+		del eval_page
+		gc.collect()
+		after = tracemalloc.get_traced_memory()[0]
+	finally:
+		tracemalloc.stop()
+	del tree
+	return after - before
+
+
+async def run_benchmark(node_count: int = 12000) -> dict:
+	dict_page = build_synthetic_page(node_count)
+	packed_page = {'rootId': dict_page['rootId'], 'packed': pack_node_map(dict_page['map'])}
+	return {
+		'nodes': len(dict_page['map']),
+		'dict_bytes': await measure_tree_memory(json.dumps(dict_page)),
+		'packed_bytes': await measure_tree_memory(json.dumps(packed_page)),
+	}
+
+
+if __name__ == '__main__':
+	node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 12000
+	results = asyncio.run(run_benchmark(node_count))
+	nodes = results['nodes']
+	print(f'nodes:           {nodes}')
+	print(f'dict format:     {results["dict_bytes"] / 1024:.0f} KiB  ({results["dict_bytes"] / nodes:.0f} B/node)')
+	print(f'packed format:   {results["packed_bytes"] / 1024:.0f} KiB  ({results["packed_bytes"] / nodes:.0f} B/node)')
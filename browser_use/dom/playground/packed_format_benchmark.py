@@ -0,0 +1,171 @@
+"""
+Benchmark the packed (columnar) DOM wire format against the per-node dict map.
+
+Builds a synthetic buildDomTree result shaped like a large listing page (nested containers,
+links and buttons with attributes, text nodes) and compares, for both formats:
+- the size of the protocol message carrying the evaluate() result
+- the time Playwright spends decoding that message into Python objects
+- the time DomService spends turning those objects into DOMElementNode trees
+
+Run with: python -m browser_use.dom.playground.packed_format_benchmark [node_count]
+"""
+
+import asyncio
+import gc
+import json
+import sys
+import time
+
+from playwright._impl._js_handle import parse_value, serialize_value
+
+from browser_use.dom.service import DomService, pack_node_map
+
+
+def build_synthetic_page(target_nodes: int = 12000) -> dict:
+	"""Return a buildDomTree-style {rootId, map} with roughly target_nodes nodes, children before parents"""
+	node_map: dict[str, dict] = {}
+	next_id = 0
+	highlight_index = 0
+
+	def add(node_data: dict) -> str:
+		nonlocal next_id
+		node_id = str(next_id)
+		next_id += 1
+		node_map[node_id] = node_data
+		return node_id
+
+	sections = []
+	section_index = 0
+	while next_id < target_nodes:
+		items = []
+		for item_index in range(20):
+			base = f'html/body/div/main/section[{section_index + 1}]/ul/li[{item_index + 1}]'
+			link_text = add({'type': 'TEXT_NODE', 'text': f'Result {section_index}-{item_index}', 'isVisible': True})
+			link = add(
+				{
+					'tagName': 'a',
+					'xpath': f'{base}/a',
+					'attributes': {'href': f'/item/{section_index}/{item_index}', 'class': 'result-link card__title'},
+					'children': [link_text],
+					'isVisible': True,
+					'isTopElement': True,
+					'isInteractive': True,
+					'isInViewport': section_index < 2,
+					'highlightIndex': highlight_index,
+				}
+			)
+			highlight_index += 1
+			price_text = add({'type': 'TEXT_NODE', 'text': f'${item_index * 3}.99', 'isVisible': True})
+			price = add(
+				{
+					'tagName': 'span',
+					'xpath': f'{base}/span',
+					'attributes': {},
+					'children': [price_text],
+					'isVisible': True,
+				}
+			)
+			button_text = add({'type': 'TEXT_NODE', 'text': 'Add to cart', 'isVisible': True})
+			button = add(
+				{
+					'tagName': 'button',
+					'xpath': f'{base}/button',
+					'attributes': {'type': 'button', 'class': 'btn btn-primary', 'aria-label': 'Add to cart'},
+					'children': [button_text],
+					'isVisible': True,
+					'isTopElement': True,
+					'isInteractive': True,
+					'highlightIndex': highlight_index,
+				}
+			)
+			highlight_index += 1
+			items.append(
+				add(
+					{
+						'tagName': 'li',
+						'xpath': base,
+						'attributes': {},
+						'children': [link, price, button],
+						'isVisible': True,
+					}
+				)
+			)
+		section_list = add(
+			{
+				'tagName': 'ul',
+				'xpath': f'html/body/div/main/section[{section_index + 1}]/ul',
+				'attributes': {},
+				'children': items,
+				'isVisible': True,
+			}
+		)
+		sections.append(
+			add(
+				{
+					'tagName': 'section',
+					'xpath': f'html/body/div/main/section[{section_index + 1}]',
+					'attributes': {},
+					'children': [section_list],
+					'isVisible': True,
+				}
+			)
+		)
+		section_index += 1
+
+	main = add({'tagName': 'main', 'xpath': 'html/body/div/main', 'attributes': {}, 'children': sections, 'isVisible': True})
+	wrapper = add({'tagName': 'div', 'xpath': 'html/body/div', 'attributes': {}, 'children': [main], 'isVisible': True})
+	root = add({'tagName': 'body', 'attributes': {}, 'xpath': '/body', 'children': [wrapper]})
+	return {'rootId': root, 'map': node_map}
+
+
+class _NoPage:
+	url = 'about:benchmark'
+
+
+async def _best_of(func, rounds: int) -> float:
+	best = float('inf')
+	for _ in range(rounds):
+		gc.collect()
+		start = time.perf_counter()
+		result = func()
+		if asyncio.iscoroutine(result):
+			await result
+		best = min(best, time.perf_counter() - start)
+	return best
+
+
+async def run_benchmark(node_count: int = 12000, rounds: int = 5) -> dict:
+	dict_page = build_synthetic_page(node_count)
+	packed_page = {'rootId': dict_page['rootId'], 'packed': pack_node_map(dict_page['map'])}
+
+	# evaluate() results arrive as Playwright's serialized-value JSON, which the client parses and then
+	# walks in pure Python (parse_value), so the payload shape matters as much as its size
+	dict_message = json.dumps(serialize_value(dict_page, []), separators=(',', ':'))
+	packed_message = json.dumps(serialize_value(packed_page, []), separators=(',', ':'))
+
+	service = DomService(_NoPage())  # type: ignore[arg-type]
+	return {
+		'nodes': len(dict_page['map']),
+		'dict_bytes': len(dict_message),
+		'packed_bytes': len(packed_message),
+		'dict_bridge_s': await _best_of(lambda: parse_value(json.loads(dict_message)), rounds),
+		'packed_bridge_s': await _best_of(lambda: parse_value(json.loads(packed_message)), rounds),
+		'dict_construct_s': await _best_of(lambda: service._construct_dom_tree(dict_page), rounds),
+		'packed_construct_s': await _best_of(lambda: service._construct_dom_tree(packed_page), rounds),
+	}
+
+
+if __name__ == '__main__':
+	node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 12000
+	results = asyncio.run(run_benchmark(node_count))
+	print(f'nodes:           {results["nodes"]}')
+	print(f'payload:         dict {results["dict_bytes"] / 1024:.0f} KiB  packed {results["packed_bytes"] / 1024:.0f} KiB')
+	print(f'result decode:   dict {results["dict_bridge_s"] * 1000:.1f} ms  packed {results["packed_bridge_s"] * 1000:.1f} ms')
+	print(
+		f'tree construct:  dict {results["dict_construct_s"] * 1000:.1f} ms  packed {results["packed_construct_s"] * 1000:.1f} ms'
+	)
+	total_dict = results['dict_bridge_s'] + results['dict_construct_s']
+	total_packed = results['packed_bridge_s'] + results['packed_construct_s']
+	print(
+		f'total:           dict {total_dict * 1000:.1f} ms  packed {total_packed * 1000:.1f} ms  ({total_dict / total_packed:.2f}x)'
+	)
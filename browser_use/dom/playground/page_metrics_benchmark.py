@@ -0,0 +1,92 @@
+"""
+Compare the page metric probes of a state capture before and after they were combined into one evaluation.
+
+Before: get_page_info, get_scroll_info (3 evaluations), page.title(), the PDF viewer check and the
+1+1 sanity check of the DOM build, each its own round-trip to the page.
+After: get_page_metrics, a single evaluation returning the same values.
+
+Serves a local test page (long scrollable listing) from a temporary directory, loads it in a headless
+BrowserSession and times both variants, interleaved, over many rounds.
+
+Run with: python -m browser_use.dom.playground.page_metrics_benchmark [rounds]
+"""
+
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.session import PAGE_METRICS_JS
+
+TEST_PAGE = (
+	'<!doctype html><html><head><title>Metrics test page</title></head><body>'
+	+ ''.join(f'<div class="row"><a href="/item/{i}">Item {i}</a><button>Add</button></div>' for i in range(2000))
+	+ '</body></html>'
+)
+
+PDF_VIEWER_JS = """() => {
+	const pdfEmbed = document.querySelector('embed[type="application/x-google-chrome-pdf"]') ||
+					 document.querySelector('embed[type="application/pdf"]');
+	const url = window.location.href;
+	return !!pdfEmbed || url.toLowerCase().includes('.pdf') || document.contentType === 'application/pdf';
+}"""
+
+PAGE_INFO_JS = """() => ({
+	viewport_width: window.innerWidth,
+	viewport_height: window.innerHeight,
+	page_width: Math.max(document.documentElement.scrollWidth, document.body.scrollWidth || 0),
+	page_height: Math.max(document.documentElement.scrollHeight, document.body.scrollHeight || 0),
+	scroll_x: window.scrollX || window.pageXOffset || document.documentElement.scrollLeft || 0,
+	scroll_y: window.scrollY || window.pageYOffset || document.documentElement.scrollTop || 0
+})"""
+
+
+async def separate_probes(page) -> None:
+	"""The round-trips a state capture made before the metrics were combined"""
+	await page.evaluate('1+1')
+	await page.evaluate(PAGE_INFO_JS)
+	await page.evaluate('window.scrollY')
+	await page.evaluate('window.innerHeight')
+	await page.evaluate('document.documentElement.scrollHeight')
+	await page.title()
+	await page.evaluate(PDF_VIEWER_JS)
+
+
+async def combined_probe(page) -> None:
+	await page.evaluate(PAGE_METRICS_JS)
+
+
+async def run_benchmark(rounds: int = 200) -> dict:
+	with tempfile.TemporaryDirectory() as tmp:
+		page_path = Path(tmp) / 'metrics.html'
+		page_path.write_text(TEST_PAGE)
+
+		browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None, keep_alive=False))
+		await browser_session.start()
+		try:
+			page = await browser_session.get_current_page()
+			await page.goto(page_path.as_uri())
+			await page.evaluate('window.scrollTo(0, 1500)')
+
+			timings = {'separate': [], 'combined': []}
+			for _ in range(rounds):
+				for name, probe in (('separate', separate_probes), ('combined', combined_probe)):
+					start = time.perf_counter()
+					await probe(page)
+					timings[name].append(time.perf_counter() - start)
+		finally:
+			await browser_session.kill()
+
+	return {name: statistics.median(values) * 1000 for name, values in timings.items()}
+
+
+if __name__ == '__main__':
+	rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+	results = asyncio.run(run_benchmark(rounds))
+	print(f'rounds:             {rounds}')
+	print(f'separate probes:    {results["separate"]:.2f} ms (median)')
+	print(f'combined probe:     {results["combined"]:.2f} ms (median)')
+	print(f'speedup:            {results["separate"] / results["combined"]:.1f}x')
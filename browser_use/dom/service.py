@@ -1,4 +1,11 @@
+import copy
+import hashlib
 import logging
+import sys
+import weakref
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import cache
 from importlib import resources
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
@@ -24,6 +31,165 @@ from browser_use.utils import is_new_tab_page, time_execution_async
 # 	height: int
 
 
+@dataclass
+class DOMSnapshotCache:
+	"""
+	Python side of an incremental snapshot: the tree built so far, patched by the next delta.
+
+	Once its nodes were handed out (in a DOMState), the next deltas copy the nodes they touch and their ancestors
+	instead of patching them, the trees and selector maps handed out earlier may still be in use (by the LLM prompt,
+	history items, new element checks). Untouched subtrees are shared by the old and new trees, their parent
+	pointer follows the newest tree (the ancestors it leads to stand for the same DOM elements).
+	"""
+
+	snapshot_id: str
+	root_id: str
+	node_map: dict[str, DOMBaseNode]
+	children_ids: dict[str, list[str]]
+	parent_ids: dict[str, str]
+	selector_map: SelectorMap
+	handed_out: bool = False
+
+
+# One cache per page, dropped together with the page object
+_snapshot_caches: 'weakref.WeakKeyDictionary[Page, DOMSnapshotCache]' = weakref.WeakKeyDictionary()
+
+
+@cache
+def get_dom_tree_js() -> str:
+	"""Source of dom_tree/index.js, read from the package resources once per process"""
+	return resources.files('browser_use.dom.dom_tree').joinpath('index.js').read_text()
+
+
+@cache
+def get_dom_runtime_version() -> str:
+	return hashlib.sha256(get_dom_tree_js().encode()).hexdigest()[:16]
+
+
+@cache
+def get_dom_runtime_install_js() -> str:
+	"""Script that defines window.__browserUse.buildDomTree, registered as an init script so every document has it"""
+	source = get_dom_tree_js().strip().rstrip(';')
+	version = get_dom_runtime_version()
+	return f"""(() => {{
+	const runtime = (window.__browserUse = window.__browserUse || {{}});
+	if (runtime.version === '{version}') return;
+	runtime.buildDomTree = {source};
+	runtime.version = '{version}';
+}})();"""
+
+
+# Flag bits of the packed wire format, mirrored in dom_tree/index.js
+PACKED_TEXT_NODE = 1
+PACKED_VISIBLE = 2
+PACKED_TOP_ELEMENT = 4
+PACKED_INTERACTIVE = 8
+PACKED_IN_VIEWPORT = 16
+PACKED_SHADOW_ROOT = 32
+
+
+def pack_node_map(node_map: dict) -> dict:
+	"""Python mirror of packNodeMap() in index.js, used to test and benchmark the decoder without a browser"""
+	strings: list[str] = []
+	string_index: dict[str, int] = {}
+
+	def intern(value: str) -> int:
+		index = string_index.get(value)
+		if index is None:
+			index = string_index[value] = len(strings)
+			strings.append(value)
+		return index
+
+	packed: dict[str, list] = {
+		key: [] for key in ('ids', 'flags', 'tags', 'xpaths', 'texts', 'highlights', 'attrNames', 'attrValues', 'childIds')
+	}
+	packed['attrOffsets'] = [0]
+	packed['childOffsets'] = [0]
+	for node_id, node_data in node_map.items():
+		packed['ids'].append(int(node_id))
+		if node_data.get('type') == 'TEXT_NODE':
+			packed['flags'].append(PACKED_TEXT_NODE | (PACKED_VISIBLE if node_data['isVisible'] else 0))
+			packed['tags'].append(-1)
+			packed['xpaths'].append(-1)
+			packed['texts'].append(intern(node_data['text']))
+			packed['highlights'].append(-1)
+		else:
+			packed['flags'].append(
+				(PACKED_VISIBLE if node_data.get('isVisible') else 0)
+				| (PACKED_TOP_ELEMENT if node_data.get('isTopElement') else 0)
+				| (PACKED_INTERACTIVE if node_data.get('isInteractive') else 0)
+				| (PACKED_IN_VIEWPORT if node_data.get('isInViewport') else 0)
+				| (PACKED_SHADOW_ROOT if node_data.get('shadowRoot') else 0)
+			)
+			packed['tags'].append(intern(node_data['tagName']))
+			packed['xpaths'].append(intern(node_data['xpath']))
+			packed['texts'].append(-1)
+			highlight_index = node_data.get('highlightIndex')
+			packed['highlights'].append(-1 if highlight_index is None else highlight_index)
+			for name, value in node_data.get('attributes', {}).items():
+				packed['attrNames'].append(intern(name))
+				packed['attrValues'].append(-1 if value is None else intern(value))
+			packed['childIds'].extend(int(child_id) for child_id in node_data.get('children', []))
+		packed['attrOffsets'].append(len(packed['attrNames']))
+		packed['childOffsets'].append(len(packed['childIds']))
+	packed['strings'] = strings
+	return packed
+
+
+def decode_packed_node_map(packed: dict) -> Iterator[tuple[str, DOMBaseNode, list[str]]]:
+	"""Decode the columnar node map sent by buildDomTree({packed: true}) in one pass.
+
+	Yields (node id, node, child ids) in the same order as the dict map, so callers that rely on
+	the bottom-up ordering of full snapshots keep working.
+	"""
+	strings = packed['strings']
+	flags = packed['flags']
+	tags = packed['tags']
+	xpaths = packed['xpaths']
+	texts = packed['texts']
+	highlights = packed['highlights']
+	attr_offsets = packed['attrOffsets']
+	attr_names = [strings[i] for i in packed['attrNames']]
+	# a missing value (-1) is an empty attribute, DOMElementNode.attributes only holds strings
+	attr_values = [strings[i] if i >= 0 else '' for i in packed['attrValues']]
+	child_offsets = packed['childOffsets']
+	child_ids = list(map(str, packed['childIds']))
+	node_ids = list(map(str, packed['ids']))
+
+	for row, node_id in enumerate(node_ids):
+		flag = flags[row]
+		if flag & PACKED_TEXT_NODE:
+			yield node_id, DOMTextNode(text=strings[texts[row]], is_visible=(flag & PACKED_VISIBLE) != 0, parent=None), []
+			continue
+
+		attr_start, attr_end = attr_offsets[row], attr_offsets[row + 1]
+		highlight_index = highlights[row]
+		element_node = DOMElementNode(
+			tag_name=strings[tags[row]],
+			xpath=strings[xpaths[row]],
+			attributes=dict(zip(attr_names[attr_start:attr_end], attr_values[attr_start:attr_end]))
+			if attr_end > attr_start
+			else {},
+			children=[],
+			is_visible=(flag & PACKED_VISIBLE) != 0,
+			is_interactive=(flag & PACKED_INTERACTIVE) != 0,
+			is_top_element=(flag & PACKED_TOP_ELEMENT) != 0,
+			is_in_viewport=(flag & PACKED_IN_VIEWPORT) != 0,
+			highlight_index=highlight_index if highlight_index >= 0 else None,
+			shadow_root=(flag & PACKED_SHADOW_ROOT) != 0,
+			parent=None,
+		)
+		yield node_id, element_node, child_ids[child_offsets[row] : child_offsets[row + 1]]
+
+
+# Small per-call payload: runs the installed analyzer, or returns null if this document doesn't have it (yet)
+CALL_DOM_RUNTIME_JS = """([version, args]) => {
+	const runtime = window.__browserUse;
+	if (!runtime || runtime.version !== version || typeof runtime.buildDomTree !== 'function') return null;
+	return runtime.buildDomTree(args);
+}"""
+
+
 class DomService:
 	logger: logging.Logger
 
@@ -31,8 +197,10 @@ class DomService:
 		self.page = page
 		self.xpath_cache = {}
 		self.logger = logger or logging.getLogger(__name__)
+		# id of the incremental snapshot the last tree was built from, the same while the page is unchanged
+		self.snapshot_id: str | None = None
 
-		self.js_code = resources.files('browser_use.dom.dom_tree').joinpath('index.js').read_text()
+		self.js_code = get_dom_tree_js()
 
 	# region - Clickable elements
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_clickable_elements')
@@ -42,10 +210,28 @@ class DomService:
 		highlight_elements: bool = True,
 		focus_element: int = -1,
 		viewport_expansion: int = 0,
+		incremental: bool = False,
+		packed: bool = False,
 	) -> DOMState:
-		element_tree, selector_map = await self._build_dom_tree(highlight_elements, focus_element, viewport_expansion)
+		element_tree, selector_map = await self._build_dom_tree(
+			highlight_elements, focus_element, viewport_expansion, incremental, packed
+		)
 		return DOMState(element_tree=element_tree, selector_map=selector_map)
 
+	@time_execution_async('--refresh_dom_snapshot')
+	async def refresh_dom_snapshot(
+		self, highlight_elements: bool = True, focus_element: int = -1, viewport_expansion: int = 0, packed: bool = False
+	) -> None:
+		"""
+		Bring the incremental snapshot of the page up to date without handing out its nodes.
+
+		Pass the arguments of the next get_clickable_elements() call, the page only copies clean subtrees into a
+		snapshot built with the same ones (the highlights change which elements get an index).
+		"""
+		await self._build_dom_tree(
+			highlight_elements, focus_element, viewport_expansion, incremental=True, packed=packed, hand_out=False
+		)
+
 	@time_execution_async('--get_cross_origin_iframes')
 	async def get_cross_origin_iframes(self) -> list[str]:
 		# invisible cross-origin iframes are used for ads and tracking, dont open those
@@ -70,10 +256,10 @@ class DomService:
 		highlight_elements: bool,
 		focus_element: int,
 		viewport_expansion: int,
+		incremental: bool = False,
+		packed: bool = False,
+		hand_out: bool = True,
 	) -> tuple[DOMElementNode, SelectorMap]:
-		if await self.page.evaluate('1+1') != 2:
-			raise ValueError('The page cannot evaluate javascript code properly')
-
 		if is_new_tab_page(self.page.url) or self.page.url.startswith('chrome://'):
 			# short-circuit if the page is a new empty tab or chrome:// page for speed, no need to inject buildDomTree.js
 			return (
@@ -97,11 +283,17 @@ class DomService:
 			'focusHighlightIndex': focus_element,
 			'viewportExpansion': viewport_expansion,
 			'debugMode': debug_mode,
+			'packed': packed,
 		}
+		snapshot_cache = _snapshot_caches.get(self.page) if incremental else None
+		if incremental:
+			# the page keeps a node registry between calls and only sends what changed since our snapshot
+			args['incremental'] = True
+			args['knownSnapshotId'] = snapshot_cache.snapshot_id if snapshot_cache else None
 
 		try:
 			self.logger.debug(f'🔧 Starting JavaScript DOM analysis for {self.page.url[:50]}...')
-			eval_page: dict = await self.page.evaluate(self.js_code, args)
+			eval_page: dict = await self._evaluate_dom_runtime(args)
 			self.logger.debug('✅ JavaScript DOM analysis completed')
 		except Exception as e:
 			self.logger.error('Error evaluating JavaScript: %s', e)
@@ -121,6 +313,8 @@ class DomService:
 				for node_data in eval_page['map'].values():
 					if isinstance(node_data, dict) and node_data.get('isInteractive'):
 						interactive_count += 1
+			elif 'packed' in eval_page:
+				interactive_count = sum(1 for flag in eval_page['packed']['flags'] if flag & PACKED_INTERACTIVE)
 
 			# Create concise summary
 			url_short = self.page.url[:50] + '...' if len(self.page.url) > 50 else self.page.url
@@ -133,26 +327,41 @@ class DomService:
 			)
 
 		self.logger.debug('🔄 Starting Python DOM tree construction...')
-		result = await self._construct_dom_tree(eval_page)
+		if incremental:
+			result = self._apply_dom_snapshot(eval_page, snapshot_cache, hand_out=hand_out)
+			self.snapshot_id = _snapshot_caches[self.page].snapshot_id
+		else:
+			result = await self._construct_dom_tree(eval_page)
 		self.logger.debug('✅ Python DOM tree construction completed')
 		return result
 
+	async def _evaluate_dom_runtime(self, args: dict) -> dict:
+		"""Run the buildDomTree installed in the page, installing it first if this document doesn't have it"""
+		version = get_dom_runtime_version()
+		eval_page = await self.page.evaluate(CALL_DOM_RUNTIME_JS, [version, args])
+		if eval_page is None:
+			# documents created before the init script was registered (or in pages we didn't set up) need it once
+			self.logger.debug('📥 Installing DOM analysis runtime into the page')
+			await self.page.evaluate(get_dom_runtime_install_js())
+			eval_page = await self.page.evaluate(CALL_DOM_RUNTIME_JS, [version, args])
+		if eval_page is None:
+			raise ValueError('Failed to install the DOM analysis runtime in the page')
+		if not isinstance(eval_page, dict):
+			# used to be a separate 1+1 round-trip before every build, the result itself tells us the same
+			raise ValueError('The page cannot evaluate javascript code properly')
+		return eval_page
+
 	@time_execution_async('--construct_dom_tree')
 	async def _construct_dom_tree(
 		self,
 		eval_page: dict,
 	) -> tuple[DOMElementNode, SelectorMap]:
-		js_node_map = eval_page['map']
 		js_root_id = eval_page['rootId']
 
 		selector_map = {}
 		node_map = {}
 
-		for id, node_data in js_node_map.items():
-			node, children_ids = self._parse_node(node_data)
-			if node is None:
-				continue
-
+		for id, node, children_ids in self._iter_nodes(eval_page):
 			node_map[id] = node
 
 			if isinstance(node, DOMElementNode) and node.highlight_index is not None:
@@ -173,7 +382,6 @@ class DomService:
 		html_to_dict = node_map[str(js_root_id)]
 
 		del node_map
-		del js_node_map
 		del js_root_id
 
 		if html_to_dict is None or not isinstance(html_to_dict, DOMElementNode):
@@ -181,10 +389,170 @@ class DomService:
 
 		return html_to_dict, selector_map
 
+	def _iter_nodes(self, eval_page: dict) -> Iterator[tuple[str, DOMBaseNode, list[str]]]:
+		"""Yield (id, node, child ids) from either the packed or the dict node map of a buildDomTree result"""
+		if 'packed' in eval_page:
+			yield from decode_packed_node_map(eval_page['packed'])
+			return
+
+		for id, node_data in eval_page['map'].items():
+			node, children_ids = self._parse_node(node_data)
+			if node is None:
+				continue
+			yield id, node, children_ids
+
+	def _apply_dom_snapshot(
+		self,
+		eval_page: dict,
+		cache: DOMSnapshotCache | None,
+		hand_out: bool = True,
+	) -> tuple[DOMElementNode, SelectorMap]:
+		"""
+		Build or patch the cached tree of this page from an incremental buildDomTree result.
+
+		hand_out=False is for callers that drop the returned tree, a cache that was never handed out is patched in place.
+		"""
+		snapshot_id = eval_page['snapshotId']
+		root_id = str(eval_page['rootId'])
+
+		if eval_page.get('unchanged') and cache is not None and cache.snapshot_id == snapshot_id:
+			self.logger.debug('♻️ DOM unchanged since last snapshot, reusing cached tree')
+			cache.handed_out = cache.handed_out or hand_out
+			return self._cached_root(cache), dict(cache.selector_map)
+
+		is_delta = cache is not None and eval_page.get('baseSnapshotId') == cache.snapshot_id
+		if not is_delta:
+			cache = DOMSnapshotCache(
+				snapshot_id=snapshot_id,
+				root_id=root_id,
+				node_map={},
+				children_ids={},
+				parent_ids={},
+				selector_map={},
+			)
+		assert cache is not None
+
+		node_map = cache.node_map
+		# selector maps handed out earlier stay untouched, actions compare them against the new one
+		selector_map = dict(cache.selector_map)
+
+		def forget(node_id: str) -> None:
+			old_node = node_map.pop(node_id, None)
+			if isinstance(old_node, DOMElementNode) and old_node.highlight_index is not None:
+				if selector_map.get(old_node.highlight_index) is old_node:
+					del selector_map[old_node.highlight_index]
+
+		for node_id in eval_page.get('removed', []):
+			forget(node_id)
+			cache.children_ids.pop(node_id, None)
+			cache.parent_ids.pop(node_id, None)
+
+		changed_ids = []
+		for node_id, node, children_ids in self._iter_nodes(eval_page):
+			forget(node_id)
+			node_map[node_id] = node
+			cache.children_ids[node_id] = [str(child_id) for child_id in children_ids]
+			changed_ids.append(node_id)
+
+		# relink every changed node and the parents of changed nodes, they hold stale child objects
+		relink_ids = set(changed_ids)
+		moved_ids = []
+		for node_id in changed_ids:
+			for child_id in cache.children_ids[node_id]:
+				if cache.parent_ids.get(child_id, node_id) != node_id:
+					moved_ids.append(child_id)
+				cache.parent_ids[child_id] = node_id
+		for node_id in changed_ids:
+			parent_id = cache.parent_ids.get(node_id)
+			if parent_id is not None:
+				relink_ids.add(parent_id)
+
+		if cache.handed_out:
+			# copy on write, the nodes handed out earlier keep their children, parents and memoized hashes
+			relink_ids |= self._copy_changed_path(cache, relink_ids - set(changed_ids), moved_ids, selector_map)
+
+		for node_id in relink_ids:
+			node = node_map.get(node_id)
+			if not isinstance(node, DOMElementNode):
+				continue
+			node.children = []
+			for child_id in cache.children_ids.get(node_id, []):
+				child_node = node_map.get(child_id)
+				if child_node is None:
+					continue
+				child_node.parent = node
+				node.children.append(child_node)
+
+		# element hashes are memoized along the branch path, which changed for moved subtrees
+		for node_id in moved_ids:
+			node = node_map.get(node_id)
+			if isinstance(node, DOMElementNode):
+				node.reset_hashes()
+
+		for node_id in changed_ids:
+			node = node_map[node_id]
+			if isinstance(node, DOMElementNode) and node.highlight_index is not None:
+				selector_map[node.highlight_index] = node
+
+		cache.snapshot_id = snapshot_id
+		cache.root_id = root_id
+		cache.selector_map = selector_map
+		# the nodes shared with a tree handed out earlier stay shared after a copy on write
+		cache.handed_out = cache.handed_out or hand_out
+		_snapshot_caches[self.page] = cache
+
+		self.logger.debug(
+			f'🧩 Applied {"delta" if is_delta else "full"} DOM snapshot: '
+			f'{len(changed_ids)} changed, {len(eval_page.get("removed", []))} removed, {len(node_map)} total nodes'
+		)
+		return self._cached_root(cache), dict(selector_map)
+
+	@staticmethod
+	def _copy_changed_path(
+		cache: DOMSnapshotCache, relinked_ids: set[str], moved_ids: list[str], selector_map: SelectorMap
+	) -> set[str]:
+		"""
+		Replace the cached nodes a delta is about to modify with shallow copies: the nodes whose children change,
+		the moved subtrees (their hashes are reset) and all their ancestors up to the root. Returns the ids of the
+		copies, which must be relinked to their children.
+		"""
+		copy_ids = set(relinked_ids)
+		stack = list(moved_ids)
+		while stack:
+			node_id = stack.pop()
+			if node_id not in copy_ids:
+				copy_ids.add(node_id)
+				stack.extend(cache.children_ids.get(node_id, []))
+		for node_id in list(copy_ids):
+			parent_id = cache.parent_ids.get(node_id)
+			while parent_id is not None and parent_id not in copy_ids:
+				copy_ids.add(parent_id)
+				parent_id = cache.parent_ids.get(parent_id)
+
+		copied = set()
+		for node_id in copy_ids:
+			node = cache.node_map.get(node_id)
+			if not isinstance(node, DOMElementNode):
+				continue
+			# memoized hashes stay valid, the copy has the same branch path (moved subtrees are reset afterwards)
+			node_copy = cache.node_map[node_id] = copy.copy(node)
+			node_copy.children = []
+			if node.highlight_index is not None and selector_map.get(node.highlight_index) is node:
+				selector_map[node.highlight_index] = node_copy
+			copied.add(node_id)
+		return copied
+
+	@staticmethod
+	def _cached_root(cache: DOMSnapshotCache) -> DOMElementNode:
+		root = cache.node_map.get(cache.root_id)
+		if root is None or not isinstance(root, DOMElementNode):
+			raise ValueError('Failed to parse HTML to dictionary')
+		return root
+
 	def _parse_node(
 		self,
 		node_data: dict,
-	) -> tuple[DOMBaseNode | None, list[int]]:
+	) -> tuple[DOMBaseNode | None, list[str]]:
 		if not node_data:
 			return None, []
 
@@ -208,7 +576,8 @@ class DomService:
 			)
 
 		element_node = DOMElementNode(
-			tag_name=node_data['tagName'],
+			# json.loads shares repeated object keys (attribute names) but not values, so intern tag names
+			tag_name=sys.intern(node_data['tagName']),
 			xpath=node_data['xpath'],
 			attributes=node_data.get('attributes', {}),
 			children=[],
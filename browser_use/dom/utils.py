@@ -2,3 +2,18 @@ def cap_text_length(text: str, max_length: int) -> str:
 	if len(text) > max_length:
 		return text[:max_length] + '...'
 	return text
+
+
+# Element hashes are built incrementally with the built-in hash(): a branch path hash is derived from the parent's,
+# so hashing every clickable element of a page is linear. Like hash() itself they are only comparable within one
+# process, which is all they are used for (new-element detection, multi_act page-change checks, history replay).
+EMPTY_BRANCH_PATH_HASH = 0
+
+
+def branch_path_hash_step(parent_hash: int, tag_name: str) -> int:
+	"""Hash of a branch path extended by one tag name"""
+	return hash((parent_hash, tag_name))
+
+
+def format_hash(value: int) -> str:
+	return f'{value & 0xFFFFFFFFFFFFFFFF:016x}'
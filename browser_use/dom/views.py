@@ -1,9 +1,8 @@
-from dataclasses import dataclass
-from functools import cached_property
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Optional
 
 from browser_use.dom.history_tree_processor.view import CoordinateSet, HashedDomElement, ViewportInfo
-from browser_use.dom.utils import cap_text_length
+from browser_use.dom.utils import EMPTY_BRANCH_PATH_HASH, branch_path_hash_step, cap_text_length
 from browser_use.utils import time_execution_sync
 
 # Avoid circular import issues
@@ -11,7 +10,11 @@ if TYPE_CHECKING:
 	from .views import DOMElementNode
 
 
-@dataclass(frozen=False)
+# Nodes are slotted: a heavy page has tens of thousands of them per session, and a per-instance __dict__
+# roughly doubles their size
+
+
+@dataclass(frozen=False, slots=True)
 class DOMBaseNode:
 	is_visible: bool
 	# Use None as default and set parent later to avoid circular reference issues
@@ -21,7 +24,7 @@ class DOMBaseNode:
 		raise NotImplementedError('DOMBaseNode is an abstract class')
 
 
-@dataclass(frozen=False)
+@dataclass(frozen=False, slots=True)
 class DOMTextNode(DOMBaseNode):
 	text: str
 	type: str = 'TEXT_NODE'
@@ -70,7 +73,7 @@ DEFAULT_INCLUDE_ATTRIBUTES = [
 ]
 
 
-@dataclass(frozen=False)
+@dataclass(frozen=False, slots=True)
 class DOMElementNode(DOMBaseNode):
 	"""
 	xpath: the xpath of the element from the last root node (shadow root or iframe OR document if no shadow root or iframe).
@@ -97,6 +100,11 @@ class DOMElementNode(DOMBaseNode):
 	"""
 	is_new: bool | None = None
 
+	# memo of the hash property (slotted classes can't use cached_property)
+	_hash: HashedDomElement | None = field(default=None, init=False, repr=False, compare=False)
+	# memo of get_branch_path_hash(), derived from the parent's
+	_branch_path_hash: int | None = field(default=None, init=False, repr=False, compare=False)
+
 	def __json__(self) -> dict:
 		return {
 			'tag_name': self.tag_name,
@@ -139,13 +147,40 @@ class DOMElementNode(DOMBaseNode):
 
 		return tag_str
 
-	@cached_property
+	@property
 	def hash(self) -> HashedDomElement:
-		from browser_use.dom.history_tree_processor.service import (
-			HistoryTreeProcessor,
-		)
-
-		return HistoryTreeProcessor._hash_dom_element(self)
+		if self._hash is None:
+			from browser_use.dom.history_tree_processor.service import (
+				HistoryTreeProcessor,
+			)
+
+			self._hash = HistoryTreeProcessor._hash_dom_element(self)
+		return self._hash
+
+	def get_branch_path_hash(self) -> int:
+		"""Hash of the tag names from below the root down to this element, memoized along the way"""
+		if self._branch_path_hash is None:
+			# walk up to the nearest ancestor that already has its hash, then fill in the chain top-down
+			chain: list[DOMElementNode] = []
+			node: DOMElementNode | None = self
+			while node is not None and node._branch_path_hash is None:
+				chain.append(node)
+				node = node.parent
+			for node in reversed(chain):
+				if node.parent is None:
+					node._branch_path_hash = EMPTY_BRANCH_PATH_HASH
+				else:
+					node._branch_path_hash = branch_path_hash_step(node.parent._branch_path_hash, node.tag_name)  # type: ignore[arg-type]
+		return self._branch_path_hash  # type: ignore[return-value]
+
+	def reset_hashes(self) -> None:
+		"""Forget the memoized hashes of this subtree, e.g. after it moved to a different parent"""
+		stack: list[DOMElementNode] = [self]
+		while stack:
+			node = stack.pop()
+			node._hash = None
+			node._branch_path_hash = None
+			stack.extend(child for child in node.children if isinstance(child, DOMElementNode))
 
 	def get_all_text_till_next_clickable_element(self, max_depth: int = -1) -> str:
 		text_parts = []
@@ -155,7 +190,7 @@ class DOMElementNode(DOMBaseNode):
 				return
 
 			# Skip this branch if we hit a highlighted element (except for the current node)
-			if isinstance(node, DOMElementNode) and node != self and node.highlight_index is not None:
+			if isinstance(node, DOMElementNode) and node is not self and node.highlight_index is not None:
 				return
 
 			if isinstance(node, DOMTextNode):
@@ -167,116 +202,166 @@ class DOMElementNode(DOMBaseNode):
 		collect_text(self, 0)
 		return '\n'.join(text_parts).strip()
 
+	def get_clickable_elements_text(self, max_depth: int = -1) -> dict[int, str]:
+		"""get_all_text_till_next_clickable_element() of every highlighted element in this subtree, keyed by highlight index.
+
+		Computed in one traversal instead of walking the subtree of each element again.
+		"""
+		text_parts: dict[int, list[str]] = {}
+		# (node, text parts of the nearest highlighted ancestor-or-self, depth below that ancestor)
+		stack: list[tuple[DOMBaseNode, list[str] | None, int]] = [(self, None, 0)]
+		while stack:
+			node, parts, depth = stack.pop()
+			if isinstance(node, DOMTextNode):
+				if parts is not None and (max_depth == -1 or depth <= max_depth):
+					parts.append(node.text)
+				continue
+			if not isinstance(node, DOMElementNode):
+				continue
+			if node.highlight_index is not None:
+				parts = text_parts[node.highlight_index] = []
+				depth = 0
+			elif parts is not None and max_depth != -1 and depth >= max_depth:
+				# nothing below this node is within max_depth of its highlighted ancestor, but
+				# highlighted descendants still need their own text
+				parts = None
+			for child in reversed(node.children):
+				stack.append((child, parts, depth + 1))
+
+		return {index: '\n'.join(parts).strip() for index, parts in text_parts.items()}
+
 	@time_execution_sync('--clickable_elements_to_string')
 	def clickable_elements_to_string(self, include_attributes: list[str] | None = None) -> str:
 		"""Convert the processed DOM content to HTML."""
-		formatted_text = []
+		formatted_text: list[str] = []
 
 		if not include_attributes:
 			include_attributes = DEFAULT_INCLUDE_ATTRIBUTES
 
-		def process_node(node: DOMBaseNode, depth: int) -> None:
-			next_depth = int(depth)
-			depth_str = depth * '\t'
+		def format_element(node: DOMElementNode, depth_str: str, text: str) -> str:
+			attributes_html_str = None
+			if include_attributes:
+				attributes_to_include = {
+					key: str(value).strip()
+					for key, value in node.attributes.items()
+					if key in include_attributes and str(value).strip() != ''
+				}
+
+				# If value of any of the attributes is the same as ANY other value attribute only include the one that appears first in include_attributes
+				# WARNING: heavy vibes, but it seems good enough for saving tokens (it kicks in hard when it's long text)
+
+				# Pre-compute ordered keys that exist in both lists (faster than repeated lookups)
+				ordered_keys = [key for key in include_attributes if key in attributes_to_include]
+
+				if len(ordered_keys) > 1:  # Only process if we have multiple attributes
+					keys_to_remove = set()  # Use set for O(1) lookups
+					seen_values = {}  # value -> first_key_with_this_value
+
+					for key in ordered_keys:
+						value = attributes_to_include[key]
+						if len(value) > 5:  # to not remove false, true, etc
+							if value in seen_values:
+								# This value was already seen with an earlier key, so remove this key
+								keys_to_remove.add(key)
+							else:
+								# First time seeing this value, record it
+								seen_values[value] = key
+
+					# Remove duplicate keys (no need to check existence since we know they exist)
+					for key in keys_to_remove:
+						del attributes_to_include[key]
+
+				# Easy LLM optimizations
+				# if tag == role attribute, don't include it
+				if node.tag_name == attributes_to_include.get('role'):
+					del attributes_to_include['role']
+
+				# Remove attributes that duplicate the node's text content
+				attrs_to_remove_if_text_matches = ['aria-label', 'placeholder', 'title']
+				for attr in attrs_to_remove_if_text_matches:
+					if (
+						attributes_to_include.get(attr)
+						and attributes_to_include.get(attr, '').strip().lower() == text.strip().lower()
+					):
+						del attributes_to_include[attr]
+
+				if attributes_to_include.items():
+					# Format as key1='value1' key2='value2'
+					attributes_html_str = ' '.join(
+						f'{key}={cap_text_length(value, 15)}' for key, value in attributes_to_include.items()
+					)
+
+			# Build the line
+			if node.is_new:
+				highlight_indicator = f'*[{node.highlight_index}]'
+
+			else:
+				highlight_indicator = f'[{node.highlight_index}]'
+
+			line = f'{depth_str}{highlight_indicator}<{node.tag_name}'
+
+			if attributes_html_str:
+				line += f' {attributes_html_str}'
+
+			if text:
+				# Add space before >text only if there were NO attributes added before
+				text = text.strip()
+				if not attributes_html_str:
+					line += ' '
+				line += f'>{text}'
+
+			# Add space before /> only if neither attributes NOR text were added
+			elif not attributes_html_str:
+				line += ' '
+
+			# makes sense to have if the website has lots of text -> so the LLM knows which things are part of the same clickable element and which are not
+			line += ' />'  # 1 token
+			return line
+
+		# Single pre-order traversal. Each text node is either printed on its own line or, if it has a highlighted
+		# ancestor, collected into the text of the nearest one (what get_all_text_till_next_clickable_element returns).
+		# Highlighted elements get a placeholder line that is formatted once their text is complete.
+		pending: list[tuple[int, DOMElementNode, str, list[str]]] = []
+
+		# text under a highlighted ancestor of this subtree is never printed
+		outer_parts: list[str] | None = None
+		ancestor = self.parent
+		while ancestor is not None:
+			if ancestor.highlight_index is not None:
+				outer_parts = []
+				break
+			ancestor = ancestor.parent
+
+		stack: list[tuple[DOMBaseNode, int, list[str] | None]] = [(self, 0, outer_parts)]
+		while stack:
+			node, depth, parts = stack.pop()
 
 			if isinstance(node, DOMElementNode):
+				next_depth = depth
 				# Add element with highlight_index
 				if node.highlight_index is not None:
 					next_depth += 1
-
-					text = node.get_all_text_till_next_clickable_element()
-					attributes_html_str = None
-					if include_attributes:
-						attributes_to_include = {
-							key: str(value).strip()
-							for key, value in node.attributes.items()
-							if key in include_attributes and str(value).strip() != ''
-						}
-
-						# If value of any of the attributes is the same as ANY other value attribute only include the one that appears first in include_attributes
-						# WARNING: heavy vibes, but it seems good enough for saving tokens (it kicks in hard when it's long text)
-
-						# Pre-compute ordered keys that exist in both lists (faster than repeated lookups)
-						ordered_keys = [key for key in include_attributes if key in attributes_to_include]
-
-						if len(ordered_keys) > 1:  # Only process if we have multiple attributes
-							keys_to_remove = set()  # Use set for O(1) lookups
-							seen_values = {}  # value -> first_key_with_this_value
-
-							for key in ordered_keys:
-								value = attributes_to_include[key]
-								if len(value) > 5:  # to not remove false, true, etc
-									if value in seen_values:
-										# This value was already seen with an earlier key, so remove this key
-										keys_to_remove.add(key)
-									else:
-										# First time seeing this value, record it
-										seen_values[value] = key
-
-							# Remove duplicate keys (no need to check existence since we know they exist)
-							for key in keys_to_remove:
-								del attributes_to_include[key]
-
-						# Easy LLM optimizations
-						# if tag == role attribute, don't include it
-						if node.tag_name == attributes_to_include.get('role'):
-							del attributes_to_include['role']
-
-						# Remove attributes that duplicate the node's text content
-						attrs_to_remove_if_text_matches = ['aria-label', 'placeholder', 'title']
-						for attr in attrs_to_remove_if_text_matches:
-							if (
-								attributes_to_include.get(attr)
-								and attributes_to_include.get(attr, '').strip().lower() == text.strip().lower()
-							):
-								del attributes_to_include[attr]
-
-						if attributes_to_include.items():
-							# Format as key1='value1' key2='value2'
-							attributes_html_str = ' '.join(
-								f'{key}={cap_text_length(value, 15)}' for key, value in attributes_to_include.items()
-							)
-
-					# Build the line
-					if node.is_new:
-						highlight_indicator = f'*[{node.highlight_index}]'
-
-					else:
-						highlight_indicator = f'[{node.highlight_index}]'
-
-					line = f'{depth_str}{highlight_indicator}<{node.tag_name}'
-
-					if attributes_html_str:
-						line += f' {attributes_html_str}'
-
-					if text:
-						# Add space before >text only if there were NO attributes added before
-						text = text.strip()
-						if not attributes_html_str:
-							line += ' '
-						line += f'>{text}'
-
-					# Add space before /> only if neither attributes NOR text were added
-					elif not attributes_html_str:
-						line += ' '
-
-					# makes sense to have if the website has lots of text -> so the LLM knows which things are part of the same clickable element and which are not
-					line += ' />'  # 1 token
-					formatted_text.append(line)
+					parts = []
+					pending.append((len(formatted_text), node, depth * '\t', parts))
+					formatted_text.append('')
 
 				# Process children regardless
-				for child in node.children:
-					process_node(child, next_depth)
+				for child in reversed(node.children):
+					stack.append((child, next_depth, parts))
 
 			elif isinstance(node, DOMTextNode):
 				# Add text only if it doesn't have a highlighted parent
-				if node.has_parent_with_highlight_index():
-					return
+				if parts is not None:
+					parts.append(node.text)
+					continue
 
 				if node.parent and node.parent.is_visible and node.parent.is_top_element:
+					depth_str = depth * '\t'
 					formatted_text.append(f'{depth_str}{node.text}')
 
-		process_node(self, 0)
+		for line_index, node, depth_str, parts in pending:
+			formatted_text[line_index] = format_element(node, depth_str, '\n'.join(parts).strip())
+
 		return '\n'.join(formatted_text)
 
 
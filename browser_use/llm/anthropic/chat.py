@@ -1,5 +1,5 @@
 import json
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Mapping
 from dataclasses import dataclass
 from typing import Any, TypeVar, overload
 
@@ -21,10 +21,12 @@ from pydantic import BaseModel
 
 from browser_use.llm.anthropic.serializer import AnthropicMessageSerializer
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_llm_client_pool
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.schema import SchemaOptimizer
-from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.llm.streaming import IncrementalJSONParser
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamItem, ChatInvokeUsage
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -98,13 +100,13 @@ class ChatAnthropic(BaseChatModel):
 
 	def get_client(self) -> AsyncAnthropic:
 		"""
-		Returns an AsyncAnthropic client.
+		Returns an AsyncAnthropic client, shared with every model using the same client params.
 
 		Returns:
 			AsyncAnthropic: An instance of the AsyncAnthropic client.
 		"""
 		client_params = self._get_client_params()
-		return AsyncAnthropic(**client_params)
+		return get_llm_client_pool().get_client(self.provider, client_params, lambda params: AsyncAnthropic(**params))
 
 	@property
 	def name(self) -> str:
@@ -170,23 +172,7 @@ class ChatAnthropic(BaseChatModel):
 
 			else:
 				# Use tool calling for structured output
-				# Create a tool that represents the output format
-				tool_name = output_format.__name__
-				schema = SchemaOptimizer.create_optimized_json_schema(output_format)
-
-				# Remove title from schema if present (Anthropic doesn't like it in parameters)
-				if 'title' in schema:
-					del schema['title']
-
-				tool = ToolParam(
-					name=tool_name,
-					description=f'Extract information in the format of {tool_name}',
-					input_schema=schema,
-					cache_control=CacheControlEphemeralParam(type='ephemeral'),
-				)
-
-				# Force the model to use this tool
-				tool_choice = ToolChoiceToolParam(type='tool', name=tool_name)
+				tool, tool_choice = self._get_output_tool(output_format)
 
 				response = await self.get_client().messages.create(
 					model=self.model,
@@ -205,32 +191,90 @@ class ChatAnthropic(BaseChatModel):
 						model=self.name,
 					)
 
-				usage = self._get_usage(response)
+				return ChatInvokeCompletion(
+					completion=self._parse_tool_output(response, output_format), usage=self._get_usage(response)
+				)
 
-				# Extract the tool use block
-				for content_block in response.content:
-					if hasattr(content_block, 'type') and content_block.type == 'tool_use':
-						# Parse the tool input as the structured output
-						try:
-							return ChatInvokeCompletion(completion=output_format.model_validate(content_block.input), usage=usage)
-						except Exception as e:
-							# If validation fails, try to parse it as JSON first
-							if isinstance(content_block.input, str):
-								data = json.loads(content_block.input)
-								return ChatInvokeCompletion(
-									completion=output_format.model_validate(data),
-									usage=usage,
-								)
-							raise e
-
-				# If no tool use block found, raise an error
-				raise ValueError('Expected tool use in response but none found')
-
-		except APIConnectionError as e:
-			raise ModelProviderError(message=e.message, model=self.name) from e
-		except RateLimitError as e:
-			raise ModelRateLimitError(message=e.message, model=self.name) from e
-		except APIStatusError as e:
-			raise ModelProviderError(message=e.message, status_code=e.status_code, model=self.name) from e
 		except Exception as e:
-			raise ModelProviderError(message=str(e), model=self.name) from e
+			raise self._provider_error(e) from e
+
+	async def astream_structured(
+		self, messages: list[BaseMessage], output_format: type[T]
+	) -> AsyncIterator[ChatInvokeStreamItem | ChatInvokeCompletion[T]]:
+		"""
+		Stream a structured output, yielding the entries of its top-level lists as soon as they are complete
+		in the tool input and the validated output last.
+		"""
+		anthropic_messages, system_prompt = AnthropicMessageSerializer.serialize_messages(messages)
+		tool, tool_choice = self._get_output_tool(output_format)
+		parser = IncrementalJSONParser()
+
+		try:
+			async with self.get_client().messages.stream(
+				model=self.model,
+				messages=anthropic_messages,
+				tools=[tool],
+				system=system_prompt or NOT_GIVEN,  # type: ignore[arg-type]  # newer SDKs type stream() with Omit
+				tool_choice=tool_choice,
+				**self._get_client_params_for_invoke(),
+			) as stream:
+				async for event in stream:
+					if event.type == 'input_json':
+						for item in parser.feed(event.partial_json):
+							yield item
+				response = await stream.get_final_message()
+
+			yield ChatInvokeCompletion(
+				completion=self._parse_tool_output(response, output_format), usage=self._get_usage(response)
+			)
+
+		except Exception as e:
+			raise self._provider_error(e) from e
+
+	def _get_output_tool(self, output_format: type[BaseModel]) -> tuple[ToolParam, ToolChoiceToolParam]:
+		"""A tool that represents the output format, and the tool choice forcing the model to use it"""
+		tool_name = output_format.__name__
+		schema = SchemaOptimizer.create_optimized_json_schema(output_format)
+
+		# Remove title from schema if present (Anthropic doesn't like it in parameters)
+		# (copied, the optimized schema is shared with other callers)
+		if 'title' in schema:
+			schema = {k: v for k, v in schema.items() if k != 'title'}
+
+		tool = ToolParam(
+			name=tool_name,
+			description=f'Extract information in the format of {tool_name}',
+			input_schema=schema,
+			cache_control=CacheControlEphemeralParam(type='ephemeral'),
+		)
+
+		# Force the model to use this tool
+		tool_choice = ToolChoiceToolParam(type='tool', name=tool_name)
+		return tool, tool_choice
+
+	def _parse_tool_output(self, response: Message, output_format: type[T]) -> T:
+		# Extract the tool use block
+		for content_block in response.content:
+			if hasattr(content_block, 'type') and content_block.type == 'tool_use':
+				# Parse the tool input as the structured output
+				try:
+					return output_format.model_validate(content_block.input)
+				except Exception as e:
+					# If validation fails, try to parse it as JSON first
+					if isinstance(content_block.input, str):
+						data = json.loads(content_block.input)
+						return output_format.model_validate(data)
+					raise e
+
+		# If no tool use block found, raise an error
+		raise ValueError('Expected tool use in response but none found')
+
+	def _provider_error(self, e: Exception) -> ModelProviderError:
+		"""The ModelProviderError to raise for an error of the Anthropic client"""
+		if isinstance(e, APIConnectionError):
+			return ModelProviderError(message=e.message, model=self.name)
+		if isinstance(e, RateLimitError):
+			return ModelRateLimitError(message=e.message, model=self.name)
+		if isinstance(e, APIStatusError):
+			return ModelProviderError(message=e.message, status_code=e.status_code, model=self.name)
+		return ModelProviderError(message=str(e), model=self.name)
@@ -7,6 +7,7 @@ from pydantic import BaseModel
 
 from browser_use.llm.aws.serializer import AWSBedrockMessageSerializer
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_llm_client_pool
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
@@ -67,8 +68,15 @@ class ChatAWSBedrock(BaseChatModel):
 				'`boto3` not installed. Please install using `pip install browser-use[aws] or pip install browser-use[all]`'
 			)
 
+		# boto3 clients keep their own connection pool, share them like the other providers' clients
+		pool = get_llm_client_pool()
 		if self.session:
-			return self.session.client('bedrock-runtime')
+			return pool.get_client(
+				self.provider,
+				{'session': self.session},
+				lambda params: params['session'].client('bedrock-runtime'),
+				http_client_param=None,
+			)
 
 		# Get credentials from environment or instance parameters
 		access_key = self.aws_access_key_id or getenv('AWS_ACCESS_KEY_ID')
@@ -76,7 +84,7 @@ class ChatAWSBedrock(BaseChatModel):
 		region = self.aws_region or getenv('AWS_REGION') or getenv('AWS_DEFAULT_REGION')
 
 		if self.aws_sso_auth:
-			return AwsClient(service_name='bedrock-runtime', region_name=region)
+			client_params = {'service_name': 'bedrock-runtime', 'region_name': region}
 		else:
 			if not access_key or not secret_key:
 				raise ModelProviderError(
@@ -84,12 +92,13 @@ class ChatAWSBedrock(BaseChatModel):
 					model=self.name,
 				)
 
-			return AwsClient(
-				service_name='bedrock-runtime',
-				region_name=region,
-				aws_access_key_id=access_key,
-				aws_secret_access_key=secret_key,
-			)
+			client_params = {
+				'service_name': 'bedrock-runtime',
+				'region_name': region,
+				'aws_access_key_id': access_key,
+				'aws_secret_access_key': secret_key,
+			}
+		return pool.get_client(self.provider, client_params, lambda params: AwsClient(**params), http_client_param=None)
 
 	@property
 	def name(self) -> str:
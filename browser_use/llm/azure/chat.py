@@ -2,10 +2,10 @@ import os
 from dataclasses import dataclass
 from typing import Any
 
-import httpx
 from openai import AsyncAzureOpenAI as AsyncAzureOpenAIClient
 from openai.types.shared import ChatModel
 
+from browser_use.llm.client_pool import get_llm_client_pool
 from browser_use.llm.openai.like import ChatOpenAILike
 
 
@@ -76,16 +76,6 @@ class ChatAzureOpenAI(ChatOpenAILike):
 		if self.client:
 			return self.client
 
+		# The pool passes its shared http client unless self.http_client is set
 		_client_params: dict[str, Any] = self._get_client_params()
-
-		if self.http_client:
-			_client_params['http_client'] = self.http_client
-		else:
-			# Create a new async HTTP client with custom limits
-			_client_params['http_client'] = httpx.AsyncClient(
-				limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
-			)
-
-		self.client = AsyncAzureOpenAIClient(**_client_params)
-
-		return self.client
+		return get_llm_client_pool().get_client(self.provider, _client_params, lambda params: AsyncAzureOpenAIClient(**params))
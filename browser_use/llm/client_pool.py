@@ -0,0 +1,299 @@
+"""
+Long-lived LLM API clients, shared by every chat model in the process.
+
+Each provider SDK client (AsyncOpenAI, AsyncAnthropic, AsyncGroq, ...) owns an httpx connection pool. Built
+per request, every agent step paid a new TCP/TLS handshake. LLMClientPool keeps one client per provider,
+resolved client params and event loop, so steps and agents using the same model settings reuse warm
+connections:
+
+- SDK clients that accept an http_client get a shared-limits httpx.AsyncClient from the pool, configured by
+  BROWSER_USE_LLM_MAX_CONNECTIONS, BROWSER_USE_LLM_MAX_KEEPALIVE_CONNECTIONS and BROWSER_USE_LLM_KEEPALIVE_EXPIRY
+- requests and newly opened connections are counted on those http clients, so stats() shows the reuse rate
+- httpx clients can't be used across event loops, clients are kept per loop and dropped once the loop closes
+
+Agents retain() the pool while they run and release() it in Agent.close(), which closes the clients once
+no agent uses them (unless close_when_unused is off, e.g. in a server that keeps them warm between agents
+and calls close_llm_clients() on shutdown).
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+import weakref
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import httpx
+
+from browser_use.config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+ClientT = TypeVar('ClientT')
+
+
+class _Identity:
+	"""Compares and hashes by identity, and keeps the object alive so its id can't be reused while the key exists"""
+
+	__slots__ = ('value',)
+
+	def __init__(self, value: Any):
+		self.value = value
+
+	def __eq__(self, other: object) -> bool:
+		return isinstance(other, _Identity) and other.value is self.value
+
+	def __hash__(self) -> int:
+		return id(self.value)
+
+
+def _freeze(value: Any) -> Any:
+	"""Hashable stand-in for a client param: plain values by value, anything else (credentials, http clients) by identity"""
+	if value is None or isinstance(value, str | int | float | bool | bytes):
+		return value
+	if isinstance(value, httpx.URL):
+		return str(value)
+	if isinstance(value, httpx.Timeout):
+		return ('timeout', value.connect, value.read, value.write, value.pool)
+	if isinstance(value, Mapping):
+		return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+	if isinstance(value, list | tuple | set | frozenset):
+		return tuple(_freeze(v) for v in value)
+	return _Identity(value)
+
+
+def client_key(provider: str, params: Mapping[str, Any]) -> tuple:
+	return (provider, _freeze(params))
+
+
+@dataclass
+class ConnectionMetrics:
+	"""Requests sent and connections opened by the pooled http clients"""
+
+	requests: int = 0
+	new_connections: int = 0
+
+	async def on_request(self, request: httpx.Request) -> None:
+		self.requests += 1
+		outer_trace = request.extensions.get('trace')
+
+		async def trace(event_name: str, info: dict[str, Any]) -> None:
+			if event_name == 'connection.connect_tcp.started':
+				self.new_connections += 1
+			if outer_trace is not None:
+				await outer_trace(event_name, info)
+
+		request.extensions['trace'] = trace
+
+	@property
+	def reused_connections(self) -> int:
+		return max(0, self.requests - self.new_connections)
+
+
+@dataclass
+class _PooledClient:
+	client: Any
+	loop: 'weakref.ReferenceType[asyncio.AbstractEventLoop] | None'
+	http_client: httpx.AsyncClient | None = None  # created by the pool, None if the caller passed its own or the SDK made one
+	owns_client: bool = True  # False if closing the SDK client would close an http client the caller passed in
+	uses: int = 0
+
+	@property
+	def loop_is_gone(self) -> bool:
+		if self.loop is None:
+			return False
+		loop = self.loop()
+		return loop is None or loop.is_closed()
+
+
+@dataclass
+class ClientPoolStats:
+	created: int = 0
+	reused: int = 0
+	closed: int = 0
+	by_provider: dict[str, int] = field(default_factory=dict)
+
+
+class LLMClientPool:
+	"""Provider SDK clients keyed by resolved client params, see the module docstring"""
+
+	def __init__(
+		self,
+		max_connections: int | None = None,
+		max_keepalive_connections: int | None = None,
+		keepalive_expiry: float | None = None,
+		close_when_unused: bool = True,
+	):
+		self.limits = httpx.Limits(
+			max_connections=max_connections if max_connections is not None else CONFIG.BROWSER_USE_LLM_MAX_CONNECTIONS,
+			max_keepalive_connections=max_keepalive_connections
+			if max_keepalive_connections is not None
+			else CONFIG.BROWSER_USE_LLM_MAX_KEEPALIVE_CONNECTIONS,
+			keepalive_expiry=keepalive_expiry if keepalive_expiry is not None else CONFIG.BROWSER_USE_LLM_KEEPALIVE_EXPIRY,
+		)
+		self.close_when_unused = close_when_unused
+		self.metrics = ConnectionMetrics()
+		self._stats = ClientPoolStats()
+		self._clients: dict[tuple, _PooledClient] = {}
+		self._lock = threading.Lock()
+		self._users = 0
+
+	def new_http_client(self) -> httpx.AsyncClient:
+		"""An httpx client with the pool's limits and connection metrics, for SDKs that take an http_client"""
+		return httpx.AsyncClient(**self.http_client_kwargs(), timeout=httpx.Timeout(600.0, connect=5.0), follow_redirects=True)
+
+	def http_client_kwargs(self) -> dict[str, Any]:
+		"""The pool's httpx.AsyncClient settings, for SDKs that build their own http client from kwargs"""
+		return {'limits': self.limits, 'event_hooks': {'request': [self.metrics.on_request]}}
+
+	def get_client(
+		self,
+		provider: str,
+		params: Mapping[str, Any],
+		factory: Callable[[dict[str, Any]], ClientT],
+		http_client_param: str | None = 'http_client',
+	) -> ClientT:
+		"""
+		The pooled client for these params, built with factory(params) on first use.
+
+		Unless params already carry one, a pooled httpx client is passed to the factory as http_client_param
+		(None for SDKs that don't take one).
+		"""
+		try:
+			loop = asyncio.get_running_loop()
+		except RuntimeError:
+			loop = None
+		key = (*client_key(provider, params), id(loop) if loop else None)
+
+		with self._lock:
+			self._drop_closed_loops()
+			pooled = self._clients.get(key)
+			if pooled is not None:
+				pooled.uses += 1
+				self._stats.reused += 1
+				return pooled.client
+
+			http_client = None
+			client_params = dict(params)
+			caller_http_client = bool(http_client_param) and client_params.get(http_client_param) is not None
+			if http_client_param and not caller_http_client:
+				http_client = client_params[http_client_param] = self.new_http_client()
+			try:
+				client = factory(client_params)
+			except TypeError:
+				if http_client is None or http_client_param is None:
+					raise
+				# SDK releases built on another http library reject httpx clients, let the SDK build its own
+				client_params.pop(http_client_param)
+				http_client = None
+				client = factory(client_params)
+			self._clients[key] = _PooledClient(
+				client=client,
+				loop=weakref.ref(loop) if loop else None,
+				http_client=http_client,
+				owns_client=not caller_http_client,
+				uses=1,
+			)
+			self._stats.created += 1
+			self._stats.by_provider[provider] = self._stats.by_provider.get(provider, 0) + 1
+			return client
+
+	def _drop_closed_loops(self) -> None:
+		for key in [key for key, pooled in self._clients.items() if pooled.loop_is_gone]:
+			# their connections went away with the loop, nothing left to close
+			del self._clients[key]
+			self._stats.closed += 1
+
+	def retain(self) -> None:
+		"""Register a user of the pooled clients (an agent), see release()"""
+		with self._lock:
+			self._users += 1
+
+	async def release(self) -> None:
+		"""Unregister a user, and close the clients when it was the last one and close_when_unused is set"""
+		with self._lock:
+			self._users = max(0, self._users - 1)
+			close = self._users == 0 and self.close_when_unused
+		if close:
+			await self.aclose()
+
+	async def aclose(self) -> None:
+		"""Close every client of the running event loop (clients of other loops are only dropped)"""
+		try:
+			loop = asyncio.get_running_loop()
+		except RuntimeError:
+			loop = None
+		with self._lock:
+			pooled_clients = list(self._clients.values())
+			self._clients.clear()
+			self._stats.closed += len(pooled_clients)
+
+		for pooled in pooled_clients:
+			if pooled.loop is not None and pooled.loop() is not loop:
+				continue
+			if pooled.owns_client:
+				await _close_client(pooled.client)
+			if pooled.http_client is not None and not pooled.http_client.is_closed:
+				try:
+					await pooled.http_client.aclose()
+				except Exception as e:
+					logger.debug(f'Failed to close pooled http client: {type(e).__name__}: {e}')
+
+	def stats(self) -> dict[str, Any]:
+		with self._lock:
+			open_clients = len(self._clients)
+		requests = self.metrics.requests
+		return {
+			'open_clients': open_clients,
+			'created': self._stats.created,
+			'reused': self._stats.reused,
+			'closed': self._stats.closed,
+			'by_provider': dict(self._stats.by_provider),
+			'requests': requests,
+			'new_connections': self.metrics.new_connections,
+			'reused_connections': self.metrics.reused_connections,
+			'connection_reuse_rate': round(self.metrics.reused_connections / requests, 3) if requests else None,
+			'users': self._users,
+		}
+
+
+async def _close_client(client: Any) -> None:
+	"""Close an SDK client whichever way it supports (aclose(), close(), or its inner http client)"""
+	closers = []
+	aio_aclose = getattr(getattr(client, 'aio', None), 'aclose', None)
+	if callable(aio_aclose):
+		# google.genai keeps its async client apart from the sync one
+		closers.append(aio_aclose)
+	close = getattr(client, 'aclose', None) or getattr(client, 'close', None)
+	if callable(close):
+		closers.append(close)
+	elif isinstance(inner := getattr(client, '_client', None), httpx.AsyncClient):
+		closers.append(inner.aclose)
+
+	for close in closers:
+		try:
+			result = close()
+			if inspect.isawaitable(result):
+				await result
+		except Exception as e:
+			logger.debug(f'Failed to close LLM client {type(client).__name__}: {type(e).__name__}: {e}')
+
+
+_pool: LLMClientPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_llm_client_pool() -> LLMClientPool:
+	"""The process-wide client pool"""
+	global _pool
+	with _pool_lock:
+		if _pool is None:
+			_pool = LLMClientPool()
+		return _pool
+
+
+async def close_llm_clients() -> None:
+	"""Close every pooled LLM client, for shutdown hooks"""
+	await get_llm_client_pool().aclose()
@@ -16,6 +16,7 @@ from openai import (
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_llm_client_pool
 from browser_use.llm.deepseek.serializer import DeepSeekMessageSerializer
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
@@ -48,12 +49,13 @@ class ChatDeepSeek(BaseChatModel):
 		return 'deepseek'
 
 	def _client(self) -> AsyncOpenAI:
-		return AsyncOpenAI(
-			api_key=self.api_key,
-			base_url=self.base_url,
-			timeout=self.timeout,
+		client_params = {
+			'api_key': self.api_key,
+			'base_url': self.base_url,
+			'timeout': self.timeout,
 			**(self.client_params or {}),
-		)
+		}
+		return get_llm_client_pool().get_client(self.provider, client_params, lambda params: AsyncOpenAI(**params))
 
 	@property
 	def name(self) -> str:
@@ -139,7 +141,8 @@ class ChatDeepSeek(BaseChatModel):
 				if output_format is not None and hasattr(output_format, 'model_json_schema'):
 					tool_name = output_format.__name__
 					schema = SchemaOptimizer.create_optimized_json_schema(output_format)
-					schema.pop('title', None)
+					# copied, the optimized schema is shared with other callers
+					schema = {k: v for k, v in schema.items() if k != 'title'}
 					call_tools = [
 						{
 							'type': 'function',
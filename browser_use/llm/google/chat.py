@@ -9,6 +9,7 @@ from google.genai.types import MediaModality
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_llm_client_pool
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.google.serializer import GoogleMessageSerializer
 from browser_use.llm.messages import BaseMessage
@@ -111,13 +112,15 @@ class ChatGoogle(BaseChatModel):
 
 	def get_client(self) -> genai.Client:
 		"""
-		Returns a genai.Client instance.
+		Returns a genai.Client instance, shared with every model using the same client params.
 
 		Returns:
 			genai.Client: An instance of the Google genai client.
 		"""
 		client_params = self._get_client_params()
-		return genai.Client(**client_params)
+		return get_llm_client_pool().get_client(
+			self.provider, client_params, lambda params: genai.Client(**params), http_client_param=None
+		)
 
 	@property
 	def name(self) -> str:
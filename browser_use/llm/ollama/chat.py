@@ -6,6 +6,7 @@ from ollama import AsyncClient as OllamaAsyncClient
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_llm_client_pool
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.ollama.serializer import OllamaMessageSerializer
@@ -46,9 +47,17 @@ class ChatOllama(BaseChatModel):
 
 	def get_client(self) -> OllamaAsyncClient:
 		"""
-		Returns an OllamaAsyncClient client.
+		Returns an OllamaAsyncClient client, shared with every model using the same client params.
 		"""
-		return OllamaAsyncClient(host=self.host, timeout=self.timeout, **self.client_params or {})
+		pool = get_llm_client_pool()
+		client_params = {'host': self.host, 'timeout': self.timeout, **(self.client_params or {})}
+		# OllamaAsyncClient builds its own httpx client from the kwargs, so it gets the pool's limits that way
+		return pool.get_client(
+			self.provider,
+			client_params,
+			lambda params: OllamaAsyncClient(**{**pool.http_client_kwargs(), **params}),
+			http_client_param=None,
+		)
 
 	@property
 	def name(self) -> str:
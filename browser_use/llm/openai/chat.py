@@ -1,21 +1,24 @@
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Mapping
 from dataclasses import dataclass
 from typing import Any, Literal, TypeVar, overload
 
 import httpx
 from openai import APIConnectionError, APIStatusError, AsyncOpenAI, RateLimitError
 from openai.types.chat.chat_completion import ChatCompletion
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 from openai.types.shared.chat_model import ChatModel
 from openai.types.shared_params.reasoning_effort import ReasoningEffort
 from openai.types.shared_params.response_format_json_schema import JSONSchema, ResponseFormatJSONSchema
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_llm_client_pool
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.openai.serializer import OpenAIMessageSerializer
 from browser_use.llm.schema import SchemaOptimizer
-from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.llm.streaming import IncrementalJSONParser
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamItem, ChatInvokeUsage
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -88,19 +91,19 @@ class ChatOpenAI(BaseChatModel):
 
 	def get_client(self) -> AsyncOpenAI:
 		"""
-		Returns an AsyncOpenAI client.
+		Returns an AsyncOpenAI client, shared with every model using the same client params.
 
 		Returns:
 			AsyncOpenAI: An instance of the AsyncOpenAI client.
 		"""
 		client_params = self._get_client_params()
-		return AsyncOpenAI(**client_params)
+		return get_llm_client_pool().get_client(self.provider, client_params, lambda params: AsyncOpenAI(**params))
 
 	@property
 	def name(self) -> str:
 		return str(self.model)
 
-	def _get_usage(self, response: ChatCompletion) -> ChatInvokeUsage | None:
+	def _get_usage(self, response: ChatCompletion | ChatCompletionChunk) -> ChatInvokeUsage | None:
 		if response.usage is not None:
 			completion_tokens = response.usage.completion_tokens
 			completion_token_details = response.usage.completion_tokens_details
@@ -148,30 +151,7 @@ class ChatOpenAI(BaseChatModel):
 		openai_messages = OpenAIMessageSerializer.serialize_messages(messages)
 
 		try:
-			model_params: dict[str, Any] = {}
-
-			if self.temperature is not None:
-				model_params['temperature'] = self.temperature
-
-			if self.frequency_penalty is not None:
-				model_params['frequency_penalty'] = self.frequency_penalty
-
-			if self.max_completion_tokens is not None:
-				model_params['max_completion_tokens'] = self.max_completion_tokens
-
-			if self.top_p is not None:
-				model_params['top_p'] = self.top_p
-
-			if self.seed is not None:
-				model_params['seed'] = self.seed
-
-			if self.service_tier is not None:
-				model_params['service_tier'] = self.service_tier
-
-			if self.model in ReasoningModels:
-				model_params['reasoning_effort'] = self.reasoning_effort
-				model_params['temperature'] = 1
-				model_params['frequency_penalty'] = 0
+			model_params = self._get_model_params()
 
 			if output_format is None:
 				# Return string response
@@ -188,17 +168,11 @@ class ChatOpenAI(BaseChatModel):
 				)
 
 			else:
-				response_format: JSONSchema = {
-					'name': 'agent_output',
-					'strict': True,
-					'schema': SchemaOptimizer.create_optimized_json_schema(output_format),
-				}
-
 				# Return structured response
 				response = await self.get_client().chat.completions.create(
 					model=self.model,
 					messages=openai_messages,
-					response_format=ResponseFormatJSONSchema(json_schema=response_format, type='json_schema'),
+					response_format=self._get_response_format(output_format),
 					**model_params,
 				)
 
@@ -218,21 +192,104 @@ class ChatOpenAI(BaseChatModel):
 					usage=usage,
 				)
 
-		except RateLimitError as e:
+		except Exception as e:
+			raise self._provider_error(e) from e
+
+	async def astream_structured(
+		self, messages: list[BaseMessage], output_format: type[T]
+	) -> AsyncIterator[ChatInvokeStreamItem | ChatInvokeCompletion[T]]:
+		"""
+		Stream a structured output, yielding the entries of its top-level lists as soon as they are complete
+		and the validated output last.
+		"""
+		openai_messages = OpenAIMessageSerializer.serialize_messages(messages)
+		parser = IncrementalJSONParser()
+		usage = None
+
+		try:
+			stream = await self.get_client().chat.completions.create(
+				model=self.model,
+				messages=openai_messages,
+				response_format=self._get_response_format(output_format),
+				stream=True,
+				stream_options={'include_usage': True},
+				**self._get_model_params(),
+			)
+			async with stream:
+				async for chunk in stream:
+					if chunk.usage is not None:
+						# sent in a last chunk without choices
+						usage = self._get_usage(chunk)
+					for choice in chunk.choices:
+						if choice.delta.content:
+							for item in parser.feed(choice.delta.content):
+								yield item
+
+			if not parser.text:
+				raise ModelProviderError(
+					message='Failed to parse structured output from model response',
+					status_code=500,
+					model=self.name,
+				)
+
+			yield ChatInvokeCompletion(completion=output_format.model_validate_json(parser.text), usage=usage)
+
+		except Exception as e:
+			raise self._provider_error(e) from e
+
+	def _get_model_params(self) -> dict[str, Any]:
+		model_params: dict[str, Any] = {}
+
+		if self.temperature is not None:
+			model_params['temperature'] = self.temperature
+
+		if self.frequency_penalty is not None:
+			model_params['frequency_penalty'] = self.frequency_penalty
+
+		if self.max_completion_tokens is not None:
+			model_params['max_completion_tokens'] = self.max_completion_tokens
+
+		if self.top_p is not None:
+			model_params['top_p'] = self.top_p
+
+		if self.seed is not None:
+			model_params['seed'] = self.seed
+
+		if self.service_tier is not None:
+			model_params['service_tier'] = self.service_tier
+
+		if self.model in ReasoningModels:
+			model_params['reasoning_effort'] = self.reasoning_effort
+			model_params['temperature'] = 1
+			model_params['frequency_penalty'] = 0
+
+		return model_params
+
+	def _get_response_format(self, output_format: type[BaseModel]) -> ResponseFormatJSONSchema:
+		response_format: JSONSchema = {
+			'name': 'agent_output',
+			'strict': True,
+			'schema': SchemaOptimizer.create_optimized_json_schema(output_format),
+		}
+		return ResponseFormatJSONSchema(json_schema=response_format, type='json_schema')
+
+	def _provider_error(self, e: Exception) -> ModelProviderError:
+		"""The ModelProviderError to raise for an error of the OpenAI client"""
+		if isinstance(e, RateLimitError):
 			error_message = e.response.json().get('error', {})
 			error_message = (
 				error_message.get('message', 'Unknown model error') if isinstance(error_message, dict) else error_message
 			)
-			raise ModelProviderError(
+			return ModelProviderError(
 				message=error_message,
 				status_code=e.response.status_code,
 				model=self.name,
-			) from e
+			)
 
-		except APIConnectionError as e:
-			raise ModelProviderError(message=str(e), model=self.name) from e
+		if isinstance(e, APIConnectionError):
+			return ModelProviderError(message=str(e), model=self.name)
 
-		except APIStatusError as e:
+		if isinstance(e, APIStatusError):
 			try:
 				error_message = e.response.json().get('error', {})
 			except Exception:
@@ -240,11 +297,10 @@ class ChatOpenAI(BaseChatModel):
 			error_message = (
 				error_message.get('message', 'Unknown model error') if isinstance(error_message, dict) else error_message
 			)
-			raise ModelProviderError(
+			return ModelProviderError(
 				message=error_message,
 				status_code=e.response.status_code,
 				model=self.name,
-			) from e
+			)
 
-		except Exception as e:
-			raise ModelProviderError(message=str(e), model=self.name) from e
+		return ModelProviderError(message=str(e), model=self.name)
@@ -12,6 +12,7 @@ from openai.types.shared_params.response_format_json_schema import (
 from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
+from browser_use.llm.client_pool import get_llm_client_pool
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.openrouter.serializer import OpenRouterMessageSerializer
@@ -85,10 +86,8 @@ class ChatOpenRouter(BaseChatModel):
 		Returns:
 		    AsyncOpenAI: An instance of the AsyncOpenAI client with OpenRouter base URL.
 		"""
-		if not hasattr(self, '_client'):
-			client_params = self._get_client_params()
-			self._client = AsyncOpenAI(**client_params)
-		return self._client
+		client_params = self._get_client_params()
+		return get_llm_client_pool().get_client(self.provider, client_params, lambda params: AsyncOpenAI(**params))
 
 	@property
 	def name(self) -> str:
@@ -2,24 +2,169 @@
 Utilities for creating optimized Pydantic schemas for LLM usage.
 """
 
-from typing import Any
+import enum
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, get_args, get_origin
+from weakref import WeakKeyDictionary
 
 from pydantic import BaseModel
 
+# Fingerprint per model class, classes don't change after creation
+_fingerprints: 'WeakKeyDictionary[type, str]' = WeakKeyDictionary()
+
+
+def _describe_value(value: Any) -> str:
+	"""Stable text for a field default, constraint or schema extra (functions by name, not address)"""
+	if callable(value) and hasattr(value, '__qualname__') and not isinstance(value, type):
+		return f'{getattr(value, "__module__", "")}.{value.__qualname__}'
+	return repr(value)
+
+
+def _describe_type(annotation: Any, stack: tuple[type, ...]) -> str:
+	if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+		return f'model:{model_fingerprint(annotation, stack)}'
+	if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+		return f'enum:{annotation.__name__}{[member.value for member in annotation]!r}'
+	origin = get_origin(annotation)
+	if origin is not None:
+		args = ','.join(
+			_describe_type(arg, stack) if isinstance(arg, type) or get_origin(arg) is not None else _describe_value(arg)
+			for arg in get_args(annotation)
+		)
+		return f'{_describe_value(origin)}[{args}]'
+	return repr(annotation)
+
+
+def model_fingerprint(model: type[BaseModel], _stack: tuple[type, ...] = ()) -> str:
+	"""
+	Hash of everything that goes into a model's JSON schema: fields, types, descriptions, defaults, constraints,
+	nested models and schema overrides. Structurally identical models get the same fingerprint even when they
+	are different classes, such as the ActionModel/AgentOutput types the agent creates every step.
+	"""
+	cached = _fingerprints.get(model)
+	if cached is not None:
+		return cached
+	if model in _stack:
+		# back-reference of a recursive model, its structure is described further up
+		return f'recursive:{model.__qualname__}'
+	stack = (*_stack, model)
+
+	config = model.model_config
+	parts = [
+		model.__name__,
+		model.__doc__ or '',
+		_describe_value(config.get('title')),
+		_describe_value(config.get('json_schema_extra')),
+		_describe_value(config.get('extra')),
+	]
+	for klass in model.__mro__:
+		if klass.__module__.startswith('pydantic.'):
+			continue
+		for name in ('model_json_schema', '__get_pydantic_json_schema__'):
+			if name in klass.__dict__:
+				func = getattr(klass.__dict__[name], '__func__', klass.__dict__[name])
+				code = getattr(func, '__code__', None)
+				# classes defined in a function body are new every call, but share the code of their methods
+				parts.append(f'{name}@{code.co_filename}:{code.co_firstlineno}' if code else _describe_value(func))
+	for name, field in model.model_fields.items():
+		parts.append(
+			'|'.join(
+				[
+					name,
+					_describe_value(field.alias),
+					_describe_type(field.annotation, stack),
+					_describe_value(field.default),
+					_describe_value(field.default_factory),
+					_describe_value(field.description),
+					_describe_value(field.title),
+					_describe_value(field.examples),
+					_describe_value(field.json_schema_extra),
+					','.join(_describe_value(constraint) for constraint in field.metadata),
+				]
+			)
+		)
+
+	fingerprint = hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+	if not _stack:
+		# nested models described inside a recursion depend on where they were reached from, only cache the roots
+		_fingerprints[model] = fingerprint
+	return fingerprint
+
+
+@dataclass(frozen=True)
+class OptimizedSchema:
+	fingerprint: str
+	schema: dict[str, Any]  # shared by every caller, must not be mutated
+
 
 class SchemaOptimizer:
+	# Optimized schemas by model fingerprint, least recently used evicted first
+	_schema_cache: 'OrderedDict[str, OptimizedSchema]' = OrderedDict()
+	_schema_cache_lock = threading.Lock()
+	schema_cache_size = 128
+	cache_hits = 0
+	cache_misses = 0
+
 	@staticmethod
 	def create_optimized_json_schema(model: type[BaseModel]) -> dict[str, Any]:
 		"""
 		Create the most optimized schema by flattening all $ref/$defs while preserving
 		FULL descriptions and ALL action definitions. Also ensures OpenAI strict mode compatibility.
 
+		Schemas are memoized by the model's structural fingerprint, so the returned dict is shared
+		with every other caller asking for an identical model and must not be mutated.
+
 		Args:
 			model: The Pydantic model to optimize
 
 		Returns:
 			Optimized schema with all $refs resolved and strict mode compatibility
 		"""
+		return SchemaOptimizer.get_optimized_schema(model).schema
+
+	@classmethod
+	def get_optimized_schema(cls, model: type[BaseModel]) -> OptimizedSchema:
+		"""The memoized optimized schema of a model"""
+		fingerprint = model_fingerprint(model)
+		with cls._schema_cache_lock:
+			cached = cls._schema_cache.get(fingerprint)
+			if cached is not None:
+				cls._schema_cache.move_to_end(fingerprint)
+				cls.cache_hits += 1
+				return cached
+
+		schema = cls._build_optimized_json_schema(model)
+		optimized = OptimizedSchema(fingerprint=fingerprint, schema=schema)
+		with cls._schema_cache_lock:
+			cls.cache_misses += 1
+			cls._schema_cache[fingerprint] = optimized
+			while len(cls._schema_cache) > cls.schema_cache_size:
+				cls._schema_cache.popitem(last=False)
+		return optimized
+
+	@classmethod
+	def cache_stats(cls) -> dict[str, Any]:
+		lookups = cls.cache_hits + cls.cache_misses
+		return {
+			'size': len(cls._schema_cache),
+			'hits': cls.cache_hits,
+			'misses': cls.cache_misses,
+			'hit_rate': round(cls.cache_hits / lookups, 3) if lookups else None,
+		}
+
+	@classmethod
+	def clear_cache(cls) -> None:
+		with cls._schema_cache_lock:
+			cls._schema_cache.clear()
+			cls.cache_hits = 0
+			cls.cache_misses = 0
+
+	@staticmethod
+	def _build_optimized_json_schema(model: type[BaseModel]) -> dict[str, Any]:
+		"""Build the optimized schema of create_optimized_json_schema(), without the cache"""
 		# Generate original schema
 		original_schema = model.model_json_schema()
 
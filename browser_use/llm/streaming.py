@@ -0,0 +1,115 @@
+"""
+Incremental parsing of structured outputs while they stream in.
+
+Structured outputs are a single JSON object, e.g. an AgentOutput whose `action` list comes after the
+`thinking`, `memory` and `next_goal` strings. IncrementalJSONParser is fed the raw chunks and returns
+each entry of the object's top-level lists as soon as the entry is complete, so callers can act on
+the first action while the model is still writing the rest.
+
+Chat models that can stream implement an optional `astream_structured(messages, output_format)` async
+generator yielding those entries as ChatInvokeStreamItem, then the validated ChatInvokeCompletion last.
+It isn't part of the BaseChatModel protocol, callers check for it and fall back to ainvoke().
+"""
+
+import json
+from collections.abc import Collection
+
+from browser_use.llm.views import ChatInvokeStreamItem
+
+_WHITESPACE = ' \t\r\n'
+
+
+class IncrementalJSONParser:
+	"""Feed chunks of a JSON object, get back the completed entries of its top-level lists"""
+
+	def __init__(self, fields: Collection[str] | None = None):
+		self.fields = set(fields) if fields is not None else None  # lists to report, None for all of them
+		self._text = ''
+		self._pos = 0  # next character of _text to scan
+
+		self._stack: list[str] = []  # open '{' and '['
+		self._in_string = False
+		self._escaped = False
+		self._expect_key = False  # the next string of the top-level object is a key
+		self._key_start: int | None = None
+		self._key: str | None = None  # key of the top-level value being read
+
+		self._list_field: str | None = None  # top-level list being read, if reported
+		self._item_start: int | None = None  # where its current entry started
+		self._item_index = 0
+
+	@property
+	def text(self) -> str:
+		"""Everything fed so far"""
+		return self._text
+
+	def feed(self, chunk: str) -> list[ChatInvokeStreamItem]:
+		"""Add a chunk, return the list entries it completed"""
+		self._text += chunk
+		text = self._text
+		items: list[ChatInvokeStreamItem] = []
+
+		for pos in range(self._pos, len(text)):
+			char = text[pos]
+			depth = len(self._stack)
+
+			if self._in_string:
+				if self._escaped:
+					self._escaped = False
+				elif char == '\\':
+					self._escaped = True
+				elif char == '"':
+					self._in_string = False
+					if self._key_start is not None:
+						self._key = json.loads(text[self._key_start : pos + 1])
+						self._key_start = None
+					elif depth == 2 and self._list_field is not None:
+						# a string entry of the list
+						self._emit(items, pos + 1)
+				continue
+
+			if char in _WHITESPACE:
+				continue
+
+			if self._list_field is not None and depth == 2 and self._item_start is None and char not in ',]':
+				self._item_start = pos
+
+			if char == '"':
+				self._in_string = True
+				if depth == 1 and self._expect_key:
+					self._key_start = pos
+					self._expect_key = False
+			elif char in '{[':
+				if depth == 1 and char == '[' and (self.fields is None or self._key in self.fields):
+					self._list_field = self._key
+					self._item_index = 0
+				self._stack.append(char)
+				if depth == 0 and char == '{':
+					self._expect_key = True
+			elif char in '}]':
+				if self._stack:
+					self._stack.pop()
+				if self._list_field is not None:
+					if depth == 3:
+						# an object or list entry closed
+						self._emit(items, pos + 1)
+					elif depth == 2:
+						# the list itself closed, after a number or literal entry maybe
+						self._emit(items, pos)
+						self._list_field = None
+			elif char == ',':
+				if depth == 1:
+					self._expect_key = True
+				elif depth == 2 and self._list_field is not None:
+					self._emit(items, pos)
+
+		self._pos = len(text)
+		return items
+
+	def _emit(self, items: list[ChatInvokeStreamItem], end: int) -> None:
+		if self._item_start is None or self._list_field is None:
+			return
+		raw = self._text[self._item_start : end]
+		self._item_start = None
+		items.append(ChatInvokeStreamItem(field=self._list_field, index=self._item_index, value=json.loads(raw)))
+		self._item_index += 1
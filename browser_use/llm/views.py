@@ -1,4 +1,4 @@
-from typing import Generic, TypeVar, Union
+from typing import Any, Generic, TypeVar, Union
 
 from pydantic import BaseModel
 
@@ -43,3 +43,18 @@ class ChatInvokeCompletion(BaseModel, Generic[T]):
 
 	usage: ChatInvokeUsage | None
 	"""The usage of the response."""
+
+
+class ChatInvokeStreamItem(BaseModel):
+	"""
+	A completed entry of a top-level list of a structured output that is still streaming.
+	"""
+
+	field: str
+	"""The list the entry belongs to, e.g. 'action'."""
+
+	index: int
+	"""Position of the entry in the list."""
+
+	value: Any
+	"""The entry, parsed from JSON but not validated yet."""
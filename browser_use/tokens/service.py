@@ -8,6 +8,7 @@ Automatically tracks token usage when LLMs are registered and invoked.
 import asyncio
 import logging
 import os
+from contextlib import aclosing
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -17,7 +18,7 @@ import httpx
 from dotenv import load_dotenv
 
 from browser_use.llm.base import BaseChatModel
-from browser_use.llm.views import ChatInvokeUsage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
 from browser_use.tokens.views import (
 	CachedPricingData,
 	ModelPricing,
@@ -321,11 +322,7 @@ class TokenCost:
 		# Store reference to self for use in the closure
 		token_cost_service = self
 
-		# Create a wrapped version that tracks usage
-		async def tracked_ainvoke(messages, output_format=None):
-			# Call the original method
-			result = await original_ainvoke(messages, output_format)
-
+		def track_usage(result: ChatInvokeCompletion) -> None:
 			# Track usage if available (no await needed since add_usage is now sync)
 			if result.usage:
 				usage = token_cost_service.add_usage(llm.model, result.usage)
@@ -337,12 +334,31 @@ class TokenCost:
 			# else:
 			# 	await token_cost_service._log_non_usage_llm(llm)
 
+		# Create a wrapped version that tracks usage
+		async def tracked_ainvoke(messages, output_format=None):
+			# Call the original method
+			result = await original_ainvoke(messages, output_format)
+			track_usage(result)
 			return result
 
 		# Replace the method with our tracked version
 		# Using setattr to avoid type checking issues with overloaded methods
 		setattr(llm, 'ainvoke', tracked_ainvoke)
 
+		# Streamed outputs report their usage on the completion that ends the stream
+		# (models without astream_structured() are streamed through ainvoke, which is tracked already)
+		original_astream_structured = getattr(llm, 'astream_structured', None)
+		if original_astream_structured is not None:
+
+			async def tracked_astream_structured(messages, output_format):
+				async with aclosing(original_astream_structured(messages, output_format)) as stream:
+					async for item in stream:
+						if isinstance(item, ChatInvokeCompletion):
+							track_usage(item)
+						yield item
+
+			setattr(llm, 'astream_structured', tracked_astream_structured)
+
 		return llm
 
 	def get_usage_tokens_for_model(self, model: str) -> ModelUsageTokens:
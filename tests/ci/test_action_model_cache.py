@@ -0,0 +1,102 @@
+"""
+Test that dynamic ActionModel/AgentOutput types are reused for pages that allow the same set of actions.
+"""
+
+from browser_use.agent.service import Agent
+from browser_use.browser.session import BrowserSession
+from browser_use.controller.service import Controller
+from browser_use.llm.schema import SchemaOptimizer
+from tests.ci.conftest import create_mock_llm
+
+
+class FakePage:
+	def __init__(self, url):
+		self.url = url
+
+
+def make_controller():
+	controller = Controller()
+
+	@controller.registry.action('Open the pull request diff', domains=['github.com'])
+	async def open_diff():
+		pass
+
+	return controller
+
+
+def test_same_actions_reuse_the_model_type():
+	registry = make_controller().registry
+	example = registry.create_action_model(page=FakePage('https://example.com/a'))
+	assert registry.create_action_model(page=FakePage('https://example.org/b')) is example
+	assert 'open_diff' not in str(example.model_json_schema())
+
+	github = registry.create_action_model(page=FakePage('https://github.com/org/repo/pull/1'))
+	assert github is not example
+	assert 'open_diff' in str(github.model_json_schema())
+	# back on a page without the domain action
+	assert registry.create_action_model(page=FakePage('https://example.com/c')) is example
+
+	assert registry.action_model_cache_stats() == {'size': 2, 'hits': 2, 'misses': 2, 'hit_rate': 0.5}
+
+
+def test_registering_an_action_invalidates_the_cache():
+	controller = make_controller()
+	before = controller.registry.create_action_model()
+
+	@controller.registry.action('Say hello')
+	async def say_hello():
+		pass
+
+	after = controller.registry.create_action_model()
+	assert after is not before
+	assert 'say_hello' in str(after.model_json_schema())
+
+
+def test_least_recently_used_models_are_evicted():
+	registry = make_controller().registry
+	registry.action_model_cache_size = 2
+	done = registry.create_action_model(include_actions=['done'])
+	registry.create_action_model(include_actions=['go_to_url'])
+	registry.create_action_model(include_actions=['done'])
+	registry.create_action_model(include_actions=['go_back'])
+	assert registry.action_model_cache_stats()['size'] == 2
+	assert registry.create_action_model(include_actions=['done']) is done
+	registry.create_action_model(include_actions=['go_to_url'])
+	assert registry.action_model_cache_stats()['misses'] == 4
+
+
+async def test_agent_steps_reuse_output_types_and_schemas():
+	agent = Agent(
+		task='Review the pull request',
+		llm=create_mock_llm(),
+		controller=make_controller(),
+		browser_session=BrowserSession(headless=True),
+	)
+	await agent._update_action_models_for_page(FakePage('https://example.com'))
+	output_type, done_output_type = agent.AgentOutput, agent.DoneAgentOutput
+
+	SchemaOptimizer.clear_cache()
+	SchemaOptimizer.create_optimized_json_schema(agent.AgentOutput)
+	await agent._update_action_models_for_page(FakePage('https://example.com/other'))
+	assert agent.AgentOutput is output_type
+	assert agent.DoneAgentOutput is done_output_type
+	SchemaOptimizer.create_optimized_json_schema(agent.AgentOutput)
+	assert SchemaOptimizer.cache_stats()['hits'] == 1
+
+	await agent._update_action_models_for_page(FakePage('https://github.com/org/repo/pull/1'))
+	assert agent.AgentOutput is not output_type
+	assert agent.DoneAgentOutput is done_output_type
+
+
+async def test_agent_output_types_follow_the_registry_cache_size():
+	controller = make_controller()
+	agent = Agent(
+		task='Review the pull request',
+		llm=create_mock_llm(),
+		controller=controller,
+		browser_session=BrowserSession(headless=True),
+	)
+	controller.registry.action_model_cache_size = 1
+	await agent._update_action_models_for_page(FakePage('https://github.com/org/repo/pull/1'))
+	# the page and done output types were built, only the most recent one is kept
+	assert list(agent._agent_output_types) == [agent.DoneActionModel]
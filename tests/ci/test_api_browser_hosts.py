@@ -0,0 +1,158 @@
+"""
+Test the shared browsers of the standalone API server, which host many sessions as contexts of one browser.
+
+Uses fake browsers and sessions so the placement bookkeeping (caps, spawning, idle stop, crashes) runs without Chromium.
+"""
+
+import asyncio
+
+import pytest
+
+from browser_use.api.browser_hosts import BrowserHostsFull, SharedBrowserHosts
+
+
+class FakeBrowser:
+	def __init__(self):
+		self.connected = True
+		self.contexts = []
+
+	def is_connected(self):
+		return self.connected
+
+
+class FakeContext:
+	def __init__(self, browser):
+		self.browser = browser
+		self.closed = False
+		browser.contexts.append(self)
+
+	async def close(self):
+		self.closed = True
+		self.browser.contexts.remove(self)
+
+
+class FakeHostSession:
+	def __init__(self):
+		self.browser = FakeBrowser()
+		self.killed = False
+
+	async def kill(self):
+		self.killed = True
+		self.browser.connected = False
+
+
+class FakeContextSession:
+	def __init__(self, host_session, profile_kwargs):
+		self.browser_context = FakeContext(host_session.browser)
+		self.profile_kwargs = profile_kwargs
+		self.stopped = False
+
+	async def stop(self):
+		self.stopped = True
+
+
+class FakeLauncher:
+	def __init__(self, fail=False):
+		self.hosts = []
+		self.fail = fail
+
+	async def launch_host(self):
+		await asyncio.sleep(0.01)
+		if self.fail:
+			raise RuntimeError('chromium failed to start')
+		host = FakeHostSession()
+		self.hosts.append(host)
+		return host
+
+	async def open_context(self, host_session, profile_kwargs):
+		await asyncio.sleep(0)
+		return FakeContextSession(host_session, profile_kwargs)
+
+
+def make_hosts(launcher, **kwargs):
+	return SharedBrowserHosts(launcher.launch_host, launcher.open_context, **kwargs)
+
+
+async def test_contexts_fill_a_browser_before_launching_another():
+	launcher = FakeLauncher()
+	hosts = make_hosts(launcher, contexts_per_browser=4, max_browsers=3)
+
+	# concurrent acquires share the browser still being launched
+	sessions = await asyncio.gather(*(hosts.acquire({'wait_between_actions': 0.5}) for _ in range(5)))
+	assert len(launcher.hosts) == 2
+	assert [len(host.browser.contexts) for host in launcher.hosts] == [4, 1]
+	assert len({id(session.browser_context) for session in sessions}) == 5
+	assert all(hosts.owns(session) for session in sessions)
+	assert hosts.status()['contexts'] == 5
+
+	# the fullest browser with room gets the next context, so the other one can drain
+	await hosts.release(sessions[0])
+	await hosts.acquire({})
+	assert [len(host.browser.contexts) for host in launcher.hosts] == [4, 1]
+
+
+async def test_cap_on_browsers():
+	hosts = make_hosts(FakeLauncher(), contexts_per_browser=2, max_browsers=1)
+	await hosts.acquire({})
+	await hosts.acquire({})
+	with pytest.raises(BrowserHostsFull):
+		await hosts.acquire({})
+
+
+async def test_release_closes_the_context_and_idle_browsers_are_stopped():
+	launcher = FakeLauncher()
+	hosts = make_hosts(launcher, contexts_per_browser=1, max_browsers=3, min_browsers=1, idle_ttl=0)
+	sessions = [await hosts.acquire({}) for _ in range(3)]
+	for session in sessions:
+		await hosts.release(session)
+		assert session.stopped and session.browser_context.closed
+		assert not hosts.owns(session)
+
+	await asyncio.sleep(0.01)
+	assert await hosts.reap_idle() == 2
+	assert sum(host.killed for host in launcher.hosts) == 2
+	assert len(hosts.status()['browsers']) == 1
+
+	await hosts.close()
+	assert all(host.killed for host in launcher.hosts)
+
+
+async def test_crashed_browser_is_replaced():
+	launcher = FakeLauncher()
+	hosts = make_hosts(launcher, contexts_per_browser=4, max_browsers=2)
+	crashed = await hosts.acquire({})
+	launcher.hosts[0].browser.connected = False
+
+	session = await hosts.acquire({})
+	assert session.browser_context.browser is launcher.hosts[1].browser
+	assert not hosts.owns(crashed)
+	assert hosts.status()['crashed'] == 1
+
+	# the dead browser is stopped and its sessions released in the background
+	await asyncio.gather(*hosts._cleanup_tasks)
+	assert launcher.hosts[0].killed
+	assert crashed.stopped and crashed.browser_context.closed
+	assert not launcher.hosts[1].killed
+
+
+async def test_failed_launch_frees_the_reservation():
+	launcher = FakeLauncher(fail=True)
+	hosts = make_hosts(launcher, contexts_per_browser=2, max_browsers=1)
+	with pytest.raises(RuntimeError):
+		await hosts.acquire({})
+	assert hosts.status()['browsers'] == []
+
+	launcher.fail = False
+	await hosts.acquire({})
+	assert hosts.status()['launch_failures'] == 1
+	assert hosts.status()['launched'] == 1
+
+
+def test_disabled_unless_configured(monkeypatch):
+	launcher = FakeLauncher()
+	monkeypatch.delenv('BROWSER_USE_API_CONTEXTS_PER_BROWSER', raising=False)
+	assert SharedBrowserHosts.from_env(launcher.launch_host, launcher.open_context) is None
+	monkeypatch.setenv('BROWSER_USE_API_CONTEXTS_PER_BROWSER', '6')
+	monkeypatch.setenv('BROWSER_USE_API_MAX_BROWSERS', '2')
+	hosts = SharedBrowserHosts.from_env(launcher.launch_host, launcher.open_context)
+	assert (hosts.contexts_per_browser, hosts.max_browsers) == (6, 2)
@@ -0,0 +1,234 @@
+"""
+Test the warm BrowserSession pool used by the standalone API server.
+
+Uses lightweight fake sessions so the pool bookkeeping (hits/misses, scrubbing, TTL expiry) runs without a browser.
+"""
+
+import asyncio
+
+from browser_use.api.browser_pool import BrowserSessionPool, make_pool_key
+
+
+class FakeFrame:
+	def __init__(self, url):
+		self.url = url
+
+
+class FakePage:
+	def __init__(self, context, url='about:blank'):
+		self.context = context
+		self.url = url
+		self.frames = [FakeFrame(url)]
+		self.closed = False
+
+	async def goto(self, url, **kwargs):
+		self.url = url
+
+	async def close(self):
+		self.closed = True
+		self.context.pages.remove(self)
+
+
+class FakeRequest:
+	def __init__(self, url, navigation=True):
+		self.url = url
+		self.navigation = navigation
+
+	def is_navigation_request(self):
+		return self.navigation
+
+
+class FakeCDPSession:
+	def __init__(self, context):
+		self.context = context
+		self.detached = False
+
+	async def send(self, method, params=None):
+		if self.context.cdp_fails:
+			raise RuntimeError('Target closed')
+		self.context.cdp_calls.append((method, params))
+
+	async def detach(self):
+		self.detached = True
+
+
+class FakeContext:
+	def __init__(self):
+		self.pages = []
+		self.cookies = ['session=abc']
+		self.listeners = {}
+		self.cdp_calls = []
+		self.cdp_fails = False
+
+	def on(self, event, handler):
+		self.listeners.setdefault(event, []).append(handler)
+
+	def emit(self, event, *args):
+		for handler in self.listeners.get(event, []):
+			handler(*args)
+
+	async def new_cdp_session(self, page):
+		return FakeCDPSession(self)
+
+	async def clear_cookies(self):
+		self.cookies = []
+
+	async def new_page(self):
+		page = FakePage(self)
+		self.pages.append(page)
+		return page
+
+
+class FakeSession:
+	def __init__(self):
+		self.browser_context = FakeContext()
+		self.browser_context.pages.extend(
+			[FakePage(self.browser_context, 'https://example.com/'), FakePage(self.browser_context, 'https://example.com/')]
+		)
+		self.agent_current_page = self.browser_context.pages[-1]
+		self.human_current_page = self.browser_context.pages[-1]
+		self._cached_browser_state_summary = object()
+		self._cached_clickable_element_hashes = object()
+		self._downloaded_files = ['report.pdf']
+		self.connected = True
+		self.killed = False
+
+	async def is_connected(self, restart=True):
+		return self.connected and not self.killed
+
+	async def kill(self):
+		self.killed = True
+
+
+def make_pool(**kwargs):
+	launched = []
+
+	async def launcher(profile_kwargs):
+		session = FakeSession()
+		session.profile_kwargs = profile_kwargs
+		launched.append(session)
+		return session
+
+	return BrowserSessionPool(launcher=launcher, **kwargs), launched
+
+
+def test_pool_key_ignores_ordering():
+	assert make_pool_key({'allowed_domains': ['b.com', 'a.com'], 'wait_between_actions': 0.5}) == make_pool_key(
+		{'wait_between_actions': 0.5, 'allowed_domains': ['a.com', 'b.com']}
+	)
+	assert make_pool_key({'allowed_domains': ['a.com']}) != make_pool_key({'allowed_domains': []})
+
+
+async def test_release_scrubs_and_reuses_session():
+	pool, launched = make_pool(min_size=0, max_size=2)
+	profile_kwargs = {'allowed_domains': [], 'wait_between_actions': 0.5}
+
+	session = await pool.acquire(profile_kwargs)
+	assert pool.stats.misses == 1 and len(launched) == 1
+
+	old_pages = list(session.browser_context.pages)
+	await pool.release(session)
+	assert pool.idle_count == 1
+	assert session.browser_context.cookies == []
+	assert len(session.browser_context.pages) == 1
+	# a fresh tab, without the history and session storage of the old ones
+	assert all(page.closed for page in old_pages)
+	assert session.agent_current_page.url == 'about:blank'
+	assert session._cached_browser_state_summary is None
+	assert session._downloaded_files == []
+
+	again = await pool.acquire(profile_kwargs)
+	assert again is session
+	assert pool.stats.hits == 1
+	assert len(launched) == 1
+
+	# a different profile key never gets someone else's browser
+	other = await pool.acquire({'allowed_domains': ['example.com'], 'wait_between_actions': 0.5})
+	assert other is not session
+	assert pool.stats.misses == 2
+	await pool.close()
+
+
+async def test_release_clears_the_storage_of_every_visited_origin():
+	pool, launched = make_pool(min_size=0, max_size=2)
+	session = await pool.acquire({})
+	context = session.browser_context
+	# visited but no longer open: a page navigated away, an iframe, and a subresource that isn't a navigation
+	context.emit('request', FakeRequest('https://shop.example.org/cart?id=1'))
+	context.emit('request', FakeRequest('https://ads.example.net/frame.html'))
+	context.emit('request', FakeRequest('https://cdn.example.com/app.js', navigation=False))
+
+	await pool.release(session)
+	cleared = [params['origin'] for method, params in context.cdp_calls if method == 'Storage.clearDataForOrigin']
+	assert cleared == ['https://ads.example.net', 'https://example.com', 'https://shop.example.org']
+	assert all(params['storageTypes'] == 'all' for method, params in context.cdp_calls if params)
+	assert ('Network.clearBrowserCache', None) in context.cdp_calls
+	assert pool.idle_count == 1
+
+	# the origins were cleared, the next checkout starts a new record
+	context.cdp_calls.clear()
+	again = await pool.acquire({})
+	await pool.release(again)
+	assert [params for method, params in context.cdp_calls if params] == []
+
+	# a session whose storage could not be cleared is never handed out again
+	session = await pool.acquire({})
+	session.browser_context.cdp_fails = True
+	await pool.release(session)
+	assert session.killed and pool.idle_count == 0
+	await pool.close()
+
+
+async def test_release_discards_when_full_or_disconnected():
+	pool, launched = make_pool(min_size=0, max_size=1)
+	first = await pool.acquire({})
+	second = await pool.acquire({})
+
+	await pool.release(first)
+	await pool.release(second)
+	assert pool.idle_count == 1
+	assert second.killed
+
+	parked = await pool.acquire({})
+	assert parked is first
+	parked.connected = False
+	await pool.release(parked)
+	assert parked.killed and pool.idle_count == 0
+
+	# sessions the pool never handed out are just stopped
+	stranger = FakeSession()
+	await pool.release(stranger)
+	assert stranger.killed
+	await pool.close()
+
+
+async def test_warm_sessions_and_ttl_expiry():
+	warm_kwargs = {'wait_between_actions': 0.5}
+	pool, launched = make_pool(min_size=1, max_size=3, idle_ttl=0.0, warm_profile_kwargs=warm_kwargs)
+	await pool.start()
+	await asyncio.sleep(0.05)
+	assert pool.idle_count == 1
+
+	session = await pool.acquire(warm_kwargs)
+	assert pool.stats.hits == 1
+	await asyncio.sleep(0.05)
+	assert pool.idle_count == 1  # replenished in the background
+
+	other = await pool.acquire({'wait_between_actions': 1.0})
+	await pool.release(other)
+	await pool.release(session)
+	assert pool.idle_count == 3
+
+	# the warm key keeps min_size sessions, everything else past the TTL is stopped
+	assert await pool.reap_expired() == 2
+	assert pool.idle_count == 1
+	assert other.killed
+
+	status = pool.status()
+	assert status['expired'] == 2
+	assert status['checkout_latency_ms']['count'] == 2
+
+	parked = [entry.session for entries in pool._idle.values() for entry in entries]
+	await pool.close()
+	assert pool.idle_count == 0
+	assert parked and all(s.killed for s in parked)
@@ -0,0 +1,109 @@
+"""
+Test the interactive elements serializer shared by the standalone API endpoints.
+"""
+
+from dataclasses import dataclass
+
+import pytest
+
+from browser_use.api.interactive_elements import InteractiveElementsSerializer
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+
+@dataclass
+class FakeState:
+	element_tree: DOMElementNode
+	selector_map: dict
+	dom_snapshot_id: str | None = None
+
+
+def make_state(elements, snapshot_id=None):
+	"""elements: (index, tag, text, attributes), added to body out of index order like a real selector map can be"""
+	body = DOMElementNode(tag_name='body', xpath='/body', attributes={}, children=[], is_visible=True, parent=None)
+	selector_map = {}
+	for index, tag, text, attributes in elements:
+		node = DOMElementNode(
+			tag_name=tag,
+			xpath=f'/body/{tag}[{index}]',
+			attributes=attributes,
+			children=[],
+			is_visible=True,
+			parent=body,
+			highlight_index=index,
+		)
+		if text:
+			node.children.append(DOMTextNode(text=text, is_visible=True, parent=node))
+		body.children.append(node)
+		selector_map[index] = node
+	return FakeState(element_tree=body, selector_map=selector_map, dom_snapshot_id=snapshot_id)
+
+
+PAGE = [
+	(2, 'input', '', {'placeholder': 'Search'}),
+	(0, 'a', 'Home', {'href': '/'}),
+	(1, 'div', 'Menu', {}),
+]
+
+
+def test_elements_are_sorted_and_cached_by_snapshot_id():
+	serializer = InteractiveElementsSerializer()
+	state = make_state(PAGE, snapshot_id='tok:1')
+
+	elements = serializer.serialize(state)
+	assert elements == [
+		{'index': 0, 'tag': 'a', 'text': 'Home', 'href': '/'},
+		{'index': 1, 'tag': 'div', 'text': 'Menu'},
+		{'index': 2, 'tag': 'input', 'text': '', 'placeholder': 'Search'},
+	]
+	assert serializer.serialize(make_state(PAGE, snapshot_id='tok:1')) is elements
+	assert serializer.stats()['hits'] == 1
+
+	# without incremental snapshots there is nothing to key the cache on
+	assert serializer.serialize(make_state(PAGE)) is not serializer.serialize(make_state(PAGE))
+
+
+def test_endpoint_presentation_options():
+	serializer = InteractiveElementsSerializer()
+	state = make_state(PAGE, snapshot_id='tok:1')
+
+	labeled = serializer.respond('s1', state, only_labeled=True)
+	assert [elem['index'] for elem in labeled.interactive_elements] == [0]
+
+	placeholder = serializer.respond('s1', state, empty_text='(No text)')
+	assert placeholder.interactive_elements[2]['text'] == '(No text)'
+	# the cached list is shared and never modified
+	assert serializer.serialize(state)[2]['text'] == ''
+
+
+def test_diff_mode_only_returns_changes_since_last_response():
+	serializer = InteractiveElementsSerializer()
+
+	first = serializer.respond('s1', make_state(PAGE, 'tok:1'), response_mode='diff')
+	assert first.elements_diff is None
+	assert len(first.interactive_elements) == 3
+
+	changed_page = [
+		(0, 'a', 'Home', {'href': '/'}),
+		(1, 'div', 'Menu (open)', {}),
+		(3, 'a', 'Settings', {'href': '/settings'}),
+	]
+	second = serializer.respond('s1', make_state(changed_page, 'tok:2'), response_mode='diff')
+	assert second.elements_diff == {'added': [3], 'changed': [1], 'removed': [2], 'unchanged': 1}
+	assert [elem['index'] for elem in second.interactive_elements] == [1, 3]
+	assert len(second.elements) == 3
+
+	# the base is whatever was last sent, full responses included
+	serializer.respond('s1', make_state(PAGE, 'tok:1'))
+	third = serializer.respond('s1', make_state(PAGE, 'tok:1'), response_mode='diff')
+	assert third.interactive_elements == []
+	assert third.elements_diff == {'added': [], 'changed': [], 'removed': [], 'unchanged': 3}
+
+	# other sessions and forgotten sessions start from scratch
+	assert serializer.respond('s2', make_state(PAGE, 'tok:1'), response_mode='diff').elements_diff is None
+	serializer.forget('s1')
+	assert serializer.respond('s1', make_state(PAGE, 'tok:1'), response_mode='diff').elements_diff is None
+
+
+def test_unknown_response_mode_is_rejected():
+	with pytest.raises(ValueError):
+		InteractiveElementsSerializer().respond('s1', make_state(PAGE), response_mode='partial')
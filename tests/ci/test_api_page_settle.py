@@ -0,0 +1,79 @@
+"""
+Test the async page-settle engine used by the standalone API server after click/type/key/scroll.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from browser_use.api.page_settle import wait_for_page_settle
+
+
+class FakePage:
+	def __init__(self, quiet=True, mutations=0):
+		self.result = {'quiet': quiet, 'mutations': mutations}
+		self.calls = []
+
+	async def evaluate(self, script, args):
+		self.calls.append(args)
+		return self.result
+
+
+class FakeSession:
+	def __init__(self, network_delay=0.0, page=None):
+		self.network_delay = network_delay
+		self.page = page or FakePage()
+		self.network_waits = 0
+
+	async def _wait_for_stable_network(self):
+		self.network_waits += 1
+		await asyncio.sleep(self.network_delay)
+
+	async def get_current_page(self):
+		return self.page
+
+
+async def test_none_mode_returns_immediately():
+	session = FakeSession(network_delay=5)
+	result = await wait_for_page_settle(session, 'none', max_wait=2)
+	assert result.elapsed == 0
+	assert session.network_waits == 0
+
+
+async def test_network_mode_is_capped_by_max_wait():
+	session = FakeSession(network_delay=5)
+	start = time.monotonic()
+	result = await wait_for_page_settle(session, 'network', max_wait=0.2)
+	assert time.monotonic() - start < 1
+	assert result.timed_out
+	assert session.page.calls == []
+
+
+async def test_dom_mode_waits_for_quiet_period_within_budget():
+	page = FakePage(quiet=True, mutations=7)
+	session = FakeSession(network_delay=0.0, page=page)
+	result = await wait_for_page_settle(session, 'dom', max_wait=1.0, quiet_period=0.3)
+	assert not result.timed_out
+	assert result.dom_mutations == 7
+	assert page.calls[0]['quietMs'] == 300
+	assert 0 < page.calls[0]['timeoutMs'] <= 1000
+
+
+async def test_settle_does_not_block_other_sessions():
+	slow = FakeSession(network_delay=5)
+	ticks = 0
+
+	async def other_session_work():
+		nonlocal ticks
+		for _ in range(5):
+			await asyncio.sleep(0.01)
+			ticks += 1
+
+	await asyncio.gather(wait_for_page_settle(slow, 'fixed', max_wait=0.2), other_session_work())
+	assert ticks == 5
+
+
+async def test_invalid_mode_is_rejected():
+	with pytest.raises(ValueError):
+		await wait_for_page_settle(FakeSession(), 'idle', max_wait=1)
@@ -0,0 +1,89 @@
+"""
+Test the per-session screenshot store and the screenshot fields of the standalone API responses.
+"""
+
+import base64
+
+import pytest
+
+from browser_use.api.screenshots import ScreenshotStore, screenshot_response_fields
+from browser_use.browser.views import PLACEHOLDER_4PX_SCREENSHOT
+
+
+class FakeSession:
+	def __init__(self, data: bytes | str = b'frame'):
+		self.data = data
+		self.calls = []
+
+	async def take_screenshot(self, image_format='png', quality=None, max_width=None):
+		self.calls.append((image_format, quality, max_width))
+		if isinstance(self.data, str):
+			return self.data
+		return base64.b64encode(self.data).decode()
+
+
+def test_store_evicts_least_recently_used_frames_above_byte_cap():
+	store = ScreenshotStore(max_bytes_per_session=10)
+	first = store.put('s1', b'aaaa', 'image/jpeg')
+	second = store.put('s1', b'bbbb', 'image/jpeg')
+
+	# reading a frame makes it the most recent one
+	assert store.get('s1', first.handle) is first
+	store.put('s1', b'cccc', 'image/jpeg')
+	assert store.get('s1', second.handle) is None
+	assert store.get('s1', first.handle) is first
+
+	# a frame over the cap on its own is still kept, as the only one
+	big = store.put('s1', b'x' * 64, 'image/png')
+	assert store.get('s1', big.handle) is big
+	assert store.stats()['frames'] == 1
+	assert store.stats()['bytes'] == 64
+
+	# other sessions have their own budget
+	other = store.put('s2', b'dddd', 'image/jpeg')
+	assert store.get('s1', other.handle) is None
+	store.forget('s1')
+	assert store.get('s1', big.handle) is None
+	assert store.get('s2', other.handle) is other
+
+
+async def test_handle_mode_stores_the_frame():
+	store = ScreenshotStore()
+	session = FakeSession(b'jpeg bytes')
+	fields = await screenshot_response_fields(store, 's1', session, image_format='webp', quality=60, max_width=640)
+
+	assert session.calls == [('webp', 60, 640)]
+	assert fields['screenshot_media_type'] == 'image/webp'
+	assert fields['screenshot_url'] == f'/sessions/s1/screenshots/{fields["screenshot_handle"]}'
+	assert 'screenshot' not in fields
+	assert store.get('s1', fields['screenshot_handle']).data == b'jpeg bytes'
+
+
+async def test_inline_and_none_modes():
+	store = ScreenshotStore()
+	session = FakeSession(b'png bytes')
+
+	inline = await screenshot_response_fields(store, 's1', session, mode='inline', image_format='png')
+	assert inline == {'screenshot': base64.b64encode(b'png bytes').decode(), 'screenshot_media_type': 'image/png'}
+
+	assert await screenshot_response_fields(store, 's1', session, mode='none') == {}
+	assert len(session.calls) == 1
+	assert store.stats()['frames'] == 0
+
+
+async def test_placeholder_screenshot_is_png():
+	fields = await screenshot_response_fields(ScreenshotStore(), 's1', FakeSession(PLACEHOLDER_4PX_SCREENSHOT), mode='inline')
+	assert fields['screenshot_media_type'] == 'image/png'
+
+
+async def test_failed_capture_returns_no_fields():
+	class BrokenSession:
+		async def take_screenshot(self, **kwargs):
+			raise RuntimeError('page crashed')
+
+	assert await screenshot_response_fields(ScreenshotStore(), 's1', BrokenSession()) == {}
+
+
+async def test_unknown_mode_is_rejected():
+	with pytest.raises(ValueError):
+		await screenshot_response_fields(ScreenshotStore(), 's1', FakeSession(), mode='thumbnail')
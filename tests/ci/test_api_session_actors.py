@@ -0,0 +1,97 @@
+"""
+Test per-session actors used by the standalone API server's /mcp dispatcher.
+"""
+
+import asyncio
+
+import pytest
+
+from browser_use.api.session_actors import SessionActorRegistry, SessionQueueFull
+
+
+async def test_operations_within_a_session_are_serialized():
+	registry = SessionActorRegistry(max_queue_depth=10)
+	events = []
+
+	def make_op(name):
+		async def op():
+			events.append(f'{name}:start')
+			await asyncio.sleep(0.02)
+			events.append(f'{name}:end')
+			return name
+
+		return op
+
+	results = await asyncio.gather(*(registry.submit('a', make_op(f'op{i}')) for i in range(3)))
+	assert results == ['op0', 'op1', 'op2']
+	assert events == ['op0:start', 'op0:end', 'op1:start', 'op1:end', 'op2:start', 'op2:end']
+	await registry.close()
+
+
+async def test_different_sessions_run_in_parallel():
+	registry = SessionActorRegistry()
+	running = 0
+	max_running = 0
+
+	async def op():
+		nonlocal running, max_running
+		running += 1
+		max_running = max(max_running, running)
+		await asyncio.sleep(0.05)
+		running -= 1
+
+	await asyncio.gather(*(registry.submit(f'session_{i}', op) for i in range(4)))
+	assert max_running == 4
+	await registry.close()
+
+
+async def test_full_queue_raises_with_retry_after():
+	registry = SessionActorRegistry(max_queue_depth=2)
+	release = asyncio.Event()
+
+	async def blocked():
+		await release.wait()
+
+	first = asyncio.create_task(registry.submit('a', blocked))
+	second = asyncio.create_task(registry.submit('a', blocked))
+	await asyncio.sleep(0.01)
+
+	with pytest.raises(SessionQueueFull) as exc_info:
+		await registry.submit('a', blocked)
+	assert exc_info.value.retry_after >= 1
+	assert registry.stats()['a']['rejected'] == 1
+
+	# other sessions are unaffected
+	assert await registry.submit('b', lambda: asyncio.sleep(0, result='done')) == 'done'
+
+	release.set()
+	await asyncio.gather(first, second)
+	await registry.close()
+
+
+async def test_errors_propagate_and_worker_keeps_running():
+	registry = SessionActorRegistry()
+
+	async def boom():
+		raise ValueError('element not found')
+
+	async def ok():
+		return 'ok'
+
+	with pytest.raises(ValueError):
+		await registry.submit('a', boom)
+	assert await registry.submit('a', ok) == 'ok'
+	assert registry.stats()['a']['failed'] == 1
+	await registry.close()
+
+
+async def test_idle_actor_is_forgotten():
+	registry = SessionActorRegistry(idle_timeout=0.05)
+
+	async def ok():
+		return 1
+
+	await registry.submit('a', ok)
+	assert 'a' in registry.stats()
+	await asyncio.sleep(0.15)
+	assert 'a' not in registry.stats()
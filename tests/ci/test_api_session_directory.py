@@ -0,0 +1,145 @@
+"""
+Test the session directory and router that let several standalone API workers share sessions.
+"""
+
+import sqlite3
+
+import pytest
+
+from browser_use.api.session_directory import (
+	FORWARDED_HEADER,
+	InMemorySessionDirectory,
+	SessionRecord,
+	SessionRouter,
+	SQLiteSessionDirectory,
+	WorkerIdentity,
+)
+
+
+async def test_sqlite_directory_is_shared_between_instances(tmp_path):
+	db_path = tmp_path / 'sessions.db'
+	worker_a = SQLiteSessionDirectory(str(db_path))
+	worker_b = SQLiteSessionDirectory(str(db_path))
+
+	await worker_a.put(SessionRecord(session_id='s1', worker_id='a', worker_url='http://a:8000', cdp_url='http://127.0.0.1:9222'))
+	record = await worker_b.get('s1')
+	assert record is not None
+	assert record.worker_id == 'a'
+	assert record.cdp_url == 'http://127.0.0.1:9222'
+
+	await worker_b.mark_closed('s1')
+	assert (await worker_a.get('s1')).status == 'closed'
+
+	await worker_a.delete('s1')
+	assert await worker_b.get('s1') is None
+	assert await worker_b.list() == []
+
+
+async def test_router_only_forwards_active_sessions_of_other_workers(tmp_path):
+	db_path = str(tmp_path / 'sessions.db')
+	router_a = SessionRouter(SQLiteSessionDirectory(db_path), WorkerIdentity('a', 'http://a:8000'))
+	router_b = SessionRouter(SQLiteSessionDirectory(db_path), WorkerIdentity('b', 'http://b:8000'))
+
+	await router_a.register('s1', cdp_url='http://127.0.0.1:9222')
+
+	assert await router_a.remote_owner('s1') is None
+	owner = await router_b.remote_owner('s1')
+	assert owner is not None and owner.worker_url == 'http://a:8000'
+	assert router_b.redirect_url(owner) == 'http://a:8000/mcp'
+	assert await router_b.remote_owner('unknown') is None
+
+	await router_a.mark_closed('s1')
+	assert await router_b.remote_owner('s1') is None
+	assert await router_b.is_closed('s1')
+
+	# shutting down a worker forgets its active sessions but keeps closed ones for status checks
+	await router_a.register('s2')
+	await router_a.close()
+	assert await router_b.directory.get('s2') is None
+	assert await router_b.is_closed('s1')
+
+
+async def test_in_memory_directory_never_forwards():
+	router = SessionRouter(InMemorySessionDirectory(), WorkerIdentity('a', None))
+	await router.directory.put(SessionRecord(session_id='s1', worker_id='other', worker_url='http://other:8000'))
+	assert await router.remote_owner('s1') is None
+
+
+def test_router_rejects_unknown_mode():
+	with pytest.raises(ValueError):
+		SessionRouter(InMemorySessionDirectory(), WorkerIdentity('a', None), mode='teleport')
+
+
+async def test_worker_refuses_a_url_claimed_by_a_live_worker(tmp_path, monkeypatch):
+	db_path = str(tmp_path / 'sessions.db')
+	router_a = SessionRouter(SQLiteSessionDirectory(db_path), WorkerIdentity('a', 'http://127.0.0.1:8000'))
+	router_b = SessionRouter(SQLiteSessionDirectory(db_path), WorkerIdentity('b', 'http://127.0.0.1:8000'))
+	await router_a.start()
+
+	# uvicorn --workers: the shared port answers as worker a
+	async def answers_as(worker_url, worker_id):
+		return worker_id == 'a'
+
+	monkeypatch.setattr(router_b, '_answers_as', answers_as)
+	with pytest.raises(RuntimeError, match='own URL'):
+		await router_b.start()
+
+	# a claim left behind by a crashed worker is taken over
+	async def nobody_answers(worker_url, worker_id):
+		return False
+
+	monkeypatch.setattr(router_b, '_answers_as', nobody_answers)
+	await router_b.start()
+	assert await router_a.directory.claim_worker_url('http://127.0.0.1:8000', 'c') == 'b'
+
+	# a clean shutdown releases the claim
+	await router_b.close()
+	assert await router_a.directory.claim_worker_url('http://127.0.0.1:8000', 'c') is None
+
+
+class _FakeResponse:
+	def __init__(self, status_code, body, headers):
+		self.status_code = status_code
+		self._body = body
+		self.headers = headers
+		self.text = str(body)
+
+	def json(self):
+		return self._body
+
+
+class _FakeHTTPClient:
+	def __init__(self, response):
+		self.response = response
+		self.requests = []
+
+	async def post(self, url, json, headers):
+		self.requests.append((url, json, headers))
+		return self.response
+
+
+async def test_forward_returns_the_owner_headers():
+	router = SessionRouter(InMemorySessionDirectory(), WorkerIdentity('b', 'http://b:8000'))
+	router._http_client = _FakeHTTPClient(_FakeResponse(429, {'detail': 'queue full'}, {'retry-after': '2'}))
+	owner = SessionRecord(session_id='s1', worker_id='a', worker_url='http://a:8000')
+
+	status_code, body, headers = await router.forward(owner, {'tool_name': 'go_to_url', 'parameters': {}})
+
+	assert (status_code, body, headers['retry-after']) == (429, {'detail': 'queue full'}, '2')
+	url, _, sent_headers = router._http_client.requests[0]
+	assert url == 'http://a:8000/mcp'
+	assert sent_headers[FORWARDED_HEADER] == 'b'
+
+
+async def test_sqlite_directory_reuses_one_connection(tmp_path):
+	directory = SQLiteSessionDirectory(str(tmp_path / 'sessions.db'))
+	conn = directory._conn
+	assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+	await directory.put(SessionRecord(session_id='s1', worker_id='a'))
+	assert await directory.get('s1') is not None
+	assert directory._conn is conn
+
+	await directory.close()
+	with pytest.raises(sqlite3.ProgrammingError):
+		conn.execute('SELECT 1')
@@ -0,0 +1,229 @@
+"""
+Test the shared on-disk static asset cache, with fake routes instead of a browser.
+"""
+
+import asyncio
+
+from browser_use.browser.asset_cache import AssetCache, cache_key, freshness_lifetime, get_asset_cache
+from browser_use.browser.session import BrowserSession
+
+
+class FakeRequest:
+	def __init__(self, url, resource_type='script', headers=None, method='GET'):
+		self.url = url
+		self.resource_type = resource_type
+		self.headers = headers or {'accept': '*/*'}
+		self.method = method
+
+	async def all_headers(self):
+		return self.headers
+
+
+class FakeResponse:
+	def __init__(self, body=b'console.log(1)', status=200, headers=None):
+		self._body = body
+		self.status = status
+		self.headers = {'content-type': 'application/javascript', 'cache-control': 'max-age=3600'} if headers is None else headers
+
+	async def body(self):
+		return self._body
+
+
+class FakeServer:
+	"""Answers route.fetch() calls and records the headers they were sent with"""
+
+	def __init__(self, response):
+		self.response = response
+		self.fetches = []
+
+	async def fetch(self, headers=None):
+		self.fetches.append(headers)
+		await asyncio.sleep(0)
+		return self.response
+
+
+class FakeRoute:
+	def __init__(self, server, url='https://example.com/app.js', **request_kwargs):
+		self.request = FakeRequest(url, **request_kwargs)
+		self.server = server
+		self.result = None
+
+	async def fetch(self, headers=None):
+		return await self.server.fetch(headers)
+
+	async def fulfill(self, **kwargs):
+		self.result = ('fulfill', kwargs)
+
+	async def fallback(self):
+		self.result = ('fallback', None)
+
+
+def test_freshness_lifetime_honours_cache_control():
+	assert freshness_lifetime({'cache-control': 'public, max-age=600'}) == 600
+	assert freshness_lifetime({'cache-control': 'max-age=600, s-maxage=60'}) == 60
+	assert freshness_lifetime({'cache-control': 'max-age=600', 'age': '100'}) == 500
+	assert freshness_lifetime({'cache-control': 'no-store'}) is None
+	assert freshness_lifetime({'cache-control': 'private, max-age=600'}) is None
+	assert freshness_lifetime({'cache-control': 'max-age=600', 'set-cookie': 'a=b'}) is None
+	assert freshness_lifetime({'cache-control': 'max-age=600', 'vary': 'Cookie'}) is None
+	assert freshness_lifetime({'cache-control': 'max-age=600', 'vary': 'Accept-Encoding'}) == 600
+	# stale right away: only worth storing if it can be revalidated
+	assert freshness_lifetime({'cache-control': 'no-cache'}) is None
+	assert freshness_lifetime({'cache-control': 'no-cache', 'etag': '"v1"'}) == 0
+	assert freshness_lifetime({}) is None
+	assert freshness_lifetime({'date': 'Wed, 21 Oct 2026 07:00:00 GMT', 'expires': 'Wed, 21 Oct 2026 08:00:00 GMT'}) == 3600
+
+
+def test_cache_key_includes_relevant_headers():
+	url = 'https://example.com/logo.png'
+	assert cache_key(url, {'accept': 'image/webp'}) != cache_key(url, {'accept': 'image/png'})
+	assert cache_key(url, {'accept': 'image/webp', 'user-agent': 'a'}) == cache_key(url, {'accept': 'image/webp'})
+
+
+async def test_second_request_is_served_from_disk(tmp_path):
+	cache = AssetCache(tmp_path)
+	server = FakeServer(FakeResponse())
+
+	first = FakeRoute(server)
+	assert await cache.handle(first)
+	assert first.result[1]['body'] == b'console.log(1)'
+	second = FakeRoute(server)
+	assert await cache.handle(second)
+	assert len(server.fetches) == 1
+	assert second.result[1]['body'] == b'console.log(1)'
+	assert second.result[1]['headers']['content-type'] == 'application/javascript'
+
+	# a new cache on the same directory (e.g. after a restart) finds the entry
+	reloaded = AssetCache(tmp_path)
+	assert await reloaded.handle(FakeRoute(server))
+	assert len(server.fetches) == 1
+	assert reloaded.stats()['hits'] == 1
+
+
+async def test_uncacheable_requests_and_responses(tmp_path):
+	cache = AssetCache(tmp_path)
+	server = FakeServer(FakeResponse(headers={'cache-control': 'no-store'}))
+
+	assert not await cache.handle(FakeRoute(server, resource_type='document'))
+	assert not await cache.handle(FakeRoute(server, method='POST'))
+	assert not await cache.handle(FakeRoute(server, headers={'authorization': 'Bearer x'}))
+	assert server.fetches == []
+
+	for _ in range(2):
+		assert await cache.handle(FakeRoute(server))
+	assert len(server.fetches) == 2
+	assert cache.stats()['entries'] == 0
+
+
+async def test_credentialed_requests_are_neither_served_nor_stored(tmp_path):
+	cache = AssetCache(tmp_path)
+	server = FakeServer(FakeResponse())
+	assert await cache.handle(FakeRoute(server))
+
+	for credentials in ({'cookie': 'session=alice'}, {'authorization': 'Bearer x'}):
+		route = FakeRoute(server, headers={'accept': '*/*', **credentials})
+		assert not await cache.handle(route)
+		assert route.result is None
+	assert len(server.fetches) == 1
+	assert cache.stats()['hits'] == 0
+
+	cache = AssetCache(tmp_path / 'fresh')
+	assert not await cache.handle(FakeRoute(server, url='https://example.com/me.js', headers={'cookie': 'session=alice'}))
+	assert cache.stats()['entries'] == 0
+
+
+async def test_cors_responses_are_not_replayed_to_other_origins(tmp_path):
+	cache = AssetCache(tmp_path)
+	url = 'https://cdn.example.com/font.woff2'
+
+	def font_response(origin):
+		headers = {'cache-control': 'max-age=3600', 'vary': 'Origin', 'access-control-allow-origin': origin}
+		return FakeResponse(body=b'font', headers=headers)
+
+	def font_route(server, origin):
+		return FakeRoute(server, url=url, resource_type='font', headers={'accept': '*/*', 'origin': origin})
+
+	site_a = FakeServer(font_response('https://a.example'))
+	assert await cache.handle(font_route(site_a, 'https://a.example'))
+	site_b = FakeServer(font_response('https://b.example'))
+	# another site's request for the same font goes to the network, it must get its own CORS headers
+	for _ in range(2):
+		assert await cache.handle(font_route(site_b, 'https://b.example'))
+	assert len(site_b.fetches) == 1
+
+	# the same origin is still served from the cache
+	route = font_route(site_a, 'https://a.example')
+	assert await cache.handle(route)
+	assert len(site_a.fetches) == 1
+	assert route.result[1]['headers']['access-control-allow-origin'] == 'https://a.example'
+
+
+async def test_stale_entries_are_revalidated(tmp_path):
+	cache = AssetCache(tmp_path)
+	server = FakeServer(FakeResponse(headers={'cache-control': 'no-cache', 'etag': '"v1"'}))
+	await cache.handle(FakeRoute(server))
+
+	server.response = FakeResponse(body=b'', status=304, headers={'cache-control': 'max-age=60'})
+	route = FakeRoute(server)
+	assert await cache.handle(route)
+	assert server.fetches[-1]['if-none-match'] == '"v1"'
+	assert route.result[1]['body'] == b'console.log(1)'
+	assert cache.stats()['revalidated'] == 1
+
+	# fresh for 60s now
+	await cache.handle(FakeRoute(server))
+	assert len(server.fetches) == 2
+
+
+async def test_size_cap_evicts_least_recently_used(tmp_path):
+	cache = AssetCache(tmp_path, max_bytes=800)
+	server = FakeServer(FakeResponse(body=b'x' * 100))
+	for name in 'abcdefgh':
+		await cache.handle(FakeRoute(server, url=f'https://example.com/{name}.js'))
+	# touch a so b is the oldest
+	await cache.handle(FakeRoute(server, url='https://example.com/a.js'))
+	await cache.handle(FakeRoute(server, url='https://example.com/i.js'))
+
+	stats = cache.stats()
+	assert stats['bytes'] <= 800
+	assert stats['evictions'] == 1
+	assert not list(tmp_path.glob(f'{cache_key("https://example.com/b.js", {"accept": "*/*"})}.*'))
+	assert cache.get(cache_key('https://example.com/a.js', {'accept': '*/*'})) is not None
+
+	# larger than an entry may be
+	await cache.handle(FakeRoute(FakeServer(FakeResponse(body=b'x' * 200)), url='https://example.com/big.js'))
+	assert cache.get(cache_key('https://example.com/big.js', {'accept': '*/*'})) is None
+
+
+async def test_concurrent_sessions_share_one_cache(tmp_path):
+	assert get_asset_cache(tmp_path) is get_asset_cache(tmp_path / '.')
+	server = FakeServer(FakeResponse())
+	routes = [FakeRoute(server, url=f'https://example.com/{i % 5}.js') for i in range(50)]
+	await asyncio.gather(*(get_asset_cache(tmp_path).handle(route) for route in routes))
+	assert all(route.result[1]['body'] == b'console.log(1)' for route in routes)
+	assert get_asset_cache(tmp_path).stats()['entries'] == 5
+	assert not list(tmp_path.glob('*.tmp'))
+
+
+async def test_session_routes_static_assets_through_the_cache(tmp_path):
+	browser_session = BrowserSession(asset_cache_dir=tmp_path / 'assets')
+	assert browser_session.asset_cache_stats() is None
+
+	class FakeContext:
+		def __init__(self):
+			self.routes = []
+
+		async def route(self, pattern, handler):
+			self.routes.append(handler)
+
+	browser_session.browser_context = FakeContext()
+	await browser_session._setup_request_interception()
+	(handler,) = browser_session.browser_context.routes
+
+	server = FakeServer(FakeResponse())
+	page = FakeRoute(server, url='https://example.com/', resource_type='document')
+	await handler(page)
+	assert page.result == ('fallback', None)
+	for _ in range(2):
+		await handler(FakeRoute(server))
+	assert browser_session.asset_cache_stats()['hits'] == 1
@@ -0,0 +1,152 @@
+"""
+Test the per-page CDP session pool of BrowserSession, with fake pages instead of a browser.
+"""
+
+import asyncio
+
+import pytest
+
+from browser_use.browser.session import BrowserSession, CDPSessionPool
+
+
+class FakeCDPSession:
+	def __init__(self):
+		self.sent = []
+		self.detached = False
+		self.fail = False
+
+	async def send(self, method, params=None):
+		if self.fail:
+			raise RuntimeError('Target closed')
+		self.sent.append((method, params))
+		return {'method': method}
+
+	async def detach(self):
+		self.detached = True
+
+
+class FakeContext:
+	def __init__(self):
+		self.attached = []
+
+	async def new_cdp_session(self, page):
+		await asyncio.sleep(0.01)
+		cdp_session = FakeCDPSession()
+		self.attached.append(cdp_session)
+		return cdp_session
+
+
+class FakePage:
+	def __init__(self, context):
+		self.context = context
+		self.handlers = {}
+
+	def on(self, event, handler):
+		self.handlers.setdefault(event, []).append(handler)
+
+	def emit(self, event):
+		for handler in self.handlers.get(event, []):
+			handler(self)
+
+
+async def test_one_session_per_page_is_reused():
+	pool = CDPSessionPool()
+	context = FakeContext()
+	page, other_page = FakePage(context), FakePage(context)
+
+	# concurrent first calls still attach only once
+	sessions = await asyncio.gather(*(pool.get(page) for _ in range(5)))
+	assert all(cdp_session is sessions[0] for cdp_session in sessions)
+	await pool.send(page, 'Page.captureScreenshot', {'format': 'jpeg'})
+	assert sessions[0].sent == [('Page.captureScreenshot', {'format': 'jpeg'})]
+
+	assert await pool.get(other_page) is not sessions[0]
+	assert len(context.attached) == 2
+	assert pool.stats() == {'attached': 2, 'created': 2, 'reused': 5}
+
+
+@pytest.mark.parametrize('event', ['close', 'crash'])
+async def test_session_is_dropped_when_page_goes_away(event):
+	pool = CDPSessionPool()
+	page = FakePage(FakeContext())
+	first = await pool.get(page)
+	page.emit(event)
+	assert await pool.get(page) is not first
+	# the target is gone, nothing to detach
+	assert not first.detached
+	# re-attaching doesn't stack more listeners on the page
+	assert len(page.handlers['close']) == len(page.handlers['crash']) == 1
+
+
+async def test_failed_command_attaches_a_fresh_session():
+	pool = CDPSessionPool()
+	page = FakePage(FakeContext())
+	first = await pool.get(page)
+	first.fail = True
+	with pytest.raises(RuntimeError):
+		await pool.send(page, 'Input.synthesizeScrollGesture')
+	second = await pool.get(page)
+	assert second is not first
+	assert (await pool.send(page, 'Input.synthesizeScrollGesture'))['method'] == 'Input.synthesizeScrollGesture'
+	# the broken session is detached, not just forgotten
+	await asyncio.sleep(0)
+	assert first.detached and not second.detached
+	assert len(page.handlers['close']) == 1
+
+
+async def test_failed_browser_session_is_detached_and_replaced():
+	class FakeBrowser:
+		async def new_browser_cdp_session(self):
+			return FakeCDPSession()
+
+	pool = CDPSessionPool()
+	browser = FakeBrowser()
+	first = await pool.get_browser_session(browser)
+	pool.discard_browser_session()
+	second = await pool.get_browser_session(browser)
+	assert second is not first
+	await pool.close()
+	assert first.detached and second.detached
+
+
+async def test_concurrent_first_calls_attach_one_browser_session():
+	class FakeBrowser:
+		def __init__(self):
+			self.attached = []
+
+		async def new_browser_cdp_session(self):
+			await asyncio.sleep(0.01)
+			cdp_session = FakeCDPSession()
+			self.attached.append(cdp_session)
+			return cdp_session
+
+	pool = CDPSessionPool()
+	browser = FakeBrowser()
+	sessions = await asyncio.gather(*(pool.get_browser_session(browser) for _ in range(5)))
+	assert all(cdp_session is sessions[0] for cdp_session in sessions)
+	assert len(browser.attached) == 1
+	assert (pool.created, pool.reused) == (1, 4)
+
+
+async def test_close_detaches_everything():
+	pool = CDPSessionPool()
+	page = FakePage(FakeContext())
+	cdp_session = await pool.get(page)
+	await pool.close()
+	assert cdp_session.detached
+	assert pool.stats()['attached'] == 0
+
+
+async def test_stop_detaches_the_pooled_sessions():
+	browser_session = BrowserSession(keep_alive=False)
+	page = FakePage(FakeContext())
+	cdp_session = await browser_session.cdp_sessions.get(page)
+	await browser_session.stop()
+	assert cdp_session.detached
+	assert browser_session.cdp_sessions.stats()['attached'] == 0
+
+
+def test_browser_session_exposes_its_pool():
+	browser_session = BrowserSession()
+	assert isinstance(browser_session.cdp_sessions, CDPSessionPool)
+	assert browser_session.cdp_sessions is browser_session.cdp_sessions
@@ -0,0 +1,175 @@
+"""
+Test the concurrent state capture of BrowserSession._get_updated_state, without a browser.
+"""
+
+import asyncio
+
+import pytest
+
+from browser_use.browser.session import BrowserSession
+from browser_use.browser.views import PageInfo, PageMetrics
+from browser_use.dom.views import DOMElementNode, DOMState
+
+PROBE_DELAY = 0.1
+
+
+class FakePage:
+	url = 'https://example.com/form'
+
+
+class ProbeSession(BrowserSession):
+	"""Every state probe sleeps PROBE_DELAY and logs when it ran"""
+
+	def model_post_init(self, __context):
+		super().model_post_init(__context)
+		self.events = []
+		self.page = FakePage()
+		self.slow_probe = None
+		self.pdf_checks = []
+
+	async def _probe(self, name, result):
+		self.events.append(f'{name}:start')
+		await asyncio.sleep(10 if name == self.slow_probe else PROBE_DELAY)
+		self.events.append(f'{name}:end')
+		if isinstance(result, Exception):
+			raise result
+		return result
+
+	async def get_current_page(self):
+		return self.page
+
+	async def remove_highlights(self):
+		return await self._probe('remove_highlights', None)
+
+	async def _auto_download_pdf_if_needed(self, page, is_pdf_viewer=None):
+		self.pdf_checks.append(is_pdf_viewer)
+		return await self._probe('pdf_download', None)
+
+	async def _build_dom_state(self, dom_service, focus_element=-1):
+		body = DOMElementNode(tag_name='body', xpath='/body', attributes={}, children=[], is_visible=True, parent=None)
+		return await self._probe('dom', DOMState(element_tree=body, selector_map={0: body}))
+
+	async def get_tabs_info(self):
+		return await self._probe('tabs', RuntimeError('tab list unavailable'))
+
+	async def get_page_metrics(self, page):
+		page_info = PageInfo(
+			viewport_width=1280,
+			viewport_height=720,
+			page_width=1280,
+			page_height=2000,
+			scroll_x=0,
+			scroll_y=0,
+			pixels_above=0,
+			pixels_below=1280,
+			pixels_left=0,
+			pixels_right=0,
+		)
+		return await self._probe('page_metrics', PageMetrics(page_info=page_info, title='Form', content_type='text/html'))
+
+	async def take_screenshot(self, *args, **kwargs):
+		return await self._probe('screenshot', 'c2NyZWVuc2hvdA==')
+
+
+def make_session(**profile_overrides):
+	return ProbeSession(**{'concurrent_state_capture': True, 'state_probe_timeout': 1.0, **profile_overrides})
+
+
+async def test_probes_run_concurrently_with_timings():
+	session = make_session(highlight_elements=False)
+	state = await session._get_updated_state()
+
+	assert state.title == 'Form'
+	assert state.pixels_below == 1280
+	assert state.content_type == 'text/html'
+	assert state.screenshot == 'c2NyZWVuc2hvdA=='
+	# the failed probe falls back to its default instead of failing the state
+	assert state.tabs == []
+	# three phases of PROBE_DELAY (highlights, the probes with the PDF check after the metrics), not one per probe
+	assert state.timings['total'] < PROBE_DELAY * 5
+	assert set(state.timings) == {'remove_highlights', 'pdf_download', 'dom', 'tabs', 'page_metrics', 'screenshot', 'total'}
+	# highlights are removed before the DOM build starts
+	assert session.events.index('remove_highlights:end') < session.events.index('dom:start')
+
+
+async def test_screenshot_waits_for_highlighted_dom():
+	session = make_session(highlight_elements=True)
+	state = await session._get_updated_state()
+	assert state.screenshot
+	assert session.events.index('dom:end') < session.events.index('screenshot:start')
+
+	state = await session._get_updated_state(include_screenshot=False)
+	assert state.screenshot is None
+	assert 'screenshot' not in state.timings
+
+
+async def test_slow_probe_times_out_to_default():
+	session = make_session(highlight_elements=False)
+	session.slow_probe = 'page_metrics'
+	state = await session._get_updated_state()
+	assert (state.title, state.pixels_above, state.pixels_below) == ('Title unavailable', 0, 0)
+	assert state.page_info is None
+	assert 1.0 <= state.timings['page_metrics'] < 2.0
+
+
+async def test_sequential_mode_keeps_probe_order():
+	session = make_session(concurrent_state_capture=False, highlight_elements=False)
+	state = await session._get_updated_state()
+	assert state.title == 'Form'
+	starts = [event.split(':')[0] for event in session.events if event.endswith(':start')]
+	assert starts == [
+		'remove_highlights',
+		'dom',
+		'tabs',
+		'page_metrics',
+		'pdf_download',
+		'screenshot',
+	]
+
+
+async def test_pdf_check_reuses_the_page_metrics():
+	session = make_session(highlight_elements=False)
+	await session._get_updated_state()
+	# the PDF auto-download gets the viewer status from the metrics probe instead of reading the metrics again
+	assert session.pdf_checks == [False]
+
+	session.slow_probe = 'page_metrics'
+	await session._get_updated_state()
+	assert session.pdf_checks == [False, None]
+
+
+async def test_page_metrics_come_from_one_evaluation():
+	class MetricsPage:
+		evaluations = 0
+
+		async def evaluate(self, script):
+			self.evaluations += 1
+			return {
+				'viewport_width': 1280,
+				'viewport_height': 720.5,
+				'page_width': 1280,
+				'page_height': 3000,
+				'scroll_x': 0,
+				'scroll_y': 500.4,
+				'title': 'Report',
+				'content_type': 'application/pdf',
+				'is_pdf_viewer': True,
+			}
+
+	page = MetricsPage()
+	metrics = await BrowserSession()._read_page_metrics(page)  # type: ignore[arg-type]
+	assert page.evaluations == 1
+	assert metrics.title == 'Report'
+	assert metrics.is_pdf_viewer
+	assert (metrics.page_info.pixels_above, metrics.page_info.pixels_below) == (500, 1780)
+
+
+async def test_dom_build_error_propagates():
+	class BrokenDomSession(ProbeSession):
+		async def _build_dom_state(self, dom_service, focus_element=-1):
+			return await self._probe('dom', ValueError('buildDomTree failed'))
+
+	session = BrokenDomSession(concurrent_state_capture=True, state_probe_timeout=1.0, highlight_elements=False)
+	# the DOM build's own error reaches the caller instead of a generic one
+	with pytest.raises(ValueError, match='buildDomTree failed'):
+		await session._get_updated_state()
@@ -0,0 +1,223 @@
+"""Test patching the cached DOM tree from incremental buildDomTree snapshots."""
+
+from browser_use.dom.history_tree_processor.service import HistoryTreeProcessor
+from browser_use.dom.service import DomService, _snapshot_caches
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+
+class FakePage:
+	url = 'https://example.com'
+
+
+def element(tag, xpath, children=(), highlight_index=None):
+	data = {
+		'tagName': tag,
+		'xpath': xpath,
+		'attributes': {},
+		'children': list(children),
+		'isVisible': True,
+		'isTopElement': True,
+		'isInteractive': highlight_index is not None,
+	}
+	if highlight_index is not None:
+		data['highlightIndex'] = highlight_index
+	return data
+
+
+def text(value):
+	return {'type': 'TEXT_NODE', 'text': value, 'isVisible': True}
+
+
+def full_snapshot():
+	# body(0) -> form(1) -> [button(2) -> "Submit"(3), input(4)]
+	return {
+		'rootId': '0',
+		'snapshotId': 'tok:1',
+		'baseSnapshotId': None,
+		'removed': [],
+		'map': {
+			'3': text('Submit'),
+			'2': element('button', 'html/body/form/button', ['3'], highlight_index=0),
+			'4': element('input', 'html/body/form/input', highlight_index=1),
+			'1': element('form', 'html/body/form', ['2', '4']),
+			# parents may have lower ids than their children once ids are stable
+			'0': {'tagName': 'body', 'attributes': {}, 'xpath': '/body', 'children': ['1']},
+		},
+	}
+
+
+def test_full_snapshot_builds_tree_regardless_of_id_order():
+	page = FakePage()
+	service = DomService(page)  # type: ignore[arg-type]
+	root, selector_map = service._apply_dom_snapshot(full_snapshot(), None)
+
+	assert root.tag_name == 'body'
+	form = root.children[0]
+	assert isinstance(form, DOMElementNode) and form.parent is root
+	assert [child.tag_name for child in form.children if isinstance(child, DOMElementNode)] == ['button', 'input']
+	assert selector_map[0].get_all_text_till_next_clickable_element() == 'Submit'
+	assert _snapshot_caches[page].snapshot_id == 'tok:1'
+
+
+def test_delta_patches_changed_nodes_and_keeps_old_selector_map():
+	page = FakePage()
+	service = DomService(page)  # type: ignore[arg-type]
+	# e.g. a DOM warm-up while the LLM runs, nobody holds on to this tree
+	_, first_map = service._apply_dom_snapshot(full_snapshot(), None, hand_out=False)
+	cache = _snapshot_caches[page]
+	old_button = first_map[0]
+	old_input = first_map[1]
+
+	# the button text changed and a new link was appended to the form
+	delta = {
+		'rootId': '0',
+		'snapshotId': 'tok:2',
+		'baseSnapshotId': 'tok:1',
+		'removed': [],
+		'map': {
+			'3': text('Sending...'),
+			'5': element('a', 'html/body/form/a', highlight_index=2),
+			'1': element('form', 'html/body/form', ['2', '4', '5']),
+		},
+	}
+	root, selector_map = service._apply_dom_snapshot(delta, cache, hand_out=False)
+
+	# unchanged nodes are reused, the changed text shows through them
+	assert _snapshot_caches[page] is cache
+	assert selector_map[0] is old_button
+	assert selector_map[1] is old_input
+	assert old_button.get_all_text_till_next_clickable_element() == 'Sending...'
+	assert selector_map[2].tag_name == 'a'
+	form = root.children[0]
+	assert isinstance(form, DOMElementNode) and old_button.parent is form
+	assert len(form.children) == 3
+	# the selector map returned for the previous state is not modified
+	assert set(first_map) == {0, 1}
+
+	removal = {
+		'rootId': '0',
+		'snapshotId': 'tok:3',
+		'baseSnapshotId': 'tok:2',
+		'removed': ['2', '3'],
+		'map': {'1': element('form', 'html/body/form', ['4', '5'])},
+	}
+	root, selector_map = service._apply_dom_snapshot(removal, cache, hand_out=False)
+	assert set(selector_map) == {1, 2}
+	assert [child.tag_name for child in root.children[0].children if isinstance(child, DOMElementNode)] == ['input', 'a']
+	assert '2' not in cache.node_map and '3' not in cache.node_map
+
+
+def test_delta_leaves_handed_out_trees_untouched():
+	page = FakePage()
+	service = DomService(page)  # type: ignore[arg-type]
+	first_root, first_map = service._apply_dom_snapshot(full_snapshot(), None)
+	old_button = first_map[0]
+	old_form = first_root.children[0]
+	old_hash = old_button.hash
+
+	# the button text changed, a link was appended and the button moved into a new div
+	delta = {
+		'rootId': '0',
+		'snapshotId': 'tok:2',
+		'baseSnapshotId': 'tok:1',
+		'removed': [],
+		'map': {
+			'3': text('Sending...'),
+			'5': element('div', 'html/body/div', ['2']),
+			'1': element('form', 'html/body/form', ['4', '6']),
+			'6': element('a', 'html/body/form/a', highlight_index=2),
+			'0': {'tagName': 'body', 'attributes': {}, 'xpath': '/body', 'children': ['1', '5']},
+		},
+	}
+	root, selector_map = service._apply_dom_snapshot(delta, _snapshot_caches[page])
+
+	# the tree the LLM saw, and its selector map, read the same as before
+	assert first_root.children == [old_form] and old_button.parent is old_form
+	assert old_button.get_all_text_till_next_clickable_element() == 'Submit'
+	assert [child.tag_name for child in old_form.children if isinstance(child, DOMElementNode)] == ['button', 'input']
+	assert old_button.hash == old_hash
+	assert set(first_map) == {0, 1} and first_map[0] is old_button
+
+	# the new tree has copies with the changes
+	button = selector_map[0]
+	assert button is not old_button
+	assert button.get_all_text_till_next_clickable_element() == 'Sending...'
+	assert button.parent is root.children[1]
+	assert button.hash.branch_path_hash == HistoryTreeProcessor._parent_branch_path_hash(['div', 'button'])
+	assert [child.tag_name for child in root.children[0].children if isinstance(child, DOMElementNode)] == ['input', 'a']
+
+
+def test_delta_copies_only_the_changed_path():
+	page = FakePage()
+	service = DomService(page)  # type: ignore[arg-type]
+	snapshot = full_snapshot()
+	snapshot['map']['8'] = element('a', 'html/body/nav/a', highlight_index=2)
+	snapshot['map']['7'] = element('nav', 'html/body/nav', ['8'])
+	snapshot['map']['0']['children'] = ['1', '7']
+	first_root, first_map = service._apply_dom_snapshot(snapshot, None)
+	old_nav = first_root.children[1]
+
+	# only the button text changed
+	delta = {'rootId': '0', 'snapshotId': 'tok:2', 'baseSnapshotId': 'tok:1', 'removed': [], 'map': {'3': text('Sending...')}}
+	root, selector_map = service._apply_dom_snapshot(delta, _snapshot_caches[page])
+
+	# the button and its ancestors are copies, the input next to it and the nav subtree are shared
+	assert root is not first_root and root.children[0] is not first_root.children[0]
+	assert selector_map[0] is not first_map[0]
+	assert first_map[0].get_all_text_till_next_clickable_element() == 'Submit'
+	assert selector_map[0].get_all_text_till_next_clickable_element() == 'Sending...'
+	assert selector_map[1] is first_map[1] and selector_map[1].parent is root.children[0]
+	assert root.children[1] is old_nav and selector_map[2] is first_map[2]
+
+
+def test_unchanged_snapshot_reuses_cached_tree():
+	page = FakePage()
+	service = DomService(page)  # type: ignore[arg-type]
+	root, selector_map = service._apply_dom_snapshot(full_snapshot(), None)
+
+	again_root, again_map = service._apply_dom_snapshot(
+		{'rootId': '0', 'snapshotId': 'tok:1', 'unchanged': True, 'map': {}}, _snapshot_caches[page]
+	)
+	assert again_root is root
+	assert again_map == selector_map and again_map is not selector_map
+
+
+def test_snapshot_from_unknown_base_rebuilds_from_scratch():
+	page = FakePage()
+	service = DomService(page)  # type: ignore[arg-type]
+	service._apply_dom_snapshot(full_snapshot(), None)
+	stale = _snapshot_caches[page]
+
+	# e.g. after a navigation the page registry starts over and sends everything
+	fresh = full_snapshot()
+	fresh['snapshotId'] = 'other:1'
+	root, selector_map = service._apply_dom_snapshot(fresh, stale)
+	assert _snapshot_caches[page].snapshot_id == 'other:1'
+	assert isinstance(root.children[0].children[0].children[0], DOMTextNode)
+	assert set(selector_map) == {0, 1}
+
+
+def test_moved_node_gets_a_new_branch_path_hash():
+	page = FakePage()
+	service = DomService(page)  # type: ignore[arg-type]
+	_, selector_map = service._apply_dom_snapshot(full_snapshot(), None, hand_out=False)
+	button = selector_map[0]
+	old_hash = button.hash
+
+	# the button moved from the form into a new div directly under body
+	delta = {
+		'rootId': '0',
+		'snapshotId': 'tok:2',
+		'baseSnapshotId': 'tok:1',
+		'removed': [],
+		'map': {
+			'1': element('form', 'html/body/form', ['4']),
+			'5': element('div', 'html/body/div', ['2']),
+			'0': {'tagName': 'body', 'attributes': {}, 'xpath': '/body', 'children': ['1', '5']},
+		},
+	}
+	_, selector_map = service._apply_dom_snapshot(delta, _snapshot_caches[page], hand_out=False)
+	assert selector_map[0] is button
+	assert button.hash.branch_path_hash != old_hash.branch_path_hash
+	assert button.hash.branch_path_hash == HistoryTreeProcessor._parent_branch_path_hash(['div', 'button'])
+	assert selector_map[1].hash.branch_path_hash == HistoryTreeProcessor._parent_branch_path_hash(['form', 'input'])
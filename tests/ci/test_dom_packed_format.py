@@ -0,0 +1,102 @@
+"""Test decoding the packed (columnar) buildDomTree wire format."""
+
+from browser_use.dom.service import DomService, _snapshot_caches, pack_node_map
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+
+class FakePage:
+	url = 'https://example.com'
+
+
+def node_map():
+	# body(5) -> form(4) -> [button(1) -> "Submit"(0), input(2), hidden text(3)]
+	return {
+		'0': {'type': 'TEXT_NODE', 'text': 'Submit', 'isVisible': True},
+		'1': {
+			'tagName': 'button',
+			'xpath': 'html/body/form/button',
+			'attributes': {'type': 'submit', 'class': 'btn', 'disabled': ''},
+			'children': ['0'],
+			'isVisible': True,
+			'isTopElement': True,
+			'isInteractive': True,
+			'isInViewport': True,
+			'highlightIndex': 0,
+		},
+		'2': {
+			'tagName': 'input',
+			'xpath': 'html/body/form/input',
+			'attributes': {'type': 'text', 'name': 'q'},
+			'children': [],
+			'isVisible': True,
+			'isTopElement': True,
+			'isInteractive': True,
+			'highlightIndex': 1,
+			'shadowRoot': True,
+		},
+		'3': {'type': 'TEXT_NODE', 'text': 'Submit', 'isVisible': False},
+		'4': {'tagName': 'form', 'xpath': 'html/body/form', 'attributes': {}, 'children': ['1', '2', '3'], 'isVisible': True},
+		'5': {'tagName': 'body', 'attributes': {}, 'xpath': '/body', 'children': ['4']},
+	}
+
+
+def describe(node):
+	"""Everything the tree builder reads from a node, as comparable plain data"""
+	if isinstance(node, DOMTextNode):
+		return ('text', node.text, node.is_visible)
+	assert isinstance(node, DOMElementNode)
+	return (
+		node.tag_name,
+		node.xpath,
+		node.attributes,
+		node.is_visible,
+		node.is_interactive,
+		node.is_top_element,
+		node.is_in_viewport,
+		node.highlight_index,
+		node.shadow_root,
+		[describe(child) for child in node.children],
+	)
+
+
+async def test_packed_and_dict_formats_build_the_same_tree():
+	service = DomService(FakePage())  # type: ignore[arg-type]
+	dict_root, dict_map = await service._construct_dom_tree({'rootId': '5', 'map': node_map()})
+	packed = pack_node_map(node_map())
+	packed_root, packed_map = await service._construct_dom_tree({'rootId': '5', 'packed': packed})
+
+	assert describe(packed_root) == describe(dict_root)
+	assert set(packed_map) == set(dict_map) == {0, 1}
+	assert packed_map[0].parent is packed_root.children[0]
+	assert packed_map[0].get_all_text_till_next_clickable_element() == 'Submit'
+	# repeated strings are sent once
+	assert packed['strings'].count('Submit') == 1
+
+
+async def test_packed_missing_attribute_values_decode_as_empty_strings():
+	service = DomService(FakePage())  # type: ignore[arg-type]
+	nodes = node_map()
+	nodes['1']['attributes']['disabled'] = None
+	_, selector_map = await service._construct_dom_tree({'rootId': '5', 'packed': pack_node_map(nodes)})
+	assert selector_map[0].attributes == {'type': 'submit', 'class': 'btn', 'disabled': ''}
+
+
+def test_packed_delta_patches_cached_tree():
+	page = FakePage()
+	service = DomService(page)  # type: ignore[arg-type]
+	full = {'rootId': '5', 'snapshotId': 'tok:1', 'baseSnapshotId': None, 'removed': [], 'packed': pack_node_map(node_map())}
+	_, first_map = service._apply_dom_snapshot(full, None, hand_out=False)
+	old_input = first_map[1]
+
+	delta = {
+		'rootId': '5',
+		'snapshotId': 'tok:2',
+		'baseSnapshotId': 'tok:1',
+		'removed': [],
+		'packed': pack_node_map({'0': {'type': 'TEXT_NODE', 'text': 'Sending...', 'isVisible': True}}),
+	}
+	root, selector_map = service._apply_dom_snapshot(delta, _snapshot_caches[page], hand_out=False)
+
+	assert selector_map[1] is old_input
+	assert selector_map[0].get_all_text_till_next_clickable_element() == 'Sending...'
+	assert root.children[0].children[0] is selector_map[0]
@@ -0,0 +1,58 @@
+"""Test the persistent DOM analysis runtime installed into pages."""
+
+from browser_use.dom.service import (
+	CALL_DOM_RUNTIME_JS,
+	DomService,
+	get_dom_runtime_install_js,
+	get_dom_runtime_version,
+	get_dom_tree_js,
+)
+
+
+class FakePage:
+	"""Mimics a document that either has window.__browserUse installed or not"""
+
+	url = 'https://example.com'
+
+	def __init__(self, installed_version=None):
+		self.installed_version = installed_version
+		self.scripts = []
+
+	async def evaluate(self, script, arg=None):
+		self.scripts.append(script)
+		if script == CALL_DOM_RUNTIME_JS:
+			version, args = arg
+			if self.installed_version != version:
+				return None
+			return {'rootId': '0', 'map': {}, 'args': args}
+		if script == get_dom_runtime_install_js():
+			self.installed_version = get_dom_runtime_version()
+			return None
+		raise AssertionError(f'unexpected script: {script[:50]}')
+
+
+def test_js_source_is_loaded_once():
+	assert get_dom_tree_js() is get_dom_tree_js()
+	assert DomService(FakePage()).js_code is DomService(FakePage()).js_code  # type: ignore[arg-type]
+	install_js = get_dom_runtime_install_js()
+	assert install_js.startswith('(() => {')
+	assert 'window.__browserUse' in install_js
+	assert get_dom_runtime_version() in install_js
+
+
+async def test_installed_runtime_is_called_without_resending_source():
+	page = FakePage(installed_version=get_dom_runtime_version())
+	result = await DomService(page)._evaluate_dom_runtime({'viewportExpansion': 0})  # type: ignore[arg-type]
+	assert result['args'] == {'viewportExpansion': 0}
+	assert page.scripts == [CALL_DOM_RUNTIME_JS]
+
+
+async def test_missing_or_outdated_runtime_is_installed_once():
+	page = FakePage(installed_version='outdated')
+	service = DomService(page)  # type: ignore[arg-type]
+	await service._evaluate_dom_runtime({})
+	assert page.scripts == [CALL_DOM_RUNTIME_JS, get_dom_runtime_install_js(), CALL_DOM_RUNTIME_JS]
+
+	page.scripts.clear()
+	await service._evaluate_dom_runtime({})
+	assert page.scripts == [CALL_DOM_RUNTIME_JS]
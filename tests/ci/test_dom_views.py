@@ -0,0 +1,170 @@
+"""Test the slotted DOM node classes."""
+
+import copy
+import pickle
+import time
+
+from browser_use.dom.clickable_element_processor.service import ClickableElementProcessor
+from browser_use.dom.history_tree_processor.service import HistoryTreeProcessor
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+
+def make_tree():
+	button = DOMElementNode(
+		tag_name='button',
+		xpath='html/body/button',
+		attributes={'type': 'submit'},
+		children=[],
+		is_visible=True,
+		parent=None,
+		highlight_index=0,
+	)
+	label = DOMTextNode(text='Send', is_visible=True, parent=button)
+	button.children.append(label)
+	body = DOMElementNode(tag_name='body', xpath='/body', attributes={}, children=[button], is_visible=True, parent=None)
+	button.parent = body
+	return body, button
+
+
+def test_nodes_have_no_instance_dict():
+	_, button = make_tree()
+	assert not hasattr(button, '__dict__')
+	assert not hasattr(button.children[0], '__dict__')
+
+
+def test_hash_is_computed_once():
+	_, button = make_tree()
+	first = button.hash
+	assert button.hash is first
+
+	_, other_button = make_tree()
+	assert other_button.hash == first
+
+
+def test_branch_path_hash_matches_history_element():
+	body, button = make_tree()
+	history_element = HistoryTreeProcessor.convert_dom_element_to_history_element(button)
+	assert history_element.entire_parent_branch_path == ['button']
+	assert HistoryTreeProcessor.compare_history_element_and_dom_element(history_element, button)
+	assert HistoryTreeProcessor.find_history_element_in_tree(history_element, body) is button
+
+	# same tag and attributes one level deeper is a different element
+	wrapper = DOMElementNode(tag_name='div', xpath='html/body/div', attributes={}, children=[], is_visible=True, parent=body)
+	moved = DOMElementNode(
+		tag_name='button', xpath='html/body/button', attributes={'type': 'submit'}, children=[], is_visible=True, parent=wrapper
+	)
+	assert moved.hash.branch_path_hash != button.hash.branch_path_hash
+	assert moved.hash.attributes_hash == button.hash.attributes_hash
+	assert not HistoryTreeProcessor.compare_history_element_and_dom_element(history_element, moved)
+
+
+def test_clickable_element_hash_reuses_node_memo():
+	_, button = make_tree()
+	assert ClickableElementProcessor.hash_dom_element(button) == ClickableElementProcessor.hash_dom_element(button)
+	memo = button.hash
+	button.reset_hashes()
+	assert button.hash is not memo and button.hash == memo
+
+
+def test_nodes_survive_copy_and_pickle():
+	body, button = make_tree()
+	button.hash
+	for clone in (copy.deepcopy(body), pickle.loads(pickle.dumps(body))):
+		cloned_button = clone.children[0]
+		assert cloned_button.parent is clone
+		assert cloned_button.get_all_text_till_next_clickable_element() == 'Send'
+		assert cloned_button.hash == button.hash
+
+
+def element(tag, children=(), highlight_index=None, **kwargs):
+	node = DOMElementNode(
+		tag_name=tag,
+		xpath=tag,
+		attributes=kwargs.pop('attributes', {}),
+		children=[],
+		is_visible=True,
+		is_top_element=kwargs.pop('is_top_element', True),
+		parent=None,
+		highlight_index=highlight_index,
+		**kwargs,
+	)
+	for child in children:
+		if isinstance(child, str):
+			child = DOMTextNode(text=child, is_visible=True, parent=None)
+		child.parent = node
+		node.children.append(child)
+	return node
+
+
+def make_page():
+	# a highlighted link wraps a nested highlighted button, whose text must not leak into the link
+	return element(
+		'body',
+		[
+			'Welcome',
+			element(
+				'a',
+				['Open', element('span', [element('em', ['deep'])]), element('button', ['Inner'], highlight_index=1)],
+				highlight_index=0,
+				attributes={'aria-label': 'Open\ndeep', 'href': '/x'},
+			),
+			element('div', ['Footer', element('input', highlight_index=2, attributes={'placeholder': 'Search'})]),
+		],
+	)
+
+
+def test_clickable_elements_text_matches_per_element_walk():
+	body = make_page()
+	selector_map = {0: body.children[1], 1: body.children[1].children[2], 2: body.children[2].children[1]}
+	for max_depth in (-1, 0, 1, 2):
+		texts = body.get_clickable_elements_text(max_depth=max_depth)
+		assert texts == {
+			index: node.get_all_text_till_next_clickable_element(max_depth=max_depth) for index, node in selector_map.items()
+		}
+	assert body.get_clickable_elements_text() == {0: 'Open\ndeep', 1: 'Inner', 2: ''}
+	assert body.get_clickable_elements_text(max_depth=2) == {0: 'Open', 1: 'Inner', 2: ''}
+
+
+def test_clickable_elements_to_string_output():
+	assert make_page().clickable_elements_to_string(include_attributes=['aria-label', 'placeholder']) == '\n'.join(
+		[
+			'Welcome',
+			'[0]<a >Open\ndeep />',
+			'\t[1]<button >Inner />',
+			'Footer',
+			'[2]<input placeholder=Search />',
+		]
+	)
+	# text below a highlighted ancestor of the subtree is not repeated
+	assert make_page().children[1].children[1].clickable_elements_to_string() == ''
+
+
+def _deep_page(depth):
+	"""A deeply nested page where every level has text, the worst case for walking up to the root per text node"""
+	root = current = element('body')
+	for level in range(depth):
+		child = element('div', [f'level {level}'], is_top_element=False)
+		child.parent = current
+		current.children.append(child)
+		current = child
+	current.children.append(element('button', ['Go'], highlight_index=0))
+	current.children[-1].parent = current
+	return root
+
+
+def _best_time(func, rounds=3):
+	best = float('inf')
+	for _ in range(rounds):
+		start = time.perf_counter()
+		func()
+		best = min(best, time.perf_counter() - start)
+	return best
+
+
+def test_clickable_elements_to_string_scales_linearly():
+	small, large = _deep_page(1000), _deep_page(8000)
+	small_time = _best_time(small.clickable_elements_to_string)
+	large_time = _best_time(large.clickable_elements_to_string)
+	# 8x the nodes: linear is ~8x, walking up to the root for every text node was ~64x
+	assert large_time < small_time * 24
+	assert large.clickable_elements_to_string().endswith('[0]<button >Go />')
@@ -0,0 +1,165 @@
+"""
+Test the process-wide pool of LLM API clients and its connection reuse metrics.
+"""
+
+import asyncio
+import gc
+import threading
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from browser_use.llm.client_pool import LLMClientPool, get_llm_client_pool
+from browser_use.llm.openai.chat import ChatOpenAI
+
+
+class FakeSDKClient:
+	def __init__(self, api_key=None, http_client=None, timeout=None):
+		self.api_key = api_key
+		self.http_client = http_client
+		self.closed = False
+
+	async def close(self):
+		self.closed = True
+		if self.http_client is not None:
+			await self.http_client.aclose()
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'
+
+	def do_GET(self):
+		body = b'{}'
+		self.send_response(200)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, format, *args):
+		pass
+
+
+@pytest.fixture
+def http_server():
+	server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+	thread = threading.Thread(target=server.serve_forever, daemon=True)
+	thread.start()
+	yield f'http://127.0.0.1:{server.server_address[1]}'
+	server.shutdown()
+	server.server_close()
+
+
+async def test_clients_are_shared_per_client_params():
+	pool = LLMClientPool()
+	first = pool.get_client('openai', {'api_key': 'a', 'timeout': httpx.Timeout(30)}, lambda params: FakeSDKClient(**params))
+	assert (
+		pool.get_client('openai', {'api_key': 'a', 'timeout': httpx.Timeout(30)}, lambda params: FakeSDKClient(**params)) is first
+	)
+	assert pool.get_client('openai', {'api_key': 'b'}, lambda params: FakeSDKClient(**params)) is not first
+	assert (
+		pool.get_client('groq', {'api_key': 'a', 'timeout': httpx.Timeout(30)}, lambda params: FakeSDKClient(**params))
+		is not first
+	)
+	assert isinstance(first.http_client, httpx.AsyncClient)
+	assert pool.stats()['created'] == 3
+	assert pool.stats()['reused'] == 1
+	await pool.aclose()
+	assert first.closed
+
+
+async def test_caller_http_client_is_used_and_left_open():
+	pool = LLMClientPool()
+	own_http_client = httpx.AsyncClient()
+	client = pool.get_client('openai', {'http_client': own_http_client}, lambda params: FakeSDKClient(**params))
+	assert client.http_client is own_http_client
+	await pool.aclose()
+	assert not client.closed and not own_http_client.is_closed
+	await own_http_client.aclose()
+
+
+async def test_objects_in_client_params_are_kept_alive_by_their_key():
+	class Credentials:
+		pass
+
+	pool = LLMClientPool()
+	credentials = Credentials()
+	credentials_ref = weakref.ref(credentials)
+	client = pool.get_client('google', {'credentials': credentials}, lambda params: object())
+	del credentials
+	gc.collect()
+	# a new object can't take over the address of one still keyed, and with it the pooled client
+	assert credentials_ref() is not None
+	assert pool.get_client('google', {'credentials': Credentials()}, lambda params: object()) is not client
+	assert pool.get_client('google', {'credentials': credentials_ref()}, lambda params: object()) is client
+	await pool.aclose()
+
+
+async def test_sdk_rejecting_httpx_clients_builds_its_own():
+	def factory(params):
+		if 'http_client' in params:
+			raise TypeError('this SDK uses another http library')
+		return FakeSDKClient(**params)
+
+	pool = LLMClientPool()
+	client = pool.get_client('anthropic', {'api_key': 'a'}, factory)
+	assert client.http_client is None
+	await pool.aclose()
+	assert client.closed
+
+
+async def test_connections_are_reused_across_requests(http_server):
+	pool = LLMClientPool(max_keepalive_connections=5)
+	client = pool.get_client('openai', {'api_key': 'a'}, lambda params: FakeSDKClient(**params))
+	for _ in range(3):
+		response = await client.http_client.get(f'{http_server}/v1/models')
+		assert response.status_code == 200
+	stats = pool.stats()
+	assert stats['requests'] == 3
+	assert stats['new_connections'] == 1
+	assert stats['reused_connections'] == 2
+	await pool.aclose()
+
+
+async def test_last_agent_release_closes_the_clients():
+	pool = LLMClientPool()
+	client = pool.get_client('openai', {'api_key': 'a'}, lambda params: FakeSDKClient(**params))
+	pool.retain()
+	pool.retain()
+	await pool.release()
+	assert not client.closed
+	await pool.release()
+	assert client.closed
+	assert pool.stats()['open_clients'] == 0
+
+	# a server keeps them warm between agents
+	pool.close_when_unused = False
+	client = pool.get_client('openai', {'api_key': 'a'}, lambda params: FakeSDKClient(**params))
+	pool.retain()
+	await pool.release()
+	assert not client.closed
+	await pool.aclose()
+
+
+def test_clients_are_kept_per_event_loop():
+	pool = LLMClientPool()
+
+	async def get():
+		return pool.get_client('openai', {'api_key': 'a'}, lambda params: FakeSDKClient(**params))
+
+	first = asyncio.run(get())
+	second = asyncio.run(get())
+	assert first is not second
+	# the first loop is closed, its client was dropped
+	assert pool.stats()['open_clients'] == 1
+
+
+async def test_chat_models_use_the_shared_pool():
+	llm = ChatOpenAI(model='gpt-4o-mini', api_key='test-key')
+	other = ChatOpenAI(model='gpt-4o', api_key='test-key')
+	assert llm.get_client() is llm.get_client()
+	# same client params, different model: still one client and connection pool
+	assert other.get_client() is llm.get_client()
+	await get_llm_client_pool().aclose()
@@ -0,0 +1,344 @@
+"""
+Test streamed structured outputs: the incremental JSON parser, the OpenAI and Anthropic streaming paths with
+fake clients, and the agent starting the first action while the rest of the output streams in.
+"""
+
+import asyncio
+import json
+
+import pytest
+from anthropic.types import Message
+from openai.types.chat import ChatCompletionChunk
+from pydantic import BaseModel, ValidationError
+
+from browser_use.agent.service import Agent
+from browser_use.agent.views import ActionResult
+from browser_use.browser.session import BrowserSession
+from browser_use.llm.anthropic.chat import ChatAnthropic
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.exceptions import ModelProviderError
+from browser_use.llm.messages import UserMessage
+from browser_use.llm.openai.chat import ChatOpenAI
+from browser_use.llm.streaming import IncrementalJSONParser
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamItem
+from tests.ci.conftest import create_mock_llm
+
+OUTPUT = {
+	'thinking': 'The "pricing" link, {maybe} [here]',
+	'memory': 'step 1\\n',
+	'action': [{'go_to_url': {'url': 'https://example.com/pricing'}}, {'go_back': {}}],
+	'tags': ['a', 1, True, None, [2, 3]],
+}
+
+
+class Plan(BaseModel):
+	thinking: str
+	action: list[dict]
+
+
+def chunked(text, size):
+	return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 7, 1000])
+def test_parser_yields_each_list_entry_once_complete(size):
+	text = json.dumps(OUTPUT)
+	parser = IncrementalJSONParser()
+	seen = []
+	for chunk in chunked(text, size):
+		for item in parser.feed(chunk):
+			seen.append((item.field, item.index, item.value))
+	assert seen == [
+		('action', 0, OUTPUT['action'][0]),
+		('action', 1, OUTPUT['action'][1]),
+		('tags', 0, 'a'),
+		('tags', 1, 1),
+		('tags', 2, True),
+		('tags', 3, None),
+		('tags', 4, [2, 3]),
+	]
+	assert parser.text == text
+
+
+def test_parser_reports_an_entry_before_the_rest_of_the_output():
+	parser = IncrementalJSONParser()
+	assert parser.feed('{"action": [{"go_back": {') == []
+	assert [item.value for item in parser.feed('}}')] == [{'go_back': {}}]
+
+
+def test_parser_reports_only_the_requested_lists():
+	parser = IncrementalJSONParser(fields=['action'])
+	items = parser.feed(json.dumps(OUTPUT))
+	assert [item.field for item in items] == ['action', 'action']
+
+
+class FakeOpenAIStream:
+	def __init__(self, chunks):
+		self.chunks = chunks
+		self.closed = False
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, *exc):
+		self.closed = True
+
+	async def __aiter__(self):
+		for chunk in self.chunks:
+			await asyncio.sleep(0)
+			yield chunk
+
+
+def openai_chunk(content=None, usage=None):
+	return ChatCompletionChunk.model_validate(
+		{
+			'id': 'chunk',
+			'object': 'chat.completion.chunk',
+			'created': 0,
+			'model': 'gpt-4o',
+			'choices': [] if content is None else [{'index': 0, 'delta': {'content': content}}],
+			'usage': usage,
+		}
+	)
+
+
+async def test_openai_streams_the_action_entries(monkeypatch):
+	text = json.dumps({'thinking': 'go', 'action': OUTPUT['action']})
+	chunks = [openai_chunk(part) for part in chunked(text, 5)]
+	chunks.append(openai_chunk(usage={'prompt_tokens': 10, 'completion_tokens': 5, 'total_tokens': 15}))
+	stream = FakeOpenAIStream(chunks)
+	calls = []
+
+	class FakeCompletions:
+		async def create(self, **kwargs):
+			calls.append(kwargs)
+			return stream
+
+	class FakeClient:
+		chat = type('Chat', (), {'completions': FakeCompletions()})()
+
+	llm = ChatOpenAI(model='gpt-4o', api_key='test-key')
+	monkeypatch.setattr(llm, 'get_client', lambda: FakeClient())
+
+	items = [item async for item in llm.astream_structured([UserMessage(content='go')], output_format=Plan)]
+	assert [item.value for item in items[:-1]] == OUTPUT['action']
+	assert isinstance(items[-1], ChatInvokeCompletion)
+	assert items[-1].completion == Plan(thinking='go', action=OUTPUT['action'])
+	assert items[-1].usage.total_tokens == 15
+	assert calls[0]['stream'] is True
+	assert stream.closed
+
+
+async def test_openai_stream_with_an_invalid_output_fails(monkeypatch):
+	stream = FakeOpenAIStream([openai_chunk('{"action": [{"go_back": {}}]')])
+
+	class FakeCompletions:
+		async def create(self, **kwargs):
+			return stream
+
+	class FakeClient:
+		chat = type('Chat', (), {'completions': FakeCompletions()})()
+
+	llm = ChatOpenAI(model='gpt-4o', api_key='test-key')
+	monkeypatch.setattr(llm, 'get_client', lambda: FakeClient())
+
+	items = []
+	with pytest.raises(ModelProviderError):
+		async for item in llm.astream_structured([UserMessage(content='go')], output_format=Plan):
+			items.append(item)
+	# the entry came out before the output turned out invalid
+	assert [item.value for item in items] == [{'go_back': {}}]
+
+
+async def test_anthropic_streams_the_tool_input(monkeypatch):
+	data = {'thinking': 'go', 'action': OUTPUT['action']}
+
+	class Event:
+		def __init__(self, partial_json):
+			self.type = 'input_json'
+			self.partial_json = partial_json
+
+	class FakeMessageStream:
+		async def __aenter__(self):
+			return self
+
+		async def __aexit__(self, *exc):
+			pass
+
+		async def __aiter__(self):
+			for part in chunked(json.dumps(data), 4):
+				yield Event(part)
+
+		async def get_final_message(self):
+			return Message.model_validate(
+				{
+					'id': 'msg',
+					'type': 'message',
+					'role': 'assistant',
+					'model': 'claude-sonnet-4-0',
+					'content': [{'type': 'tool_use', 'id': 'tool', 'name': 'Plan', 'input': data}],
+					'stop_reason': 'tool_use',
+					'usage': {'input_tokens': 10, 'output_tokens': 5},
+				}
+			)
+
+	class FakeMessages:
+		def stream(self, **kwargs):
+			return FakeMessageStream()
+
+	class FakeClient:
+		messages = FakeMessages()
+
+	llm = ChatAnthropic(model='claude-sonnet-4-0', api_key='test-key')
+	monkeypatch.setattr(llm, 'get_client', lambda: FakeClient())
+
+	items = [item async for item in llm.astream_structured([UserMessage(content='go')], output_format=Plan)]
+	assert [item.value for item in items[:-1]] == OUTPUT['action']
+	assert items[-1].completion == Plan(**data)
+	assert items[-1].usage.total_tokens == 15
+
+
+class FakeStreamingLLM(BaseChatModel):
+	model = 'fake-streaming'
+	_verified_api_keys = True
+
+	def __init__(self, output, after_first_action=None):
+		self.output = output
+		self.after_first_action = after_first_action  # awaited once the first action was streamed
+
+	@property
+	def provider(self):
+		return 'fake'
+
+	@property
+	def name(self):
+		return self.model
+
+	async def ainvoke(self, messages, output_format=None):
+		return ChatInvokeCompletion(completion=output_format.model_validate(self.output), usage=None)
+
+	async def astream_structured(self, messages, output_format):
+		for index, action in enumerate(self.output['action']):
+			yield ChatInvokeStreamItem(field='action', index=index, value=action)
+			if index == 0 and self.after_first_action is not None:
+				await self.after_first_action()
+		yield ChatInvokeCompletion(completion=output_format.model_validate(self.output), usage=None)
+
+
+class FakeController:
+	def __init__(self, registry):
+		self.registry = registry
+		self.started = []
+		self.finished = []
+		self.delay = 0.0
+
+	async def act(self, action, **kwargs):
+		name = next(iter(action.model_dump(exclude_unset=True)))
+		self.started.append(name)
+		await asyncio.sleep(self.delay)
+		self.finished.append(name)
+		return ActionResult(extracted_content=name)
+
+
+def agent_output(*actions):
+	return {'evaluation_previous_goal': '', 'memory': '', 'next_goal': '', 'action': list(actions)}
+
+
+def make_agent(llm):
+	agent = Agent(task='Find the pricing page', llm=llm, browser_session=BrowserSession(headless=True), stream_actions=True)
+	agent.controller = FakeController(agent.controller.registry)  # type: ignore
+	return agent
+
+
+async def test_first_action_starts_while_the_output_streams():
+	async def after_first_action():
+		await asyncio.sleep(0.01)
+		# the rest of the output is still coming
+		assert agent.controller.started == ['go_to_url']
+
+	llm = FakeStreamingLLM(
+		agent_output({'go_to_url': {'url': 'https://example.com/pricing'}}, {'go_back': {}}), after_first_action
+	)
+	agent = make_agent(llm)
+	output = await agent.get_model_output([UserMessage(content='go')])
+	assert agent._early_action is not None
+	assert len(output.action) == 2
+
+	agent.state.last_model_output = output
+	results = await agent.multi_act(output.action, started_first_action=agent._early_action[1])
+	# the first action ran once, the second after it
+	assert agent.controller.started == ['go_to_url', 'go_back']
+	assert [result.extracted_content for result in results] == ['go_to_url', 'go_back']
+
+
+async def test_early_action_is_cancelled_when_the_output_is_invalid():
+	async def after_first_action():
+		await asyncio.sleep(0)
+
+	llm = FakeStreamingLLM(agent_output({'go_to_url': {'url': 'https://example.com/pricing'}}), after_first_action)
+	llm.output['next_goal'] = {'not': 'a goal'}
+	agent = make_agent(llm)
+	agent.controller.delay = 1
+
+	with pytest.raises(ValidationError):
+		await agent.get_model_output([UserMessage(content='go')])
+	assert agent.controller.started == ['go_to_url']
+	assert agent.controller.finished == []
+	assert agent._early_action is None
+
+
+class FakeDuckTypedLLM:
+	"""A model that only implements the BaseChatModel protocol, without astream_structured()"""
+
+	model = 'fake-duck-typed'
+	_verified_api_keys = True
+
+	def __init__(self, output):
+		self.output = output
+		self.calls = 0
+
+	@property
+	def provider(self):
+		return 'fake'
+
+	@property
+	def name(self):
+		return self.model
+
+	@property
+	def model_name(self):
+		return self.model
+
+	__get_pydantic_core_schema__ = BaseChatModel.__get_pydantic_core_schema__
+
+	async def ainvoke(self, messages, output_format=None):
+		self.calls += 1
+		return ChatInvokeCompletion(completion=output_format.model_validate(self.output), usage=None)
+
+
+async def test_models_without_streaming_fall_back_to_ainvoke():
+	llm = FakeDuckTypedLLM(agent_output({'go_to_url': {'url': 'https://example.com/pricing'}}))
+	assert isinstance(llm, BaseChatModel)
+	assert isinstance(FakeStreamingLLM(agent_output()), BaseChatModel)
+
+	agent = make_agent(llm)
+	output = await agent.get_model_output([UserMessage(content='go')])
+	assert llm.calls == 1
+	assert agent._early_action is None
+	assert agent.controller.started == []
+	assert len(output.action) == 1
+
+	# the mock models of the other tests don't stream either
+	agent = make_agent(create_mock_llm())
+	assert not hasattr(agent.llm, 'astream_structured')
+	output = await agent.get_model_output([UserMessage(content='go')])
+	assert output.action
+
+
+async def test_done_is_not_started_early():
+	llm = FakeStreamingLLM(agent_output({'done': {'text': 'found it', 'success': True}}))
+	agent = make_agent(llm)
+	output = await agent.get_model_output([UserMessage(content='go')])
+	assert agent._early_action is None
+	assert agent.controller.started == []
+	assert output.action[0].model_dump(exclude_unset=True)['done']['text'] == 'found it'
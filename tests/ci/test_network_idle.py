@@ -0,0 +1,256 @@
+"""
+Test the event-driven network idle wait and the per-domain settle profiles, with fake pages instead of a browser.
+"""
+
+import asyncio
+import json
+import time
+
+from browser_use.browser.network_idle import (
+	IGNORED_URL_PATTERNS,
+	IGNORED_URL_RE,
+	MIN_IDLE_WINDOW,
+	SAVE_DELAY,
+	NetworkIdleWatcher,
+	SettleProfile,
+	SettleProfileStore,
+	get_settle_profile_store,
+)
+from browser_use.browser.session import BrowserSession
+
+
+class FakeRequest:
+	def __init__(self, url, resource_type='script', headers=None):
+		self.url = url
+		self.resource_type = resource_type
+		self.headers = headers or {}
+
+
+class FakeResponse:
+	def __init__(self, request, content_type='application/javascript'):
+		self.request = request
+		self.headers = {'content-type': content_type}
+
+
+class FakePage:
+	def __init__(self, url):
+		self.url = url
+		self.handlers = {}
+
+	def on(self, event, handler):
+		self.handlers.setdefault(event, []).append(handler)
+
+	def remove_listener(self, event, handler):
+		self.handlers[event].remove(handler)
+
+	def emit(self, event, arg):
+		for handler in list(self.handlers.get(event, [])):
+			handler(arg)
+
+
+def test_ignored_url_regex_matches_substring_scan():
+	urls = [
+		'https://www.google-analytics.com/collect',
+		'https://example.com/app.js',
+		'https://cdn.example.com/ping?x=1',
+		'https://static.cloudfront.net/bundle.js',
+		'https://example.com/api/items',
+		'wss://socket.example.com/',
+	]
+	for url in urls:
+		assert bool(IGNORED_URL_RE.search(url)) == any(pattern in url for pattern in IGNORED_URL_PATTERNS)
+
+
+async def test_watcher_wakes_on_events_instead_of_polling():
+	watcher = NetworkIdleWatcher()
+	request = FakeRequest('https://example.com/app.js')
+	watcher.on_request(request)
+	# ignored requests never hold up the load
+	watcher.on_request(FakeRequest('https://www.google-analytics.com/collect'))
+	watcher.on_request(FakeRequest('https://example.com/video.mp4', resource_type='media'))
+	assert len(watcher.pending) == 1
+
+	async def respond_later():
+		await asyncio.sleep(0.05)
+		watcher.on_response(FakeResponse(request))
+
+	start = time.monotonic()
+	asyncio.create_task(respond_later())
+	result = await watcher.wait(idle_window=0.1, max_wait=2.0)
+	assert result.idle
+	# response after 0.05s + 0.1s idle window, not a multiple of a polling interval
+	assert 0.15 <= time.monotonic() - start < 0.3
+
+
+async def test_failed_requests_stop_counting_and_timeouts_report_pending():
+	watcher = NetworkIdleWatcher()
+	failed = FakeRequest('https://example.com/missing.css', resource_type='stylesheet')
+	watcher.on_request(failed)
+	watcher.on_request_failed(failed)
+	assert (await watcher.wait(idle_window=0.01, max_wait=1.0)).idle
+
+	stuck = NetworkIdleWatcher()
+	stuck.on_request(FakeRequest('https://example.com/poll?cursor=1'))
+	result = await stuck.wait(idle_window=0.01, max_wait=0.05)
+	assert not result.idle
+	assert result.pending_urls == ['https://example.com/poll?cursor=1']
+
+
+def test_settle_profile_shortens_idle_window_after_enough_samples():
+	profile = SettleProfile()
+	for _ in range(2):
+		profile.record(max_quiet_gap=0.05, timed_out_endpoints=set())
+		assert profile.idle_window(0.5) == 0.5
+	profile.record(max_quiet_gap=0.05, timed_out_endpoints=set())
+	assert profile.idle_window(0.5) == MIN_IDLE_WINDOW
+
+	# a slow site keeps the configured window
+	profile.record(max_quiet_gap=0.4, timed_out_endpoints=set())
+	assert profile.idle_window(0.5) == 0.5
+
+
+def test_long_polls_are_learned_after_repeated_timeouts(tmp_path):
+	path = tmp_path / 'settle.json'
+	store = SettleProfileStore(path)
+	store.record('example.com', 0.0, {'example.com/poll'})
+	assert store.get('example.com').long_poll_endpoints == set()
+	store.record('example.com', 0.0, {'example.com/poll'})
+	assert store.get('example.com').long_poll_endpoints == {'example.com/poll'}
+
+	# persisted and reloaded
+	reloaded = SettleProfileStore(path)
+	assert reloaded.get('example.com').long_poll_endpoints == {'example.com/poll'}
+	assert reloaded.get('example.com').samples == 2
+
+
+def test_long_poll_strikes_decay_when_the_endpoint_completes():
+	profile = SettleProfile()
+	for _ in range(3):
+		profile.record(0.0, {'example.com/api/feed'})
+	assert profile.long_poll_endpoints == {'example.com/api/feed'}
+
+	profile.record(0.0, set(), completed_endpoints={'example.com/api/feed'})
+	assert profile.long_poll_endpoints == {'example.com/api/feed'}
+	profile.record(0.0, set(), completed_endpoints={'example.com/api/feed'})
+	assert profile.long_poll_endpoints == set()
+	profile.record(0.0, set(), completed_endpoints={'example.com/api/feed'})
+	assert profile.long_poll_strikes == {}
+
+
+def test_old_profile_files_still_load(tmp_path):
+	path = tmp_path / 'settle.json'
+	path.write_text(
+		json.dumps({'example.com': {'samples': 4, 'settle_time': 0.8, 'max_quiet_gap': 0.1, 'long_poll_strikes': {}}})
+	)
+	assert SettleProfileStore(path).get('example.com').samples == 4
+
+
+async def test_updates_on_the_event_loop_are_written_later_in_one_go(tmp_path):
+	path = tmp_path / 'settle.json'
+	store = SettleProfileStore(path)
+	for _ in range(3):
+		store.record('example.com', 0.0, set())
+	# nothing written on the event loop right after a navigation
+	assert not path.exists()
+
+	await asyncio.sleep(SAVE_DELAY + 0.2)
+	assert json.loads(path.read_text())['example.com']['samples'] == 3
+
+	store.record('example.com', 0.0, set())
+	store.flush()
+	assert json.loads(path.read_text())['example.com']['samples'] == 4
+
+
+async def test_adaptive_watcher_waits_for_api_requests_but_not_ignored_polls():
+	# without adaptive idle detection only page resources are waited for
+	page_only = NetworkIdleWatcher()
+	page_only.on_request(FakeRequest('https://example.com/api/items', resource_type='fetch'))
+	assert not page_only.pending
+
+	watcher = NetworkIdleWatcher(ignored_endpoints={'example.com/poll'}, include_api_requests=True)
+	items = FakeRequest('https://example.com/api/items?page=2', resource_type='fetch')
+	poll = FakeRequest('https://example.com/poll?cursor=3', resource_type='xhr')
+	bundle = FakeRequest('https://example.com/app.js')
+	for request in (items, poll, bundle):
+		watcher.on_request(request)
+	assert set(watcher.pending) == {items, bundle}
+
+	watcher.on_response(FakeResponse(items, content_type='application/json'))
+	watcher.on_response(FakeResponse(poll, content_type='application/json'))
+	result = await watcher.wait(idle_window=0.01, max_wait=0.05)
+	assert not result.idle
+	# the slow bundle timed out, but only xhr/fetch endpoints can be long polls
+	assert result.pending_urls == ['https://example.com/app.js']
+	assert result.pending_poll_endpoints == set()
+	assert result.completed_poll_endpoints == {'example.com/api/items', 'example.com/poll'}
+
+
+async def test_session_ignores_learned_long_polls(tmp_path):
+	path = tmp_path / 'settle.json'
+	for _ in range(2):
+		get_settle_profile_store(path).record('example.com', 0.0, {'example.com/poll'})
+
+	page = FakePage('https://example.com/inbox')
+
+	class PageSession(BrowserSession):
+		async def get_current_page(self):
+			return page
+
+	session = PageSession(
+		adaptive_network_idle=True,
+		network_settle_profiles_path=path,
+		wait_for_network_idle_page_load_time=0.05,
+		maximum_wait_page_load_time=1.0,
+	)
+	wait = asyncio.create_task(session._wait_for_stable_network())
+	await asyncio.sleep(0.01)
+	page.emit('request', FakeRequest('https://example.com/poll?cursor=2', resource_type='xhr'))
+	await asyncio.wait_for(wait, timeout=0.5)
+
+	assert session._current_page_loading_status is None
+	assert all(not handlers for handlers in page.handlers.values())
+	assert get_settle_profile_store(path).get('example.com').samples == 3
+
+	# a document that keeps timing out is still waited for, it never becomes a long poll
+	session.browser_profile.maximum_wait_page_load_time = 0.05
+	for _ in range(3):
+		wait = asyncio.create_task(session._wait_for_stable_network())
+		await asyncio.sleep(0.01)
+		page.emit('request', FakeRequest('https://example.com/inbox', resource_type='document'))
+		await wait
+		assert session._current_page_loading_status is not None
+	assert get_settle_profile_store(path).get('example.com').long_poll_endpoints == {'example.com/poll'}
+	get_settle_profile_store(path).flush()
+
+
+async def test_first_load_of_a_domain_waits_like_without_a_profile(tmp_path):
+	path = tmp_path / 'settle.json'
+	store = get_settle_profile_store(path)
+	assert store.get('chat.example.com') is None
+
+	page = FakePage('https://chat.example.com/')
+
+	class PageSession(BrowserSession):
+		async def get_current_page(self):
+			return page
+
+	session = PageSession(
+		adaptive_network_idle=True,
+		network_settle_profiles_path=path,
+		wait_for_network_idle_page_load_time=0.05,
+		maximum_wait_page_load_time=1.0,
+	)
+	wait = asyncio.create_task(session._wait_for_stable_network())
+	await asyncio.sleep(0.01)
+	me = FakeRequest('https://chat.example.com/api/me', resource_type='fetch')
+	page.emit('request', FakeRequest('https://chat.example.com/poll?cursor=1', resource_type='xhr'))
+	page.emit('request', me)
+	page.emit('response', FakeResponse(me, content_type='application/json'))
+	# the long poll doesn't hold up the first load
+	await asyncio.wait_for(wait, timeout=0.5)
+	assert session._current_page_loading_status is None
+
+	profile = store.get('chat.example.com')
+	assert profile is not None and profile.samples == 1
+	assert profile.long_poll_endpoints == {'chat.example.com/poll'}
+	store.flush()
@@ -0,0 +1,93 @@
+"""
+Test that @require_healthy_browser reuses recent page responsiveness checks.
+"""
+
+from browser_use.browser.session import BrowserSession, PageHealthCache, require_healthy_browser
+
+
+class FakePage:
+	def __init__(self, url='https://example.com'):
+		self.url = url
+		self.main_frame = object()
+		self.handlers = {}
+		self.closed = False
+		self.evaluations = 0
+
+	def is_closed(self):
+		return self.closed
+
+	def on(self, event, handler):
+		self.handlers.setdefault(event, []).append(handler)
+
+	def emit(self, event, arg=None):
+		for handler in self.handlers.get(event, []):
+			handler(arg)
+
+	async def evaluate(self, expression):
+		self.evaluations += 1
+		return 1
+
+
+class FakeContext:
+	def __init__(self, page):
+		self.pages = [page]
+
+
+class HealthCheckedSession(BrowserSession):
+	@require_healthy_browser(usable_page=True, reopen_page=True)
+	async def read_state(self):
+		return 'ok'
+
+
+def make_session(ttl=60.0):
+	page = FakePage()
+	session = HealthCheckedSession(page_health_cache_ttl=ttl)
+	session.initialized = True
+	session.browser_context = FakeContext(page)  # type: ignore[assignment]
+	session.agent_current_page = page  # type: ignore[assignment]
+	return session, page
+
+
+async def test_checks_are_reused_within_a_navigation():
+	session, page = make_session()
+	for _ in range(4):
+		assert await session.read_state() == 'ok'
+	assert page.evaluations == 1
+	assert session.page_health_stats() == {'probes': 1, 'hits': 3}
+
+	# subframe navigations don't invalidate the check, main frame navigations do
+	page.emit('framenavigated', object())
+	await session.read_state()
+	assert page.evaluations == 1
+	page.emit('framenavigated', page.main_frame)
+	await session.read_state()
+	assert page.evaluations == 2
+
+	page.emit('crash', page)
+	await session.read_state()
+	assert page.evaluations == 3
+
+
+async def test_zero_ttl_checks_every_call():
+	session, page = make_session(ttl=0)
+	for _ in range(3):
+		await session.read_state()
+	assert page.evaluations == 3
+	assert session.page_health_stats() == {'probes': 3, 'hits': 0}
+
+
+def test_cache_expires_and_skips_closed_pages():
+	cache = PageHealthCache(ttl=60.0)
+	page = FakePage()
+	cache.mark_responsive(page)
+	assert cache.is_fresh(page)
+
+	page.closed = True
+	assert not cache.is_fresh(page)
+	page.closed = False
+
+	cache.ttl = -1
+	assert not cache.is_fresh(page)
+	cache.ttl = 60.0
+	page.emit('close', page)
+	assert not cache.is_fresh(page)
@@ -0,0 +1,146 @@
+"""
+Test the resource_policy request blocking, with fake routes instead of a browser.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from browser_use.browser.resource_policy import (
+	ESTIMATED_RESOURCE_BYTES,
+	PLACEHOLDER_IMAGE,
+	ResourceBlocker,
+	ResourcePolicy,
+)
+from browser_use.browser.session import BrowserSession
+
+
+class FakeFrame:
+	def __init__(self, parent_frame=None):
+		self.parent_frame = parent_frame
+
+
+class FakeRequest:
+	def __init__(self, url, resource_type='script', frame=None):
+		self.url = url
+		self.resource_type = resource_type
+		self.frame = frame or FakeFrame()
+
+	def is_navigation_request(self):
+		return self.resource_type == 'document'
+
+
+class FakeRoute:
+	def __init__(self, url, resource_type='script', frame=None):
+		self.request = FakeRequest(url, resource_type, frame)
+		self.result = None
+
+	async def abort(self, error_code=None):
+		self.result = ('abort', error_code)
+
+	async def fulfill(self, **kwargs):
+		self.result = ('fulfill', kwargs)
+
+	async def fallback(self):
+		self.result = ('fallback', None)
+
+
+def test_block_reasons():
+	blocker = ResourceBlocker(
+		ResourcePolicy(
+			block_resource_types={'media', 'font'},
+			block_url_patterns=['*.mp4', '*://*/ads/*'],
+			block_domains=['doubleclick.net'],
+		)
+	)
+	assert blocker.block_reason('https://example.com/a.woff2', 'font') == 'resource_type'
+	assert blocker.block_reason('https://doubleclick.net/pixel', 'image') == 'domain'
+	assert blocker.block_reason('https://stats.g.DoubleClick.net/pixel', 'image') == 'domain'
+	assert blocker.block_reason('https://notdoubleclick.net/pixel', 'image') is None
+	assert blocker.block_reason('https://cdn.example.com/intro.MP4', 'other') == 'url_pattern'
+	assert blocker.block_reason('https://example.com/ads/banner.js', 'script') == 'url_pattern'
+	assert blocker.block_reason('https://example.com/app.js', 'script') is None
+	# top-level navigations are never blocked, iframe documents are
+	assert blocker.block_reason('https://doubleclick.net/', 'document', main_frame_navigation=True) is None
+	assert blocker.block_reason('https://doubleclick.net/', 'document') == 'domain'
+
+
+async def test_only_main_frame_navigations_are_exempt():
+	blocker = ResourceBlocker(ResourcePolicy(block_domains=['doubleclick.net']))
+
+	navigation = FakeRoute('https://doubleclick.net/', 'document')
+	assert not await blocker.handle(navigation)
+	assert navigation.result is None
+
+	ad_frame = FakeRoute('https://ad.doubleclick.net/frame.html', 'document', frame=FakeFrame(parent_frame=FakeFrame()))
+	assert await blocker.handle(ad_frame)
+	assert ad_frame.result == ('abort', 'blockedbyclient')
+	assert blocker.stats()['blocked_by_reason'] == {'domain': 1}
+
+
+def test_documents_cannot_be_blocked():
+	with pytest.raises(ValidationError):
+		ResourcePolicy(block_resource_types={'document'})
+	assert ResourcePolicy().is_empty
+	assert not ResourcePolicy.form_filling().is_empty
+
+
+async def test_images_get_placeholder_and_everything_else_is_aborted():
+	blocker = ResourceBlocker(ResourcePolicy(block_resource_types={'image', 'media'}, image_placeholder=True))
+
+	image = FakeRoute('https://example.com/hero.jpg', 'image')
+	assert await blocker.handle(image)
+	action, kwargs = image.result
+	assert action == 'fulfill'
+	assert kwargs['body'] == PLACEHOLDER_IMAGE
+	assert PLACEHOLDER_IMAGE.startswith(b'\x89PNG\r\n\x1a\n')
+
+	video = FakeRoute('https://example.com/intro.webm', 'media')
+	assert await blocker.handle(video)
+	assert video.result == ('abort', 'blockedbyclient')
+
+	assert not await blocker.handle(FakeRoute('https://example.com/app.js'))
+	assert blocker.stats() == {
+		'blocked_requests': 2,
+		'estimated_bytes_saved': ESTIMATED_RESOURCE_BYTES['image'] + ESTIMATED_RESOURCE_BYTES['media'],
+		'blocked_by_reason': {'resource_type': 2},
+	}
+
+
+async def test_session_routes_through_the_policy():
+	browser_session = BrowserSession(resource_policy=ResourcePolicy(block_domains=['hotjar.com']))
+	assert browser_session.resource_blocking_stats()['blocked_requests'] == 0
+
+	class FakeContext:
+		def __init__(self):
+			self.routes = []
+
+		async def route(self, pattern, handler):
+			self.routes.append((pattern, handler))
+
+	context = FakeContext()
+	browser_session.browser_context = context
+	await browser_session._setup_request_interception()
+	# installed once per context
+	await browser_session._setup_request_interception()
+	assert len(context.routes) == 1
+	pattern, handler = context.routes[0]
+	assert pattern == '**/*'
+
+	blocked = FakeRoute('https://script.hotjar.com/modules.js')
+	allowed = FakeRoute('https://example.com/app.js')
+	await handler(blocked)
+	await handler(allowed)
+	assert blocked.result[0] == 'abort'
+	assert allowed.result == ('fallback', None)
+	assert browser_session.resource_blocking_stats()['blocked_by_reason'] == {'domain': 1}
+
+
+async def test_no_policy_installs_no_route():
+	browser_session = BrowserSession()
+
+	class FailingContext:
+		async def route(self, pattern, handler):
+			raise AssertionError('no route expected without a resource_policy')
+
+	browser_session.browser_context = FailingContext()
+	await browser_session._setup_request_interception()
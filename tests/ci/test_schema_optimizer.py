@@ -64,3 +64,45 @@ def test_optimizer_preserves_all_fields_in_structured_done_action():
 		f'Missing from optimized: {original_fields - optimized_fields}\n'
 		f'Unexpected in optimized: {optimized_fields - original_fields}'
 	)
+
+
+def test_identical_action_sets_share_one_optimized_schema():
+	"""A fresh ActionModel/AgentOutput type with the same actions reuses the cached schema and its JSON bytes."""
+	SchemaOptimizer.clear_cache()
+	controller = Controller()
+	first_model = AgentOutput.type_with_custom_actions(controller.registry.create_action_model())
+	second_model = AgentOutput.type_with_custom_actions(controller.registry.create_action_model())
+	assert first_model is not second_model
+
+	first = SchemaOptimizer.get_optimized_schema(first_model)
+	second = SchemaOptimizer.get_optimized_schema(second_model)
+	assert second is first
+	assert SchemaOptimizer.create_optimized_json_schema(second_model) is first.schema
+	# the cached schema is what an uncached build produces
+	assert SchemaOptimizer._build_optimized_json_schema(second_model) == first.schema
+
+	stats = SchemaOptimizer.cache_stats()
+	assert (stats['hits'], stats['misses']) == (2, 1)
+	assert stats['hit_rate'] == 0.667
+
+
+def test_different_action_sets_get_their_own_schema():
+	SchemaOptimizer.clear_cache()
+	controller = Controller()
+	action_model = controller.registry.create_action_model()
+	default_schema = SchemaOptimizer.create_optimized_json_schema(AgentOutput.type_with_custom_actions(action_model))
+
+	# same actions, different output variant (the schema override of the class differs)
+	no_thinking = SchemaOptimizer.create_optimized_json_schema(AgentOutput.type_with_custom_actions_no_thinking(action_model))
+	assert 'thinking' in default_schema['properties'] and 'thinking' not in no_thinking['properties']
+
+	# a subset of the actions, as page filters produce
+	subset = controller.registry.create_action_model(include_actions=['go_to_url', 'done'])
+	subset_schema = SchemaOptimizer.create_optimized_json_schema(AgentOutput.type_with_custom_actions(subset))
+	assert len(subset_schema['properties']['action']['items']['anyOf']) == 2
+
+	# a structured output model changes the done action
+	structured = Controller(output_model=ProductInfo).registry.create_action_model()
+	structured_schema = SchemaOptimizer.create_optimized_json_schema(AgentOutput.type_with_custom_actions(structured))
+	assert structured_schema is not default_schema
+	assert SchemaOptimizer.cache_stats()['misses'] == 4
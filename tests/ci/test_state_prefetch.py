@@ -0,0 +1,243 @@
+"""
+Test the speculative capture of the next step's browser state, mostly with a fake browser session.
+"""
+
+import asyncio
+import threading
+import time
+
+from browser_use.agent.service import Agent
+from browser_use.agent.views import ActionResult, AgentStepInfo
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.session import BrowserSession
+from browser_use.browser.views import BrowserStateSummary
+from browser_use.controller.registry.service import Registry
+from browser_use.dom.service import DomService
+from browser_use.dom.views import DOMElementNode
+from tests.ci.conftest import create_mock_llm
+
+
+class FakePage:
+	def __init__(self, url='https://example.com/'):
+		self.url = url
+
+
+class FakeBrowserSession:
+	def __init__(self):
+		self.id = '0000-fake'
+		self.agent_current_page = FakePage()
+		self.page_mutation_count = 0
+		self.captures = 0
+		self.marked = []
+		self.warmups = 0
+		self.capture_delay = 0.01
+
+	async def get_browser_state_with_recovery(self, cache_clickable_elements_hashes=True, include_screenshot=True):
+		self.captures += 1
+		await asyncio.sleep(self.capture_delay)
+		return BrowserStateSummary(
+			element_tree=DOMElementNode(tag_name='body', xpath='', attributes={}, children=[], is_visible=True, parent=None),
+			selector_map={},
+			url=self.agent_current_page.url,
+			title='',
+			tabs=[],
+		)
+
+	def mark_new_clickable_elements(self, state):
+		self.marked.append(state)
+
+	async def warm_dom_cache(self):
+		self.warmups += 1
+		return True
+
+
+def make_agent(**kwargs):
+	agent = Agent(
+		task='Find the pricing page',
+		llm=create_mock_llm(),
+		browser_session=BrowserSession(headless=True),
+		**kwargs,
+	)
+	agent.browser_session = FakeBrowserSession()  # type: ignore
+	agent.state.last_result = [ActionResult(extracted_content='clicked')]
+	return agent
+
+
+async def test_prefetched_state_is_used_by_the_next_step():
+	agent = make_agent(speculative_state_prefetch=True)
+	agent._start_state_prefetch(AgentStepInfo(step_number=0, max_steps=10))
+	state = await agent._take_state_prefetch()
+	assert state is not None
+	assert agent.browser_session.captures == 1
+	# elements are compared with the previous state only once the state is used
+	assert agent.browser_session.marked == [state]
+	assert agent._state_prefetch_stats == {'used': 1, 'discarded': 0}
+	assert await agent._take_state_prefetch() is None
+
+
+async def test_prefetch_is_discarded_when_the_pages_change():
+	agent = make_agent(speculative_state_prefetch=True)
+	session = agent.browser_session
+
+	# an action ran after the capture started
+	agent._start_state_prefetch()
+	session.page_mutation_count += 1
+	assert await agent._take_state_prefetch() is None
+
+	# another tab became the current one
+	agent._start_state_prefetch()
+	session.agent_current_page = FakePage('https://example.com/other')
+	assert await agent._take_state_prefetch() is None
+
+	# the page navigated on its own after the capture
+	agent._start_state_prefetch()
+	await asyncio.sleep(0.02)
+	session.agent_current_page.url = 'https://example.com/redirected'
+	assert await agent._take_state_prefetch() is None
+
+	# paused in between
+	agent._start_state_prefetch()
+	agent.pause()
+	assert await agent._take_state_prefetch() is None
+
+	assert agent._state_prefetch_stats == {'used': 0, 'discarded': 4}
+	assert session.marked == []
+
+
+async def test_no_prefetch_unless_another_step_follows():
+	agent = make_agent()
+	agent._start_state_prefetch()
+	assert agent._state_prefetch is None
+
+	agent = make_agent(speculative_state_prefetch=True)
+	agent._start_state_prefetch(AgentStepInfo(step_number=9, max_steps=10))
+	assert agent._state_prefetch is None
+	agent.state.last_result = [ActionResult(is_done=True, extracted_content='done')]
+	agent._start_state_prefetch()
+	assert agent._state_prefetch is None
+
+
+async def test_close_stops_a_running_prefetch():
+	agent = make_agent(speculative_state_prefetch=True)
+	agent.browser_session.capture_delay = 10
+	agent._start_state_prefetch()
+	task = agent._state_prefetch
+	await asyncio.sleep(0)
+	await agent._discard_state_prefetch(reason='test')
+	assert task.cancelled()
+	assert agent._state_prefetch is None
+
+
+async def test_step_is_recorded_on_the_event_loop_while_prefetching():
+	agent = make_agent(speculative_state_prefetch=True)
+	recorded_in = []
+
+	def record_step(browser_state_summary, metadata):
+		# the history must not be touched from another thread
+		recorded_in.append(threading.current_thread())
+
+	agent._record_step = record_step
+	agent._start_state_prefetch()
+	await agent._finalize(None)
+	assert recorded_in == [threading.main_thread()]
+	assert await agent._take_state_prefetch() is not None
+
+
+async def test_capture_starts_while_the_step_is_finalized():
+	agent = make_agent(speculative_state_prefetch=True)
+	agent.step_start_time = time.time()
+	agent._start_state_prefetch()
+	assert agent.browser_session.captures == 0
+	await agent._finalize(None)
+	# the capture has started before the next step prepares its context
+	assert agent.browser_session.captures == 1
+	assert agent.state.file_system_state is not None
+	assert await agent._take_state_prefetch() is not None
+
+
+async def test_no_prefetch_with_step_hooks():
+	agent = make_agent(speculative_state_prefetch=True)
+	agent._run_has_step_hooks = True
+	agent._start_state_prefetch()
+	assert agent._state_prefetch is None
+
+
+async def test_dom_warmup_overlaps_the_llm_call():
+	agent = make_agent(speculative_state_prefetch=True)
+	session = agent.browser_session
+	warming, release = asyncio.Event(), asyncio.Event()
+	calls = []
+
+	async def warm_dom_cache():
+		session.warmups += 1
+		warming.set()
+		await release.wait()
+		return True
+
+	async def get_next_action(browser_state_summary):
+		# only returns once the warm-up is running, so they can't run one after the other
+		await warming.wait()
+		calls.append(session.warmups)
+		release.set()
+
+	session.warm_dom_cache = warm_dom_cache
+	agent._get_next_action = get_next_action
+	await asyncio.wait_for(agent._get_next_action_warming_dom(None), timeout=1)
+	assert calls == [1]
+	assert agent._dom_warmup is None
+
+
+async def test_actions_count_as_page_mutations():
+	registry = Registry()
+
+	@registry.action('Say hello')
+	async def say_hello():
+		pass
+
+	browser_session = BrowserSession(headless=True)
+	assert browser_session.page_mutation_count == 0
+	await registry.execute_action('say_hello', {}, browser_session=browser_session)
+	assert browser_session.page_mutation_count == 1
+	# nothing to warm without incremental DOM snapshots
+	assert not await browser_session.warm_dom_cache()
+
+
+async def test_capture_after_dom_warmup_copies_clean_subtrees(httpserver, monkeypatch):
+	items = ''.join(f'<li><button>Item {i}</button></li>' for i in range(20))
+	httpserver.expect_request('/').respond_with_data(f'<html><body><ul>{items}</ul></body></html>', content_type='text/html')
+
+	results = []
+	evaluate_dom_runtime = DomService._evaluate_dom_runtime
+
+	async def recording_evaluate_dom_runtime(self, args):
+		result = await evaluate_dom_runtime(self, args)
+		results.append(result)
+		return result
+
+	monkeypatch.setattr(DomService, '_evaluate_dom_runtime', recording_evaluate_dom_runtime)
+
+	browser_session = BrowserSession(
+		browser_profile=BrowserProfile(headless=True, user_data_dir=None, incremental_dom_snapshots=True, highlight_elements=True)
+	)
+	await browser_session.start()
+	try:
+		page = await browser_session.get_current_page()
+		await page.goto(httpserver.url_for('/'))
+		await browser_session.get_state_summary(cache_clickable_elements_hashes=True, include_screenshot=False)
+
+		await page.evaluate("document.querySelectorAll('button')[3].textContent = 'Changed'")
+		assert await browser_session.warm_dom_cache()
+		# the warm-up ran with the capture's arguments, so the capture finds nothing left to do
+		await browser_session.get_state_summary(cache_clickable_elements_hashes=True, include_screenshot=False)
+		assert results[-1].get('unchanged')
+
+		await page.evaluate("document.querySelectorAll('button')[7].textContent = 'Changed too'")
+		assert await browser_session.warm_dom_cache()
+		# only the changed subtree was analysed again, the other 19 items were copied
+		assert results[-1]['baseSnapshotId'] is not None
+		assert 0 < len(results[-1]['map']) < 5
+		state = await browser_session.get_state_summary(cache_clickable_elements_hashes=True, include_screenshot=False)
+		assert results[-1].get('unchanged')
+		assert len(state.selector_map) == 20
+	finally:
+		await browser_session.kill()